@@ -0,0 +1,263 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, TypedDict
+
+from ahc_local_leaderboard.dependency_setup import Dependencies
+from ahc_local_leaderboard.models.sort_config import (
+    DetailScoreRecordsSortConfig,
+    SummaryScoreRecordsSortConfig,
+)
+from ahc_local_leaderboard.models.summary_score_record import SummaryScoreRecord
+from ahc_local_leaderboard.models.test_case import TestCases
+from ahc_local_leaderboard.models.test_file import TestFiles
+from ahc_local_leaderboard.view.viewer import Viewer
+from benchmarks.synthetic_leaderboard import SyntheticLeaderboard, create_submitter
+
+
+class BenchmarkResult(TypedDict):
+    """ベンチマーク1件の計測結果（秒）を定義する型。"""
+
+    min: float
+    median: float
+    mean: float
+    runs: list[float]
+
+
+class Benchmark:
+    """計測対象の処理と、計測に含めない前処理・後処理の組を管理するクラス。"""
+
+    def __init__(
+        self,
+        name: str,
+        target: Callable[[], Any],
+        setup: Callable[[], None] = lambda: None,
+        teardown: Callable[[], None] = lambda: None,
+    ) -> None:
+        self.name = name
+        self.target = target
+        self.setup = setup
+        self.teardown = teardown
+
+    def run(self, repeat: int) -> BenchmarkResult:
+        """前処理と後処理を除いた処理時間を'repeat'回計測します。"""
+        assert 0 < repeat
+
+        runs = []
+        for _ in range(repeat):
+            self.setup()
+            try:
+                start_time = time.perf_counter()
+                self.target()
+                runs.append(time.perf_counter() - start_time)
+            finally:
+                self.teardown()
+
+        return {"min": min(runs), "median": statistics.median(runs), "mean": statistics.fmean(runs), "runs": runs}
+
+
+class SubmitAndViewBenchmarks:
+    """生成した順位表に対して、submit と view の主要な処理のベンチマークを作成するクラス。
+
+    データベースに書き込むベンチマークはトランザクションの中で実行してロールバックするため、
+    繰り返し計測してもデータベースの内容は変わりません。
+    """
+
+    DETAIL_SORT_COLUMN = "id"
+    SUMMARY_LIST_LENGTH = 20
+
+    def __init__(self, leaderboard: SyntheticLeaderboard, dependencies: Dependencies) -> None:
+        self.leaderboard = leaderboard
+        self.dependencies = dependencies
+        self.submitter = create_submitter(dependencies)
+        self.test_cases = self.score_test_files()
+        self.reserved_record: Optional[SummaryScoreRecord] = None
+
+    def score_test_files(self) -> TestCases:
+        """out/ の提出ファイルのスコアを ConstantTimeTestFileProcessor で計算します。"""
+        return self.submitter.score_test_files(
+            TestFiles(self.leaderboard.get_input_dir(), self.leaderboard.get_submit_dir())
+        )
+
+    def begin_submission(self) -> None:
+        """トランザクションを開始し、out/ の提出のスコア履歴レコードを仮登録します。"""
+        self.dependencies["db_manager"].begin_transaction()
+        submission_time = self.submitter.generate_submission_times(1)[0]
+        self.reserved_record = self.submitter.reserve_record(self.test_cases, submission_time)
+
+    def process_test_cases(self) -> None:
+        """仮登録したレコードに out/ の提出のテストケースを記録します。"""
+        assert self.reserved_record is not None
+        self.dependencies["test_cases_processor"].process_test_cases(self.test_cases, self.reserved_record.id)
+
+    def begin_relative_score_update(self) -> None:
+        """相対スコアの更新の直前まで、out/ の提出を記録します。"""
+        self.begin_submission()
+        self.process_test_cases()
+        assert self.reserved_record is not None
+        self.dependencies["reserved_record_updater"].update_reserved_record(self.reserved_record)
+
+    def rollback(self) -> None:
+        """ベンチマークで書き込んだ内容を取り消します。トップスコアとしてコピーされたファイルは残ります。"""
+        self.dependencies["db_manager"].rollback()
+
+    def create_viewer(self) -> Viewer:
+        """表示用の Viewer を生成します。"""
+        return Viewer(self.dependencies["record_read_service"], self.dependencies["relative_score_calculator"])
+
+    def create_benchmarks(self) -> list[Benchmark]:
+        """計測するベンチマークの一覧を作成します。"""
+        calculator = self.dependencies["relative_score_calculator"]
+        viewer = self.create_viewer()
+        latest_id = self.dependencies["record_read_service"].fetch_latest_submission_id()
+
+        return [
+            Benchmark("TestFilesProcessor.process_test_files", self.score_test_files),
+            Benchmark(
+                "TestCasesProcessor.process_test_cases", self.process_test_cases, self.begin_submission, self.rollback
+            ),
+            Benchmark(
+                "RelativeScoreUpdater.apply_relative_score_updates",
+                self.dependencies["relative_score_updater"].apply_relative_score_updates,
+                self.begin_relative_score_update,
+                self.rollback,
+            ),
+            Benchmark(
+                "SubmissionMatcher.is_submission_already_recorded",
+                lambda: self.dependencies["submission_matcher"].is_submission_already_recorded(self.test_cases),
+            ),
+            Benchmark(
+                "Viewer.show_summary_list",
+                lambda: viewer.show_summary_list(
+                    self.SUMMARY_LIST_LENGTH, SummaryScoreRecordsSortConfig("rank", "asc")
+                ),
+            ),
+            Benchmark(
+                "Viewer.show_detail",
+                lambda: viewer.show_detail(
+                    latest_id, DetailScoreRecordsSortConfig(self.DETAIL_SORT_COLUMN, "asc", calculator)
+                ),
+            ),
+        ]
+
+
+class BenchmarkReport:
+    """ベンチマークの結果を JSON ファイルに保存し、基準となる結果と比較するクラス。"""
+
+    VERSION = 1
+
+    def __init__(self, parameters: dict[str, Any], results: dict[str, BenchmarkResult]) -> None:
+        self.parameters = parameters
+        self.results = results
+
+    def to_dict(self) -> dict[str, Any]:
+        """結果を JSON に変換できる辞書にします。"""
+        return {
+            "version": self.VERSION,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": self.parameters,
+            "results": self.results,
+        }
+
+    def write(self, output_path: Path) -> None:
+        """結果を JSON ファイルに書き込みます。"""
+        output_path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+
+    def compare(self, baseline: dict[str, Any], tolerance: float) -> list[str]:
+        """基準となる結果と中央値を比較した表を表示し、'tolerance'の割合を超えて遅くなったベンチマークの名前を返します。"""
+        if baseline.get("parameters") != self.parameters:
+            print(f"Warning: baseline parameters differ: {baseline.get('parameters')}", file=sys.stderr)
+
+        baseline_results = baseline.get("results", {})
+        regressions = []
+        print(f"{'benchmark':<52} {'median [ms]':>12} {'baseline [ms]':>14} {'ratio':>7}")
+        for name, result in self.results.items():
+            if name not in baseline_results:
+                print(f"{name:<52} {result['median'] * 1000:>12.3f} {'-':>14} {'-':>7}")
+                continue
+
+            baseline_median = baseline_results[name]["median"]
+            ratio = result["median"] / baseline_median if 0 < baseline_median else 1.0
+            is_regression = 1 + tolerance < ratio
+            if is_regression:
+                regressions.append(name)
+            print(
+                f"{name:<52} {result['median'] * 1000:>12.3f} {baseline_median * 1000:>14.3f} {ratio:>7.2f}"
+                + (" (regression)" if is_regression else "")
+            )
+
+        return regressions
+
+
+def run_benchmarks(root_dir: Path, parameters: dict[str, Any], repeat: int) -> dict[str, BenchmarkResult]:
+    """'root_dir'に順位表を生成し、各ベンチマークを'repeat'回ずつ計測します。"""
+    leaderboard = SyntheticLeaderboard(
+        root_dir, parameters["cases"], parameters["submissions"], parameters["scoring_type"], parameters["seed"]
+    )
+    dependencies = leaderboard.generate()
+
+    # 表示の処理時間には rich による描画を含めるが、端末への出力は捨てる
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            benchmarks = SubmitAndViewBenchmarks(leaderboard, dependencies).create_benchmarks()
+            return {benchmark.name: benchmark.run(repeat) for benchmark in benchmarks}
+        finally:
+            dependencies["db_manager"].close()
+
+
+def parse_arguments(args: Optional[list[str]] = None) -> argparse.Namespace:
+    """コマンドライン引数を解析します。"""
+    parser = argparse.ArgumentParser(description="Benchmark the submit and view hot paths on a synthetic leaderboard.")
+    parser.add_argument("--cases", type=int, default=1000, help="Number of test cases.")
+    parser.add_argument("--submissions", type=int, default=100, help="Number of recorded submissions.")
+    parser.add_argument("--scoring-type", choices=["Maximization", "Minimization"], default="Maximization")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generated scores.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measurements per benchmark.")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", type=Path, help="Compare the results with this JSON file.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed slowdown ratio against the baseline (default: 0.2)."
+    )
+    return parser.parse_args(args)
+
+
+def main(args: Optional[list[str]] = None) -> int:
+    """ベンチマークを実行し、基準となる結果より遅くなったベンチマークがあれば 1 を返します。"""
+    parsed_args = parse_arguments(args)
+    parameters = {
+        "cases": parsed_args.cases,
+        "submissions": parsed_args.submissions,
+        "scoring_type": parsed_args.scoring_type,
+        "seed": parsed_args.seed,
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        report = BenchmarkReport(parameters, run_benchmarks(Path(temp_dir), parameters, parsed_args.repeat))
+
+    if parsed_args.output is not None:
+        report.write(parsed_args.output)
+
+    if parsed_args.baseline is None:
+        report.compare({"parameters": parameters}, parsed_args.tolerance)
+        return 0
+
+    baseline = json.loads(parsed_args.baseline.read_text(encoding="utf-8"))
+    regressions = report.compare(baseline, parsed_args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} benchmarks are slower than the baseline.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import argparse
+import random
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+from ahc_local_leaderboard import consts
+from ahc_local_leaderboard.config import Config
+from ahc_local_leaderboard.dependency_setup import (
+    Dependencies,
+    setup_initial_dependencies,
+    setup_scoring_dependencies,
+)
+from ahc_local_leaderboard.init.initializer import Initializer
+from ahc_local_leaderboard.models.test_case import TestCase, TestCases
+from ahc_local_leaderboard.models.test_file import TestFile
+from ahc_local_leaderboard.submit.submitter import Submitter
+from ahc_local_leaderboard.submit.test_file_processor import (
+    TestFileProcessorInterface,
+    TestFilesProcessor,
+)
+
+
+class ConstantTimeTestFileProcessor(TestFileProcessorInterface):
+    """ファイルを読まず、テストケース名と提出ディレクトリから決まるスコアを一定時間で返す TestFileProcessor。
+
+    ビジュアライザの実行時間を除き、スコア計算の前後にある順位表側の処理時間だけを測るために用います。
+    """
+
+    MAX_SCORE = 1000000
+
+    def process_test_file(self, test_file: TestFile) -> Optional[int]:
+        """テストケース名と提出ディレクトリのハッシュ値からスコアを計算します。"""
+        key = f"{test_file.submit_file_path.parent.name}/{test_file.file_name}"
+        return zlib.crc32(key.encode("utf-8")) % self.MAX_SCORE + 1
+
+
+class SyntheticLeaderboard:
+    """ベンチマーク用に、指定した規模の順位表（データベース、in/、out/）を生成するクラス。
+
+    過去の提出はスコア計算を行わずに乱数で作ったテストケースを、submit のバッチ処理と同じ経路で記録します。
+    """
+
+    # 1つのトランザクションでまとめて記録する提出の数
+    CHUNK_SIZE = 100
+
+    # スコアを無効（None）にするテストケースの割合
+    INVALID_SCORE_RATE = 0.01
+
+    def __init__(
+        self, root_dir: Path, case_count: int, submission_count: int, scoring_type: str = "Maximization", seed: int = 0
+    ) -> None:
+        assert 0 < case_count
+        assert 0 <= submission_count
+
+        self.root_dir = root_dir
+        self.case_count = case_count
+        self.submission_count = submission_count
+        self.scoring_type = scoring_type
+        self.random = random.Random(seed)
+
+    def get_file_names(self) -> list[str]:
+        """テストケースのファイル名を返します。"""
+        return [f"{seed:04}.txt" for seed in range(self.case_count)]
+
+    def get_input_dir(self) -> Path:
+        """入力ファイルのディレクトリを返します。"""
+        return self.root_dir / "in"
+
+    def get_submit_dir(self) -> Path:
+        """提出ファイルのディレクトリを返します。"""
+        return self.root_dir / "out"
+
+    def create_test_files(self) -> None:
+        """テストケースごとの入力ファイルと提出ファイルを作成します。"""
+        for directory in [self.get_input_dir(), self.get_submit_dir()]:
+            directory.mkdir(parents=True, exist_ok=True)
+            for file_name in self.get_file_names():
+                (directory / file_name).write_text(f"{file_name}\n")
+
+    def create_config_file(self) -> None:
+        """ベンチマークの結果がキャッシュに左右されないよう、スコアキャッシュを無効にした設定ファイルを作成します。"""
+        consts.get_leader_board_path().mkdir(parents=True, exist_ok=True)
+        with open(consts.get_config_path(), "w") as file:
+            yaml.dump({"scoring_type": self.scoring_type, "score_cache": {"enabled": False}}, file)
+
+    def setup_dependencies(self) -> Dependencies:
+        """順位表を初期化し、スコア計算を ConstantTimeTestFileProcessor に置き換えた依存関係を生成します。"""
+        initial_dependencies = setup_initial_dependencies()
+        Initializer(
+            initial_dependencies["record_write_service"],
+            initial_dependencies["file_utility"],
+            consts.get_database_path(),
+            [consts.get_leader_board_path(), consts.get_top_dir()],
+            consts.get_config_path(),
+        ).execute()
+
+        dependencies = setup_scoring_dependencies(Config(consts.get_config_path()), initial_dependencies)
+        dependencies["test_files_processor"] = TestFilesProcessor(ConstantTimeTestFileProcessor())
+        return dependencies
+
+    def generate_score(self) -> Optional[int]:
+        """過去の提出のテストケースのスコアを乱数で生成します。"""
+        if self.random.random() < self.INVALID_SCORE_RATE:
+            return None
+        return self.random.randint(1, ConstantTimeTestFileProcessor.MAX_SCORE)
+
+    def generate_test_cases(self) -> TestCases:
+        """過去の提出1件分のテストケースを生成します。提出ファイルはすべて out/ のものを指します。"""
+        test_cases = TestCases()
+        for file_name in self.get_file_names():
+            test_cases.add_test_case(TestCase(file_name, self.generate_score(), self.get_submit_dir() / file_name))
+        return test_cases
+
+    def record_submissions(self, dependencies: Dependencies, submitter: Submitter) -> None:
+        """過去の提出を CHUNK_SIZE 件ずつ、それぞれ一つのトランザクションで記録します。"""
+        db_manager = dependencies["db_manager"]
+        for offset in range(0, self.submission_count, self.CHUNK_SIZE):
+            chunk_size = min(self.CHUNK_SIZE, self.submission_count - offset)
+            try:
+                db_manager.begin_transaction()
+                submitter.record_test_cases_batch([self.generate_test_cases() for _ in range(chunk_size)], False)
+                db_manager.commit()
+            except Exception:
+                db_manager.rollback()
+                raise
+
+    def generate(self) -> Dependencies:
+        """順位表を生成し、生成した順位表を操作する依存関係を返します。"""
+        # 以降のパスはすべて root_dir を基準にする
+        consts.ROOT_DIR = self.root_dir
+
+        self.create_test_files()
+        self.create_config_file()
+        dependencies = self.setup_dependencies()
+        self.record_submissions(dependencies, create_submitter(dependencies))
+        return dependencies
+
+
+def create_submitter(dependencies: Dependencies) -> Submitter:
+    """依存関係から Submitter を生成します。"""
+    return Submitter(
+        dependencies["record_read_service"],
+        dependencies["record_write_service"],
+        dependencies["test_files_processor"],
+        dependencies["test_cases_processor"],
+        dependencies["reserved_record_updater"],
+        dependencies["relative_score_updater"],
+        dependencies["submission_matcher"],
+    )
+
+
+def main() -> None:
+    """コマンドライン引数で指定した規模の順位表を生成します。"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic local leaderboard for benchmarks.")
+    parser.add_argument("root_dir", type=Path, help="Directory to create in/, out/ and leader_board/ in.")
+    parser.add_argument("--cases", type=int, default=1000, help="Number of test cases.")
+    parser.add_argument("--submissions", type=int, default=100, help="Number of recorded submissions.")
+    parser.add_argument("--scoring-type", choices=["Maximization", "Minimization"], default="Maximization")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the generated scores.")
+    args = parser.parse_args()
+
+    args.root_dir.mkdir(parents=True, exist_ok=True)
+    dependencies = SyntheticLeaderboard(
+        args.root_dir.resolve(), args.cases, args.submissions, args.scoring_type, args.seed
+    ).generate()
+    dependencies["db_manager"].close()
+
+
+if __name__ == "__main__":
+    main()
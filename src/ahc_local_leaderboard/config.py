@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import yaml
 
@@ -24,3 +24,101 @@ class Config:
     def get_scoring_type(self) -> str:
         """scoring_type のデフォルト値を返します。"""
         return str(self.config_data.get("scoring_type", "Minimization"))
+
+    def get_jobs(self) -> int:
+        """スコア計算の並列数を返します。"""
+        jobs = int(self.config_data.get("jobs", 1))
+        if jobs < 1:
+            raise ValueError(f"'jobs' must be a positive integer: {jobs}")
+        return jobs
+
+    def is_score_cache_enabled(self) -> bool:
+        """スコアキャッシュを使用するかどうかを返します。"""
+        return bool(self.get_score_cache_config().get("enabled", True))
+
+    def get_score_cache_max_entries(self) -> int:
+        """スコアキャッシュに保持するエントリ数の上限を返します。"""
+        return int(self.get_score_cache_config().get("max_entries", 100000))
+
+    def get_score_cache_max_age_days(self) -> float:
+        """スコアキャッシュのエントリを保持する日数を返します。"""
+        return float(self.get_score_cache_config().get("max_age_days", 30))
+
+    def get_score_cache_config(self) -> Dict[str, Any]:
+        """score_cache セクションの設定を返します。"""
+        return dict(self.config_data.get("score_cache") or {})
+
+    def is_score_vector_storage_enabled(self) -> bool:
+        """テストケースのスコアを提出ごとの配列としてまとめて保存するかどうかを返します。"""
+        return bool(self.get_database_config().get("score_vectors", False))
+
+    def get_database_config(self) -> Dict[str, Any]:
+        """database セクションの設定を返します。"""
+        return dict(self.config_data.get("database") or {})
+
+    def get_relative_score_mode(self) -> str:
+        """相対スコアと順位を提出時に更新するか（eager）、表示時にまとめて計算するか（lazy）を返します。"""
+        mode = str(self.get_relative_scores_config().get("mode", "eager"))
+        if mode not in ["eager", "lazy"]:
+            raise ValueError(f"Unknown relative score mode: {mode}")
+        return mode
+
+    def get_relative_scores_config(self) -> Dict[str, Any]:
+        """relative_scores セクションの設定を返します。"""
+        return dict(self.config_data.get("relative_scores") or {})
+
+    def get_scheduler_backend(self) -> str:
+        """スコア計算に用いるバックエンド（thread または async）を返します。"""
+        backend = str(self.get_scheduler_config().get("backend", "thread"))
+        if backend not in ["thread", "async"]:
+            raise ValueError(f"Unknown scheduler backend: {backend}")
+        return backend
+
+    def get_scheduler_timeout(self) -> Optional[float]:
+        """テストケースごとのスコア計算のタイムアウト秒数を返します。設定されていない場合は None を返します。"""
+        timeout = self.get_scheduler_config().get("timeout")
+        return None if timeout is None else float(timeout)
+
+    def get_scheduler_retries(self) -> int:
+        """一時的に失敗したスコア計算を再試行する回数を返します。"""
+        return int(self.get_scheduler_config().get("retries", 0))
+
+    def get_scheduler_config(self) -> Dict[str, Any]:
+        """scheduler セクションの設定を返します。"""
+        return dict(self.config_data.get("scheduler") or {})
+
+    def get_scorer_command(self) -> Optional[str]:
+        """スコア計算コマンドのテンプレートを返します。設定されていない場合は None を返します。"""
+        command = self.get_scorer_config().get("command")
+        return None if command is None else str(command)
+
+    def get_scorer_worker_command(self) -> Optional[str]:
+        """常駐させるスコア計算ワーカーのコマンドを返します。設定されていない場合は None を返します。"""
+        worker_command = self.get_scorer_config().get("worker_command")
+        return None if worker_command is None else str(worker_command)
+
+    def get_scorer_plugin(self) -> Optional[str]:
+        """`module:function` の形式で指定されたスコア計算プラグインを返します。設定されていない場合は None を返します。"""
+        plugin = self.get_scorer_config().get("plugin")
+        return None if plugin is None else str(plugin)
+
+    def get_scorer_batch_size(self) -> Optional[int]:
+        """スコア計算プラグインのワーカープロセスに一度に送るテストケース数を返します。設定されていない場合は None を返します。"""
+        batch_size = self.get_scorer_config().get("batch_size")
+        if batch_size is None:
+            return None
+        if int(batch_size) < 1:
+            raise ValueError(f"'batch_size' must be a positive integer: {batch_size}")
+        return int(batch_size)
+
+    def get_score_regex(self) -> str:
+        """スコア計算コマンドの出力からスコアを取り出す正規表現を返します。"""
+        return str(self.get_scorer_config().get("score_regex", r"Score = (\d+)"))
+
+    def is_score_only(self) -> bool:
+        """スコア計算コマンドがスコアのみを出力するかどうかを返します。"""
+        return bool(self.get_scorer_config().get("score_only", False))
+
+    def get_scorer_config(self) -> Dict[str, Any]:
+        """scorer セクションの設定を返します。"""
+        return dict(self.config_data.get("scorer") or {})
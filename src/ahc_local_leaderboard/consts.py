@@ -18,11 +18,41 @@ def get_database_path() -> Path:
     return get_leader_board_path() / "leader_board.db"
 
 
+def get_score_cache_path() -> Path:
+    """スコアキャッシュファイルのパスを返します。"""
+    return get_leader_board_path() / "score_cache.db"
+
+
+def get_journal_dir() -> Path:
+    """中断された提出のスコア計算結果を記録するジャーナルのディレクトリパスを返します。"""
+    return get_leader_board_path() / "journal"
+
+
 def get_config_path() -> Path:
     """設定ファイル（config.yaml）のパスを返します。"""
     return get_leader_board_path() / "config.yaml"
 
 
+def get_socket_path() -> Path:
+    """常駐サーバーが待ち受ける Unix ソケットのパスを返します。"""
+    return get_leader_board_path() / "server.sock"
+
+
+def get_status_snapshot_path() -> Path:
+    """順位表の状況をまとめたスナップショットのパスを返します。"""
+    return get_leader_board_path() / "status.json"
+
+
+def get_trace_path() -> Path:
+    """--trace で記録した処理ごとの経過時間を書き出すファイルのパスを返します。"""
+    return get_leader_board_path() / "trace.jsonl"
+
+
+def get_profile_path() -> Path:
+    """--profile で記録した cProfile の統計を書き出すファイルのパスを返します。"""
+    return get_leader_board_path() / "profile.prof"
+
+
 def get_top_dir() -> Path:
     """トップスコアデータのディレクトリパスを返します。"""
     return get_leader_board_path() / "top"
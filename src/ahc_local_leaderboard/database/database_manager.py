@@ -1,9 +1,12 @@
 import sqlite3
 import traceback
 from datetime import datetime
-from typing import Optional, Type
+from typing import Callable, Iterator, Optional, Type
 
 from ahc_local_leaderboard.consts import get_database_path, get_datetime_format
+from ahc_local_leaderboard.database.schema_migrator import SchemaMigrator
+from ahc_local_leaderboard.database.score_vector import ScoreVector
+from ahc_local_leaderboard.database.transaction_hook import TransactionHookInterface
 from ahc_local_leaderboard.models.detail_score_record import (
     DetailScoreRecord,
     DetailScoreRecords,
@@ -15,30 +18,75 @@ from ahc_local_leaderboard.models.summary_score_record import (
     TopSummaryScoreRecord,
 )
 from ahc_local_leaderboard.models.test_case import TestCase
+from ahc_local_leaderboard.models.top_score_record import TopScoreRecord
 from ahc_local_leaderboard.models.updated_top_score import UpdatedTopScore
 
 
 class DatabaseManager:
-    """データベース接続の管理とテーブルの作成を行うクラス。"""
+    """データベース接続の管理とテーブルの作成を行うクラス。
+
+    接続はプロセス内で使い回し、close() が呼ばれるまで開いたままにします。
+    """
+
+    # 各リポジトリは同じ SQL を繰り返し実行するため、プリペアドステートメントを多めにキャッシュする
+    CACHED_STATEMENTS = 256
+
+    # WAL モードでは提出の書き込み中も読み取りがブロックされない
+    PRAGMAS = [
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -65536",
+        "PRAGMA mmap_size = 268435456",
+        "PRAGMA temp_store = MEMORY",
+    ]
 
     def __init__(self) -> None:
         self.connection: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
         self.transaction_mode = False
+        self.transaction_hooks: list[TransactionHookInterface] = []
+        self.trace_callback: Optional[Callable[[str], None]] = None
+
+    def add_transaction_hook(self, transaction_hook: TransactionHookInterface) -> None:
+        """トランザクションの開始前と終了後に呼び出すフックを登録します。"""
+        self.transaction_hooks.append(transaction_hook)
+
+    def set_trace_callback(self, trace_callback: Optional[Callable[[str], None]]) -> None:
+        """実行する SQL ごとに呼び出すコールバックを設定します。None を指定すると解除します。"""
+        self.trace_callback = trace_callback
+        if self.connection:
+            self.connection.set_trace_callback(trace_callback)
 
     def open(self) -> sqlite3.Connection:
+        """データベースに接続します。既に接続している場合はその接続を返します。"""
+        db_path = str(get_database_path())
+        if self.connection and self._db_path != db_path and not self.transaction_mode:
+            # 参照するデータベースが切り替わった場合は接続し直す
+            self.close()
+
         if not self.connection:
-            self._db_path = str(get_database_path())
-            self.connection = sqlite3.connect(self._db_path)
+            self._db_path = db_path
+            self.connection = sqlite3.connect(self._db_path, cached_statements=self.CACHED_STATEMENTS)
             self.connection.isolation_level = None
+            self.configure(self.connection)
+            self.connection.set_trace_callback(self.trace_callback)
+            # 古いバージョンで作成されたデータベースはその場で最新のスキーマに更新する
+            SchemaMigrator.migrate(self.connection)
 
         return self.connection
 
+    def configure(self, conn: sqlite3.Connection) -> None:
+        """接続に性能向上のためのプラグマを設定します。"""
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+
     def __enter__(self) -> sqlite3.Connection:
         """with 文の開始時にデータベースに接続します。"""
 
         return self.open()
 
     def close(self) -> None:
+        """トランザクション中でなければデータベース接続を閉じます。"""
         if self.connection:
             if not self.transaction_mode:
                 self.connection.commit()
@@ -51,12 +99,15 @@ class DatabaseManager:
         exc_value: Optional[BaseException],
         traceback: Optional[traceback.TracebackException],
     ) -> None:
-        """with 文の終了時にデータベース接続を閉じます。"""
-        self.close()
+        """with 文の終了時の処理です。接続は使い回すため閉じません。"""
+        pass
 
     def begin_transaction(self) -> None:
         assert not self.transaction_mode
 
+        for transaction_hook in self.transaction_hooks:
+            transaction_hook.before_transaction()
+
         conn = self.open()
         conn.execute("BEGIN")
         self.transaction_mode = True
@@ -67,7 +118,9 @@ class DatabaseManager:
         conn = self.open()
         conn.commit()
         self.transaction_mode = False
-        self.close()
+
+        for transaction_hook in self.transaction_hooks:
+            transaction_hook.after_transaction()
 
     def rollback(self) -> None:
         assert self.transaction_mode
@@ -75,8 +128,13 @@ class DatabaseManager:
         conn = self.open()
         conn.rollback()
         self.transaction_mode = False
-        self.close()
 
+        for transaction_hook in self.transaction_hooks:
+            transaction_hook.after_rollback()
+        for transaction_hook in self.transaction_hooks:
+            transaction_hook.after_transaction()
+
+    # 初期バージョンのスキーマ。以降の変更は SchemaMigrator のマイグレーションで適用される
     SCORE_HISTORY_TABLE = """
     CREATE TABLE IF NOT EXISTS score_history (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -111,14 +169,22 @@ class DatabaseManager:
     )
     """
 
+    @staticmethod
+    def register_cases(cursor: sqlite3.Cursor, case_names: list[str]) -> None:
+        """テストケース名を cases テーブルに登録します。既に登録されている名前は無視します。"""
+        cursor.executemany("INSERT OR IGNORE INTO cases (name) VALUES (?)", [(name,) for name in case_names])
+
     @staticmethod
     def setup() -> None:
         """必要なテーブルを作成してデータベースを初期化します。"""
-        with DatabaseManager() as conn:
+        db_manager = DatabaseManager()
+        with db_manager as conn:
             cursor = conn.cursor()
             cursor.execute(DatabaseManager.SCORE_HISTORY_TABLE)
             cursor.execute(DatabaseManager.TEST_CASES_TABLE)
             cursor.execute(DatabaseManager.TOP_SCORES_TABLE)
+            SchemaMigrator.migrate(conn)
+        db_manager.close()
 
 
 class ScoreHistoryRepository:
@@ -127,16 +193,18 @@ class ScoreHistoryRepository:
     def __init__(self, db_manager: DatabaseManager) -> None:
         self.db_manager = db_manager
 
-    def reserve_empty_score_history_record(self, submission_time: datetime) -> SummaryScoreRecord:
-        """指定された日時で空のスコア履歴レコードを作成し、そのレコードを返します。"""
+    def reserve_empty_score_history_record(
+        self, submission_time: datetime, fingerprint: Optional[str] = None, submit_dir: Optional[str] = None
+    ) -> SummaryScoreRecord:
+        """指定された日時・提出のハッシュ値・提出ディレクトリで空のスコア履歴レコードを作成し、そのレコードを返します。"""
         with self.db_manager as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                INSERT INTO score_history (submission_time)
-                VALUES (?)
+                INSERT INTO score_history (submission_time, fingerprint, submit_dir)
+                VALUES (?, ?, ?)
             """,
-                (submission_time.strftime(get_datetime_format()),),
+                (submission_time.strftime(get_datetime_format()), fingerprint, submit_dir),
             )
 
             lastrowid: Optional[int] = cursor.lastrowid
@@ -164,6 +232,42 @@ class ScoreHistoryRepository:
                 ),
             )
 
+    def update_score_histories(self, records: list[SummaryScoreRecord]) -> None:
+        """指定された複数のスコア履歴レコードの内容でデータベースをまとめて更新します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                UPDATE score_history
+                SET total_absolute_score = ?, total_relative_score = ?, invalid_score_count = ?, relative_rank = ?
+                WHERE id = ?
+            """,
+                [
+                    (
+                        record.total_absolute_score,
+                        record.total_relative_score,
+                        record.invalid_score_count,
+                        record.relative_rank,
+                        record.id,
+                    )
+                    for record in records
+                ],
+            )
+
+    def delete_record(self, id: int) -> None:
+        """指定されたIDのスコア履歴レコードを削除します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM score_history WHERE id = ?", (id,))
+
+    def fetch_submit_dir(self, id: int) -> Optional[str]:
+        """指定されたIDの提出の提出ディレクトリを取得します。記録されていない場合は None を返します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT submit_dir FROM score_history WHERE id = ?", (id,))
+            row: Optional[tuple[Optional[str]]] = cursor.fetchone()
+        return None if row is None else row[0]
+
     def fetch_summary_record_by_id(self, id: int) -> SummaryScoreRecord:
         """指定されたIDのスコア履歴レコードを取得し、返します。"""
         with self.db_manager as conn:
@@ -232,6 +336,26 @@ class ScoreHistoryRepository:
         records = [SummaryScoreRecord.from_row(row) for row in rows]
         return SummaryScoreRecords(records)
 
+    def fetch_top_ranked_summary_records(self, limit: int) -> SummaryScoreRecords:
+        """順位が付いたスコア履歴レコードを、順位の高い順に指定した数だけ取得します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT id, submission_time, total_absolute_score, total_relative_score,
+                       invalid_score_count, relative_rank
+                FROM score_history
+                WHERE relative_rank IS NOT NULL
+                ORDER BY relative_rank
+                LIMIT ?
+                """,
+                (limit,),
+            )
+            rows = cursor.fetchall()
+
+        records = [SummaryScoreRecord.from_row(row) for row in rows]
+        return SummaryScoreRecords(records)
+
     def exists_id(self, id: int) -> bool:
         """指定したIDのスコア履歴レコードが存在するかを確認します。"""
         with self.db_manager as conn:
@@ -249,6 +373,13 @@ class ScoreHistoryRepository:
             result: int = cursor.fetchone()[0]
             return result > 0
 
+    def exists_fingerprint(self, fingerprint: str) -> bool:
+        """指定したハッシュ値を持つスコア履歴レコードが存在するかを確認します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM score_history WHERE fingerprint = ? LIMIT 1", (fingerprint,))
+            return cursor.fetchone() is not None
+
     def fetch_total_record_count(self) -> int:
         """スコア履歴レコードに登録されたレコードの総数を返します。"""
         with self.db_manager as conn:
@@ -281,56 +412,286 @@ class ScoreHistoryRepository:
         records = [SummaryScoreRecord.from_row(row) for row in rows]
         return SummaryScoreRecords(records)
 
+    def fetch_relative_score_epochs(self) -> tuple[int, int]:
+        """現在の epoch と、相対スコアと順位を最後に計算し直した時点の epoch を取得します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT epoch, materialized_epoch FROM relative_score_state WHERE id = 1")
+            row: tuple[int, int] = cursor.fetchone()
+        return row
+
+    def increment_relative_score_epoch(self) -> None:
+        """相対スコアと順位が記録された提出を反映していないことを示すため、epoch を1つ進めます。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE relative_score_state SET epoch = epoch + 1 WHERE id = 1")
+
+    def update_materialized_epoch(self, epoch: int) -> None:
+        """相対スコアと順位を計算し直した時点の epoch を記録します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE relative_score_state SET materialized_epoch = ? WHERE id = 1", (epoch,))
+
 
 class TestCaseRepository:
-    """テストケーステーブルへの操作を提供するクラス。"""
+    """テストケーステーブルへの操作を提供するクラス。
+
+    score_vector_storage が有効な場合、テストケースのスコアは test_cases テーブルの行ではなく
+    score_history テーブルの score_vector 列に ScoreVector として書き込みます。
+    読み取りはどちらの形式で記録された提出にも対応します。
+    """
 
     __test__ = False  # pytest によるテスト収集を無効化
 
-    def __init__(self, db_manager: DatabaseManager) -> None:
+    def __init__(self, db_manager: DatabaseManager, score_vector_storage: bool = False) -> None:
         self.db_manager = db_manager
+        self.score_vector_storage = score_vector_storage
 
     def insert_test_case(self, test_case: TestCase, score_history_id: int) -> None:
         """指定されたテストケース情報をテストケーステーブルに挿入します。"""
+        if self.score_vector_storage:
+            self.insert_test_cases([test_case], score_history_id)
+            return
+
         with self.db_manager as conn:
             cursor = conn.cursor()
+            DatabaseManager.register_cases(cursor, [test_case.file_name])
             cursor.execute(
                 """
-                INSERT INTO test_cases (test_case_input, absolute_score, score_history_id)
-                VALUES (?, ?, ?)
+                INSERT INTO test_cases (case_id, absolute_score, score_history_id)
+                SELECT id, ?, ? FROM cases WHERE name = ?
             """,
-                (test_case.file_name, test_case.score, score_history_id),
+                (test_case.score, score_history_id, test_case.file_name),
             )
 
-    def fetch_absolute_score_for_test_case(self, test_case_input: str, score_history_id: int) -> Optional[int]:
-        """指定されたテストケースとスコア履歴IDの絶対スコアを取得します。"""
+    def insert_test_cases(self, test_cases: list[TestCase], score_history_id: int) -> None:
+        """指定されたテストケース情報をまとめてテストケーステーブルに挿入します。"""
+        if self.score_vector_storage:
+            self.insert_score_vector(test_cases, score_history_id)
+            return
+
         with self.db_manager as conn:
             cursor = conn.cursor()
-            cursor.execute(
+            DatabaseManager.register_cases(cursor, [test_case.file_name for test_case in test_cases])
+            cursor.executemany(
                 """
-                SELECT absolute_score
-                FROM test_cases
-                WHERE test_case_input = ? AND score_history_id = ?
+                INSERT INTO test_cases (case_id, absolute_score, score_history_id)
+                SELECT id, ?, ? FROM cases WHERE name = ?
             """,
-                (test_case_input, score_history_id),
+                [(test_case.score, score_history_id, test_case.file_name) for test_case in test_cases],
+            )
+
+    def insert_score_vector(self, test_cases: list[TestCase], score_history_id: int) -> None:
+        """指定されたテストケースのスコアを、スコア履歴レコードの ScoreVector に追加します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            DatabaseManager.register_cases(cursor, [test_case.file_name for test_case in test_cases])
+            case_ids = dict(cursor.execute("SELECT name, id FROM cases").fetchall())
+
+            cursor.execute("SELECT score_vector FROM score_history WHERE id = ?", (score_history_id,))
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"No record found for id: {score_history_id}")
+
+            scores = ScoreVector.unpack(row[0]) if row[0] is not None else {}
+            for test_case in test_cases:
+                case_id = case_ids[test_case.file_name]
+                if case_id in scores:
+                    raise sqlite3.IntegrityError(
+                        f"{test_case.file_name} is already recorded for score_history_id={score_history_id}"
+                    )
+                scores[case_id] = test_case.score
+
+            cursor.execute(
+                "UPDATE score_history SET score_vector = ? WHERE id = ?", (ScoreVector.pack(scores), score_history_id)
+            )
+
+    def delete_records_by_id(self, score_history_id: int) -> None:
+        """指定されたスコア履歴IDのテストケースレコードを削除します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM test_cases WHERE score_history_id = ?", (score_history_id,))
+
+    def fetch_score_vector(self, score_history_id: int) -> Optional[bytes]:
+        """指定されたスコア履歴IDの ScoreVector を取得します。テストケースの行として記録されている場合は None を返します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT score_vector FROM score_history WHERE id = ?", (score_history_id,))
+            row: Optional[tuple[Optional[bytes]]] = cursor.fetchone()
+        return None if row is None else row[0]
+
+    def fetch_case_names(self) -> dict[int, str]:
+        """登録されているすべてのテストケース名を id ごとに取得します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, name FROM cases")
+            rows = cursor.fetchall()
+        return {case_id: name for case_id, name in rows}
+
+    def iterate_score_row_chunks(self, chunk_size: int) -> Iterator[list[tuple[int, int, int]]]:
+        """test_cases テーブルに行として記録されたすべてのスコアを、chunk_size 行ずつ (提出ID, テストケースID, スコア) の組で取得します。
+
+        スコアは ScoreVector と同じく、無効なスコアを ScoreVector.INVALID に置き換えた整数で返します。
+        全行を一度にタプルのリストにしないため、行数が多くても一度に保持するのは chunk_size 行だけです。
+        """
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT score_history_id, case_id, COALESCE(absolute_score, ?) FROM test_cases",
+                (ScoreVector.INVALID,),
+            )
+            while rows := cursor.fetchmany(chunk_size):
+                yield rows
+
+    def fetch_all_score_vectors(self) -> dict[int, bytes]:
+        """ScoreVector として記録されたすべての提出のスコアを提出IDごとに取得します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, score_vector FROM score_history WHERE score_vector IS NOT NULL")
+            rows = cursor.fetchall()
+        return {score_history_id: score_vector for score_history_id, score_vector in rows}
+
+    def fetch_next_top_scores(
+        self, case_names: list[str], excluded_id: int, descending: bool
+    ) -> dict[str, tuple[int, Optional[int]]]:
+        """指定した提出を除いたときに各テストケースのトップスコアとなるスコアを、記録した提出IDとの組で取得します。
+
+        有効なスコアのうち最も優れたもの (同じスコアの場合は先の提出) を選び、有効なスコアがない場合は
+        そのテストケースを含む最後の提出を選びます。'descending' が True の場合はスコアが大きいほど優れているとみなします。
+        test_cases テーブルの行はテストケースとスコアの索引を用いて探し、ScoreVector は全提出を走査します。
+        """
+        order = "DESC" if descending else "ASC"
+        candidates: dict[str, list[tuple[int, Optional[int]]]] = {name: [] for name in case_names}
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            case_ids = {name: case_id for case_id, name in cursor.execute("SELECT id, name FROM cases")}
+            target_case_ids = {case_ids[name]: name for name in case_names if name in case_ids}
+
+            for case_id, name in target_case_ids.items():
+                cursor.execute(
+                    f"""
+                    SELECT score_history_id, absolute_score
+                    FROM test_cases
+                    WHERE case_id = ? AND score_history_id != ? AND absolute_score IS NOT NULL
+                    ORDER BY absolute_score {order}, score_history_id
+                    LIMIT 1
+                """,
+                    (case_id, excluded_id),
+                )
+                candidates[name] += cursor.fetchall()
+                cursor.execute(
+                    """
+                    SELECT score_history_id, absolute_score
+                    FROM test_cases
+                    WHERE case_id = ? AND score_history_id != ?
+                    ORDER BY score_history_id DESC
+                    LIMIT 1
+                """,
+                    (case_id, excluded_id),
+                )
+                candidates[name] += cursor.fetchall()
+
+            cursor.execute(
+                "SELECT id, score_vector FROM score_history WHERE score_vector IS NOT NULL AND id != ?", (excluded_id,)
             )
-            result: Optional[tuple[Optional[int]]] = cursor.fetchone()
+            score_vectors = cursor.fetchall() if target_case_ids else []
+
+        for score_history_id, score_vector in score_vectors:
+            for case_id, score in ScoreVector.select(score_vector, sorted(target_case_ids)).items():
+                candidates[target_case_ids[case_id]].append((score_history_id, score))
+
+        next_top_scores: dict[str, tuple[int, Optional[int]]] = {}
+        for name, case_candidates in candidates.items():
+            valid_candidates = [(id, score) for id, score in case_candidates if score is not None]
+            if valid_candidates:
+                # 同点の場合は先に記録した提出がトップスコアを保持する
+                next_top_scores[name] = max(
+                    valid_candidates,
+                    key=lambda candidate: (candidate[1] if descending else -candidate[1], -candidate[0]),
+                )
+            elif case_candidates:
+                next_top_scores[name] = max(case_candidates, key=lambda candidate: candidate[0])
+        return next_top_scores
+
+    def fetch_absolute_score_for_test_case(self, test_case_input: str, score_history_id: int) -> Optional[int]:
+        """指定されたテストケースとスコア履歴IDの絶対スコアを取得します。"""
+        score_vector = self.fetch_score_vector(score_history_id)
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            if score_vector is not None:
+                cursor.execute("SELECT id FROM cases WHERE name = ?", (test_case_input,))
+                case_row = cursor.fetchone()
+                scores = ScoreVector.select(score_vector, [case_row[0]]) if case_row else {}
+                result = (scores[case_row[0]],) if scores else None
+            else:
+                cursor.execute(
+                    """
+                    SELECT tc.absolute_score
+                    FROM test_cases AS tc
+                    JOIN cases AS c ON tc.case_id = c.id
+                    WHERE c.name = ? AND tc.score_history_id = ?
+                """,
+                    (test_case_input, score_history_id),
+                )
+                result = cursor.fetchone()
 
         if result is None:
             raise ValueError(f"No absolute score found for {test_case_input} and score_history_id={score_history_id}")
 
         return result[0]
 
+    def fetch_absolute_scores_for_updated_top_scores(self) -> dict[int, dict[str, Optional[int]]]:
+        """トップスコアが更新されたテストケースについて、全提出の絶対スコアを提出IDごとにまとめて取得します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT tc.score_history_id, c.name, tc.absolute_score
+                FROM top_scores AS ts
+                JOIN test_cases AS tc ON tc.case_id = ts.case_id
+                JOIN cases AS c ON ts.case_id = c.id
+                WHERE ts.is_updated = TRUE
+            """
+            )
+            rows = cursor.fetchall()
+
+            cursor.execute(
+                "SELECT c.id, c.name FROM top_scores AS ts JOIN cases AS c ON ts.case_id = c.id WHERE ts.is_updated"
+            )
+            updated_case_names: dict[int, str] = dict(cursor.fetchall())
+            score_vectors = (
+                cursor.execute("SELECT id, score_vector FROM score_history WHERE score_vector IS NOT NULL").fetchall()
+                if updated_case_names
+                else []
+            )
+
+        absolute_scores: dict[int, dict[str, Optional[int]]] = {}
+        for score_history_id, test_case_input, absolute_score in rows:
+            absolute_scores.setdefault(score_history_id, {})[test_case_input] = absolute_score
+
+        updated_case_ids = sorted(updated_case_names)
+        for score_history_id, score_vector in score_vectors:
+            scores = ScoreVector.select(score_vector, updated_case_ids)
+            if scores:
+                absolute_scores[score_history_id] = {
+                    updated_case_names[case_id]: score for case_id, score in scores.items()
+                }
+        return absolute_scores
+
     def fetch_records_by_id(self, submission_id: int) -> DetailScoreRecords[DetailScoreRecord]:
         """指定された提出IDに関連するすべてのテストケースレコードを取得します。"""
+        score_vector = self.fetch_score_vector(submission_id)
+        if score_vector is not None:
+            return self.fetch_records_from_score_vector(submission_id, score_vector)
 
         with self.db_manager as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT tc.test_case_input, tc.absolute_score, ts.top_absolute_score
+                SELECT c.name, tc.absolute_score, ts.top_absolute_score
                 FROM test_cases AS tc
-                LEFT JOIN top_scores AS ts ON tc.test_case_input = ts.test_case_input
+                JOIN cases AS c ON tc.case_id = c.id
+                LEFT JOIN top_scores AS ts ON tc.case_id = ts.case_id
                 WHERE tc.score_history_id = ?
             """,
                 (submission_id,),
@@ -340,6 +701,29 @@ class TestCaseRepository:
         records = [DetailScoreRecord.from_row(row) for row in rows]
         return DetailScoreRecords[DetailScoreRecord](submission_id, records)
 
+    def fetch_records_from_score_vector(
+        self, submission_id: int, score_vector: bytes
+    ) -> DetailScoreRecords[DetailScoreRecord]:
+        """ScoreVector として記録された提出のテストケースレコードを取得します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT c.id, c.name, ts.top_absolute_score
+                FROM cases AS c
+                LEFT JOIN top_scores AS ts ON c.id = ts.case_id
+            """
+            )
+            rows = cursor.fetchall()
+
+        scores = ScoreVector.unpack(score_vector)
+        records = [
+            DetailScoreRecord(name, scores[case_id], top_absolute_score)
+            for case_id, name, top_absolute_score in rows
+            if case_id in scores
+        ]
+        return DetailScoreRecords[DetailScoreRecord](submission_id, records)
+
 
 class TopScoresRepository:
     """トップスコアテーブルへの操作を提供するクラス。"""
@@ -351,18 +735,49 @@ class TopScoresRepository:
         """指定テストケースのスコアをもとにトップスコアを更新します。"""
         with self.db_manager as conn:
             cursor = conn.cursor()
+            DatabaseManager.register_cases(cursor, [test_case.file_name])
             cursor.execute(
-                "SELECT top_absolute_score FROM top_scores WHERE test_case_input = ?", (test_case.file_name,)
+                """
+                SELECT ts.top_absolute_score, ts.second_top_score, ts.is_updated
+                FROM top_scores AS ts
+                JOIN cases AS c ON ts.case_id = c.id
+                WHERE c.name = ?
+            """,
+                (test_case.file_name,),
             )
             result = cursor.fetchone()
-            second_top_score = result[0] if result else None
+            # 同じ更新の間に複数回更新された場合は、更新前のトップスコアを保持する
+            if result is None:
+                second_top_score = None
+            else:
+                second_top_score = result[1] if result[2] else result[0]
             cursor.execute(
                 """
-                INSERT OR REPLACE INTO top_scores (test_case_input, top_absolute_score,
+                INSERT OR REPLACE INTO top_scores (case_id, top_absolute_score,
+                           second_top_score, is_updated, score_history_id)
+                SELECT id, ?, ?, ?, ? FROM cases WHERE name = ?
+            """,
+                (test_case.score, second_top_score, True, score_history_id, test_case.file_name),
+            )
+
+    def update_top_scores(self, test_cases: list[TestCase], score_history_id: int) -> None:
+        """指定テストケースのスコアでトップスコアをまとめて更新します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            DatabaseManager.register_cases(cursor, [test_case.file_name for test_case in test_cases])
+            # 同じ更新の間に複数回更新された場合は、更新前のトップスコアを保持する
+            cursor.executemany(
+                """
+                INSERT INTO top_scores (case_id, top_absolute_score,
                            second_top_score, is_updated, score_history_id)
-                VALUES (?, ?, ?, ?, ?)
+                SELECT id, ?, NULL, TRUE, ? FROM cases WHERE name = ?
+                ON CONFLICT (case_id) DO UPDATE SET
+                    second_top_score = CASE WHEN is_updated THEN second_top_score ELSE top_absolute_score END,
+                    top_absolute_score = excluded.top_absolute_score,
+                    is_updated = TRUE,
+                    score_history_id = excluded.score_history_id
             """,
-                (test_case.file_name, test_case.score, second_top_score, True, score_history_id),
+                [(test_case.score, score_history_id, test_case.file_name) for test_case in test_cases],
             )
 
     def fetch_top_score_for_test_case(self, test_case: TestCase) -> Optional[int]:
@@ -370,11 +785,90 @@ class TopScoresRepository:
         with self.db_manager as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT top_absolute_score FROM top_scores WHERE test_case_input = ?", (test_case.file_name,)
+                """
+                SELECT ts.top_absolute_score
+                FROM top_scores AS ts
+                JOIN cases AS c ON ts.case_id = c.id
+                WHERE c.name = ?
+            """,
+                (test_case.file_name,),
             )
             result = cursor.fetchone()
         return result[0] if result else None
 
+    def fetch_top_scores(self) -> dict[str, Optional[int]]:
+        """全テストケースのトップスコアをテストケース名ごとに取得します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT c.name, ts.top_absolute_score FROM top_scores AS ts JOIN cases AS c ON ts.case_id = c.id"
+            )
+            rows = cursor.fetchall()
+        return {name: top_absolute_score for name, top_absolute_score in rows}
+
+    def fetch_top_score_records(self) -> list[TopScoreRecord]:
+        """全テストケースのトップスコアを、直前のトップスコアと記録した提出IDとともに取得します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT c.name, ts.top_absolute_score, ts.second_top_score, ts.score_history_id
+                FROM top_scores AS ts
+                JOIN cases AS c ON ts.case_id = c.id
+            """
+            )
+            rows = cursor.fetchall()
+        return [TopScoreRecord(*row) for row in rows]
+
+    def replace_top_scores(self, records: list[TopScoreRecord]) -> None:
+        """トップスコアテーブルの内容を指定したレコードで置き換えます。更新フラグはすべてリセットされます。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            DatabaseManager.register_cases(cursor, [record.file_name for record in records])
+            cursor.execute("DELETE FROM top_scores")
+            cursor.executemany(
+                """
+                INSERT INTO top_scores (case_id, top_absolute_score,
+                           second_top_score, is_updated, score_history_id)
+                SELECT id, ?, ?, FALSE, ? FROM cases WHERE name = ?
+            """,
+                [
+                    (record.top_score, record.second_top_score, record.submission_id, record.file_name)
+                    for record in records
+                ],
+            )
+
+    def update_top_score_records(self, records: list[TopScoreRecord]) -> None:
+        """指定したレコードの内容でトップスコアを更新し、更新フラグを立てます。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            DatabaseManager.register_cases(cursor, [record.file_name for record in records])
+            cursor.executemany(
+                """
+                INSERT INTO top_scores (case_id, top_absolute_score,
+                           second_top_score, is_updated, score_history_id)
+                SELECT id, ?, ?, TRUE, ? FROM cases WHERE name = ?
+                ON CONFLICT (case_id) DO UPDATE SET
+                    top_absolute_score = excluded.top_absolute_score,
+                    second_top_score = excluded.second_top_score,
+                    is_updated = TRUE,
+                    score_history_id = excluded.score_history_id
+            """,
+                [
+                    (record.top_score, record.second_top_score, record.submission_id, record.file_name)
+                    for record in records
+                ],
+            )
+
+    def delete_top_scores(self, file_names: list[str]) -> None:
+        """指定したテストケースのトップスコアを削除します。"""
+        with self.db_manager as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "DELETE FROM top_scores WHERE case_id IN (SELECT id FROM cases WHERE name = ?)",
+                [(file_name,) for file_name in file_names],
+            )
+
     def reset_is_updated_flags(self) -> None:
         """トップスコアテーブルのすべてのis_updatedフラグをリセットします。"""
         with self.db_manager as conn:
@@ -401,9 +895,10 @@ class TopScoresRepository:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT test_case_input, top_absolute_score, second_top_score
-                FROM top_scores
-                WHERE is_updated = TRUE
+                SELECT c.name, ts.top_absolute_score, ts.second_top_score
+                FROM top_scores AS ts
+                JOIN cases AS c ON ts.case_id = c.id
+                WHERE ts.is_updated = TRUE
             """
             )
 
@@ -435,10 +930,81 @@ class TopScoresRepository:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                SELECT test_case_input, top_absolute_score, score_history_id
-                FROM top_scores
+                SELECT c.name, ts.top_absolute_score, ts.score_history_id
+                FROM top_scores AS ts
+                JOIN cases AS c ON ts.case_id = c.id
             """
             )
             rows = cursor.fetchall()
         records = [TopDetailScoreRecord(*row) for row in rows]
         return DetailScoreRecords[TopDetailScoreRecord]("Top", records)
+
+
+class CachedTopScoresRepository(TopScoresRepository, TransactionHookInterface):
+    """常駐サーバー向けに、全テストケースのトップスコアをメモリに保持する TopScoresRepository。
+
+    自身の書き込みはキャッシュにも反映し、他のプロセスがコミットした場合は PRAGMA data_version の変化で検知して読み直します。
+    """
+
+    def __init__(self, db_manager: DatabaseManager) -> None:
+        super().__init__(db_manager)
+        self.top_scores: Optional[dict[str, Optional[int]]] = None
+        self.connection: Optional[sqlite3.Connection] = None
+        self.data_version: Optional[int] = None
+
+    def invalidate(self) -> None:
+        """保持しているトップスコアを破棄し、次回の取得時にデータベースから読み直すようにします。"""
+        self.top_scores = None
+
+    def fetch_top_scores(self) -> dict[str, Optional[int]]:
+        """全テストケースのトップスコアを取得します。キャッシュが有効な間はデータベースを読みません。"""
+        with self.db_manager as conn:
+            data_version: int = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self.top_scores is None or self.connection is not conn or self.data_version != data_version:
+            self.top_scores = super().fetch_top_scores()
+            self.connection = conn
+            self.data_version = data_version
+        return self.top_scores.copy()
+
+    def fetch_top_score_for_test_case(self, test_case: TestCase) -> Optional[int]:
+        """指定テストケースのトップスコアを、キャッシュしたトップスコアから取得します。"""
+        return self.fetch_top_scores().get(test_case.file_name)
+
+    def update_top_score(self, test_case: TestCase, score_history_id: int) -> None:
+        """指定テストケースのスコアをもとにトップスコアを更新し、キャッシュにも反映します。"""
+        super().update_top_score(test_case, score_history_id)
+        if self.top_scores is not None:
+            self.top_scores[test_case.file_name] = test_case.score
+
+    def update_top_scores(self, test_cases: list[TestCase], score_history_id: int) -> None:
+        """指定テストケースのスコアでトップスコアをまとめて更新し、キャッシュにも反映します。"""
+        super().update_top_scores(test_cases, score_history_id)
+        if self.top_scores is not None:
+            self.top_scores.update((test_case.file_name, test_case.score) for test_case in test_cases)
+
+    def replace_top_scores(self, records: list[TopScoreRecord]) -> None:
+        """トップスコアテーブルの内容を置き換え、キャッシュを破棄します。"""
+        super().replace_top_scores(records)
+        self.invalidate()
+
+    def update_top_score_records(self, records: list[TopScoreRecord]) -> None:
+        """指定したレコードの内容でトップスコアを更新し、キャッシュを破棄します。"""
+        super().update_top_score_records(records)
+        self.invalidate()
+
+    def delete_top_scores(self, file_names: list[str]) -> None:
+        """指定したテストケースのトップスコアを削除し、キャッシュを破棄します。"""
+        super().delete_top_scores(file_names)
+        self.invalidate()
+
+    def before_transaction(self) -> None:
+        """トランザクションの開始前には何もしません。"""
+        pass
+
+    def after_transaction(self) -> None:
+        """トランザクションの終了後には何もしません。"""
+        pass
+
+    def after_rollback(self) -> None:
+        """ロールバックした書き込みがキャッシュに残らないよう、キャッシュを破棄します。"""
+        self.invalidate()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterator, Optional
 
 from ahc_local_leaderboard.database.database_manager import (
     ScoreHistoryRepository,
@@ -16,6 +16,7 @@ from ahc_local_leaderboard.models.summary_score_record import (
     TopSummaryScoreRecord,
 )
 from ahc_local_leaderboard.models.test_case import TestCase
+from ahc_local_leaderboard.models.top_score_record import TopScoreRecord
 from ahc_local_leaderboard.models.updated_top_score import UpdatedTopScore
 
 
@@ -45,6 +46,11 @@ class RecordReadService:
         assert 0 < limit
         return self.score_history_repo.fetch_recent_summary_records(limit)
 
+    def fetch_top_ranked_summary_records(self, limit: int) -> SummaryScoreRecords:
+        """データベースから順位の高い順に 'limit' 件のレコードを取得します。"""
+        assert 0 < limit
+        return self.score_history_repo.fetch_top_ranked_summary_records(limit)
+
     def fetch_summary_record_by_id(self, submission_id: int) -> SummaryScoreRecord:
         """指定IDのレコードを取得します。"""
         assert 0 < submission_id
@@ -54,6 +60,15 @@ class RecordReadService:
         """指定したidがデータベースに存在しているかを返します。"""
         return self.score_history_repo.exists_id(id)
 
+    def exists_fingerprint(self, fingerprint: str) -> bool:
+        """指定したハッシュ値を持つ提出がデータベースに存在しているかを返します。"""
+        return self.score_history_repo.exists_fingerprint(fingerprint)
+
+    def fetch_submit_dir(self, submission_id: int) -> Optional[str]:
+        """指定IDの提出の提出ディレクトリを取得します。"""
+        assert 0 < submission_id
+        return self.score_history_repo.fetch_submit_dir(submission_id)
+
     def fetch_total_record_count(self) -> int:
         """データベースに存在する提出記録の総数を返します。"""
         return self.score_history_repo.fetch_total_record_count()
@@ -62,6 +77,10 @@ class RecordReadService:
         """入力されたスコアと同じ絶対スコアを持つ概略レコードを取得します。"""
         return self.score_history_repo.fetch_records_by_absolute_score(total_absolute_score)
 
+    def fetch_relative_score_epochs(self) -> tuple[int, int]:
+        """現在の epoch と、相対スコアと順位を最後に計算し直した時点の epoch を返します。"""
+        return self.score_history_repo.fetch_relative_score_epochs()
+
     def fetch_detail_records_by_id(self, submission_id: int) -> DetailScoreRecords[DetailScoreRecord]:
         """指定した提出IDのテストケースレコードを取得します。"""
         assert 0 < submission_id
@@ -72,6 +91,28 @@ class RecordReadService:
         assert 0 < submission_id
         return self.test_case_repo.fetch_absolute_score_for_test_case(test_case_name, submission_id)
 
+    def fetch_absolute_scores_for_updated_top_scores(self) -> dict[int, dict[str, Optional[int]]]:
+        """トップスコアが更新されたテストケースの絶対スコアを、提出IDとテストケース名の組ごとに取得します。"""
+        return self.test_case_repo.fetch_absolute_scores_for_updated_top_scores()
+
+    def fetch_case_names(self) -> dict[int, str]:
+        """登録されているテストケース名をテストケースIDごとに取得します。"""
+        return self.test_case_repo.fetch_case_names()
+
+    def iterate_score_row_chunks(self, chunk_size: int) -> Iterator[list[tuple[int, int, int]]]:
+        """テストケースの行として記録された全スコアを、chunk_size 行ずつ (提出ID, テストケースID, スコア) の組で取得します。"""
+        return self.test_case_repo.iterate_score_row_chunks(chunk_size)
+
+    def fetch_all_score_vectors(self) -> dict[int, bytes]:
+        """ScoreVector として記録された全提出のスコアを提出IDごとに取得します。"""
+        return self.test_case_repo.fetch_all_score_vectors()
+
+    def fetch_next_top_scores(
+        self, case_names: list[str], excluded_id: int, descending: bool
+    ) -> dict[str, tuple[int, Optional[int]]]:
+        """指定した提出を除いたときの各テストケースのトップスコアを、記録した提出IDとの組で取得します。"""
+        return self.test_case_repo.fetch_next_top_scores(case_names, excluded_id, descending)
+
     def fetch_top_summary_record(self) -> TopSummaryScoreRecord:
         """トップテストケースの概要レコードを取得します。"""
         return self.top_score_repo.fetch_top_summary_record()
@@ -94,6 +135,14 @@ class RecordReadService:
         """指定したテストケースのトップスコアを取得します。"""
         return self.top_score_repo.fetch_top_score_for_test_case(test_case)
 
+    def fetch_top_scores(self) -> dict[str, Optional[int]]:
+        """全テストケースのトップスコアをテストケース名ごとに取得します。"""
+        return self.top_score_repo.fetch_top_scores()
+
+    def fetch_top_score_records(self) -> list[TopScoreRecord]:
+        """全テストケースのトップスコアを、直前のトップスコアと記録した提出IDとともに取得します。"""
+        return self.top_score_repo.fetch_top_score_records()
+
     def fetch_recently_updated_top_scores(self) -> list[UpdatedTopScore]:
         """更新されたトップスコアの情報を取得します。"""
         return self.top_score_repo.fetch_recently_updated_top_scores()
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 
 from ahc_local_leaderboard.database.database_manager import (
     DatabaseManager,
@@ -8,6 +9,7 @@ from ahc_local_leaderboard.database.database_manager import (
 )
 from ahc_local_leaderboard.models.summary_score_record import SummaryScoreRecord
 from ahc_local_leaderboard.models.test_case import TestCase
+from ahc_local_leaderboard.models.top_score_record import TopScoreRecord
 
 
 class RecordWriteService:
@@ -29,25 +31,73 @@ class RecordWriteService:
         """データベースのセットアップを行います。"""
         self.database_manager.setup()
 
-    def reserve_empty_score_history_record(self, submission_time: datetime) -> SummaryScoreRecord:
-        """指定した提出時間で空のスコア履歴レコードを仮登録します。"""
-        return self.score_history_repo.reserve_empty_score_history_record(submission_time)
+    def set_score_vector_storage(self, enabled: bool) -> None:
+        """テストケースのスコアを提出ごとの配列としてまとめて書き込むかどうかを設定します。"""
+        self.test_case_repo.score_vector_storage = enabled
+
+    def reserve_empty_score_history_record(
+        self, submission_time: datetime, fingerprint: Optional[str] = None, submit_dir: Optional[str] = None
+    ) -> SummaryScoreRecord:
+        """指定した提出時間・提出のハッシュ値・提出ディレクトリで空のスコア履歴レコードを仮登録します。"""
+        return self.score_history_repo.reserve_empty_score_history_record(submission_time, fingerprint, submit_dir)
 
     def update_score_history(self, score_record: SummaryScoreRecord) -> None:
         """スコア履歴レコードを指定の内容で更新します。"""
         assert 0 < score_record.id
         self.score_history_repo.update_score_history(score_record)
 
+    def update_score_histories(self, score_records: list[SummaryScoreRecord]) -> None:
+        """複数のスコア履歴レコードをそれぞれ指定の内容でまとめて更新します。"""
+        assert all(0 < score_record.id for score_record in score_records)
+        self.score_history_repo.update_score_histories(score_records)
+
+    def increment_relative_score_epoch(self) -> None:
+        """相対スコアと順位が最新の提出を反映していないことを記録します。"""
+        self.score_history_repo.increment_relative_score_epoch()
+
+    def update_materialized_epoch(self, epoch: int) -> None:
+        """相対スコアと順位を計算し直した時点の epoch を記録します。"""
+        assert 0 <= epoch
+        self.score_history_repo.update_materialized_epoch(epoch)
+
+    def delete_submission(self, score_history_id: int) -> None:
+        """指定の提出IDのスコア履歴レコードとテストケースを削除します。"""
+        assert 0 < score_history_id
+        self.test_case_repo.delete_records_by_id(score_history_id)
+        self.score_history_repo.delete_record(score_history_id)
+
     def insert_test_case(self, test_case: TestCase, score_history_id: int) -> None:
         """指定の提出IDに関連するテストケースをデータベースに挿入します。"""
         assert 0 < score_history_id
         self.test_case_repo.insert_test_case(test_case, score_history_id)
 
+    def insert_test_cases(self, test_cases: list[TestCase], score_history_id: int) -> None:
+        """指定の提出IDに関連するテストケースをまとめてデータベースに挿入します。"""
+        assert 0 < score_history_id
+        self.test_case_repo.insert_test_cases(test_cases, score_history_id)
+
     def update_top_score(self, test_case: TestCase, score_history_id: int) -> None:
         """指定のテストケースでトップスコアを更新します。"""
         assert 0 < score_history_id
         self.top_score_repo.update_top_score(test_case, score_history_id)
 
+    def update_top_scores(self, test_cases: list[TestCase], score_history_id: int) -> None:
+        """指定のテストケースでトップスコアをまとめて更新します。"""
+        assert 0 < score_history_id
+        self.top_score_repo.update_top_scores(test_cases, score_history_id)
+
+    def update_top_score_records(self, top_score_records: list[TopScoreRecord]) -> None:
+        """指定したレコードの内容でトップスコアを更新します。"""
+        self.top_score_repo.update_top_score_records(top_score_records)
+
+    def delete_top_scores(self, file_names: list[str]) -> None:
+        """指定したテストケースのトップスコアを削除します。"""
+        self.top_score_repo.delete_top_scores(file_names)
+
+    def replace_top_scores(self, top_score_records: list[TopScoreRecord]) -> None:
+        """トップスコアを指定したレコードの内容で置き換えます。"""
+        self.top_score_repo.replace_top_scores(top_score_records)
+
     def reset_is_updated_flags(self) -> None:
         """トップスコアの更新フラグをリセットします。"""
         self.top_score_repo.reset_is_updated_flags()
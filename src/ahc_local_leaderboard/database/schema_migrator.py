@@ -0,0 +1,201 @@
+import hashlib
+import sqlite3
+from typing import Callable, Iterable, Optional, Union
+
+from ahc_local_leaderboard.database.score_vector import ScoreVector
+
+# SQL 文、または SQL だけでは表せない変換を行う関数
+MigrationStep = Union[str, Callable[[sqlite3.Connection], None]]
+
+
+def _generate_fingerprint(scores: Iterable[tuple[str, Optional[int]]]) -> str:
+    """マイグレーション4の時点の TestCases.generate_fingerprint と同じ方法で、提出のハッシュ値を計算します。
+
+    TestCases.generate_fingerprint が後から変更されても、適用済みのデータベースと同じ値を設定できるよう複製しています。
+    """
+    digest = hashlib.sha256()
+    for file_name, score in sorted(scores, key=lambda item: item[0]):
+        digest.update(f"{file_name}\0{'' if score is None else score}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def backfill_fingerprints(conn: sqlite3.Connection) -> None:
+    """既存のスコア履歴レコードに、記録されたテストケースのスコアから計算した提出のハッシュ値を設定します。"""
+    case_names: dict[int, str] = dict(conn.execute("SELECT id, name FROM cases").fetchall())
+
+    scores: dict[int, list[tuple[str, Optional[int]]]] = {}
+    for score_history_id, case_id, absolute_score in conn.execute(
+        "SELECT score_history_id, case_id, absolute_score FROM test_cases"
+    ):
+        scores.setdefault(score_history_id, []).append((case_names[case_id], absolute_score))
+    for score_history_id, score_vector in conn.execute(
+        "SELECT id, score_vector FROM score_history WHERE score_vector IS NOT NULL"
+    ).fetchall():
+        vector_scores = ScoreVector.unpack(score_vector)
+        scores.setdefault(score_history_id, []).extend(
+            (case_names[case_id], absolute_score) for case_id, absolute_score in vector_scores.items()
+        )
+
+    conn.executemany(
+        "UPDATE score_history SET fingerprint = ? WHERE id = ?",
+        [(_generate_fingerprint(case_scores), id) for id, case_scores in scores.items()],
+    )
+
+
+class Migration:
+    """スキーマのバージョンを1つ上げるための手順をまとめたクラス。"""
+
+    def __init__(self, version: int, description: str, statements: list[MigrationStep]) -> None:
+        self.version = version
+        self.description = description
+        self.statements = statements
+
+
+class SchemaMigrator:
+    """PRAGMA user_version を用いて、既存のデータベースのスキーマを最新の状態に更新するクラス。
+
+    マイグレーションはバージョン順に1つずつ、それぞれ1つのトランザクションの中で適用されます。
+    """
+
+    MIGRATIONS = [
+        Migration(
+            1,
+            "add indexes for lookups by submission and total absolute score",
+            [
+                # score_history(submission_time) には UNIQUE 制約による索引が既に存在する
+                "CREATE INDEX IF NOT EXISTS idx_test_cases_score_history_id ON test_cases (score_history_id)",
+                "CREATE INDEX IF NOT EXISTS idx_score_history_total_absolute_score "
+                "ON score_history (total_absolute_score)",
+            ],
+        ),
+        Migration(
+            2,
+            "store test case names once in the cases table and reference them by integer id",
+            [
+                "CREATE TABLE cases (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)",
+                "INSERT INTO cases (name) SELECT test_case_input FROM test_cases "
+                "UNION SELECT test_case_input FROM top_scores ORDER BY 1",
+                """
+                CREATE TABLE new_test_cases (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    case_id INTEGER NOT NULL,
+                    absolute_score INTEGER,
+                    score_history_id INTEGER NOT NULL,
+                    FOREIGN KEY (case_id) REFERENCES cases(id),
+                    FOREIGN KEY (score_history_id) REFERENCES score_history(id) ON DELETE CASCADE,
+                    UNIQUE(case_id, score_history_id)
+                )
+                """,
+                "INSERT INTO new_test_cases (id, case_id, absolute_score, score_history_id) "
+                "SELECT tc.id, c.id, tc.absolute_score, tc.score_history_id "
+                "FROM test_cases AS tc JOIN cases AS c ON tc.test_case_input = c.name ORDER BY tc.id",
+                "DROP TABLE test_cases",
+                "ALTER TABLE new_test_cases RENAME TO test_cases",
+                "CREATE INDEX idx_test_cases_score_history_id ON test_cases (score_history_id)",
+                """
+                CREATE TABLE new_top_scores (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    case_id INTEGER NOT NULL UNIQUE,
+                    top_absolute_score INTEGER DEFAULT NULL,
+                    second_top_score INTEGER DEFAULT NULL,
+                    is_updated BOOLEAN NOT NULL DEFAULT FALSE,
+                    score_history_id INTEGER NOT NULL,
+                    FOREIGN KEY (case_id) REFERENCES cases(id),
+                    FOREIGN KEY (score_history_id) REFERENCES score_history(id) ON DELETE SET NULL
+                )
+                """,
+                "INSERT INTO new_top_scores (id, case_id, top_absolute_score, second_top_score, is_updated, "
+                "score_history_id) "
+                "SELECT ts.id, c.id, ts.top_absolute_score, ts.second_top_score, ts.is_updated, ts.score_history_id "
+                "FROM top_scores AS ts JOIN cases AS c ON ts.test_case_input = c.name ORDER BY ts.id",
+                "DROP TABLE top_scores",
+                "ALTER TABLE new_top_scores RENAME TO top_scores",
+            ],
+        ),
+        Migration(
+            3,
+            "add a column storing the scores of a submission as a packed int64 array",
+            ["ALTER TABLE score_history ADD COLUMN score_vector BLOB DEFAULT NULL"],
+        ),
+        Migration(
+            4,
+            "add a fingerprint of the recorded scores for duplicate submission detection",
+            [
+                "ALTER TABLE score_history ADD COLUMN fingerprint TEXT DEFAULT NULL",
+                # 重複した提出も記録できるよう、一意制約は付けない
+                "CREATE INDEX idx_score_history_fingerprint ON score_history (fingerprint)",
+                backfill_fingerprints,
+            ],
+        ),
+        Migration(
+            5,
+            "record the submit directory of each submission and index test case scores by case and score",
+            [
+                "ALTER TABLE score_history ADD COLUMN submit_dir TEXT DEFAULT NULL",
+                # 提出を削除した際に、次のトップスコアをテストケースごとにスコア順で探す
+                "CREATE INDEX idx_test_cases_case_id_absolute_score ON test_cases (case_id, absolute_score)",
+            ],
+        ),
+        Migration(
+            6,
+            "track whether the stored relative scores and ranks reflect all recorded submissions",
+            [
+                # epoch は相対スコアを更新せずに提出を記録するたびに増え、materialized_epoch は再計算した時点の epoch
+                """
+                CREATE TABLE relative_score_state (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    epoch INTEGER NOT NULL DEFAULT 0,
+                    materialized_epoch INTEGER NOT NULL DEFAULT 0
+                )
+                """,
+                "INSERT INTO relative_score_state (id) VALUES (1)",
+            ],
+        ),
+    ]
+
+    @classmethod
+    def get_latest_version(cls) -> int:
+        """最新のスキーマバージョンを返します。"""
+        return max(migration.version for migration in cls.MIGRATIONS)
+
+    @staticmethod
+    def fetch_version(conn: sqlite3.Connection) -> int:
+        """データベースのスキーマバージョンを取得します。"""
+        version: int = conn.execute("PRAGMA user_version").fetchone()[0]
+        return version
+
+    @staticmethod
+    def is_initialized(conn: sqlite3.Connection) -> bool:
+        """テーブルが作成済みのデータベースであるかを確認します。"""
+        row = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'score_history'")
+        result: int = row.fetchone()[0]
+        return result > 0
+
+    @classmethod
+    def migrate(cls, conn: sqlite3.Connection) -> list[Migration]:
+        """未適用のマイグレーションを順に適用し、適用したマイグレーションを返します。
+
+        テーブルが未作成のデータベースには何もしません。
+        """
+        if cls.fetch_version(conn) >= cls.get_latest_version() or not cls.is_initialized(conn):
+            return []
+
+        applied_migrations: list[Migration] = []
+        for migration in sorted(cls.MIGRATIONS, key=lambda migration: migration.version):
+            # 他のプロセスが同時に更新した場合に備え、書き込みロックを取得してからバージョンを確認する
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if cls.fetch_version(conn) < migration.version:
+                    for statement in migration.statements:
+                        if callable(statement):
+                            statement(conn)
+                        else:
+                            conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {migration.version}")
+                    applied_migrations.append(migration)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        return applied_migrations
@@ -0,0 +1,99 @@
+import hashlib
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+from ahc_local_leaderboard.utils.file_utility import FileUtility
+
+
+class ScoreCache:
+    """入力・出力・スコア計算方法のハッシュ値をキーにして、計算済みのスコアを永続化するクラス。"""
+
+    SCORE_CACHE_TABLE = """
+    CREATE TABLE IF NOT EXISTS score_cache (
+        cache_key TEXT PRIMARY KEY,
+        score INTEGER NOT NULL,
+        last_used_at REAL NOT NULL
+    )
+    """
+
+    LAST_USED_AT_INDEX = "CREATE INDEX IF NOT EXISTS idx_score_cache_last_used_at ON score_cache(last_used_at)"
+
+    # SQLite のプレースホルダ数の上限を超えないように分割して問い合わせる
+    QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, cache_path: Path, max_entries: int, max_age_days: float) -> None:
+        assert 0 < max_entries
+        assert 0 < max_age_days
+
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+
+    @staticmethod
+    def generate_key(scorer_fingerprint: str, input_file_path: Path, submit_file_path: Path) -> Optional[str]:
+        """スコア計算方法と入出力ファイルの内容からキャッシュキーを生成します。ファイルが読めない場合は None を返します。"""
+        try:
+            input_hash = FileUtility.calculate_file_hash(input_file_path)
+            submit_hash = FileUtility.calculate_file_hash(submit_file_path)
+        except OSError:
+            return None
+
+        return hashlib.sha256(f"{scorer_fingerprint}\0{input_hash}\0{submit_hash}".encode("utf-8")).hexdigest()
+
+    def connect(self) -> sqlite3.Connection:
+        """キャッシュファイルに接続し、必要であればテーブルを作成します。"""
+        conn = sqlite3.connect(str(self.cache_path))
+        conn.execute(self.SCORE_CACHE_TABLE)
+        conn.execute(self.LAST_USED_AT_INDEX)
+        return conn
+
+    def fetch_scores(self, cache_keys: list[str]) -> dict[str, int]:
+        """指定したキーのうちキャッシュに存在するもののスコアを返し、最終利用日時を更新します。"""
+        scores: dict[str, int] = {}
+        if not cache_keys:
+            return scores
+
+        with closing(self.connect()) as conn, conn:
+            for start in range(0, len(cache_keys), self.QUERY_CHUNK_SIZE):
+                chunk = cache_keys[start : start + self.QUERY_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT cache_key, score FROM score_cache WHERE cache_key IN ({placeholders})", chunk
+                ).fetchall()
+                scores.update(rows)
+
+            now = time.time()
+            conn.executemany(
+                "UPDATE score_cache SET last_used_at = ? WHERE cache_key = ?",
+                [(now, cache_key) for cache_key in scores],
+            )
+
+        return scores
+
+    def store_scores(self, scores: dict[str, int]) -> None:
+        """計算したスコアをキャッシュに保存し、古いエントリを削除します。"""
+        with closing(self.connect()) as conn, conn:
+            now = time.time()
+            conn.executemany(
+                "INSERT OR REPLACE INTO score_cache (cache_key, score, last_used_at) VALUES (?, ?, ?)",
+                [(cache_key, score, now) for cache_key, score in scores.items()],
+            )
+            self.evict(conn, now)
+
+    def evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """有効期限を過ぎたエントリと、上限件数を超えた古いエントリを削除します。"""
+        conn.execute("DELETE FROM score_cache WHERE last_used_at < ?", (now - self.max_age_days * 24 * 60 * 60,))
+        conn.execute(
+            """
+            DELETE FROM score_cache
+            WHERE cache_key IN (
+                SELECT cache_key FROM score_cache
+                ORDER BY last_used_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
@@ -0,0 +1,95 @@
+import importlib.util
+import sys
+from array import array
+from typing import Optional
+
+# NumPy は読み込みに時間がかかるため、インストールされているかだけを確認し、使う時点で読み込む
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class ScoreVector:
+    """1回の提出のテストケースごとの絶対スコアを、int64 の配列を詰めた BLOB として扱うクラス。
+
+    配列の i 番目の要素は cases テーブルの id が i + 1 のテストケースのスコアです。
+    バイト順はリトルエンディアンに固定し、NumPy がインストールされている場合は NumPy で読み取ります。
+    """
+
+    TYPECODE = "q"
+    # 提出にそのテストケースが含まれていないことを表す値
+    MISSING = -1
+    # スコアが無効 (NULL) であることを表す値。有効なスコアは常に正の整数
+    INVALID = 0
+
+    @staticmethod
+    def encode_score(score: Optional[int]) -> int:
+        """スコアを配列の要素に変換します。"""
+        return ScoreVector.INVALID if score is None else score
+
+    @staticmethod
+    def decode_score(value: int) -> Optional[int]:
+        """配列の要素をスコアに変換します。"""
+        return None if value == ScoreVector.INVALID else value
+
+    @staticmethod
+    def pack(scores: dict[int, Optional[int]]) -> bytes:
+        """テストケースの id ごとのスコアを BLOB に変換します。"""
+        values = array(ScoreVector.TYPECODE, [ScoreVector.MISSING]) * max(scores, default=0)
+        for case_id, score in scores.items():
+            assert 0 < case_id
+            values[case_id - 1] = ScoreVector.encode_score(score)
+
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tobytes()
+
+    @staticmethod
+    def unpack(blob: bytes) -> dict[int, Optional[int]]:
+        """BLOB を提出に含まれるテストケースの id ごとのスコアに変換します。"""
+        if HAS_NUMPY:
+            import numpy
+
+            vector = numpy.frombuffer(blob, dtype="<i8")
+            case_indices = numpy.flatnonzero(vector != ScoreVector.MISSING)
+            return {
+                case_index + 1: ScoreVector.decode_score(value)
+                for case_index, value in zip(case_indices.tolist(), vector[case_indices].tolist())
+            }
+
+        values = ScoreVector.to_array(blob)
+        return {
+            case_index + 1: ScoreVector.decode_score(value)
+            for case_index, value in enumerate(values)
+            if value != ScoreVector.MISSING
+        }
+
+    @staticmethod
+    def select(blob: bytes, case_ids: list[int]) -> dict[int, Optional[int]]:
+        """BLOB から指定したテストケースのスコアだけを取り出します。提出に含まれないテストケースは除きます。"""
+        if HAS_NUMPY:
+            import numpy
+
+            vector = numpy.frombuffer(blob, dtype="<i8")
+            indices = numpy.asarray(case_ids, dtype=numpy.int64) - 1
+            indices = indices[indices < len(vector)]
+            selected = vector[indices]
+            present = selected != ScoreVector.MISSING
+            return {
+                case_index + 1: ScoreVector.decode_score(value)
+                for case_index, value in zip(indices[present].tolist(), selected[present].tolist())
+            }
+
+        values = ScoreVector.to_array(blob)
+        return {
+            case_id: ScoreVector.decode_score(values[case_id - 1])
+            for case_id in case_ids
+            if case_id <= len(values) and values[case_id - 1] != ScoreVector.MISSING
+        }
+
+    @staticmethod
+    def to_array(blob: bytes) -> "array[int]":
+        """BLOB を int64 の配列に変換します。"""
+        values = array(ScoreVector.TYPECODE)
+        values.frombytes(blob)
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+
+class TransactionHookInterface(ABC):
+    """DatabaseManager のトランザクションの開始前と終了後に呼び出されるフックのインターフェース。"""
+
+    @abstractmethod
+    def before_transaction(self) -> None:
+        """トランザクションを開始する前に呼び出されます。"""
+        pass
+
+    @abstractmethod
+    def after_transaction(self) -> None:
+        """トランザクションをコミットまたはロールバックした後に呼び出されます。"""
+        pass
+
+    def after_rollback(self) -> None:
+        """トランザクションをロールバックした後、after_transaction より先に呼び出されます。"""
+        pass
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from ahc_local_leaderboard.database.record_read_service import RecordReadService
+from ahc_local_leaderboard.database.record_write_service import RecordWriteService
+from ahc_local_leaderboard.models.top_score_record import TopScoreRecord
+from ahc_local_leaderboard.submit.relative_score_updater import RelativeScoreUpdater
+from ahc_local_leaderboard.utils.file_utility import FileUtility
+from ahc_local_leaderboard.utils.relative_score_calculater import (
+    RelativeScoreCalculaterInterface,
+)
+
+
+class SubmissionDeleter:
+    """提出をローカル順位表から削除し、その提出がトップスコアを保持していたテストケースだけを更新するクラス。
+
+    次のトップスコアはテストケースごとにスコア順の索引から探し、相対スコアは提出時と同じく
+    トップスコアが変わったテストケースの差分だけを反映します。
+    """
+
+    def __init__(
+        self,
+        record_read_service: RecordReadService,
+        record_write_service: RecordWriteService,
+        relative_score_updater: RelativeScoreUpdater,
+        relative_score_calculator: RelativeScoreCalculaterInterface,
+        file_utility: FileUtility,
+    ) -> None:
+        self.record_read_service = record_read_service
+        self.record_write_service = record_write_service
+        self.relative_score_updater = relative_score_updater
+        self.relative_score_calculator = relative_score_calculator
+        self.file_utility = file_utility
+
+    def delete_submission(self, submission_id: int) -> tuple[list[TopScoreRecord], list[str]]:
+        """提出を削除し、更新したトップスコアと、どの提出にも含まれなくなったテストケース名を返します。"""
+        held_top_scores = [
+            top_score
+            for top_score in self.record_read_service.fetch_top_score_records()
+            if top_score.submission_id == submission_id
+        ]
+        next_top_scores = self.record_read_service.fetch_next_top_scores(
+            [top_score.file_name for top_score in held_top_scores],
+            submission_id,
+            self.relative_score_calculator.is_better_score(2, 1),
+        )
+
+        updated_top_scores: list[TopScoreRecord] = []
+        removed_file_names: list[str] = []
+        for held_top_score in held_top_scores:
+            next_top_score = next_top_scores.get(held_top_score.file_name)
+            if next_top_score is None:
+                removed_file_names.append(held_top_score.file_name)
+                continue
+
+            # 削除した提出のスコアを直前のトップスコアとして、提出時と同じ差分で相対スコアを更新する
+            next_submission_id, next_score = next_top_score
+            updated_top_scores.append(
+                TopScoreRecord(held_top_score.file_name, next_score, held_top_score.top_score, next_submission_id)
+            )
+
+        self.record_write_service.update_top_score_records(updated_top_scores)
+        self.record_write_service.delete_top_scores(removed_file_names)
+        self.record_write_service.delete_submission(submission_id)
+
+        # 新しく追加された提出はないので、残りのすべての提出が更新の対象となる
+        self.relative_score_updater.apply_relative_score_updates([])
+
+        return updated_top_scores, removed_file_names
+
+    def find_submit_file(self, top_score: TopScoreRecord) -> Optional[Path]:
+        """トップスコアを記録した提出の出力ファイルを返します。
+
+        提出ディレクトリが記録されていない場合や、出力ファイルが提出後に書き換えられている場合は None を返します。
+        """
+        submit_dir = self.record_read_service.fetch_submit_dir(top_score.submission_id)
+        if submit_dir is None:
+            return None
+
+        submit_file_path = Path(submit_dir) / top_score.file_name
+        if not self.file_utility.path_exists(submit_file_path):
+            return None
+
+        # 提出日時は秒単位で記録されているため、同じ秒の間に書き込まれたファイルは提出時のものとみなす
+        submission_time = self.record_read_service.fetch_summary_record_by_id(top_score.submission_id).submission_time
+        modified_time = datetime.fromtimestamp(submit_file_path.stat().st_mtime)
+        if submission_time + timedelta(seconds=1) <= modified_time:
+            return None
+
+        return submit_file_path
+
+    def restore_top_files(self, updated_top_scores: list[TopScoreRecord], removed_file_names: list[str]) -> list[str]:
+        """順位表ディレクトリの出力ファイルを新しいトップスコアの提出のものに差し替え、差し替えられなかったテストケース名を返します。
+
+        差し替えられなかったテストケースや、どの提出にも含まれなくなったテストケースの出力ファイルは削除します。
+        """
+        unrestored_file_names: list[str] = []
+        for top_score in updated_top_scores:
+            submit_file_path = self.find_submit_file(top_score)
+            if submit_file_path is None:
+                self.file_utility.remove_file_from_leaderboard(top_score.file_name)
+                unrestored_file_names.append(top_score.file_name)
+            else:
+                self.file_utility.copy_file_to_leaderboard(submit_file_path, top_score.file_name)
+
+        for file_name in removed_file_names:
+            self.file_utility.remove_file_from_leaderboard(file_name)
+
+        return unrestored_file_names
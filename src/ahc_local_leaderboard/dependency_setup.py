@@ -1,8 +1,14 @@
 from pathlib import Path
-from typing import Optional, TypedDict
+from typing import TYPE_CHECKING, Optional, TypedDict
 
-from ahc_local_leaderboard.config import Config
+from ahc_local_leaderboard.consts import (
+    get_journal_dir,
+    get_root_dir,
+    get_score_cache_path,
+    get_status_snapshot_path,
+)
 from ahc_local_leaderboard.database.database_manager import (
+    CachedTopScoresRepository,
     DatabaseManager,
     ScoreHistoryRepository,
     TestCaseRepository,
@@ -10,23 +16,35 @@ from ahc_local_leaderboard.database.database_manager import (
 )
 from ahc_local_leaderboard.database.record_read_service import RecordReadService
 from ahc_local_leaderboard.database.record_write_service import RecordWriteService
-from ahc_local_leaderboard.submit.relative_score_updater import RelativeScoreUpdater
-from ahc_local_leaderboard.submit.reserved_record_updater import ReservedRecordUpdater
-from ahc_local_leaderboard.submit.submission_matcher import SubmissionMatcher
-from ahc_local_leaderboard.submit.test_case_processor import (
-    TestCaseProcessor,
-    TestCasesProcessor,
-)
-from ahc_local_leaderboard.submit.test_file_processor import (
-    AtCoderTestFileProcessor,
-    PahcerTestFileProcessor,
-    TestFilesProcessor,
-)
+from ahc_local_leaderboard.status.status_snapshot import StatusSnapshotFile
+from ahc_local_leaderboard.status.status_snapshot_writer import StatusSnapshotWriter
 from ahc_local_leaderboard.utils.file_utility import FileUtility
-from ahc_local_leaderboard.utils.relative_score_calculater import (
-    RelativeScoreCalculaterInterface,
-    get_relative_score_calculator,
-)
+
+# 初期依存関係だけを使うコマンドの起動を速くするため、スコア計算や再構築のモジュールは依存関係を生成する時点で読み込む
+if TYPE_CHECKING:
+    from ahc_local_leaderboard.config import Config
+    from ahc_local_leaderboard.database.score_cache import ScoreCache
+    from ahc_local_leaderboard.rebuild.relative_score_materializer import (
+        RelativeScoreMaterializer,
+    )
+    from ahc_local_leaderboard.submit.relative_score_updater import (
+        RelativeScoreUpdater,
+    )
+    from ahc_local_leaderboard.submit.reserved_record_updater import (
+        ReservedRecordUpdater,
+    )
+    from ahc_local_leaderboard.submit.scoring_journal import ScoringJournal
+    from ahc_local_leaderboard.submit.submission_matcher import SubmissionMatcher
+    from ahc_local_leaderboard.submit.test_case_processor import TestCasesProcessor
+    from ahc_local_leaderboard.submit.test_file_processor import (
+        CommandTestFileProcessorInterface,
+        PahcerTestFileProcessor,
+        TestFileProcessorInterface,
+        TestFilesProcessor,
+    )
+    from ahc_local_leaderboard.utils.relative_score_calculater import (
+        RelativeScoreCalculaterInterface,
+    )
 
 
 class PrevDependencies(TypedDict):
@@ -43,27 +61,42 @@ class Dependencies(TypedDict):
 
     record_read_service: RecordReadService
     record_write_service: RecordWriteService
-    relative_score_calculator: RelativeScoreCalculaterInterface
+    relative_score_calculator: "RelativeScoreCalculaterInterface"
     file_utility: FileUtility
-    test_files_processor: TestFilesProcessor
-    test_cases_processor: TestCasesProcessor
-    relative_score_updater: RelativeScoreUpdater
-    reserved_record_updater: ReservedRecordUpdater
+    test_files_processor: "TestFilesProcessor"
+    test_cases_processor: "TestCasesProcessor"
+    relative_score_updater: "RelativeScoreUpdater"
+    reserved_record_updater: "ReservedRecordUpdater"
     db_manager: DatabaseManager
-    submission_matcher: SubmissionMatcher
+    submission_matcher: "SubmissionMatcher"
+    relative_score_materializer: "RelativeScoreMaterializer"
+    lazy_relative_scores: bool
+
 
+def setup_initial_dependencies(cache_top_scores: bool = False) -> PrevDependencies:
+    """scoring_type に依存しない初期依存関係を生成します。
 
-def setup_initial_dependencies() -> PrevDependencies:
-    """scoring_type に依存しない初期依存関係を生成します。"""
+    cache_top_scores が True の場合は、常駐サーバー向けにトップスコアをメモリに保持します。
+    """
     db_manager = DatabaseManager()
     score_history_repo = ScoreHistoryRepository(db_manager)
     tese_case_repo = TestCaseRepository(db_manager)
     top_scores_repo = TopScoresRepository(db_manager)
+    if cache_top_scores:
+        cached_top_scores_repo = CachedTopScoresRepository(db_manager)
+        # ロールバックした書き込みをキャッシュから取り除く
+        db_manager.add_transaction_hook(cached_top_scores_repo)
+        top_scores_repo = cached_top_scores_repo
 
     record_read_service = RecordReadService(score_history_repo, tese_case_repo, top_scores_repo)
     record_write_service = RecordWriteService(db_manager, score_history_repo, tese_case_repo, top_scores_repo)
     file_utility = FileUtility()
 
+    # 書き込みをコミットするたびに、status コマンドなどが SQLite を開かずに読めるスナップショットを書き直す
+    db_manager.add_transaction_hook(
+        StatusSnapshotWriter(record_read_service, StatusSnapshotFile(get_status_snapshot_path()))
+    )
+
     return {
         "db_manager": db_manager,
         "record_read_service": record_read_service,
@@ -72,10 +105,41 @@ def setup_initial_dependencies() -> PrevDependencies:
     }
 
 
-def setup_scoring_dependencies(config: Config, initial_dependencies: PrevDependencies) -> Dependencies:
+def setup_scoring_dependencies(config: "Config", initial_dependencies: PrevDependencies) -> Dependencies:
     """scoring_type に依存する依存関係を追加します。"""
+    from ahc_local_leaderboard.database.score_cache import ScoreCache
+    from ahc_local_leaderboard.rebuild.leaderboard_rebuilder import (
+        LeaderboardRebuilder,
+    )
+    from ahc_local_leaderboard.rebuild.relative_score_materializer import (
+        RelativeScoreMaterializer,
+    )
+    from ahc_local_leaderboard.submit.relative_score_updater import (
+        RelativeScoreUpdater,
+    )
+    from ahc_local_leaderboard.submit.reserved_record_updater import (
+        ReservedRecordUpdater,
+    )
+    from ahc_local_leaderboard.submit.scoring_journal import ScoringJournal
+    from ahc_local_leaderboard.submit.submission_matcher import SubmissionMatcher
+    from ahc_local_leaderboard.submit.test_case_processor import (
+        TestCaseProcessor,
+        TestCasesProcessor,
+    )
+    from ahc_local_leaderboard.utils.relative_score_calculater import (
+        get_relative_score_calculator,
+    )
+
     relative_score_calculator = get_relative_score_calculator(config.get_scoring_type())
-    test_files_processor = TestFilesProcessor(AtCoderTestFileProcessor())
+    initial_dependencies["record_write_service"].set_score_vector_storage(config.is_score_vector_storage_enabled())
+    score_cache = (
+        ScoreCache(get_score_cache_path(), config.get_score_cache_max_entries(), config.get_score_cache_max_age_days())
+        if config.is_score_cache_enabled()
+        else None
+    )
+    test_files_processor = create_test_files_processor(
+        config, create_test_file_processor(config), score_cache, ScoringJournal(get_journal_dir())
+    )
     test_cases_processor = TestCasesProcessor(
         TestCaseProcessor(
             initial_dependencies["record_read_service"],
@@ -97,6 +161,17 @@ def setup_scoring_dependencies(config: Config, initial_dependencies: PrevDepende
 
     submission_matcher = SubmissionMatcher(initial_dependencies["record_read_service"])
 
+    relative_score_materializer = RelativeScoreMaterializer(
+        initial_dependencies["db_manager"],
+        initial_dependencies["record_read_service"],
+        initial_dependencies["record_write_service"],
+        LeaderboardRebuilder(
+            initial_dependencies["record_read_service"],
+            initial_dependencies["record_write_service"],
+            relative_score_calculator,
+        ),
+    )
+
     all_dependencies: Dependencies = {
         **initial_dependencies,
         "relative_score_calculator": relative_score_calculator,
@@ -105,13 +180,134 @@ def setup_scoring_dependencies(config: Config, initial_dependencies: PrevDepende
         "relative_score_updater": relative_score_updater,
         "reserved_record_updater": reserved_record_updater,
         "submission_matcher": submission_matcher,
+        "relative_score_materializer": relative_score_materializer,
+        "lazy_relative_scores": config.get_relative_score_mode() == "lazy",
     }
 
     return all_dependencies
 
 
-def setup_pahcer_test_file_processor(pahcer_directory_path: Path) -> Optional[PahcerTestFileProcessor]:
+class DependencyCache:
+    """常駐サーバーで、scoring_type に依存する依存関係を config.yaml が変更されるまで使い回すクラス。
+
+    スコア計算ワーカーは提出のたびに終了させず、設定を読み込み直す際と close() で後片付けします。
+    """
+
+    def __init__(self, config_path: Path, initial_dependencies: PrevDependencies) -> None:
+        self.config_path = config_path
+        self.initial_dependencies = initial_dependencies
+        self.dependencies: Optional[Dependencies] = None
+        self.config_mtime: Optional[float] = None
+
+    def get(self) -> Dependencies:
+        """使い回している依存関係を返します。コマンドごとの変更が残らないよう、辞書は複製して返します。"""
+        from ahc_local_leaderboard.config import Config
+
+        config_mtime = self.config_path.stat().st_mtime
+        if self.dependencies is None or self.config_mtime != config_mtime:
+            self.close()
+            self.dependencies = setup_scoring_dependencies(Config(self.config_path), self.initial_dependencies)
+            self.dependencies["test_files_processor"].keep_scorer_alive = True
+            self.config_mtime = config_mtime
+
+        return self.dependencies.copy()
+
+    def close(self) -> None:
+        """使い回しているスコア計算ワーカーを終了させ、次回は依存関係を生成し直すようにします。"""
+        if self.dependencies is not None:
+            self.dependencies["test_files_processor"].close()
+            self.dependencies = None
+
+
+def create_command_test_file_processor(config: "Config") -> "CommandTestFileProcessorInterface":
+    """設定されたスコア計算コマンドを実行する TestFileProcessor を生成します。"""
+    from ahc_local_leaderboard.submit.scorer_builder import VisScorerBuilder
+    from ahc_local_leaderboard.submit.test_file_processor import (
+        AtCoderTestFileProcessor,
+        ScorerCommandTestFileProcessor,
+    )
+
+    scorer_command = config.get_scorer_command()
+    if scorer_command is None:
+        return AtCoderTestFileProcessor(VisScorerBuilder(get_root_dir()))
+
+    return ScorerCommandTestFileProcessor(
+        scorer_command, config.get_score_regex(), config.is_score_only(), get_root_dir()
+    )
+
+
+def create_test_file_processor(config: "Config") -> "TestFileProcessorInterface":
+    """設定に応じて、プラグイン・常駐ワーカー・テストケースごとのコマンドのいずれかでスコアを計算する TestFileProcessor を生成します。"""
+    from ahc_local_leaderboard.submit.test_file_processor import (
+        PluginTestFileProcessor,
+    )
+
+    scorer_plugin = config.get_scorer_plugin()
+    if scorer_plugin is not None:
+        return PluginTestFileProcessor(scorer_plugin, get_root_dir())
+
+    command_test_file_processor = create_command_test_file_processor(config)
+
+    worker_command = config.get_scorer_worker_command()
+    if worker_command is None:
+        return command_test_file_processor
+
+    from ahc_local_leaderboard.submit.persistent_scorer import (
+        PersistentTestFileProcessor,
+    )
+
+    return PersistentTestFileProcessor(
+        worker_command, command_test_file_processor, get_root_dir(), config.get_scheduler_timeout()
+    )
+
+
+def create_test_files_processor(
+    config: "Config",
+    test_file_processor: "TestFileProcessorInterface",
+    score_cache: Optional["ScoreCache"],
+    journal: Optional["ScoringJournal"] = None,
+) -> "TestFilesProcessor":
+    """設定されたバックエンドでテストファイルを処理する TestFilesProcessor を生成します。"""
+    from ahc_local_leaderboard.submit.test_file_processor import (
+        CommandTestFileProcessorInterface,
+        PluginTestFileProcessor,
+        TestFilesProcessor,
+    )
+
+    # asyncio やプロセスプールは、そのバックエンドを使う場合にのみ読み込む
+    if isinstance(test_file_processor, PluginTestFileProcessor):
+        from ahc_local_leaderboard.submit.plugin_test_files_processor import (
+            PluginTestFilesProcessor,
+        )
+
+        return PluginTestFilesProcessor(
+            test_file_processor, config.get_jobs(), score_cache, config.get_scorer_batch_size(), journal
+        )
+
+    if config.get_scheduler_backend() == "async" and isinstance(
+        test_file_processor, CommandTestFileProcessorInterface
+    ):
+        from ahc_local_leaderboard.submit.async_test_files_processor import (
+            AsyncTestFilesProcessor,
+        )
+
+        return AsyncTestFilesProcessor(
+            test_file_processor,
+            config.get_jobs(),
+            score_cache,
+            config.get_scheduler_timeout(),
+            config.get_scheduler_retries(),
+            journal,
+        )
+
+    return TestFilesProcessor(test_file_processor, config.get_jobs(), score_cache, journal)
+
+
+def setup_pahcer_test_file_processor(pahcer_directory_path: Path) -> Optional["PahcerTestFileProcessor"]:
     """PahcerTestFileProcessorを初期化します。"""
+    from ahc_local_leaderboard.submit.test_file_processor import (
+        PahcerTestFileProcessor,
+    )
 
     latest_json = find_latest_json(pahcer_directory_path / Path("json"))
     if latest_json is None:
@@ -1,40 +1,38 @@
 import argparse
+import copy
+import glob
+import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
 
-from ahc_local_leaderboard.config import Config
 from ahc_local_leaderboard.consts import (
     get_config_path,
     get_database_path,
     get_leader_board_path,
+    get_profile_path,
     get_root_dir,
+    get_socket_path,
+    get_status_snapshot_path,
     get_top_dir,
+    get_trace_path,
 )
-from ahc_local_leaderboard.dependency_setup import (
-    Dependencies,
-    PrevDependencies,
-    setup_initial_dependencies,
-    setup_pahcer_test_file_processor,
-    setup_scoring_dependencies,
-)
-from ahc_local_leaderboard.init.initializer import Initializer
-from ahc_local_leaderboard.models.sort_config import (
-    DetailScoreRecordsSortConfig,
-    SummaryScoreRecordsSortConfig,
-)
-from ahc_local_leaderboard.models.test_file import TestFiles
-from ahc_local_leaderboard.submit.submitter import Submitter
-from ahc_local_leaderboard.submit.test_file_processor import TestFilesProcessor
-from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
-from ahc_local_leaderboard.utils.validator import (
-    InitValidator,
-    SubmitValidator,
-    ViewValidator,
-)
-from ahc_local_leaderboard.view.viewer import Viewer
+from ahc_local_leaderboard.serve.leaderboard_client import LeaderboardClient
+
+# 起動を速くするため、各コマンドで使うモジュールはそのコマンドを実行する時点で読み込む
+if TYPE_CHECKING:
+    from ahc_local_leaderboard.dependency_setup import (
+        Dependencies,
+        DependencyCache,
+        PrevDependencies,
+    )
+    from ahc_local_leaderboard.models.test_file import TestFiles
+    from ahc_local_leaderboard.submit.submitter import Submitter
 
 
-def handle_setup(initial_dependencies: PrevDependencies) -> None:
+def handle_setup(initial_dependencies: "PrevDependencies") -> None:
     """ローカル順位表のセットアップを実行します。"""
+    from ahc_local_leaderboard.init.initializer import Initializer
+
     initializer = Initializer(
         initial_dependencies["record_write_service"],
         initial_dependencies["file_utility"],
@@ -45,18 +43,48 @@ def handle_setup(initial_dependencies: PrevDependencies) -> None:
     initializer.execute()
 
 
-def handle_submit(dependencies: Dependencies, test_files: TestFiles, skip_duplicate: bool) -> None:
-    """指定した出力をローカル順位表に送信します。"""
-    submitter = Submitter(
+def create_submitter(dependencies: "Dependencies") -> "Submitter":
+    """依存関係から Submitter を生成します。"""
+    from ahc_local_leaderboard.submit.submitter import Submitter
+
+    return Submitter(
+        dependencies["record_read_service"],
         dependencies["record_write_service"],
         dependencies["test_files_processor"],
         dependencies["test_cases_processor"],
         dependencies["reserved_record_updater"],
         dependencies["relative_score_updater"],
         dependencies["submission_matcher"],
+        # 遅延計算では提出時に過去の提出を更新せず、view コマンドで表示する際にまとめて計算し直す
+        dependencies["relative_score_materializer"] if dependencies["lazy_relative_scores"] else None,
     )
 
-    submit_result = submitter.execute(test_files, skip_duplicate)
+
+def handle_submit(dependencies: "Dependencies", test_files_list: list["TestFiles"], skip_duplicate: bool) -> None:
+    """指定した出力をローカル順位表に送信します。"""
+    from ahc_local_leaderboard.models.sort_config import DetailScoreRecordsSortConfig
+    from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+    from ahc_local_leaderboard.view.viewer import Viewer
+
+    if len(test_files_list) != 1:
+        handle_batch_submit(dependencies, test_files_list, skip_duplicate)
+        return
+
+    submitter = create_submitter(dependencies)
+
+    # スコア計算の結果はジャーナルに逐次記録されるため、トランザクションはデータベースへの書き込みのみを囲む
+    test_cases = submitter.score_test_files(test_files_list[0])
+
+    db_manager = dependencies["db_manager"]
+    try:
+        db_manager.begin_transaction()
+        submit_result = submitter.record_test_cases(test_cases, skip_duplicate)
+        db_manager.commit()
+    except Exception:
+        db_manager.rollback()
+        raise
+
+    dependencies["test_files_processor"].discard_journal()
 
     if submit_result:
         viewer = Viewer(
@@ -71,11 +99,119 @@ def handle_submit(dependencies: Dependencies, test_files: TestFiles, skip_duplic
         ConsoleHandler.print_info("Skipping duplicate submissions")
 
 
-def handle_view(dependencies: Dependencies, limit: int, detail: str, sort_column: str, sort_order: str) -> None:
+def handle_batch_submit(
+    dependencies: "Dependencies", test_files_list: list["TestFiles"], skip_duplicate: bool
+) -> None:
+    """複数の出力をまとめてスコア計算し、一つのトランザクションでローカル順位表に送信します。"""
+    from ahc_local_leaderboard.models.sort_config import SummaryScoreRecordsSortConfig
+    from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+    from ahc_local_leaderboard.view.viewer import Viewer
+
+    submitter = create_submitter(dependencies)
+
+    test_cases_list = submitter.score_test_files_batch(test_files_list)
+
+    db_manager = dependencies["db_manager"]
+    try:
+        db_manager.begin_transaction()
+        new_record_ids = submitter.record_test_cases_batch(test_cases_list, skip_duplicate)
+        db_manager.commit()
+    except Exception:
+        db_manager.rollback()
+        raise
+
+    dependencies["test_files_processor"].discard_journal()
+
+    skipped_count = len(test_files_list) - len(new_record_ids)
+    if skipped_count:
+        ConsoleHandler.print_info(f"Skipping {skipped_count} duplicate submissions")
+
+    if new_record_ids:
+        viewer = Viewer(
+            dependencies["record_read_service"],
+            dependencies["relative_score_calculator"],
+        )
+        viewer.show_summary_list(len(new_record_ids), SummaryScoreRecordsSortConfig("id", "asc"))
+
+
+def run_handler(dependencies: "Dependencies", args: argparse.Namespace, handler: Callable[[], None]) -> None:
+    """コマンドの処理'handler'を実行します。
+
+    '--trace' または '--profile' を指定した場合は、段階ごと・リポジトリのメソッドごと・スコア計算ごとの
+    経過時間と SQL の実行回数を記録し、集計を表示します。
+    """
+    if not args.trace and not args.profile:
+        handler()
+        return
+
+    import cProfile
+
+    from ahc_local_leaderboard.profiling.stage_tracer import get_stage_tracer
+    from ahc_local_leaderboard.profiling.trace_report import TraceReport
+    from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+    from ahc_local_leaderboard.view.table_builder import TraceSummaryTableBuilder
+
+    tracer = get_stage_tracer()
+    tracer.start()
+    record_read_service = dependencies["record_read_service"]
+    for repository in [
+        record_read_service.score_history_repo,
+        record_read_service.test_case_repo,
+        record_read_service.top_score_repo,
+    ]:
+        tracer.instrument(repository, "repository")
+    dependencies["db_manager"].set_trace_callback(tracer.count_query)
+
+    profiler = cProfile.Profile() if args.profile else None
+    try:
+        if profiler is not None:
+            profiler.enable()
+        with tracer.stage(args.command, "command"):
+            handler()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(get_profile_path())
+        dependencies["db_manager"].set_trace_callback(None)
+
+        report = TraceReport(tracer.stop())
+        report.write(get_trace_path())
+        table_builder = TraceSummaryTableBuilder(f"Trace Summary ({get_trace_path()})")
+        table_builder.insert_records(report.summarize())
+        table_builder.display()
+        if profiler is not None:
+            ConsoleHandler.print_info(f"cProfile statistics are written to {get_profile_path()}")
+
+
+def expand_submit_dirs(patterns: list[str]) -> list[str]:
+    """'--submit-file' に指定されたディレクトリ名を、glob パターンを展開しながら重複なく並べて返します。"""
+    submit_dirs: list[str] = []
+    for pattern in patterns:
+        matched_dirs = sorted(path for path in get_root_dir().glob(pattern) if path.is_dir())
+        if glob.has_magic(pattern) and matched_dirs:
+            candidates = [str(path.relative_to(get_root_dir())) for path in matched_dirs]
+        else:
+            # 存在しないディレクトリはバリデータでエラーとして報告する
+            candidates = [pattern]
+
+        submit_dirs += [candidate for candidate in candidates if candidate not in submit_dirs]
+
+    return submit_dirs
+
+
+def handle_view(dependencies: "Dependencies", limit: int, detail: str, sort_column: str, sort_order: str) -> None:
     """スコア履歴やテストケースの詳細を表示します。"""
+    from ahc_local_leaderboard.models.sort_config import (
+        DetailScoreRecordsSortConfig,
+        SummaryScoreRecordsSortConfig,
+    )
+    from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+    from ahc_local_leaderboard.view.viewer import Viewer
+
     viewer = Viewer(
         dependencies["record_read_service"],
         dependencies["relative_score_calculator"],
+        dependencies["relative_score_materializer"],
     )
     if detail:
         if detail.isdigit():
@@ -103,7 +239,150 @@ def handle_view(dependencies: Dependencies, limit: int, detail: str, sort_column
         viewer.show_summary_list(limit, SummaryScoreRecordsSortConfig(sort_column, sort_order))
 
 
-def main() -> None:
+def handle_rebuild(dependencies: "Dependencies", check: bool) -> None:
+    """記録されたすべてのスコアから、トップスコアと各提出の相対スコア・順位を計算し直します。"""
+    from ahc_local_leaderboard.rebuild.leaderboard_rebuilder import LeaderboardRebuilder
+    from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+
+    rebuilder = LeaderboardRebuilder(
+        dependencies["record_read_service"],
+        dependencies["record_write_service"],
+        dependencies["relative_score_calculator"],
+    )
+
+    if check:
+        discrepancies = rebuilder.check()
+        for discrepancy in discrepancies:
+            ConsoleHandler.print_error(discrepancy)
+
+        if discrepancies:
+            ConsoleHandler.print_info(f"Found {len(discrepancies)} discrepancies")
+            ConsoleHandler.print_directive("local-leaderboard rebuild")
+        else:
+            ConsoleHandler.print_success("All top scores, relative scores and ranks are consistent")
+        return
+
+    db_manager = dependencies["db_manager"]
+    try:
+        db_manager.begin_transaction()
+        discrepancies = rebuilder.rebuild()
+        db_manager.commit()
+    except Exception:
+        db_manager.rollback()
+        raise
+
+    ConsoleHandler.print_success(f"Rebuilt the leaderboard ({len(discrepancies)} discrepancies fixed)")
+    if any(discrepancy.startswith("Top score of") for discrepancy in discrepancies):
+        # 過去の提出の出力ファイルは保存されていないため、トップスコアの出力ファイルは差し替えられない
+        ConsoleHandler.print_info("Output files in the top directory were not updated for the changed top scores")
+
+
+def handle_delete(dependencies: "Dependencies", submission_id: int) -> None:
+    """指定した提出をローカル順位表から削除し、トップスコアと相対スコアを更新します。"""
+    from ahc_local_leaderboard.delete.submission_deleter import SubmissionDeleter
+    from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+
+    deleter = SubmissionDeleter(
+        dependencies["record_read_service"],
+        dependencies["record_write_service"],
+        dependencies["relative_score_updater"],
+        dependencies["relative_score_calculator"],
+        dependencies["file_utility"],
+    )
+
+    db_manager = dependencies["db_manager"]
+    try:
+        db_manager.begin_transaction()
+        updated_top_scores, removed_file_names = deleter.delete_submission(submission_id)
+        db_manager.commit()
+    except Exception:
+        db_manager.rollback()
+        raise
+
+    unrestored_file_names = deleter.restore_top_files(updated_top_scores, removed_file_names)
+
+    ConsoleHandler.print_success(f"Deleted submission {submission_id} ({len(updated_top_scores)} top scores updated)")
+    if unrestored_file_names:
+        ConsoleHandler.print_info(
+            "Output files of the new top scores are no longer available: " + ", ".join(unrestored_file_names)
+        )
+
+
+def positive_int(value: str) -> int:
+    """コマンドライン引数を正の整数として解釈します。"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
+
+
+def handle_status() -> None:
+    """ベストの提出と最新の提出の順位を、rich を読み込まずに1行で表示します。"""
+    from ahc_local_leaderboard.status.leaderboard_status import LeaderboardStatus
+
+    if not get_database_path().exists():
+        print("Error: The local leaderboard is not set up. Run 'local-leaderboard setup'.", file=sys.stderr)
+        return
+
+    print(LeaderboardStatus(get_database_path(), get_status_snapshot_path()).format_status())
+
+
+def handle_serve(parser: argparse.ArgumentParser, initial_dependencies: "PrevDependencies") -> None:
+    """依存関係とスコア計算ワーカーを保持したまま常駐し、Unix ソケットで受け付けたコマンドを実行します。"""
+    import signal
+
+    from ahc_local_leaderboard.dependency_setup import DependencyCache
+    from ahc_local_leaderboard.serve.leaderboard_server import (
+        LeaderboardServer,
+        ServerAlreadyRunningError,
+    )
+    from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+
+    dependency_cache = DependencyCache(get_config_path(), initial_dependencies)
+
+    def execute_command(argv: list[str]) -> None:
+        run_command(parser, parser.parse_args(argv), initial_dependencies, dependency_cache)
+
+    def stop_server(signum: int, frame: object) -> None:
+        raise KeyboardInterrupt
+
+    server = LeaderboardServer(get_socket_path(), execute_command)
+    # kill で終了させた場合も Ctrl-C と同様に、ソケットファイルとスコア計算ワーカーを後片付けする
+    signal.signal(signal.SIGTERM, stop_server)
+    try:
+        server.start()
+    except (OSError, ServerAlreadyRunningError) as e:
+        ConsoleHandler.print_error(f"Failed to start the server: {e}")
+        return
+
+    ConsoleHandler.print_success(f"Serving the local leaderboard on {get_socket_path()} (press Ctrl-C to stop)")
+    try:
+        while True:
+            server.handle_next_connection()
+    except KeyboardInterrupt:
+        ConsoleHandler.print_info("Stopped the server")
+    finally:
+        server.close()
+        dependency_cache.close()
+
+
+def add_trace_arguments(parser: argparse.ArgumentParser) -> None:
+    """処理時間を計測するためのオプションを追加します。"""
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Record the wall time and SQL query count of each stage to leader_board/trace.jsonl and print a summary.",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="In addition to --trace, dump cProfile statistics to leader_board/profile.prof.",
+    )
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数のパーサーを生成します。"""
     parser = argparse.ArgumentParser(description="Local Lederboard")
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
@@ -112,7 +391,11 @@ def main() -> None:
 
     submit_parser = subparsers.add_parser("submit", help="Submit output to the local leaderboard")
     submit_parser.add_argument(
-        "--submit-file", type=str, help="Specify the submit file to submit. Default is 'out'.", default="out"
+        "--submit-file",
+        type=str,
+        nargs="+",
+        help="Specify the submit directories to submit. Glob patterns such as 'out*' are expanded. Default is 'out'.",
+        default=["out"],
     )
 
     submit_parser.add_argument(
@@ -128,6 +411,15 @@ def main() -> None:
         help="Skip submission if the same submission already exists in the database.",
     )
 
+    submit_parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        help="Number of test files to score in parallel. Default is 'jobs' in config.yaml (or 1).",
+        default=None,
+    )
+
+    add_trace_arguments(submit_parser)
+
     view_parser = subparsers.add_parser("view", help="View score history and test case details")
 
     view_parser.add_argument(
@@ -161,13 +453,85 @@ def main() -> None:
         default="desc",
     )
 
+    add_trace_arguments(view_parser)
+
+    delete_parser = subparsers.add_parser("delete", help="Delete a submission from the local leaderboard")
+
+    delete_parser.add_argument("id", help="Specify the submission Id to delete", type=positive_int)
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild", help="Recompute top scores, relative scores and ranks from all recorded scores"
+    )
+
+    rebuild_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report discrepancies between the recorded and recomputed values without rewriting them.",
+    )
+
+    subparsers.add_parser(
+        "serve", help="Keep the database connection and scorer workers in memory and serve submit/view requests"
+    )
+
+    subparsers.add_parser(
+        "status", help="Print the best submission and the rank of the latest submission in a single line"
+    )
+
+    return parser
+
+
+def main() -> None:
+    parser = create_parser()
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return
 
-    initial_dependencies = setup_initial_dependencies()
+    if args.command == "status":
+        handle_status()
+        return
+
+    # 常駐サーバーが起動している場合は、コマンドの実行をサーバーに任せる
+    if args.command in LeaderboardClient.FORWARDED_COMMANDS and LeaderboardClient(get_socket_path()).run(sys.argv[1:]):
+        return
+
+    from ahc_local_leaderboard.dependency_setup import setup_initial_dependencies
+
+    # 常駐サーバーは提出のたびにトップスコアを読み直さないよう、メモリに保持する
+    initial_dependencies = setup_initial_dependencies(cache_top_scores=args.command == "serve")
+    try:
+        run_command(parser, args, initial_dependencies)
+    finally:
+        # プロセス内で使い回したデータベース接続を閉じる
+        initial_dependencies["db_manager"].close()
+
+
+def run_command(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    initial_dependencies: "PrevDependencies",
+    dependency_cache: Optional["DependencyCache"] = None,
+) -> None:
+    """解析したコマンドライン引数に応じてコマンドを実行します。
+
+    'dependency_cache' を指定した場合は、常駐サーバーが保持している依存関係を使い回します。
+    """
+    from ahc_local_leaderboard.config import Config
+    from ahc_local_leaderboard.dependency_setup import (
+        setup_pahcer_test_file_processor,
+        setup_scoring_dependencies,
+    )
+    from ahc_local_leaderboard.models.test_file import TestFiles
+    from ahc_local_leaderboard.submit.test_file_processor import TestFilesProcessor
+    from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+    from ahc_local_leaderboard.utils.validator import (
+        DeleteValidator,
+        InitValidator,
+        SubmitValidator,
+        ViewValidator,
+    )
+
     if args.command == "setup":
         handle_setup(initial_dependencies)
         return
@@ -179,29 +543,46 @@ def main() -> None:
         ConsoleHandler.print_directive("local-leaderboard setup")
         return
 
-    config = Config(get_config_path())
+    if args.command == "serve":
+        handle_serve(parser, initial_dependencies)
+        return
 
-    dependencies = setup_scoring_dependencies(config, initial_dependencies)
+    if dependency_cache is None:
+        dependencies = setup_scoring_dependencies(Config(get_config_path()), initial_dependencies)
+    else:
+        dependencies = dependency_cache.get()
 
     if args.command == "submit":
 
-        test_files = TestFiles(get_root_dir() / "in", get_root_dir() / args.submit_file)
-        submit_validator = SubmitValidator(test_files)
-        if not submit_validator.validate(args):
-            submit_validator.print_errors()
-            return
+        test_files_list = [
+            TestFiles(get_root_dir() / "in", get_root_dir() / submit_dir)
+            for submit_dir in expand_submit_dirs(args.submit_file)
+        ]
+        for test_files in test_files_list:
+            submit_validator = SubmitValidator(test_files)
+            if not submit_validator.validate(args):
+                submit_validator.print_errors()
+                return
+
+        if args.jobs:
+            # 常駐サーバーが使い回す TestFilesProcessor の並列数は書き換えない
+            dependencies["test_files_processor"] = copy.copy(dependencies["test_files_processor"])
+            dependencies["test_files_processor"].max_workers = args.jobs
 
         if args.pahcer_directory:
+            if len(test_files_list) != 1:
+                ConsoleHandler.print_error("'--pahcer-directory' can only be used with a single submit directory.")
+                return
+
             pahcer_test_file_processor = setup_pahcer_test_file_processor(Path(args.pahcer_directory))
             assert pahcer_test_file_processor
-            dependencies["test_files_processor"] = TestFilesProcessor(pahcer_test_file_processor)
+            dependencies["test_files_processor"] = TestFilesProcessor(
+                pahcer_test_file_processor, dependencies["test_files_processor"].max_workers
+            )
 
         try:
-            dependencies["db_manager"].begin_transaction()
-            handle_submit(dependencies, test_files, args.skip_duplicate)
-            dependencies["db_manager"].commit()
+            run_handler(dependencies, args, lambda: handle_submit(dependencies, test_files_list, args.skip_duplicate))
         except Exception as e:
-            dependencies["db_manager"].rollback()
             ConsoleHandler.print_error(f"Faild to submit file: {e}")
 
     elif args.command == "view":
@@ -210,7 +591,22 @@ def main() -> None:
             view_validator.print_errors()
             return
 
-        handle_view(dependencies, args.limit, args.detail, args.sort_column, args.sort_order)
+        run_handler(
+            dependencies,
+            args,
+            lambda: handle_view(dependencies, args.limit, args.detail, args.sort_column, args.sort_order),
+        )
+
+    elif args.command == "delete":
+        delete_validator = DeleteValidator(dependencies["record_read_service"])
+        if not delete_validator.validate(args):
+            delete_validator.print_errors()
+            return
+
+        handle_delete(dependencies, args.id)
+
+    elif args.command == "rebuild":
+        handle_rebuild(dependencies, args.check)
 
     else:
         parser.print_help()
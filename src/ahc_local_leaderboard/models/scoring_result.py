@@ -0,0 +1,13 @@
+from typing import Optional
+
+
+class ScoringResult:
+    """単一のテストファイルのスコア計算結果を管理するクラス。"""
+
+    def __init__(self, score: Optional[int], error_message: Optional[str] = None) -> None:
+        self.score = score
+        self.error_message = error_message
+
+    def is_failed(self) -> bool:
+        """スコア計算自体が失敗した場合は True を返します。"""
+        return self.error_message is not None
@@ -1,3 +1,5 @@
+import bisect
+import itertools
 from datetime import datetime
 from typing import Iterator, Optional
 
@@ -96,6 +98,43 @@ class SummaryScoreRecords:
             record.relative_rank = relative_rank
             relative_rank += 1
 
+    @staticmethod
+    def get_rank_key(record: SummaryScoreRecord) -> tuple[int, int]:
+        """順位の並び順のキーを返します。相対スコアが同じ場合は、先に記録された（IDの小さい）レコードを上位とします。"""
+        return -record.total_relative_score, record.id
+
+    def update_relative_ranks_incrementally(self, moved_records: list[SummaryScoreRecord]) -> list[SummaryScoreRecord]:
+        """順位順に並んだ records に'moved_records'を挿入し直し、relative_rank が変わったレコードを順位順に返します。
+
+        'moved_records'には、相対スコアが変化したレコードと順位の付いていないレコードを指定します。
+        それ以外のレコードは並び順を保ったまま、挿入や削除によって順位がずれたものだけを更新します。
+        """
+        moved_ids = {record.id for record in moved_records}
+        first_changed_index = next(
+            (index for index, record in enumerate(self.records) if record.id in moved_ids), len(self.records)
+        )
+        self.records = [record for record in self.records if record.id not in moved_ids]
+
+        # データベースの順位が相対スコアと食い違っている場合は、二分探索できないので並べ直す
+        if any(
+            self.get_rank_key(record) > self.get_rank_key(next_record)
+            for record, next_record in itertools.pairwise(self.records)
+        ):
+            self.records.sort(key=self.get_rank_key)
+            first_changed_index = 0
+
+        for record in moved_records:
+            index = bisect.bisect_right(self.records, self.get_rank_key(record), key=self.get_rank_key)
+            self.records.insert(index, record)
+            first_changed_index = min(first_changed_index, index)
+
+        changed_records = []
+        for relative_rank, record in enumerate(self.records[first_changed_index:], first_changed_index + 1):
+            if record.relative_rank != relative_rank:
+                record.relative_rank = relative_rank
+                changed_records.append(record)
+        return changed_records
+
     def get_latest_record(self) -> SummaryScoreRecord:
         """submission_time が最も新しい record を返す。"""
         assert len(self.records) != 0
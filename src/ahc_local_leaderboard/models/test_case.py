@@ -1,5 +1,6 @@
+import hashlib
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Iterable, Iterator, Optional
 
 
 class TestCase:
@@ -7,10 +8,13 @@ class TestCase:
 
     __test__ = False  # pytest によるテスト収集を無効化
 
-    def __init__(self, file_name: str, score: Optional[int], submit_file_path: Path) -> None:
+    def __init__(
+        self, file_name: str, score: Optional[int], submit_file_path: Path, error_message: Optional[str] = None
+    ) -> None:
         self.file_name = file_name
         self.score = score
         self.submit_file_path = submit_file_path
+        self.error_message = error_message
 
 
 class TestCases:
@@ -35,5 +39,27 @@ class TestCases:
         """指定されたファイル名とスコアを持つテストケースが含まれている場合はTrueを返します。"""
         return any(file_name == tc.file_name and score == tc.score for tc in self.test_cases)
 
+    @staticmethod
+    def generate_fingerprint(scores: Iterable[tuple[str, Optional[int]]]) -> str:
+        """テストケース名とスコアの組をテストケース名順に並べたもののハッシュ値を返します。"""
+        digest = hashlib.sha256()
+        for file_name, score in sorted(scores, key=lambda item: item[0]):
+            digest.update(f"{file_name}\0{'' if score is None else score}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def calculate_fingerprint(self) -> str:
+        """提出内容を識別するハッシュ値を返します。同じテストケースに同じスコアを持つ提出は同じ値になります。"""
+        return self.generate_fingerprint((tc.file_name, tc.score) for tc in self.test_cases)
+
+    def get_submit_dir(self) -> Optional[Path]:
+        """提出ファイルが置かれているディレクトリを返します。テストケースがない場合は None を返します。"""
+        if not self.test_cases:
+            return None
+        return self.test_cases[0].submit_file_path.parent
+
+    def fetch_failed_test_cases(self) -> list[TestCase]:
+        """スコア計算に失敗したテストケースを返します。"""
+        return [tc for tc in self.test_cases if tc.error_message is not None]
+
     def __iter__(self) -> Iterator[TestCase]:
         return iter(self.test_cases)
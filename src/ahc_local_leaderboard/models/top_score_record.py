@@ -0,0 +1,15 @@
+from typing import Optional
+
+
+class TopScoreRecord:
+    """テストケースごとのトップスコア、その直前のトップスコア、およびトップスコアを記録した提出を管理するクラス。"""
+
+    def __init__(
+        self, file_name: str, top_score: Optional[int], second_top_score: Optional[int], submission_id: int
+    ) -> None:
+        assert 0 < submission_id
+
+        self.file_name = file_name
+        self.top_score = top_score
+        self.second_top_score = second_top_score
+        self.submission_id = submission_id
@@ -0,0 +1,133 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, TypedDict
+
+
+class TraceEvent(TypedDict):
+    """計測した処理1回分の記録を定義する型。"""
+
+    name: str
+    kind: str
+    start: float
+    elapsed: float
+    queries: int
+    depth: int
+    thread: str
+
+
+class OpenStage:
+    """計測中の処理1回分の、実行した SQL の数を保持するクラス。"""
+
+    def __init__(self) -> None:
+        self.query_count = 0
+
+
+class StageTracer:
+    """submit や view の処理の段階ごとに、経過時間と実行した SQL の数を記録するクラス。
+
+    既定では無効で、start() を呼び出すまで stage() は何も記録しません。
+    SQL の数は、同じスレッドで計測中の処理すべてに数えるため、外側の処理の値は内側の処理の値を含みます。
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.start_time = 0.0
+        self.events: list[TraceEvent] = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.instrumented_methods: list[tuple[object, str]] = []
+
+    def get_open_stages(self) -> list[OpenStage]:
+        """現在のスレッドで計測中の処理を返します。"""
+        if not hasattr(self.local, "open_stages"):
+            self.local.open_stages = []
+        open_stages: list[OpenStage] = self.local.open_stages
+        return open_stages
+
+    def start(self) -> None:
+        """これまでの記録を消去して計測を開始します。"""
+        with self.lock:
+            self.events = []
+        self.start_time = time.perf_counter()
+        self.enabled = True
+
+    def stop(self) -> list[TraceEvent]:
+        """計測を終了し、instrument() で置き換えたメソッドを元に戻して、記録した処理を開始順に返します。"""
+        self.enabled = False
+        for target, method_name in self.instrumented_methods:
+            delattr(target, method_name)
+        self.instrumented_methods = []
+
+        with self.lock:
+            return sorted(self.events, key=lambda event: event["start"])
+
+    @contextmanager
+    def stage(self, name: str, kind: str = "stage") -> Iterator[None]:
+        """with 文で囲んだ処理の経過時間と、その間に実行した SQL の数を記録します。"""
+        if not self.enabled:
+            yield
+            return
+
+        open_stages = self.get_open_stages()
+        open_stage = OpenStage()
+        depth = len(open_stages)
+        open_stages.append(open_stage)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            # asyncio のタスクが並行して計測している場合は、末尾の処理から終わるとは限らない
+            open_stages.remove(open_stage)
+            event: TraceEvent = {
+                "name": name,
+                "kind": kind,
+                "start": start_time - self.start_time,
+                "elapsed": elapsed,
+                "queries": open_stage.query_count,
+                "depth": depth,
+                "thread": threading.current_thread().name,
+            }
+            with self.lock:
+                self.events.append(event)
+
+    def count_query(self, statement: str) -> None:
+        """sqlite3 のトレースコールバックとして、実行された SQL を計測中の処理に数えます。"""
+        for open_stage in self.get_open_stages():
+            open_stage.query_count += 1
+
+    def trace_method(self, name: str, kind: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        """呼び出しごとに'name'の処理として記録するよう、'method'を包んだ関数を返します。"""
+
+        @wraps(method)
+        def traced_method(*args: Any, **kwargs: Any) -> Any:
+            with self.stage(name, kind):
+                return method(*args, **kwargs)
+
+        return traced_method
+
+    def instrument(self, target: object, kind: str) -> None:
+        """'target'の公開メソッドを、stop() まで呼び出しごとに記録するものに置き換えます。
+
+        置き換えはインスタンスの属性で行うため、同じクラスの他のインスタンスには影響しません。
+        """
+        for method_name in dir(type(target)):
+            if method_name.startswith("_") or method_name in vars(target):
+                continue
+
+            method = getattr(target, method_name)
+            if not callable(method):
+                continue
+
+            setattr(target, method_name, self.trace_method(f"{type(target).__name__}.{method_name}", kind, method))
+            self.instrumented_methods.append((target, method_name))
+
+
+STAGE_TRACER = StageTracer()
+
+
+def get_stage_tracer() -> StageTracer:
+    """プロセス全体で共有する StageTracer を返します。"""
+    return STAGE_TRACER
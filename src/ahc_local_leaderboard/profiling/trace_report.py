@@ -0,0 +1,52 @@
+import json
+from pathlib import Path
+from typing import TypedDict
+
+from ahc_local_leaderboard.profiling.stage_tracer import TraceEvent
+
+
+class TraceSummary(TypedDict):
+    """同じ名前の処理を集計した結果（秒）を定義する型。"""
+
+    name: str
+    kind: str
+    calls: int
+    total: float
+    max: float
+    queries: int
+
+
+class TraceReport:
+    """StageTracer が記録した処理を JSON Lines 形式で書き出し、処理ごとに集計するクラス。"""
+
+    def __init__(self, events: list[TraceEvent]) -> None:
+        self.events = events
+
+    def write(self, trace_path: Path) -> None:
+        """記録した処理を1行に1件ずつ JSON で書き出します。"""
+        with open(trace_path, "w", encoding="utf-8") as file:
+            for event in self.events:
+                file.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    def summarize(self) -> list[TraceSummary]:
+        """記録した処理を種類と名前ごとに集計し、合計時間の長い順に返します。"""
+        summaries: dict[tuple[str, str], TraceSummary] = {}
+        for event in self.events:
+            key = (event["kind"], event["name"])
+            if key not in summaries:
+                summaries[key] = {
+                    "name": event["name"],
+                    "kind": event["kind"],
+                    "calls": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "queries": 0,
+                }
+
+            summary = summaries[key]
+            summary["calls"] += 1
+            summary["total"] += event["elapsed"]
+            summary["max"] = max(summary["max"], event["elapsed"])
+            summary["queries"] += event["queries"]
+
+        return sorted(summaries.values(), key=lambda summary: summary["total"], reverse=True)
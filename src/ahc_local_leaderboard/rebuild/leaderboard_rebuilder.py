@@ -0,0 +1,258 @@
+import importlib.util
+import itertools
+from typing import Any, Optional
+
+from ahc_local_leaderboard.database.record_read_service import RecordReadService
+from ahc_local_leaderboard.database.record_write_service import RecordWriteService
+from ahc_local_leaderboard.database.score_vector import ScoreVector
+from ahc_local_leaderboard.models.summary_score_record import (
+    SummaryScoreRecord,
+    SummaryScoreRecords,
+)
+from ahc_local_leaderboard.models.top_score_record import TopScoreRecord
+from ahc_local_leaderboard.utils.relative_score_calculater import (
+    RelativeScoreCalculaterInterface,
+)
+
+# NumPy は読み込みに時間がかかるため、rebuild などで行列を作る時点で読み込む
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class LeaderboardRebuilder:
+    """記録されたすべてのスコアから、トップスコアと各提出の相対スコア・順位を計算し直すクラス。
+
+    提出ごとの差分更新で生じたずれや、config.yaml の scoring_type の変更を反映するために用います。
+    NumPy がインストールされている場合は、全提出のスコアを (提出数 × テストケース数) の行列として一括で計算します。
+    """
+
+    # test_cases テーブルから一度に読み込む行数。全行をタプルのリストとして保持しないよう、この行数ずつ処理する
+    SCORE_ROW_CHUNK_SIZE = 65536
+
+    def __init__(
+        self,
+        record_read_service: RecordReadService,
+        record_write_service: RecordWriteService,
+        relative_score_calculator: RelativeScoreCalculaterInterface,
+    ) -> None:
+        self.record_read_service = record_read_service
+        self.record_write_service = record_write_service
+        self.relative_score_calculator = relative_score_calculator
+
+    def recompute(self) -> tuple[list[SummaryScoreRecord], list[TopScoreRecord]]:
+        """全提出の概要レコードとトップスコアを計算し直して返します。データベースは更新しません。"""
+        stored_records = sorted(self.record_read_service.fetch_all_summary_records(), key=lambda record: record.id)
+        submission_ids = [record.id for record in stored_records]
+        case_names = self.record_read_service.fetch_case_names()
+
+        if not submission_ids:
+            return [], []
+        if HAS_NUMPY:
+            totals, top_scores = self.recompute_with_numpy(submission_ids, case_names)
+        else:
+            totals, top_scores = self.recompute_with_python(submission_ids, case_names)
+
+        summary_records = [
+            SummaryScoreRecord(record.id, record.submission_time, *total, None)
+            for record, total in zip(stored_records, totals)
+        ]
+        # 提出ID順に並べてから順位を付け、差分更新と同じく同点の場合は先の提出を上位にする
+        SummaryScoreRecords(summary_records).update_relative_ranks()
+        summary_records.sort(key=lambda record: record.id)
+
+        return summary_records, top_scores
+
+    def build_score_matrix(self, submission_ids: list[int], case_count: int) -> Any:
+        """全提出のスコアを ScoreVector と同じ符号化で並べた (提出数 × テストケース数) の行列を作成します。"""
+        import numpy
+
+        matrix = numpy.full((len(submission_ids), case_count), ScoreVector.MISSING, dtype=numpy.int64)
+
+        sorted_submission_ids = numpy.asarray(submission_ids, dtype=numpy.int64)
+        for score_rows in self.record_read_service.iterate_score_row_chunks(self.SCORE_ROW_CHUNK_SIZE):
+            # 行ごとの配列を作らず、平坦化した値から (行数 × 3) の配列を直接作る
+            values = numpy.fromiter(
+                itertools.chain.from_iterable(score_rows), dtype=numpy.int64, count=3 * len(score_rows)
+            ).reshape(-1, 3)
+            row_indices = numpy.searchsorted(sorted_submission_ids, values[:, 0])
+            matrix[row_indices, values[:, 1] - 1] = values[:, 2]
+
+        row_index_by_id = {submission_id: index for index, submission_id in enumerate(submission_ids)}
+        for submission_id, score_vector in self.record_read_service.fetch_all_score_vectors().items():
+            vector = numpy.frombuffer(score_vector, dtype="<i8")
+            matrix[row_index_by_id[submission_id], : len(vector)] = vector
+
+        return matrix
+
+    def recompute_with_numpy(
+        self, submission_ids: list[int], case_names: dict[int, str]
+    ) -> tuple[list[tuple[int, int, int]], list[TopScoreRecord]]:
+        """スコア行列に対する一括演算で、提出ごとの集計値とトップスコアを計算します。"""
+        import numpy
+
+        calculator = self.relative_score_calculator
+        matrix = self.build_score_matrix(submission_ids, max(case_names, default=0))
+        submission_count, case_count = matrix.shape
+
+        present = matrix != ScoreVector.MISSING
+        valid = matrix > ScoreVector.INVALID
+        # 優れたスコアほど大きくなるキーに変換し、無効なスコアは最小値にする
+        direction = 1 if calculator.is_better_score(2, 1) else -1
+        keys = numpy.where(valid, matrix * direction, numpy.iinfo(numpy.int64).min)
+
+        # 同点の場合は先に記録した提出がトップスコアを保持する
+        best_indices = keys.argmax(axis=0)
+        has_valid = valid.any(axis=0)
+        columns = numpy.arange(case_count)
+        top_values = matrix[best_indices, columns]
+        # 有効なスコアが1つもない場合は、そのテストケースを含む最後の提出がトップスコアを保持する
+        last_present_indices = submission_count - 1 - present[::-1].argmax(axis=0)
+        holder_indices = numpy.where(has_valid, best_indices, last_present_indices)
+
+        # 直前のトップスコアは、トップスコアを記録した提出より前の提出の中で最も優れたスコア
+        earlier_valid = valid & (numpy.arange(submission_count)[:, None] < holder_indices[None, :])
+        second_indices = numpy.where(earlier_valid, keys, numpy.iinfo(numpy.int64).min).argmax(axis=0)
+        has_second = earlier_valid.any(axis=0)
+        second_values = matrix[second_indices, columns]
+
+        ratios = calculator.score_ratio(numpy.where(valid, matrix, 1), numpy.where(has_valid, top_values, 1))
+        relative_scores = numpy.rint(calculator.MAX_SCORE * ratios).astype(numpy.int64)
+        relative_scores = numpy.where(valid, relative_scores, calculator.MIN_SCORE)
+        relative_scores = numpy.where(has_valid, relative_scores, calculator.MAX_SCORE)
+        relative_scores = numpy.where(present, relative_scores, 0)
+
+        totals = list(
+            zip(
+                numpy.where(valid, matrix, 0).sum(axis=1).tolist(),
+                relative_scores.sum(axis=1).tolist(),
+                (matrix == ScoreVector.INVALID).sum(axis=1).tolist(),
+            )
+        )
+
+        top_scores = [
+            TopScoreRecord(
+                case_names[case_index + 1],
+                top_value if valid_top else None,
+                second_value if valid_second else None,
+                submission_ids[holder_index],
+            )
+            for case_index, top_value, valid_top, second_value, valid_second, holder_index, has_present in zip(
+                range(case_count),
+                top_values.tolist(),
+                has_valid.tolist(),
+                second_values.tolist(),
+                has_second.tolist(),
+                holder_indices.tolist(),
+                present.any(axis=0).tolist(),
+            )
+            if has_present and case_index + 1 in case_names
+        ]
+        return totals, top_scores
+
+    def recompute_with_python(
+        self, submission_ids: list[int], case_names: dict[int, str]
+    ) -> tuple[list[tuple[int, int, int]], list[TopScoreRecord]]:
+        """NumPy を使わずに、提出を順に処理して提出ごとの集計値とトップスコアを計算します。"""
+        calculator = self.relative_score_calculator
+        scores: dict[int, dict[int, Optional[int]]] = {submission_id: {} for submission_id in submission_ids}
+        for score_rows in self.record_read_service.iterate_score_row_chunks(self.SCORE_ROW_CHUNK_SIZE):
+            for submission_id, case_id, encoded_score in score_rows:
+                scores[submission_id][case_id] = ScoreVector.decode_score(encoded_score)
+        for submission_id, score_vector in self.record_read_service.fetch_all_score_vectors().items():
+            scores[submission_id].update(ScoreVector.unpack(score_vector))
+
+        # 提出を記録順に処理し、提出時と同じ規則でトップスコアを更新する
+        top_scores: dict[int, TopScoreRecord] = {}
+        for submission_id in submission_ids:
+            for case_id, score in scores[submission_id].items():
+                top_score = top_scores.get(case_id)
+                if top_score is None:
+                    top_scores[case_id] = TopScoreRecord(case_names[case_id], score, None, submission_id)
+                elif calculator.is_better_score(score, top_score.top_score):
+                    top_scores[case_id] = TopScoreRecord(
+                        case_names[case_id], score, top_score.top_score, submission_id
+                    )
+
+        totals = []
+        for submission_id in submission_ids:
+            case_scores = scores[submission_id]
+            totals.append(
+                (
+                    sum(score for score in case_scores.values() if score is not None),
+                    sum(calculator(score, top_scores[case_id].top_score) for case_id, score in case_scores.items()),
+                    sum(1 for score in case_scores.values() if score is None),
+                )
+            )
+
+        return totals, [top_scores[case_id] for case_id in sorted(top_scores)]
+
+    def find_discrepancies(
+        self, summary_records: list[SummaryScoreRecord], top_scores: list[TopScoreRecord]
+    ) -> list[str]:
+        """計算し直した内容とデータベースに記録されている内容の差異を説明する文字列のリストを返します。
+
+        直前のトップスコアは提出をまとめて記録したかどうかで変わるため、比較の対象にしません。
+        """
+        discrepancies: list[str] = []
+
+        stored_records = {record.id: record for record in self.record_read_service.fetch_all_summary_records()}
+        for record in summary_records:
+            stored_record = stored_records[record.id]
+            differences = [
+                f"{name} {stored_value} -> {value}"
+                for name, stored_value, value in [
+                    ("total_absolute_score", stored_record.total_absolute_score, record.total_absolute_score),
+                    ("total_relative_score", stored_record.total_relative_score, record.total_relative_score),
+                    ("invalid_score_count", stored_record.invalid_score_count, record.invalid_score_count),
+                    ("relative_rank", stored_record.relative_rank, record.relative_rank),
+                ]
+                if stored_value != value
+            ]
+            if differences:
+                discrepancies.append(f"Submission {record.id}: {', '.join(differences)}")
+
+        stored_top_scores = {record.file_name: record for record in self.record_read_service.fetch_top_score_records()}
+        for top_score in top_scores:
+            stored_top_score = stored_top_scores.pop(top_score.file_name, None)
+            if stored_top_score is None:
+                discrepancies.append(f"Top score of {top_score.file_name}: missing")
+            elif (stored_top_score.top_score, stored_top_score.submission_id) != (
+                top_score.top_score,
+                top_score.submission_id,
+            ):
+                discrepancies.append(
+                    f"Top score of {top_score.file_name}: "
+                    f"{stored_top_score.top_score} (id {stored_top_score.submission_id}) -> "
+                    f"{top_score.top_score} (id {top_score.submission_id})"
+                )
+        for file_name in sorted(stored_top_scores):
+            discrepancies.append(f"Top score of {file_name}: not recorded by any submission")
+
+        return discrepancies
+
+    def is_materialized(self) -> bool:
+        """記録されている相対スコアと順位が、すべての提出を反映しているかを返します。"""
+        epoch, materialized_epoch = self.record_read_service.fetch_relative_score_epochs()
+        return epoch == materialized_epoch
+
+    def check(self) -> list[str]:
+        """データベースを更新せずに、記録されている内容と計算し直した内容の差異を返します。
+
+        相対スコアの遅延計算により相対スコアと順位が未反映の場合は、トップスコアのみを比較します。
+        """
+        summary_records, top_scores = self.recompute()
+        if not self.is_materialized():
+            summary_records = []
+        return self.find_discrepancies(summary_records, top_scores)
+
+    def rebuild(self) -> list[str]:
+        """計算し直した内容でトップスコアと全提出の概要レコードを書き換え、修正した差異を返します。"""
+        epoch, materialized_epoch = self.record_read_service.fetch_relative_score_epochs()
+        summary_records, top_scores = self.recompute()
+        # 未反映の相対スコアと順位は、ずれではないため差異として報告しない
+        discrepancies = self.find_discrepancies(summary_records if epoch == materialized_epoch else [], top_scores)
+
+        self.record_write_service.replace_top_scores(top_scores)
+        self.record_write_service.update_score_histories(summary_records)
+        self.record_write_service.update_materialized_epoch(epoch)
+
+        return discrepancies
@@ -0,0 +1,59 @@
+from ahc_local_leaderboard.database.database_manager import DatabaseManager
+from ahc_local_leaderboard.database.record_read_service import RecordReadService
+from ahc_local_leaderboard.database.record_write_service import RecordWriteService
+from ahc_local_leaderboard.rebuild.leaderboard_rebuilder import LeaderboardRebuilder
+
+
+class RelativeScoreMaterializer:
+    """相対スコアの遅延計算で未反映となった各提出の相対スコアと順位を、必要になった時点でまとめて計算し直すクラス。
+
+    提出のたびに epoch を進め、計算し直した時点の epoch と一致している間は記録済みの値をそのまま使います。
+    """
+
+    def __init__(
+        self,
+        database_manager: DatabaseManager,
+        record_read_service: RecordReadService,
+        record_write_service: RecordWriteService,
+        leaderboard_rebuilder: LeaderboardRebuilder,
+    ) -> None:
+        self.database_manager = database_manager
+        self.record_read_service = record_read_service
+        self.record_write_service = record_write_service
+        self.leaderboard_rebuilder = leaderboard_rebuilder
+
+    def invalidate(self) -> None:
+        """記録されている相対スコアと順位を、次に必要になった時点で計算し直すようにします。"""
+        self.record_write_service.increment_relative_score_epoch()
+
+    def materialize(self) -> bool:
+        """相対スコアと順位が未反映であれば計算し直して記録し、計算し直したかどうかを返します。"""
+        if self.leaderboard_rebuilder.is_materialized():
+            return False
+
+        self.database_manager.begin_transaction()
+        try:
+            self.write_materialized_records()
+            self.database_manager.commit()
+        except Exception:
+            self.database_manager.rollback()
+            raise
+        return True
+
+    def write_materialized_records(self) -> None:
+        """全提出の相対スコアと順位を計算し直し、変化した概要レコードと現在の epoch を記録します。"""
+        epoch, _ = self.record_read_service.fetch_relative_score_epochs()
+        stored_states = {
+            record.id: (record.total_relative_score, record.relative_rank)
+            for record in self.record_read_service.fetch_all_summary_records()
+        }
+
+        summary_records, _ = self.leaderboard_rebuilder.recompute()
+        self.record_write_service.update_score_histories(
+            [
+                record
+                for record in summary_records
+                if stored_states.get(record.id) != (record.total_relative_score, record.relative_rank)
+            ]
+        )
+        self.record_write_service.update_materialized_epoch(epoch)
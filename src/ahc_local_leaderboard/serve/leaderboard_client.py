@@ -0,0 +1,69 @@
+import codecs
+import json
+import shutil
+import socket
+import sys
+from pathlib import Path
+from typing import Optional
+
+
+class LeaderboardClient:
+    """常駐サーバーにコマンドを送信し、その出力をそのまま表示するクラス。
+
+    サーバーに接続できない場合は何もせず、呼び出し元でコマンドを実行します。
+    起動を速くするため、標準ライブラリ以外は読み込みません。
+    """
+
+    # 常駐サーバーに実行させるコマンド
+    FORWARDED_COMMANDS = ["submit", "view"]
+
+    RECEIVE_BUFFER_SIZE = 65536
+
+    def __init__(self, socket_path: Path) -> None:
+        self.socket_path = socket_path
+
+    def connect(self) -> Optional[socket.socket]:
+        """常駐サーバーに接続します。サーバーが起動していない場合は None を返します。"""
+        if not hasattr(socket, "AF_UNIX") or not self.socket_path.exists():
+            return None
+
+        client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client_socket.connect(str(self.socket_path))
+        except OSError:
+            # 異常終了したサーバーのソケットファイルが残っている場合
+            client_socket.close()
+            return None
+        return client_socket
+
+    def create_request(self, argv: list[str]) -> bytes:
+        """コマンドライン引数と、出力の表示に必要な端末の情報をリクエストとして符号化します。"""
+        request = {
+            "argv": argv,
+            "cwd": str(Path.cwd()),
+            "is_terminal": sys.stdout.isatty(),
+            "width": shutil.get_terminal_size().columns,
+        }
+        return json.dumps(request).encode("utf-8") + b"\n"
+
+    def run(self, argv: list[str]) -> bool:
+        """常駐サーバーにコマンドを実行させ、出力を表示します。サーバーに接続できなかった場合は False を返します。"""
+        # 同じプロセス内のサーバーが sys.stdout を差し替えても影響を受けないよう、出力先は接続前に決める
+        output = sys.stdout
+        client_socket = self.connect()
+        if client_socket is None:
+            return False
+
+        with client_socket:
+            client_socket.sendall(self.create_request(argv))
+
+            # サーバーは出力を逐次送信し、コマンドが終了したら接続を閉じる
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            while True:
+                chunk = client_socket.recv(self.RECEIVE_BUFFER_SIZE)
+                output.write(decoder.decode(chunk, final=not chunk))
+                output.flush()
+                if not chunk:
+                    break
+
+        return True
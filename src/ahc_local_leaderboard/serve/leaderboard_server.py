@@ -0,0 +1,135 @@
+import contextlib
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+import rich
+
+from ahc_local_leaderboard.consts import get_root_dir
+from ahc_local_leaderboard.serve.leaderboard_client import LeaderboardClient
+from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+
+
+class ServerAlreadyRunningError(Exception):
+    """同じソケットで既に常駐サーバーが起動していることを表す例外。"""
+
+    pass
+
+
+class LeaderboardServer:
+    """Unix ソケットでコマンドを受け付け、起動時に生成した依存関係を使い回して実行するクラス。
+
+    リクエストはコマンドライン引数などを JSON で表した1行で、レスポンスはコマンドの出力です。
+    コマンドは1つずつ順に実行するため、データベースへの書き込みが重なることはありません。
+    """
+
+    MAX_REQUEST_SIZE = 1 << 20
+
+    # 他のユーザーがコマンドを実行できないよう、ソケットファイルは所有者のみが読み書きできるようにする
+    SOCKET_UMASK = 0o177
+
+    def __init__(self, socket_path: Path, command_executor: Callable[[list[str]], None]) -> None:
+        self.socket_path = socket_path
+        self.command_executor = command_executor
+        self.server_socket: Optional[socket.socket] = None
+
+    def start(self) -> None:
+        """ソケットファイルを作成して接続の待ち受けを開始します。"""
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not supported on this platform.")
+
+        if self.socket_path.exists():
+            client_socket = LeaderboardClient(self.socket_path).connect()
+            if client_socket is not None:
+                client_socket.close()
+                raise ServerAlreadyRunningError(f"A server is already running on {self.socket_path}")
+            # 異常終了したサーバーのソケットファイルは削除して作り直す
+            self.socket_path.unlink()
+
+        server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # bind() の後に chmod すると他のユーザーが接続できる時間ができるため、作成時の umask で権限を決める
+        umask = os.umask(self.SOCKET_UMASK)
+        try:
+            server_socket.bind(str(self.socket_path))
+            server_socket.listen()
+        except OSError:
+            server_socket.close()
+            raise
+        finally:
+            os.umask(umask)
+        self.server_socket = server_socket
+
+    def close(self) -> None:
+        """待ち受けを終了し、ソケットファイルを削除します。"""
+        if self.server_socket is not None:
+            self.server_socket.close()
+            self.server_socket = None
+            self.socket_path.unlink(missing_ok=True)
+
+    def handle_next_connection(self) -> None:
+        """次の接続を受け付け、リクエストされたコマンドを実行します。"""
+        assert self.server_socket is not None
+
+        connection, _ = self.server_socket.accept()
+        try:
+            with connection, connection.makefile("rb") as reader, connection.makefile(
+                "w", encoding="utf-8", errors="replace"
+            ) as stream:
+                try:
+                    self.execute_request(
+                        self.parse_request(reader.readline(self.MAX_REQUEST_SIZE)),
+                        stream,
+                    )
+                except (BrokenPipeError, ConnectionResetError):
+                    raise
+                except Exception as e:
+                    ConsoleHandler.print_error(f"Failed to handle a request: {type(e).__name__}: {e}")
+                    stream.write(f"Error: the server failed to handle the request: {e}\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # クライアントが Ctrl-C などで切断した場合は、次の接続を待つ
+            pass
+
+    @staticmethod
+    def parse_request(line: bytes) -> dict[str, Any]:
+        """リクエストの1行を解析します。"""
+        request = json.loads(line.decode("utf-8"))
+        if not isinstance(request, dict) or not isinstance(request.get("argv"), list):
+            raise ValueError(f"Invalid request: {line!r}")
+        return request
+
+    def execute_request(self, request: dict[str, Any], stream: TextIO) -> None:
+        """リクエストされたコマンドを、出力をクライアントに送りながら実行します。"""
+        argv = [str(arg) for arg in request["argv"]]
+        if not argv or argv[0] not in LeaderboardClient.FORWARDED_COMMANDS:
+            stream.write(f"Error: the server cannot run this command: {' '.join(argv)}\n")
+            return
+
+        # 相対パスで指定されたディレクトリは、サーバーのルートディレクトリからのパスとして解釈される
+        if Path(str(request.get("cwd"))).resolve() != get_root_dir().resolve():
+            stream.write(f"Error: the server is serving a different directory: {get_root_dir()}\n")
+            return
+
+        with self.redirect_output(stream, bool(request.get("is_terminal")), int(request.get("width") or 80)):
+            try:
+                self.command_executor(argv)
+            except SystemExit:
+                # argparse の引数エラーなどでサーバーを終了させない
+                pass
+
+    @staticmethod
+    @contextlib.contextmanager
+    def redirect_output(stream: TextIO, is_terminal: bool, width: int) -> Iterator[None]:
+        """コンソールへの出力を、クライアントの端末に合わせてクライアントに送るようにします。"""
+        console = ConsoleHandler.console
+        # 進捗バーは rich のグローバルなコンソールに出力される
+        rich.reconfigure(file=stream, force_terminal=is_terminal, width=width)
+        ConsoleHandler.console = rich.get_console()
+        try:
+            with contextlib.redirect_stdout(stream), contextlib.redirect_stderr(stream):
+                yield
+        finally:
+            rich.reconfigure()
+            ConsoleHandler.console = console
+            stream.flush()
@@ -0,0 +1,109 @@
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+from ahc_local_leaderboard.status.status_snapshot import (
+    StatusSnapshot,
+    StatusSnapshotFile,
+)
+
+# 提出数、ベストの提出 (ID, 相対スコアの合計, 絶対スコアの合計)、最新の提出 (ID, 順位)、順位が最新かどうか
+StatusValues = tuple[int, Optional[tuple[int, int, int]], Optional[tuple[int, Optional[int]]], bool]
+
+
+class LeaderboardStatus:
+    """ベストの提出と最新の提出の順位を、シェルのプロンプトなどに表示できる1行にまとめるクラス。
+
+    起動を速くするため、rich やリポジトリのクラスは読み込みません。
+    スナップショットがあればそれを読み、なければ sqlite3 で直接データベースを参照します。
+    """
+
+    def __init__(self, database_path: Path, snapshot_path: Optional[Path] = None) -> None:
+        self.database_path = database_path
+        self.snapshot_path = snapshot_path
+
+    @staticmethod
+    def fetch_best_submission(conn: sqlite3.Connection) -> Optional[tuple[int, int, int]]:
+        """順位が1位の提出の ID、相対スコアの合計、絶対スコアの合計を返します。"""
+        cursor = conn.execute(
+            """
+            SELECT id, total_relative_score, total_absolute_score
+            FROM score_history
+            WHERE relative_rank = 1
+            """
+        )
+        best_submission: Optional[tuple[int, int, int]] = cursor.fetchone()
+        return best_submission
+
+    @staticmethod
+    def fetch_latest_submission(conn: sqlite3.Connection) -> Optional[tuple[int, Optional[int]]]:
+        """最新の提出の ID と順位を返します。"""
+        cursor = conn.execute("SELECT id, relative_rank FROM score_history ORDER BY submission_time DESC LIMIT 1")
+        latest_submission: Optional[tuple[int, Optional[int]]] = cursor.fetchone()
+        return latest_submission
+
+    @staticmethod
+    def is_materialized(conn: sqlite3.Connection) -> bool:
+        """相対スコアの遅延計算で、順位に未反映の提出が残っていないかを返します。"""
+        try:
+            epoch, materialized_epoch = conn.execute(
+                "SELECT epoch, materialized_epoch FROM relative_score_state WHERE id = 1"
+            ).fetchone()
+        except (sqlite3.OperationalError, TypeError):
+            # 遅延計算に対応する前のデータベースでは、順位は常に最新
+            return True
+        return bool(epoch == materialized_epoch)
+
+    def read_database(self) -> StatusValues:
+        """データベースから表示する値を読み取ります。"""
+        conn = sqlite3.connect(self.database_path)
+        try:
+            submission_count = conn.execute("SELECT COUNT(*) FROM score_history").fetchone()[0]
+            return (
+                submission_count,
+                self.fetch_best_submission(conn),
+                self.fetch_latest_submission(conn),
+                self.is_materialized(conn),
+            )
+        finally:
+            conn.close()
+
+    @staticmethod
+    def read_snapshot(snapshot: StatusSnapshot) -> StatusValues:
+        """スナップショットから表示する値を読み取ります。"""
+        ranking = snapshot["ranking"]
+        best_submission = None
+        if ranking and ranking[0]["relative_rank"] == 1:
+            best_submission = (
+                ranking[0]["id"],
+                ranking[0]["total_relative_score"],
+                ranking[0]["total_absolute_score"],
+            )
+
+        latest_id = snapshot["latest_id"]
+        latest_submission = None if latest_id is None else (latest_id, snapshot["latest_rank"])
+
+        return snapshot["submission_count"], best_submission, latest_submission, snapshot["is_materialized"]
+
+    def format_status(self) -> str:
+        """ベストの提出と最新の提出の順位を1行の文字列にします。"""
+        snapshot = None if self.snapshot_path is None else StatusSnapshotFile(self.snapshot_path).load()
+        if snapshot is None:
+            submission_count, best_submission, latest_submission, is_materialized = self.read_database()
+        else:
+            submission_count, best_submission, latest_submission, is_materialized = self.read_snapshot(snapshot)
+
+        if latest_submission is None:
+            return "No submissions"
+
+        latest_id, latest_rank = latest_submission
+        latest_text = f"Latest: #{latest_id} rank {'-' if latest_rank is None else latest_rank}/{submission_count}"
+        if not is_materialized:
+            # view コマンドで表示するまで、順位は最新の提出を反映していない
+            latest_text += " (not ranked yet)"
+
+        if best_submission is None:
+            return latest_text
+
+        best_id, total_relative_score, total_absolute_score = best_submission
+        return f"Best: #{best_id} (relative {total_relative_score}, absolute {total_absolute_score}) | {latest_text}"
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, TypedDict, cast
+
+
+class SummarySnapshot(TypedDict):
+    """スナップショットに含める提出の概要を定義する型。"""
+
+    id: int
+    submission_time: str
+    total_absolute_score: int
+    total_relative_score: int
+    invalid_score_count: int
+    relative_rank: Optional[int]
+
+
+class TopSummarySnapshot(TypedDict):
+    """スナップショットに含めるトップスコアの集計値を定義する型。"""
+
+    total_absolute_score: int
+    total_relative_score: int
+    invalid_score_count: int
+
+
+class StatusSnapshot(TypedDict):
+    """順位表の状況をまとめたスナップショットを定義する型。"""
+
+    version: int
+    submission_count: int
+    latest_id: Optional[int]
+    latest_rank: Optional[int]
+    is_materialized: bool
+    top_summary: TopSummarySnapshot
+    ranking: list[SummarySnapshot]
+
+
+class StatusSnapshotFile:
+    """順位表の状況をまとめたスナップショットを JSON ファイルとして読み書きするクラス。
+
+    SQLite を開かずに読み取れるよう、データベースへの書き込みをコミットするたびに書き直されます。
+    書き込み中のトランザクションがある間はファイルを削除しておき、読み取る側はデータベースを参照します。
+    """
+
+    VERSION = 1
+
+    def __init__(self, snapshot_path: Path) -> None:
+        self.snapshot_path = snapshot_path
+
+    def load(self) -> Optional[StatusSnapshot]:
+        """スナップショットを読み込みます。存在しない場合や形式が異なる場合は None を返します。"""
+        try:
+            snapshot = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(snapshot, dict) or snapshot.get("version") != self.VERSION:
+            return None
+        return cast(StatusSnapshot, snapshot)
+
+    def write(self, snapshot: StatusSnapshot) -> None:
+        """読み取る側が書きかけのファイルを読まないよう、一時ファイルに書き込んでから置き換えます。"""
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f".{self.snapshot_path.name}.", suffix=".tmp", dir=self.snapshot_path.parent
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(snapshot, file, ensure_ascii=False)
+            os.replace(temp_path, self.snapshot_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def remove(self) -> None:
+        """スナップショットを削除します。"""
+        self.snapshot_path.unlink(missing_ok=True)
@@ -0,0 +1,80 @@
+import sqlite3
+
+from ahc_local_leaderboard.consts import get_datetime_format
+from ahc_local_leaderboard.database.record_read_service import RecordReadService
+from ahc_local_leaderboard.database.transaction_hook import TransactionHookInterface
+from ahc_local_leaderboard.models.summary_score_record import SummaryScoreRecord
+from ahc_local_leaderboard.status.status_snapshot import (
+    StatusSnapshot,
+    StatusSnapshotFile,
+    SummarySnapshot,
+)
+
+
+class StatusSnapshotWriter(TransactionHookInterface):
+    """トランザクションの終了ごとに、コミットされた内容からスナップショットを書き直すクラス。
+
+    トランザクションの開始前にスナップショットを削除するため、書き込みの途中でプロセスが終了しても
+    データベースと食い違ったスナップショットは残りません。
+    """
+
+    # スナップショットに含める上位の提出の数
+    RANKING_LENGTH = 10
+
+    def __init__(self, record_read_service: RecordReadService, snapshot_file: StatusSnapshotFile) -> None:
+        self.record_read_service = record_read_service
+        self.snapshot_file = snapshot_file
+
+    @staticmethod
+    def create_summary_snapshot(record: SummaryScoreRecord) -> SummarySnapshot:
+        """提出の概要レコードをスナップショットの形式に変換します。"""
+        return {
+            "id": record.id,
+            "submission_time": record.submission_time.strftime(get_datetime_format()),
+            "total_absolute_score": record.total_absolute_score,
+            "total_relative_score": record.total_relative_score,
+            "invalid_score_count": record.invalid_score_count,
+            "relative_rank": record.relative_rank,
+        }
+
+    def create_snapshot(self) -> StatusSnapshot:
+        """データベースの現在の内容からスナップショットを作成します。"""
+        submission_count = self.record_read_service.fetch_total_record_count()
+        latest_record = None
+        if 0 < submission_count:
+            latest_id = self.record_read_service.fetch_latest_submission_id()
+            latest_record = self.record_read_service.fetch_summary_record_by_id(latest_id)
+
+        epoch, materialized_epoch = self.record_read_service.fetch_relative_score_epochs()
+        top_record = self.record_read_service.fetch_top_summary_record()
+        ranking = self.record_read_service.fetch_top_ranked_summary_records(self.RANKING_LENGTH)
+
+        return {
+            "version": StatusSnapshotFile.VERSION,
+            "submission_count": submission_count,
+            "latest_id": None if latest_record is None else latest_record.id,
+            "latest_rank": None if latest_record is None else latest_record.relative_rank,
+            "is_materialized": epoch == materialized_epoch,
+            "top_summary": {
+                "total_absolute_score": top_record.total_absolute_score,
+                "total_relative_score": top_record.total_relative_score,
+                "invalid_score_count": top_record.invalid_score_count,
+            },
+            "ranking": [self.create_summary_snapshot(record) for record in ranking],
+        }
+
+    def before_transaction(self) -> None:
+        """トランザクション中に読み取られないよう、スナップショットを削除します。"""
+        self.snapshot_file.remove()
+
+    def after_transaction(self) -> None:
+        """コミットまたはロールバックした後の内容でスナップショットを書き直します。"""
+        try:
+            self.snapshot_file.write(self.create_snapshot())
+        except (OSError, sqlite3.Error) as e:
+            # スナップショットがなくても、読み取る側はデータベースを参照できる
+            self.snapshot_file.remove()
+            # rich はエラーを表示する場合にのみ読み込む
+            from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+
+            ConsoleHandler.print_error(f"Failed to write the status snapshot: {e}")
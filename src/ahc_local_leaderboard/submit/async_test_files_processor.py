@@ -0,0 +1,128 @@
+import asyncio
+from typing import Optional
+
+from rich.progress import Progress
+
+from ahc_local_leaderboard.database.score_cache import ScoreCache
+from ahc_local_leaderboard.models.scoring_result import ScoringResult
+from ahc_local_leaderboard.models.test_file import TestFile
+from ahc_local_leaderboard.profiling.stage_tracer import get_stage_tracer
+from ahc_local_leaderboard.submit.scoring_journal import ScoringJournal
+from ahc_local_leaderboard.submit.test_file_processor import (
+    CommandTestFileProcessorInterface,
+    TestFilesProcessor,
+)
+
+
+class TransientScoringError(Exception):
+    """再試行によって成功する可能性があるスコア計算の失敗を表す例外。"""
+
+    pass
+
+
+class AsyncTestFilesProcessor(TestFilesProcessor):
+    """asyncio のサブプロセスでスコア計算を行う TestFilesProcessor のバックエンド。
+
+    同時実行数の上限、テストケースごとのタイムアウト、一時的な失敗の再試行に対応しており、
+    Ctrl-C で中断された場合は実行中のスコア計算プロセスを終了させます。
+    """
+
+    __test__ = False  # pytest によるテスト収集を無効化
+
+    def __init__(
+        self,
+        test_file_processor: CommandTestFileProcessorInterface,
+        max_workers: int = 1,
+        score_cache: Optional[ScoreCache] = None,
+        timeout: Optional[float] = None,
+        retries: int = 0,
+        journal: Optional[ScoringJournal] = None,
+    ) -> None:
+        assert timeout is None or 0 < timeout
+        assert 0 <= retries
+
+        super().__init__(test_file_processor, max_workers, score_cache, journal)
+        self.command_processor = test_file_processor
+        self.timeout = timeout
+        self.retries = retries
+
+    @staticmethod
+    async def kill_process(process: asyncio.subprocess.Process) -> None:
+        """実行中のプロセスを強制終了し、終了を待ちます。"""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+    async def score_test_file(self, test_file: TestFile) -> ScoringResult:
+        """サブプロセスでスコアを一度計算します。再試行すべき失敗の場合は TransientScoringError を送出します。"""
+        with self.command_processor.acquire_working_directory() as working_directory:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *self.command_processor.build_command(test_file),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    cwd=working_directory,
+                )
+            except OSError as e:
+                raise TransientScoringError(f"failed to start scorer: {e}")
+
+            try:
+                stdout, _ = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                await self.kill_process(process)
+                raise TransientScoringError(f"timed out after {self.timeout} seconds")
+            except asyncio.CancelledError:
+                await self.kill_process(process)
+                raise
+
+        decoded_output = stdout.decode("utf-8", errors="replace")
+        score = self.command_processor.parse_stdout(decoded_output)
+
+        returncode = process.returncode
+        assert returncode is not None
+        if score is None and returncode < 0:
+            raise TransientScoringError(f"scorer was terminated by signal {-returncode}")
+        if score is None and returncode != 0:
+            last_line = decoded_output.strip().splitlines()[-1] if decoded_output.strip() else ""
+            return ScoringResult(None, f"scorer exited with code {returncode}: {last_line}")
+
+        return ScoringResult(score)
+
+    async def score_test_file_with_retries(self, test_file: TestFile) -> ScoringResult:
+        """一時的な失敗の場合は再試行しながらスコアを計算します。"""
+        attempt_count = self.retries + 1
+        reason = ""
+        for _ in range(attempt_count):
+            try:
+                with get_stage_tracer().stage(f"{type(self).__name__}.score_test_file", "scorer"):
+                    return await self.score_test_file(test_file)
+            except TransientScoringError as e:
+                reason = str(e)
+
+        return ScoringResult(None, f"{reason} (attempted {attempt_count} times)")
+
+    async def score_test_files_async(self, test_files: list[TestFile]) -> list[ScoringResult]:
+        """同時実行数を制限しながら全テストファイルのスコアを計算します。"""
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        with Progress() as progress:
+            task_id = progress.add_task(self.LOADING_TEXT, total=len(test_files))
+
+            async def score(test_file: TestFile) -> ScoringResult:
+                async with semaphore:
+                    result = await self.score_test_file_with_retries(test_file)
+                self.checkpoint(test_file, result)
+                progress.advance(task_id)
+                return result
+
+            return list(await asyncio.gather(*(score(test_file) for test_file in test_files)))
+
+    def score_test_files(self, test_files: list[TestFile]) -> list[ScoringResult]:
+        """asyncio のイベントループ上でテストファイルのスコアを計算し、入力と同じ順序で返します。"""
+        if not test_files:
+            return []
+
+        return asyncio.run(self.score_test_files_async(test_files))
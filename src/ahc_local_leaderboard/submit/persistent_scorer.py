@@ -0,0 +1,221 @@
+import queue
+import shlex
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from ahc_local_leaderboard.models.test_file import TestFile
+from ahc_local_leaderboard.submit.test_file_processor import (
+    TestFileProcessorInterface,
+    calculate_command_hash,
+    resolve_command_paths,
+)
+from ahc_local_leaderboard.submit.working_directory_pool import WorkingDirectoryPool
+from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+
+
+class ScorerProtocolError(Exception):
+    """常駐ワーカーがプロトコルに従った応答を返さなかったことを表す例外。"""
+
+    pass
+
+
+class PersistentScorerWorker:
+    """標準入力から入力・出力ファイルのパスを受け取り、スコアを1行ずつ返す常駐プロセスを管理するクラス。
+
+    リクエストは「入力ファイルのパス<TAB>出力ファイルのパス」の1行、レスポンスは整数のスコア1行です。
+    0以下のスコアは無効なスコアとして扱います。
+    """
+
+    def __init__(self, command: list[str], timeout: Optional[float]) -> None:
+        self.command = command
+        self.timeout = timeout
+        self.working_directory = tempfile.TemporaryDirectory(prefix=WorkingDirectoryPool.PREFIX)
+
+        try:
+            self.process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.working_directory.name,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+            )
+        except OSError as e:
+            self.working_directory.cleanup()
+            raise ScorerProtocolError(f"failed to start scorer worker: {e}")
+
+        # タイムアウト付きで応答を待てるように、標準出力は別スレッドで読み取る
+        self.responses: queue.Queue[Optional[str]] = queue.Queue()
+        self.reader = threading.Thread(target=self.read_responses, daemon=True)
+        self.reader.start()
+
+    def read_responses(self) -> None:
+        """ワーカーの標準出力を1行ずつ読み取ります。終了した場合は None を積みます。"""
+        assert self.process.stdout is not None
+        for line in self.process.stdout:
+            self.responses.put(line)
+        self.responses.put(None)
+
+    def request(self, input_file_path: Path, submit_file_path: Path) -> Optional[int]:
+        """入力ファイルと出力ファイルのパスを送信し、返されたスコアを返します。"""
+        assert self.process.stdin is not None
+        try:
+            self.process.stdin.write(f"{input_file_path}\t{submit_file_path}\n")
+            self.process.stdin.flush()
+        except OSError as e:
+            raise ScorerProtocolError(f"failed to send a request to scorer worker: {e}")
+
+        try:
+            response = self.responses.get(timeout=self.timeout)
+        except queue.Empty:
+            raise ScorerProtocolError(f"scorer worker did not respond within {self.timeout} seconds")
+
+        if response is None:
+            raise ScorerProtocolError(f"scorer worker exited with code {self.process.wait()}")
+
+        try:
+            score = int(response.strip())
+        except ValueError:
+            raise ScorerProtocolError(f"unexpected response from scorer worker: {response.strip()!r}")
+
+        return score if 0 < score else None
+
+    def close(self) -> None:
+        """標準入力を閉じてワーカーを終了させ、作業ディレクトリを削除します。"""
+        try:
+            if self.process.stdin is not None:
+                self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.working_directory.cleanup()
+
+
+class PersistentTestFileProcessor(TestFileProcessorInterface):
+    """常駐するスコア計算ワーカーにテストケースを振り分けてスコアを計算するクラス。
+
+    ワーカーは同時に処理しているテストケースの数だけ起動され、使い回されます。
+    ワーカーが応答しなくなった場合は MAX_RESTARTS 回まで起動し直し、それでも応答しない場合や
+    ワーカーを起動できない場合は、fallback_processor でテストケースごとにスコアを計算します。
+    """
+
+    # プロトコルエラーやタイムアウトの後に、フォールバックせずにワーカーを起動し直す回数
+    MAX_RESTARTS = 2
+
+    def __init__(
+        self,
+        worker_command: str,
+        fallback_processor: TestFileProcessorInterface,
+        root_dir_path: Path,
+        timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__()
+        self.worker_command = resolve_command_paths(shlex.split(worker_command), root_dir_path)
+        self.fallback_processor = fallback_processor
+        self.timeout = timeout
+
+        self.lock = threading.Lock()
+        self.workers: list[PersistentScorerWorker] = []
+        self.idle_workers: list[PersistentScorerWorker] = []
+        self.is_protocol_supported = True
+        self.restart_count = 0
+
+    def prepare(self) -> None:
+        """フォールバック用の TestFileProcessor の準備を行います。"""
+        self.fallback_processor.prepare()
+
+    def cleanup(self) -> None:
+        """すべてのワーカーを終了させます。"""
+        with self.lock:
+            workers = list(self.workers)
+            self.workers.clear()
+            self.idle_workers.clear()
+
+        for worker in workers:
+            worker.close()
+
+        self.fallback_processor.cleanup()
+
+    def get_scorer_fingerprint(self) -> Optional[str]:
+        """ワーカーのコマンドと、実行ファイルやスクリプトの内容を識別子として返します。
+
+        ワーカーの変更を検出できないコマンドの場合は None を返します。
+        """
+        command_hash = calculate_command_hash(self.worker_command)
+        if command_hash is None:
+            return None
+
+        return "\0".join(["persistent", shlex.join(self.worker_command), command_hash])
+
+    def acquire_worker(self) -> PersistentScorerWorker:
+        """待機中のワーカーを返します。待機中のワーカーがいない場合は新たに起動します。"""
+        with self.lock:
+            if self.idle_workers:
+                return self.idle_workers.pop()
+
+        worker = PersistentScorerWorker(self.worker_command, self.timeout)
+        with self.lock:
+            self.workers.append(worker)
+        return worker
+
+    def release_worker(self, worker: PersistentScorerWorker) -> None:
+        """ワーカーを待機状態に戻します。"""
+        with self.lock:
+            self.idle_workers.append(worker)
+
+    def discard_worker(self, worker: PersistentScorerWorker) -> None:
+        """応答しなくなったワーカーを終了させます。"""
+        with self.lock:
+            self.workers.remove(worker)
+        worker.close()
+
+    def try_restart(self, reason: str) -> bool:
+        """ワーカーを起動し直す回数が MAX_RESTARTS 回以内であれば数えて True を返します。"""
+        with self.lock:
+            if self.MAX_RESTARTS <= self.restart_count:
+                return False
+            self.restart_count += 1
+            restart_count = self.restart_count
+
+        ConsoleHandler.print_info(f"Restarting scorer worker ({reason}). [{restart_count}/{self.MAX_RESTARTS}]")
+        return True
+
+    def disable_protocol(self, reason: str) -> None:
+        """以降のテストケースをフォールバック用の TestFileProcessor で計算するようにします。"""
+        with self.lock:
+            if not self.is_protocol_supported:
+                return
+            self.is_protocol_supported = False
+
+        ConsoleHandler.print_error(f"Scorer worker is not available ({reason}). Falling back to per-case scoring.")
+
+    def process_test_file(self, test_file: TestFile) -> Optional[int]:
+        """ワーカーにスコアを計算させます。ワーカーが使えない場合はテストケースごとにスコアを計算します。"""
+        while self.is_protocol_supported:
+            try:
+                worker = self.acquire_worker()
+            except ScorerProtocolError as e:
+                # 起動できないワーカーは起動し直しても結果が変わらない
+                self.disable_protocol(str(e))
+                break
+
+            try:
+                score = worker.request(
+                    Path(test_file.input_file_path).resolve(), Path(test_file.submit_file_path).resolve()
+                )
+            except ScorerProtocolError as e:
+                self.discard_worker(worker)
+                if not self.try_restart(str(e)):
+                    self.disable_protocol(str(e))
+                continue
+
+            self.release_worker(worker)
+            return score
+
+        return self.fallback_processor.process_test_file(test_file)
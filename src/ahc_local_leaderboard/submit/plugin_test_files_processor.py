@@ -0,0 +1,125 @@
+import math
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+from rich.progress import Progress
+
+from ahc_local_leaderboard.database.score_cache import ScoreCache
+from ahc_local_leaderboard.models.scoring_result import ScoringResult
+from ahc_local_leaderboard.models.test_file import TestFile
+from ahc_local_leaderboard.profiling.stage_tracer import get_stage_tracer
+from ahc_local_leaderboard.submit.scoring_journal import ScoringJournal
+from ahc_local_leaderboard.submit.test_file_processor import (
+    PluginTestFileProcessor,
+    TestFilesProcessor,
+)
+
+# プロセスプールの各ワーカープロセスで読み込んだプラグイン
+worker_processor: Optional[PluginTestFileProcessor] = None
+
+
+def initialize_worker(plugin_spec: str, root_dir_path: Path) -> None:
+    """ワーカープロセスの起動時にプラグインを読み込みます。"""
+    global worker_processor
+    worker_processor = PluginTestFileProcessor(plugin_spec, root_dir_path)
+    worker_processor.prepare()
+
+
+def process_batch_in_worker(test_files: list[TestFile]) -> list[ScoringResult]:
+    """ワーカープロセスで読み込んだプラグインを使ってテストファイルのスコアを計算します。"""
+    assert worker_processor is not None
+    return worker_processor.process_test_files_batch(test_files)
+
+
+class PluginTestFilesProcessor(TestFilesProcessor):
+    """Python のスコア計算プラグインをプロセスプールで実行する TestFilesProcessor のバックエンド。
+
+    テストファイルはバッチにまとめてワーカープロセスへ送られるため、プロセス間通信の回数を抑えつつ
+    GIL に制限されずに複数のテストケースを並列に計算できます。
+    """
+
+    __test__ = False  # pytest によるテスト収集を無効化
+
+    # バッチの大きさを指定しない場合、各ワーカーにこの数程度のバッチが行き渡るように分割する
+    BATCHES_PER_WORKER = 4
+    MAX_BATCH_SIZE = 64
+
+    def __init__(
+        self,
+        test_file_processor: PluginTestFileProcessor,
+        max_workers: int = 1,
+        score_cache: Optional[ScoreCache] = None,
+        batch_size: Optional[int] = None,
+        journal: Optional[ScoringJournal] = None,
+    ) -> None:
+        assert batch_size is None or 0 < batch_size
+
+        super().__init__(test_file_processor, max_workers, score_cache, journal)
+        self.plugin_processor = test_file_processor
+        self.batch_size = batch_size
+
+    def split_into_batches(self, test_files: list[TestFile]) -> list[list[TestFile]]:
+        """テストファイルをワーカープロセスに送るバッチに分割します。"""
+        batch_size = self.batch_size
+        if batch_size is None:
+            batch_size = min(
+                self.MAX_BATCH_SIZE, max(1, math.ceil(len(test_files) / (self.max_workers * self.BATCHES_PER_WORKER)))
+            )
+        return [test_files[start : start + batch_size] for start in range(0, len(test_files), batch_size)]
+
+    def checkpoint_batch(self, test_files: list[TestFile], results: list[ScoringResult]) -> None:
+        """計算が完了したバッチの結果をジャーナルに記録します。"""
+        for test_file, result in zip(test_files, results):
+            self.checkpoint(test_file, result)
+
+    def score_test_files(self, test_files: list[TestFile]) -> list[ScoringResult]:
+        """プロセスプールでテストファイルのスコアを計算し、入力と同じ順序で返します。"""
+        if not test_files:
+            return []
+
+        batches = self.split_into_batches(test_files)
+        results: list[ScoringResult] = []
+
+        with Progress() as progress:
+            task_id = progress.add_task(self.LOADING_TEXT, total=len(test_files))
+
+            # 並列数が1の場合はプロセスを起動せず、このプロセス内で計算する
+            if self.max_workers == 1:
+                for batch in batches:
+                    with get_stage_tracer().stage(
+                        f"{type(self.plugin_processor).__name__}.process_test_files_batch", "scorer"
+                    ):
+                        batch_result = self.plugin_processor.process_test_files_batch(batch)
+                    self.checkpoint_batch(batch, batch_result)
+                    results += batch_result
+                    progress.advance(task_id, len(batch))
+                return results
+
+            batch_results: list[list[ScoringResult]] = [[] for _ in batches]
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=initialize_worker,
+                initargs=(self.plugin_processor.plugin_spec, self.plugin_processor.root_dir_path),
+            )
+            try:
+                futures: dict[Future[list[ScoringResult]], int] = {
+                    executor.submit(process_batch_in_worker, batch): index for index, batch in enumerate(batches)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    exception = future.exception()
+                    if exception is not None:
+                        error_message = f"{type(exception).__name__}: {exception}"
+                        batch_results[index] = [ScoringResult(None, error_message) for _ in batches[index]]
+                    else:
+                        batch_results[index] = future.result()
+                    self.checkpoint_batch(batches[index], batch_results[index])
+                    progress.advance(task_id, len(batches[index]))
+            finally:
+                # 中断された場合は未着手のバッチを破棄する
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        for batch_result in batch_results:
+            results += batch_result
+        return results
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from ahc_local_leaderboard.database.record_read_service import RecordReadService
 from ahc_local_leaderboard.database.record_write_service import RecordWriteService
 from ahc_local_leaderboard.models.summary_score_record import (
@@ -28,28 +30,30 @@ class RelativeScoreUpdater:
 
     def calculate_individual_relative_score_diff(
         self,
-        non_latest_record: SummaryScoreRecord,
+        absolute_score: Optional[int],
         updated_top_score: UpdatedTopScore,
     ) -> int:
-        """指定されたレコードの相対スコア更新前後の差分を計算します。"""
+        """絶対スコアが'absolute_score'であるテストケースの相対スコア更新前後の差分を計算します。"""
 
-        absolute_score = self.record_read_service.fetch_absolute_score_for_test_case(
-            updated_top_score.file_name, non_latest_record.id
-        )
         return self.relative_score_calculator.calculate_diff_relative_score(
             absolute_score, updated_top_score.top_score, updated_top_score.second_top_score
         )
 
     def calculate_total_relative_score_diff(
         self,
-        non_latest_record: SummaryScoreRecord,
+        absolute_scores: dict[str, Optional[int]],
         updated_top_scores: list[UpdatedTopScore],
     ) -> int:
-        """指定されたレコードの相対スコア更新前後の差分の総和を計算します。"""
+        """テストケース名ごとの絶対スコア'absolute_scores'を持つレコードについて、相対スコア更新前後の差分の総和を計算します。"""
 
         total_score_diff = 0
         for updated_top_score in updated_top_scores:
-            total_score_diff += self.calculate_individual_relative_score_diff(non_latest_record, updated_top_score)
+            # そのテストケースを含まない提出の相対スコアは変化しない
+            if updated_top_score.file_name not in absolute_scores:
+                continue
+            total_score_diff += self.calculate_individual_relative_score_diff(
+                absolute_scores[updated_top_score.file_name], updated_top_score
+            )
 
         return total_score_diff
 
@@ -57,8 +61,15 @@ class RelativeScoreUpdater:
         """入力されたレコードの相対スコアを更新します。"""
 
         updated_top_scores = self.record_read_service.fetch_recently_updated_top_scores()
+        if not updated_top_scores:
+            return
+
+        # 提出ごとに問い合わせず、更新されたテストケースの絶対スコアを一度にまとめて取得する
+        absolute_scores = self.record_read_service.fetch_absolute_scores_for_updated_top_scores()
         for summary_record in records:
-            total_relative_score_diff = self.calculate_total_relative_score_diff(summary_record, updated_top_scores)
+            total_relative_score_diff = self.calculate_total_relative_score_diff(
+                absolute_scores.get(summary_record.id, {}), updated_top_scores
+            )
             summary_record.total_relative_score += total_relative_score_diff
 
     def fetch_latest_and_remaining_records(self) -> tuple[SummaryScoreRecord, list[SummaryScoreRecord]]:
@@ -72,21 +83,85 @@ class RelativeScoreUpdater:
 
         return latest_record, remaining_records
 
-    def apply_relative_score_updates(self) -> None:
-        """データベース内の相対スコアに関連する内容を更新します。"""
+    def fetch_new_and_remaining_records(
+        self, new_record_ids: list[int]
+    ) -> tuple[list[SummaryScoreRecord], list[SummaryScoreRecord]]:
+        """データベースから今回追加されたレコードと、それ以外のレコードを取得します。"""
 
-        latest_record, remaining_records = self.fetch_latest_and_remaining_records()
+        all_summary_records = self.record_read_service.fetch_all_summary_records()
 
-        # 最新の要素はデータベースに追加時に計算済みなのでそれ以外を更新する
+        new_records = [record for record in all_summary_records if record.id in new_record_ids]
+        remaining_records = [record for record in all_summary_records if record.id not in new_record_ids]
+
+        return new_records, remaining_records
+
+    @staticmethod
+    def arrange_by_relative_rank(records: list[SummaryScoreRecord]) -> list[SummaryScoreRecord]:
+        """順位の付いたレコードを前回の順位の順に並べて返します。
+
+        順位は1から連続しているため、ソートせずにそれぞれの位置に配置します。
+        順位が付いていないレコードや、順位の欠けや重複がある場合は空のリストを返します。
+        """
+        ranked_records: list[Optional[SummaryScoreRecord]] = [None] * len(records)
+        for record in records:
+            if record.relative_rank is None or len(records) < record.relative_rank:
+                return []
+            if ranked_records[record.relative_rank - 1] is not None:
+                return []
+            ranked_records[record.relative_rank - 1] = record
+
+        return [record for record in ranked_records if record is not None]
+
+    def apply_relative_score_updates(self, new_record_ids: Optional[list[int]] = None) -> None:
+        """データベース内の相対スコアに関連する内容を更新します。
+
+        'new_record_ids' を指定しない場合は、最新のレコードのみを今回追加されたレコードとして扱います。
+        順位は前回の並び順を保ったまま、相対スコアが変化したレコードと今回追加されたレコードだけを挿入し直して更新し、
+        相対スコアまたは順位が変化したレコードのみを書き込みます。
+        """
+
+        if new_record_ids is None:
+            latest_record, remaining_records = self.fetch_latest_and_remaining_records()
+            new_records = [latest_record]
+        else:
+            new_records, remaining_records = self.fetch_new_and_remaining_records(new_record_ids)
+
+        # 更新前の相対スコアと順位を控えておき、変化したレコードのみを書き込む
+        previous_states = {
+            record.id: (record.total_relative_score, record.relative_rank) for record in remaining_records
+        }
+        ranked_records = SummaryScoreRecords(self.arrange_by_relative_rank(remaining_records))
+
+        # 今回追加されたレコードはデータベースに追加時に計算済みなのでそれ以外を更新する
         self.update_relative_scores(remaining_records)
 
-        updated_records = SummaryScoreRecords(remaining_records)
-
-        updated_records.add_record(latest_record)
-
-        updated_records.update_relative_ranks()
-
-        for summary_record in updated_records:
-            self.record_write_service.update_score_history(summary_record)
+        ranked_ids = {record.id for record in ranked_records}
+        moved_records = [
+            record
+            for record in remaining_records
+            if record.id not in ranked_ids or record.total_relative_score != previous_states[record.id][0]
+        ]
+        moved_records.extend(new_records)
+
+        rank_changed_records = ranked_records.update_relative_ranks_incrementally(moved_records)
+
+        candidate_records = {record.id: record for record in rank_changed_records + moved_records}
+        self.record_write_service.update_score_histories(
+            self.select_changed_records(
+                SummaryScoreRecords(sorted(candidate_records.values(), key=lambda record: record.relative_rank or 0)),
+                previous_states,
+            )
+        )
 
         self.record_write_service.reset_is_updated_flags()
+
+    @staticmethod
+    def select_changed_records(
+        records: SummaryScoreRecords, previous_states: dict[int, tuple[int, Optional[int]]]
+    ) -> list[SummaryScoreRecord]:
+        """相対スコアまたは順位が'previous_states'から変化したレコードを返します。今回追加されたレコードは常に含みます。"""
+        return [
+            record
+            for record in records
+            if previous_states.get(record.id) != (record.total_relative_score, record.relative_rank)
+        ]
@@ -0,0 +1,76 @@
+import os
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+
+
+class VisScorerBuilder:
+    """AHCツールのビジュアライザ(vis)を一度だけビルドし、実行ファイルのパスを解決するクラス。"""
+
+    BUILD_COMMAND = ["cargo", "build", "-r", "--bin", "vis"]
+    SOURCE_FILE_NAMES = ["Cargo.toml", "Cargo.lock"]
+
+    def __init__(self, tools_dir_path: Path) -> None:
+        self.tools_dir_path = tools_dir_path
+        self.resolved_binary_path: Optional[Path] = None
+        self.is_resolved = False
+
+    def get_binary_path(self) -> Path:
+        """ビルドされたビジュアライザの実行ファイルのパスを返します。"""
+        target_dir = os.environ.get("CARGO_TARGET_DIR")
+        target_dir_path = Path(target_dir) if target_dir else self.tools_dir_path / "target"
+        binary_name = "vis.exe" if os.name == "nt" else "vis"
+        return target_dir_path / "release" / binary_name
+
+    def fetch_source_paths(self) -> list[Path]:
+        """ビルド結果に影響するソースファイルのパスを返します。"""
+        source_paths = [self.tools_dir_path / file_name for file_name in self.SOURCE_FILE_NAMES]
+        source_paths += list((self.tools_dir_path / "src").rglob("*.rs"))
+        return [path for path in source_paths if path.is_file()]
+
+    def is_up_to_date(self) -> bool:
+        """実行ファイルが存在し、すべてのソースファイルより新しい場合は True を返します。"""
+        binary_path = self.get_binary_path()
+        if not binary_path.is_file():
+            return False
+
+        binary_mtime = binary_path.stat().st_mtime
+        return all(path.stat().st_mtime <= binary_mtime for path in self.fetch_source_paths())
+
+    def build(self) -> bool:
+        """ビジュアライザをリリースビルドし、成功した場合は True を返します。"""
+        if not (self.tools_dir_path / "Cargo.toml").is_file():
+            return False
+
+        ConsoleHandler.print_info("Building visualizer...")
+        try:
+            build_process = subprocess.run(
+                self.BUILD_COMMAND,
+                cwd=self.tools_dir_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+        except OSError as e:
+            ConsoleHandler.print_error(f"Failed to build visualizer: {e}")
+            return False
+
+        if build_process.returncode != 0:
+            ConsoleHandler.print_error(
+                f"Failed to build visualizer:\n{build_process.stdout.decode('utf-8', errors='replace')}"
+            )
+            return False
+
+        return True
+
+    def resolve(self) -> Optional[Path]:
+        """必要な場合のみビルドを行い、実行ファイルのパスを返します。解決できない場合は None を返します。"""
+        if self.is_resolved:
+            return self.resolved_binary_path
+
+        if self.is_up_to_date() or (self.build() and self.get_binary_path().is_file()):
+            self.resolved_binary_path = self.get_binary_path()
+
+        self.is_resolved = True
+        return self.resolved_binary_path
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, TextIO
+
+from ahc_local_leaderboard.models.scoring_result import ScoringResult
+from ahc_local_leaderboard.models.test_file import TestFile
+
+
+class ScoringJournal:
+    """スコア計算の結果を完了したものから順にファイルへ記録し、中断された提出を再開できるようにするクラス。
+
+    ジャーナルは提出するファイルの組ごとに作成され、データベースへの書き込みが完了した後に削除されます。
+    中断された他の提出のジャーナルは、その提出を再開できるよう削除せずに残します。
+    """
+
+    FILE_SUFFIX = ".jsonl"
+
+    def __init__(self, journal_dir_path: Path) -> None:
+        self.journal_dir_path = journal_dir_path
+        self.journal_path: Optional[Path] = None
+        self.journal_file: Optional[TextIO] = None
+
+    @staticmethod
+    def generate_key(test_files: list[TestFile], scorer_fingerprint: str) -> str:
+        """入出力ファイルの名前・サイズ・更新日時とスコア計算方法から、提出を識別するキーを生成します。"""
+        digest = hashlib.sha256(scorer_fingerprint.encode("utf-8"))
+        for test_file in sorted(test_files, key=lambda test_file: str(test_file.submit_file_path)):
+            digest.update(f"\0{test_file.submit_file_path}".encode("utf-8"))
+            for file_path in [test_file.input_file_path, test_file.submit_file_path]:
+                try:
+                    stat = os.stat(file_path)
+                    digest.update(f"\0{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8"))
+                except OSError:
+                    digest.update(b"\0missing")
+        return digest.hexdigest()
+
+    @staticmethod
+    def generate_entry_key(test_file: TestFile) -> str:
+        """ジャーナルの各行を識別するキーを返します。複数の出力ディレクトリをまとめて提出できるよう出力ファイルのパスを用います。"""
+        return str(test_file.submit_file_path)
+
+    @staticmethod
+    def load(journal_path: Path) -> dict[str, ScoringResult]:
+        """ジャーナルに記録された結果を出力ファイルのパスごとに読み込みます。書き込み途中で中断された行は無視します。"""
+        results: dict[str, ScoringResult] = {}
+        try:
+            with open(journal_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                        results[str(entry["submit_file_path"])] = ScoringResult(entry["score"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        return results
+
+    def open(self, key: str) -> dict[str, ScoringResult]:
+        """指定した提出のジャーナルを開き、既に記録されている結果を返します。"""
+        self.close()
+        os.makedirs(self.journal_dir_path, exist_ok=True)
+
+        self.journal_path = self.journal_dir_path / f"{key}{self.FILE_SUFFIX}"
+        results = self.load(self.journal_path)
+        self.journal_file = open(self.journal_path, "a", encoding="utf-8")
+        return results
+
+    def append(self, test_file: TestFile, result: ScoringResult) -> None:
+        """スコア計算の結果を1行追記します。再試行すべき失敗した結果は記録しません。"""
+        if self.journal_file is None or result.is_failed():
+            return
+
+        entry = {"submit_file_path": self.generate_entry_key(test_file), "score": result.score}
+        self.journal_file.write(json.dumps(entry) + "\n")
+        self.journal_file.flush()
+
+    def close(self) -> None:
+        """ジャーナルファイルを閉じます。"""
+        if self.journal_file is not None:
+            self.journal_file.close()
+            self.journal_file = None
+
+    def delete(self) -> None:
+        """提出が完了したジャーナルを削除します。"""
+        self.close()
+        if self.journal_path is not None:
+            self.journal_path.unlink(missing_ok=True)
+            self.journal_path = None
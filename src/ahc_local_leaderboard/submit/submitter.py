@@ -1,7 +1,15 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Optional
 
+from ahc_local_leaderboard.database.record_read_service import RecordReadService
 from ahc_local_leaderboard.database.record_write_service import RecordWriteService
+from ahc_local_leaderboard.models.summary_score_record import SummaryScoreRecord
+from ahc_local_leaderboard.models.test_case import TestCases
 from ahc_local_leaderboard.models.test_file import TestFiles
+from ahc_local_leaderboard.profiling.stage_tracer import get_stage_tracer
+from ahc_local_leaderboard.rebuild.relative_score_materializer import (
+    RelativeScoreMaterializer,
+)
 from ahc_local_leaderboard.submit.relative_score_updater import RelativeScoreUpdater
 from ahc_local_leaderboard.submit.reserved_record_updater import ReservedRecordUpdater
 from ahc_local_leaderboard.submit.submission_matcher import SubmissionMatcher
@@ -10,39 +18,134 @@ from ahc_local_leaderboard.submit.test_file_processor import TestFilesProcessor
 
 
 class Submitter:
-    """入力されたテスト結果をローカル順位表に提出し、データベースを更新するクラス。"""
+    """入力されたテスト結果をローカル順位表に提出し、データベースを更新するクラス。
+
+    'relative_score_materializer' を指定した場合は、他の提出の相対スコアと順位を更新せず、表示時にまとめて計算し直します。
+    """
 
     def __init__(
         self,
+        record_read_service: RecordReadService,
         record_write_service: RecordWriteService,
         test_files_processor: TestFilesProcessor,
         test_case_processor: TestCasesProcessor,
         reserved_record_updater: ReservedRecordUpdater,
         relative_score_updater: RelativeScoreUpdater,
         submission_matcher: SubmissionMatcher,
+        relative_score_materializer: Optional[RelativeScoreMaterializer] = None,
     ) -> None:
+        self.record_read_service = record_read_service
         self.record_write_service = record_write_service
         self.test_files_processor = test_files_processor
         self.test_case_processor = test_case_processor
         self.reserved_record_updater = reserved_record_updater
         self.relative_score_updater = relative_score_updater
         self.submission_matcher = submission_matcher
+        self.relative_score_materializer = relative_score_materializer
 
     def execute(self, test_files: TestFiles, skip_duplicate: bool) -> bool:
         """入力された'test_files'の実行結果をローカル順位表に提出します。"""
 
-        test_cases = self.test_files_processor.process_test_files(test_files)
+        test_cases = self.score_test_files(test_files)
+        return self.record_test_cases(test_cases, skip_duplicate)
+
+    def score_test_files(self, test_files: TestFiles) -> TestCases:
+        """入力された'test_files'のスコアを計算します。データベースへの書き込みは行いません。"""
+        with get_stage_tracer().stage("submit.score_test_files"):
+            return self.test_files_processor.process_test_files(test_files)
+
+    def record_test_cases(self, test_cases: TestCases, skip_duplicate: bool) -> bool:
+        """スコアを計算済みの'test_cases'をローカル順位表に記録します。"""
 
-        if skip_duplicate and self.submission_matcher.is_submission_already_recorded(test_cases):
+        if skip_duplicate and self.is_submission_already_recorded(test_cases):
             return False
 
-        submission_time = datetime.now()
-        reserved_record = self.record_write_service.reserve_empty_score_history_record(submission_time)
+        submission_time = self.generate_submission_times(1)[0]
+        reserved_record = self.reserve_record(test_cases, submission_time)
 
-        self.test_case_processor.process_test_cases(test_cases, reserved_record.id)
+        self.process_test_cases(test_cases, reserved_record)
 
-        self.reserved_record_updater.update_reserved_record(reserved_record)
+        self.update_reserved_record(reserved_record)
 
-        self.relative_score_updater.apply_relative_score_updates()
+        self.update_relative_scores()
 
         return True
+
+    def is_submission_already_recorded(self, test_cases: TestCases) -> bool:
+        """全テストケースのスコアが一致する提出が既に記録されているかを確認します。"""
+        with get_stage_tracer().stage("submit.match_submission"):
+            return self.submission_matcher.is_submission_already_recorded(test_cases)
+
+    def process_test_cases(self, test_cases: TestCases, reserved_record: SummaryScoreRecord) -> None:
+        """'test_cases'を記録し、トップスコアを更新します。"""
+        with get_stage_tracer().stage("submit.update_top_scores"):
+            self.test_case_processor.process_test_cases(test_cases, reserved_record.id)
+
+    def update_reserved_record(self, reserved_record: SummaryScoreRecord) -> None:
+        """仮登録した'reserved_record'を記録したテストケースの内容で集計します。"""
+        with get_stage_tracer().stage("submit.update_reserved_record"):
+            self.reserved_record_updater.update_reserved_record(reserved_record)
+
+    def update_relative_scores(self, new_record_ids: Optional[list[int]] = None) -> None:
+        """トップスコアの更新を他の提出の相対スコアと順位に反映するか、遅延計算の場合は未反映であることを記録します。"""
+        with get_stage_tracer().stage("submit.update_relative_scores"):
+            if self.relative_score_materializer is None:
+                self.relative_score_updater.apply_relative_score_updates(new_record_ids)
+                return
+
+            # 過去の提出は読み書きせず、トップスコアの更新フラグだけを戻しておく
+            self.record_write_service.reset_is_updated_flags()
+            self.relative_score_materializer.invalidate()
+
+    def reserve_record(self, test_cases: TestCases, submission_time: datetime) -> SummaryScoreRecord:
+        """'test_cases' のハッシュ値と提出ディレクトリを記録した空のスコア履歴レコードを仮登録します。"""
+        submit_dir = test_cases.get_submit_dir()
+        with get_stage_tracer().stage("submit.reserve_record"):
+            return self.record_write_service.reserve_empty_score_history_record(
+                submission_time, test_cases.calculate_fingerprint(), None if submit_dir is None else str(submit_dir)
+            )
+
+    def generate_submission_times(self, count: int) -> list[datetime]:
+        """提出する記録に、既存の記録と重複しない1秒刻みの提出日時を割り当てます。"""
+        base_time = datetime.now().replace(microsecond=0)
+
+        recent_records = self.record_read_service.fetch_recent_summary_records(1).records
+        if recent_records and base_time <= recent_records[0].submission_time:
+            base_time = recent_records[0].submission_time + timedelta(seconds=1)
+
+        return [base_time + timedelta(seconds=offset) for offset in range(count)]
+
+    def score_test_files_batch(self, test_files_list: list[TestFiles]) -> list[TestCases]:
+        """複数の提出のスコアを一つのワーカープールでまとめて計算します。データベースへの書き込みは行いません。"""
+        with get_stage_tracer().stage("submit.score_test_files"):
+            return self.test_files_processor.process_test_files_batch(test_files_list)
+
+    def record_test_cases_batch(self, test_cases_list: list[TestCases], skip_duplicate: bool) -> list[int]:
+        """スコアを計算済みの複数の提出をローカル順位表に記録し、記録した提出のIDを返します。
+
+        相対スコアと順位の再計算は、すべての提出を記録した後に一度だけ行います。
+        """
+
+        reserved_records: list[SummaryScoreRecord] = []
+        for test_cases, submission_time in zip(test_cases_list, self.generate_submission_times(len(test_cases_list))):
+            if skip_duplicate and self.is_submission_already_recorded(test_cases):
+                continue
+
+            reserved_record = self.reserve_record(test_cases, submission_time)
+            self.process_test_cases(test_cases, reserved_record)
+
+            # 以降の提出の重複判定に使うため、この時点のトップスコアで一旦集計する
+            self.update_reserved_record(reserved_record)
+            reserved_records.append(reserved_record)
+
+        if not reserved_records:
+            return []
+
+        # 後の提出でトップスコアが更新されている可能性があるので、最終的なトップスコアで集計し直す
+        for reserved_record in reserved_records[:-1]:
+            self.update_reserved_record(reserved_record)
+
+        new_record_ids = [reserved_record.id for reserved_record in reserved_records]
+        self.update_relative_scores(new_record_ids)
+
+        return new_record_ids
@@ -40,6 +40,23 @@ class TestCaseProcessor:
         self.try_update_top_score(test_case, submission_id)
         self.record_write_service.insert_test_case(test_case, submission_id)
 
+    def process_test_cases(self, test_cases: TestCases, submission_id: int) -> None:
+        """全テストケースをまとめてTestCasesテーブルに追加し、トップスコアを超えたものだけTopScoresテーブルを更新します。
+
+        トップスコアは一度に読み込んでメモリ上で比較し、書き込みは executemany でまとめて行います。
+        """
+        top_scores = self.record_read_service.fetch_top_scores()
+        updated_test_cases = [
+            test_case
+            for test_case in test_cases
+            if self.relative_score_calculator.is_better_score(test_case.score, top_scores.get(test_case.file_name))
+        ]
+
+        self.record_write_service.update_top_scores(updated_test_cases, submission_id)
+        for test_case in updated_test_cases:
+            self.file_utility.copy_submit_file_to_leaderboard(test_case)
+        self.record_write_service.insert_test_cases(list(test_cases), submission_id)
+
 
 class TestCasesProcessor:
     """複数のテストケースのスコア評価と記録をまとめて処理するクラス。"""
@@ -54,6 +71,4 @@ class TestCasesProcessor:
 
     def process_test_cases(self, test_cases: TestCases, submission_id: int) -> None:
         """全テストケースのスコア評価と記録を処理します。"""
-
-        for test_case in test_cases:
-            self.test_case_processor.process_test_case(test_case, submission_id)
+        self.test_case_processor.process_test_cases(test_cases, submission_id)
@@ -1,14 +1,115 @@
+import importlib
 import json
+import mmap
+import os
 import re
+import shlex
+import shutil
 import subprocess
+import sys
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional, Union
 
 from rich.progress import track
 
+from ahc_local_leaderboard.database.score_cache import ScoreCache
+from ahc_local_leaderboard.models.scoring_result import ScoringResult
 from ahc_local_leaderboard.models.test_case import TestCase, TestCases
 from ahc_local_leaderboard.models.test_file import TestFile, TestFiles
+from ahc_local_leaderboard.profiling.stage_tracer import get_stage_tracer
+from ahc_local_leaderboard.submit.scorer_builder import VisScorerBuilder
+from ahc_local_leaderboard.submit.scoring_journal import ScoringJournal
+from ahc_local_leaderboard.submit.working_directory_pool import WorkingDirectoryPool
+from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+from ahc_local_leaderboard.utils.file_utility import FileUtility
+
+# スクリプトを読み込んで実行するため、実行ファイルの内容だけでは点数計算プログラムの変更を検出できないコマンド
+INTERPRETER_NAME_PATTERN = re.compile(
+    r"(python|pypy|node|deno|ruby|perl|php|bash|sh|julia|Rscript|java)[\d.]*(\.exe)?"
+)
+
+# ソースコードからビルドして実行するため、点数計算プログラムの変更を検出できないコマンド
+BUILD_TOOL_NAME_PATTERN = re.compile(r"(cargo|go|make|dotnet|npm|npx|uv|poetry|stack|cabal|gradle|mvn)(\.exe)?")
+
+
+def resolve_command_paths(command: list[str], root_dir_path: Path) -> list[str]:
+    """コマンドの実行ファイルと、ルートディレクトリにあるファイルを指す引数を、ルートディレクトリ基準の絶対パスに置き換えます。
+
+    実行ファイルはパス区切りを含む場合のみ置き換え、それ以外は PATH から検索させます。
+    """
+    executable = command[0]
+    if os.sep in executable or (os.altsep is not None and os.altsep in executable):
+        executable = str((root_dir_path / executable).resolve())
+
+    arguments = [
+        str((root_dir_path / argument).resolve()) if (root_dir_path / argument).is_file() else argument
+        for argument in command[1:]
+    ]
+    return [executable, *arguments]
+
+
+def calculate_executable_hash(executable: str) -> str:
+    """実行ファイルの内容のハッシュ値を返します。実行ファイルが見つからない場合は空文字列を返します。"""
+    executable_path = shutil.which(executable)
+    return FileUtility.calculate_file_hash(Path(executable_path)) if executable_path else ""
+
+
+def calculate_command_hash(command: list[str]) -> Optional[str]:
+    """コマンドの実行ファイルと、引数で指定されたファイルの内容のハッシュ値を返します。
+
+    ビルドツールを経由して実行する場合や、スクリプトのファイルを指定せずにインタプリタを実行する場合は、
+    点数計算プログラムの変更を検出できないため None を返します。
+    """
+    executable_name = Path(command[0]).name
+    if BUILD_TOOL_NAME_PATTERN.fullmatch(executable_name):
+        return None
+
+    file_hashes = [
+        FileUtility.calculate_file_hash(Path(argument)) for argument in command[1:] if Path(argument).is_file()
+    ]
+    if not file_hashes and INTERPRETER_NAME_PATTERN.fullmatch(executable_name):
+        return None
+
+    return "\0".join([calculate_executable_hash(command[0]), *file_hashes])
+
+
+# プラグインの関数は入力ファイルと出力ファイルの内容を bytes 互換のオブジェクトとして受け取る
+PluginScorer = Callable[[Union[mmap.mmap, bytes], Union[mmap.mmap, bytes]], Optional[int]]
+
+
+def load_plugin_scorer(plugin_spec: str, root_dir_path: Path) -> PluginScorer:
+    """`module:function` の形式で指定されたスコア計算関数を読み込みます。モジュールはルートディレクトリからも検索します。"""
+    module_name, separator, function_name = plugin_spec.partition(":")
+    if not separator or not module_name or not function_name:
+        raise ValueError(f"Scorer plugin must be specified as 'module:function': {plugin_spec}")
+
+    if str(root_dir_path) not in sys.path:
+        sys.path.insert(0, str(root_dir_path))
+
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise ValueError(f"Failed to import scorer plugin '{module_name}': {e}")
+
+    scorer = getattr(module, function_name, None)
+    if not callable(scorer):
+        raise ValueError(f"Scorer plugin '{plugin_spec}' is not a callable function.")
+    return scorer  # type: ignore
+
+
+@contextmanager
+def map_file(file_path: Path) -> Iterator[Union[mmap.mmap, bytes]]:
+    """ファイルを読み取り専用でメモリマップします。空のファイルはメモリマップできないため空の bytes を返します。"""
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            yield mapped_file
 
 
 class TestFileProcessorInterface(ABC):
@@ -16,15 +117,169 @@ class TestFileProcessorInterface(ABC):
 
     __test__ = False  # pytest によるテスト収集を無効化
 
+    def prepare(self) -> None:
+        """スコア計算を始める前に一度だけ呼び出される準備処理です。"""
+        pass
+
+    def cleanup(self) -> None:
+        """スコア計算が終わった後に一度だけ呼び出される後片付けの処理です。"""
+        pass
+
+    def get_scorer_fingerprint(self) -> Optional[str]:
+        """スコアキャッシュのキーに用いるスコア計算方法の識別子を返します。キャッシュできない場合は None を返します。"""
+        return None
+
     @abstractmethod
     def process_test_file(self, test_file: TestFile) -> Optional[int]:
         """単一のテストファイルのスコアを計算し、成功した場合はスコアを返します。"""
         pass
 
 
-class AtCoderTestFileProcessor(TestFileProcessorInterface):
+class CommandTestFileProcessorInterface(TestFileProcessorInterface):
+    """外部コマンドを実行し、その出力からスコアを計算するためのインターフェース。"""
+
+    # None の場合はカレントディレクトリでコマンドを実行する
+    working_directory_pool: Optional[WorkingDirectoryPool] = None
+
+    @abstractmethod
+    def build_command(self, test_file: TestFile) -> list[str]:
+        """指定したテストファイルのスコアを計算するコマンドを返します。"""
+        pass
+
+    @abstractmethod
+    def parse_stdout(self, decoded_output: str) -> Optional[int]:
+        """コマンドの出力からスコアを取り出します。"""
+        pass
+
+    @contextmanager
+    def acquire_working_directory(self) -> Iterator[Optional[Path]]:
+        """コマンドを実行する作業ディレクトリを確保します。作業ディレクトリを分離しない場合は None を返します。"""
+        if self.working_directory_pool is None:
+            yield None
+            return
+
+        with self.working_directory_pool.acquire() as working_directory:
+            yield working_directory
+
+    def cleanup(self) -> None:
+        """作成した作業ディレクトリを削除します。"""
+        if self.working_directory_pool is not None:
+            self.working_directory_pool.cleanup()
+
+    def process_test_file(self, test_file: TestFile) -> Optional[int]:
+        """コマンドを実行してスコアを計算し、成功した場合はスコアを返します。"""
+        with open(test_file.input_file_path), open(test_file.submit_file_path):
+            with self.acquire_working_directory() as working_directory:
+                score_process = subprocess.run(
+                    self.build_command(test_file),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    cwd=working_directory,
+                )
+
+        return self.parse_stdout(score_process.stdout.decode("utf-8"))
+
+
+class ScorerCommandTestFileProcessor(CommandTestFileProcessorInterface):
+    """config.yaml で指定されたコマンドテンプレートを実行し、スコアを計算するクラス。"""
+
+    INPUT_PLACEHOLDER = "{input}"
+    OUTPUT_PLACEHOLDER = "{output}"
+
+    def __init__(self, command_template: str, score_regex: str, score_only: bool, root_dir_path: Path) -> None:
+        super().__init__()
+        self.command_template = shlex.split(command_template)
+        if not self.command_template:
+            raise ValueError("Scorer command must not be empty.")
+        if not any(self.INPUT_PLACEHOLDER in token for token in self.command_template) or not any(
+            self.OUTPUT_PLACEHOLDER in token for token in self.command_template
+        ):
+            raise ValueError(f"Scorer command must contain {self.INPUT_PLACEHOLDER} and {self.OUTPUT_PLACEHOLDER}.")
+
+        self.score_pattern = re.compile(score_regex)
+        self.score_only = score_only
+        self.working_directory_pool = WorkingDirectoryPool()
+
+        # 作業ディレクトリを分離するので、相対パスで指定された実行ファイルやスクリプトはルートディレクトリ基準で解決する
+        self.command_template = resolve_command_paths(self.command_template, root_dir_path)
+
+    def get_scorer_fingerprint(self) -> Optional[str]:
+        """コマンドテンプレート・スコアの抽出方法・実行ファイルとスクリプトの内容を識別子として返します。
+
+        点数計算プログラムの変更を検出できないコマンドの場合は None を返します。
+        """
+        command_hash = calculate_command_hash(self.command_template)
+        if command_hash is None:
+            return None
+
+        return "\0".join(
+            [
+                "command",
+                shlex.join(self.command_template),
+                self.score_pattern.pattern,
+                str(self.score_only),
+                command_hash,
+            ]
+        )
+
+    def build_command(self, test_file: TestFile) -> list[str]:
+        """コマンドテンプレートのプレースホルダを入力ファイルと出力ファイルの絶対パスに置き換えます。"""
+        input_path = str(Path(test_file.input_file_path).resolve())
+        output_path = str(Path(test_file.submit_file_path).resolve())
+        return [
+            token.replace(self.INPUT_PLACEHOLDER, input_path).replace(self.OUTPUT_PLACEHOLDER, output_path)
+            for token in self.command_template
+        ]
+
+    def parse_stdout(self, decoded_output: str) -> Optional[int]:
+        """コマンドの出力からスコアを取り出します。score_only の場合は出力全体をスコアとして解釈します。"""
+        if self.score_only:
+            try:
+                score = int(decoded_output.strip())
+            except ValueError:
+                return None
+        else:
+            match = self.score_pattern.search(decoded_output)
+            if match is None:
+                return None
+            score = int(match.group(1))
+
+        return score if 0 < score else None
+
+
+class AtCoderTestFileProcessor(CommandTestFileProcessorInterface):
     """AtCoderのツールを使用してテストファイルを処理し、スコアを計算するクラス。"""
 
+    CARGO_RUN_COMMAND = ["cargo", "run", "-r", "--bin", "vis"]
+
+    def __init__(self, scorer_builder: Optional[VisScorerBuilder] = None) -> None:
+        super().__init__()
+        self.scorer_builder = scorer_builder
+        self.scorer_command = self.CARGO_RUN_COMMAND
+        self.scorer_fingerprint: Optional[str] = None
+
+    def prepare(self) -> None:
+        """ビジュアライザを事前にビルドし、以降は実行ファイルを直接呼び出すようにします。"""
+        if self.scorer_builder is None:
+            return
+
+        binary_path = self.scorer_builder.resolve()
+        if binary_path is not None:
+            # 常駐サーバーでは後片付けをせずに何度も準備されるため、前回の作業ディレクトリを削除しておく
+            self.cleanup()
+            self.scorer_command = [str(binary_path)]
+            # cargo run はツールのディレクトリで実行する必要があるので、ビルド済みの場合のみ作業ディレクトリを分離する
+            self.working_directory_pool = WorkingDirectoryPool()
+            self.scorer_fingerprint = f"vis:{FileUtility.calculate_file_hash(binary_path)}"
+
+    def get_scorer_fingerprint(self) -> Optional[str]:
+        """ビルド済みのビジュアライザの内容を識別子として返します。cargo run で実行する場合は None を返します。"""
+        return self.scorer_fingerprint
+
+    def build_command(self, test_file: TestFile) -> list[str]:
+        """AHCで配布されるビジュアライザを実行するコマンドを返します。"""
+        return [*self.scorer_command, str(test_file.input_file_path), str(test_file.submit_file_path)]
+
     def parse_stdout(self, decoded_output: str) -> Optional[int]:
         """標準出力からスコアを取り出します。"""
         match = re.search(r"Score = (\d+)", decoded_output)
@@ -37,22 +292,6 @@ class AtCoderTestFileProcessor(TestFileProcessorInterface):
         else:
             return None
 
-    def process_test_file(self, test_file: TestFile) -> Optional[int]:
-        """AHCで配布されるツールを使ってスコアを計算し、成功した場合はスコアを返します。"""
-        try:
-            with open(test_file.input_file_path) as fin, open(test_file.submit_file_path) as fout:
-                score_process = subprocess.run(
-                    ["cargo", "run", "-r", "--bin", "vis", fin.name, fout.name],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                )
-
-                decoded_output = score_process.stdout.decode("utf-8")
-
-                return self.parse_stdout(decoded_output)
-        except Exception:
-            return None
-
 
 class PahcerTestFileProcessor(TestFileProcessorInterface):
     """pahcerファイルからスコアを計算するクラス。"""
@@ -94,26 +333,253 @@ class PahcerTestFileProcessor(TestFileProcessorInterface):
         return int(result["score"])
 
 
+class PluginTestFileProcessor(TestFileProcessorInterface):
+    """config.yaml で `module:function` の形式で指定された Python の関数を呼び出し、スコアを計算するクラス。
+
+    関数は入力ファイルと出力ファイルをメモリマップしたオブジェクトを受け取り、スコアの整数を返します。
+    """
+
+    def __init__(self, plugin_spec: str, root_dir_path: Path) -> None:
+        super().__init__()
+        self.plugin_spec = plugin_spec
+        self.root_dir_path = root_dir_path
+        self.scorer: Optional[PluginScorer] = None
+
+    def load_scorer(self) -> PluginScorer:
+        """スコア計算関数を読み込みます。読み込みは最初の呼び出し時のみ行います。"""
+        if self.scorer is None:
+            self.scorer = load_plugin_scorer(self.plugin_spec, self.root_dir_path)
+        return self.scorer
+
+    def prepare(self) -> None:
+        """スコア計算を始める前にプラグインを読み込み、指定の誤りを早期に検出します。"""
+        self.load_scorer()
+
+    def get_scorer_fingerprint(self) -> Optional[str]:
+        """プラグインの指定とモジュールのソースファイルの内容を識別子として返します。"""
+        module_file = getattr(sys.modules.get(self.load_scorer().__module__), "__file__", None)
+        module_hash = FileUtility.calculate_file_hash(Path(module_file)) if module_file else ""
+        return "\0".join(["plugin", self.plugin_spec, module_hash])
+
+    def process_test_file(self, test_file: TestFile) -> Optional[int]:
+        """入力ファイルと出力ファイルをメモリマップしてスコア計算関数に渡し、成功した場合はスコアを返します。"""
+        scorer = self.load_scorer()
+        with map_file(test_file.input_file_path) as input_data, map_file(test_file.submit_file_path) as output_data:
+            score = scorer(input_data, output_data)
+
+        if score is None:
+            return None
+        score = int(score)
+        return score if 0 < score else None
+
+    def process_test_files_batch(self, test_files: list[TestFile]) -> list[ScoringResult]:
+        """複数のテストファイルのスコアを順に計算します。失敗したテストファイルは理由を記録して処理を続けます。"""
+        results = []
+        for test_file in test_files:
+            try:
+                results.append(ScoringResult(self.process_test_file(test_file)))
+            except Exception as e:
+                results.append(ScoringResult(None, f"{type(e).__name__}: {e}"))
+        return results
+
+
 class TestFilesProcessor:
     """複数のテストファイルを処理して、それらに対応するテストケースを生成するクラス。"""
 
     __test__ = False  # pytest によるテスト収集を無効化
 
     LOADING_TEXT = "Test Case Processing..."
+    MAX_REPORTED_ERRORS = 10
+
+    # True の場合は、スコア計算ワーカーを提出のたびに終了させずに close() まで使い回す
+    keep_scorer_alive = False
+
+    def __init__(
+        self,
+        test_file_processor: TestFileProcessorInterface,
+        max_workers: int = 1,
+        score_cache: Optional[ScoreCache] = None,
+        journal: Optional[ScoringJournal] = None,
+    ) -> None:
+        assert 0 < max_workers
 
-    def __init__(self, test_file_processor: TestFileProcessorInterface) -> None:
         self.test_file_processor = test_file_processor
+        self.max_workers = max_workers
+        self.score_cache = score_cache
+        self.journal = journal
+
+    def generate_cache_keys(self, test_files: list[TestFile]) -> list[Optional[str]]:
+        """各テストファイルのスコアキャッシュのキーを生成します。キャッシュを使わない場合は None を返します。"""
+
+        scorer_fingerprint = self.test_file_processor.get_scorer_fingerprint()
+        if self.score_cache is None or scorer_fingerprint is None:
+            return [None] * len(test_files)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda test_file: ScoreCache.generate_key(
+                        scorer_fingerprint, test_file.input_file_path, test_file.submit_file_path
+                    ),
+                    test_files,
+                )
+            )
+
+    def fetch_cached_scores(self, cache_keys: list[Optional[str]]) -> dict[str, int]:
+        """スコアキャッシュから計算済みのスコアを取得します。"""
+        valid_cache_keys = [cache_key for cache_key in cache_keys if cache_key is not None]
+        if self.score_cache is None or not valid_cache_keys:
+            return {}
+        return self.score_cache.fetch_scores(valid_cache_keys)
+
+    def store_cached_scores(self, cache_keys: list[Optional[str]], results: list[ScoringResult]) -> None:
+        """新たに計算できたスコアをスコアキャッシュに保存します。"""
+        if self.score_cache is None:
+            return
+
+        new_scores = {
+            cache_key: result.score
+            for cache_key, result in zip(cache_keys, results)
+            if cache_key is not None and result.score is not None
+        }
+        if new_scores:
+            self.score_cache.store_scores(new_scores)
+
+    def open_journal(self, test_files: list[TestFile]) -> dict[str, ScoringResult]:
+        """この提出のジャーナルを開き、中断された前回の実行で計算済みの結果を返します。"""
+        if self.journal is None:
+            return {}
+
+        scorer_fingerprint = (
+            self.test_file_processor.get_scorer_fingerprint() or type(self.test_file_processor).__name__
+        )
+        journaled_results = self.journal.open(ScoringJournal.generate_key(test_files, scorer_fingerprint))
+        if journaled_results:
+            ConsoleHandler.print_info(
+                f"Resuming an interrupted submission: {len(journaled_results)} test cases are already scored."
+            )
+        return journaled_results
+
+    def checkpoint(self, test_file: TestFile, result: ScoringResult) -> None:
+        """計算が完了した結果をジャーナルに記録します。各バックエンドは結果が得られるたびに呼び出します。"""
+        if self.journal is not None:
+            self.journal.append(test_file, result)
+
+    def discard_journal(self) -> None:
+        """提出がデータベースに書き込まれた後に、不要になったジャーナルを削除します。"""
+        if self.journal is not None:
+            self.journal.delete()
+
+    def process_test_file(self, test_file: TestFile) -> Optional[int]:
+        """単一のテストファイルのスコアを計算し、計算1回ごとの経過時間を記録します。"""
+        with get_stage_tracer().stage(f"{type(self.test_file_processor).__name__}.process_test_file", "scorer"):
+            return self.test_file_processor.process_test_file(test_file)
+
+    def score_test_files(self, test_files: list[TestFile]) -> list[ScoringResult]:
+        """スレッドプールでテストファイルのスコアを計算し、入力と同じ順序で返します。"""
+
+        results = [ScoringResult(None) for _ in test_files]
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {
+                executor.submit(self.process_test_file, test_file): index for index, test_file in enumerate(test_files)
+            }
+            for future in track(as_completed(futures), description=self.LOADING_TEXT, total=len(futures)):
+                index = futures[future]
+                exception = future.exception()
+                if exception is not None:
+                    results[index] = ScoringResult(None, f"{type(exception).__name__}: {exception}")
+                else:
+                    results[index] = ScoringResult(future.result())
+                self.checkpoint(test_files[index], results[index])
+        finally:
+            # 中断された場合は未着手のスコア計算を破棄する
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return results
+
+    def calculate_scores(self, test_files: list[TestFile]) -> list[ScoringResult]:
+        """キャッシュにもジャーナルにもないテストファイルのみスコアを計算し、入力と同じ順序で結果を返します。"""
+
+        cache_keys = self.generate_cache_keys(test_files)
+        cached_scores = self.fetch_cached_scores(cache_keys)
+
+        try:
+            journaled_results = self.open_journal(test_files)
+
+            results = [
+                ScoringResult(cached_scores.get(cache_key) if cache_key is not None else None)
+                for cache_key in cache_keys
+            ]
+            uncached_indices = [index for index, cache_key in enumerate(cache_keys) if cache_key not in cached_scores]
+            pending_indices = []
+            for index in uncached_indices:
+                entry_key = ScoringJournal.generate_entry_key(test_files[index])
+                if entry_key in journaled_results:
+                    results[index] = journaled_results[entry_key]
+                else:
+                    pending_indices.append(index)
+
+            pending_results = self.score_test_files([test_files[index] for index in pending_indices])
+            for index, result in zip(pending_indices, pending_results):
+                results[index] = result
+        finally:
+            if self.journal is not None:
+                self.journal.close()
+
+        self.store_cached_scores(
+            [cache_keys[index] for index in uncached_indices], [results[index] for index in uncached_indices]
+        )
+
+        return results
+
+    def close(self) -> None:
+        """使い回しているスコア計算ワーカーと作業ディレクトリを後片付けします。"""
+        self.test_file_processor.cleanup()
+
+    def report_scoring_errors(self, test_cases: TestCases) -> None:
+        """スコア計算に失敗したテストケースとその理由を表示します。"""
+        failed_test_cases = test_cases.fetch_failed_test_cases()
+        for test_case in failed_test_cases[: self.MAX_REPORTED_ERRORS]:
+            ConsoleHandler.print_error(f"Failed to score {test_case.file_name}: {test_case.error_message}")
+
+        if self.MAX_REPORTED_ERRORS < len(failed_test_cases):
+            ConsoleHandler.print_error(f"... and {len(failed_test_cases) - self.MAX_REPORTED_ERRORS} more failures")
 
     def process_test_files(self, test_files: TestFiles) -> TestCases:
         """全てのテストファイルのスコアを計算します。"""
+        return self.process_test_files_batch([test_files])[0]
+
+    def process_test_files_batch(self, test_files_list: list[TestFiles]) -> list[TestCases]:
+        """複数の提出のテストファイルを一つのワーカープールでまとめてスコア計算し、提出ごとのテストケースを返します。"""
 
-        self.test_files = test_files
+        self.test_file_processor.prepare()
 
-        test_cases = TestCases()
-        self.test_files.add_all_files()
+        target_files_list = []
+        for test_files in test_files_list:
+            test_files.add_all_files()
+            target_files_list.append(list(test_files))
+
+        try:
+            results = self.calculate_scores(
+                [test_file for target_files in target_files_list for test_file in target_files]
+            )
+        finally:
+            if not self.keep_scorer_alive:
+                self.test_file_processor.cleanup()
+
+        test_cases_list = []
+        offset = 0
+        for target_files in target_files_list:
+            test_cases = TestCases()
+            for test_file, result in zip(target_files, results[offset : offset + len(target_files)]):
+                test_cases.add_test_case(
+                    TestCase(test_file.file_name, result.score, test_file.submit_file_path, result.error_message)
+                )
+            offset += len(target_files)
 
-        for test_file in track(self.test_files, description=self.LOADING_TEXT, total=self.test_files.file_count):
-            score = self.test_file_processor.process_test_file(test_file)
-            test_cases.add_test_case(TestCase(test_file.file_name, score, test_file.submit_file_path))
+            self.report_scoring_errors(test_cases)
+            test_cases_list.append(test_cases)
 
-        return test_cases
+        return test_cases_list
@@ -0,0 +1,46 @@
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class WorkingDirectoryPool:
+    """スコア計算コマンドを実行するワーカーごとに、専用の作業ディレクトリを貸し出すクラス。
+
+    ビジュアライザは実行のたびにカレントディレクトリへ vis.html などを書き出すため、
+    並列実行時に同じディレクトリを共有すると書き込みが衝突します。
+    """
+
+    PREFIX = "ahc-local-leaderboard-"
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.free_directories: list[Path] = []
+        self.created_directories: list[Path] = []
+
+    def create_directory(self) -> Path:
+        """新しい作業ディレクトリを作成します。"""
+        directory = Path(tempfile.mkdtemp(prefix=self.PREFIX))
+        self.created_directories.append(directory)
+        return directory
+
+    @contextmanager
+    def acquire(self) -> Iterator[Path]:
+        """他のワーカーが使用していない作業ディレクトリを貸し出し、使用後に返却させます。"""
+        with self.lock:
+            directory = self.free_directories.pop() if self.free_directories else self.create_directory()
+        try:
+            yield directory
+        finally:
+            with self.lock:
+                self.free_directories.append(directory)
+
+    def cleanup(self) -> None:
+        """作成したすべての作業ディレクトリを削除します。"""
+        with self.lock:
+            for directory in self.created_directories:
+                shutil.rmtree(directory, ignore_errors=True)
+            self.created_directories.clear()
+            self.free_directories.clear()
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import shutil
 from pathlib import Path
@@ -33,3 +34,22 @@ class FileUtility:
         submit_file_path = test_case.submit_file_path
         top_file_path = get_top_dir() / test_case.file_name
         FileUtility.copy_file(submit_file_path, top_file_path)
+
+    @staticmethod
+    def copy_file_to_leaderboard(src: Path, file_name: str) -> None:
+        """指定されたファイルを、テストケース名 'file_name' のトップスコアの出力として順位表ディレクトリにコピーします。"""
+        FileUtility.copy_file(src, get_top_dir() / file_name)
+
+    @staticmethod
+    def remove_file_from_leaderboard(file_name: str) -> None:
+        """順位表ディレクトリにあるテストケース名 'file_name' の出力ファイルを、存在する場合のみ削除します。"""
+        (get_top_dir() / file_name).unlink(missing_ok=True)
+
+    @staticmethod
+    def calculate_file_hash(file_path: Path, chunk_size: int = 1 << 20) -> str:
+        """ファイル全体をメモリに読み込まずに、内容の SHA-256 ハッシュ値を計算します。"""
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            while chunk := file.read(chunk_size):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
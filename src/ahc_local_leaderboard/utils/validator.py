@@ -106,6 +106,24 @@ class SubmitValidator(CommandValidatorBase):
         return True
 
 
+class DeleteValidator(CommandValidatorBase):
+    """'delete' コマンド用のバリデータクラス。"""
+
+    def __init__(self, record_read_service: RecordReadService) -> None:
+        self.record_read_service = record_read_service
+        super().__init__()
+
+    def validate(self, args: argparse.Namespace) -> bool:
+        """'delete' コマンド用のバリデーション処理。削除する ID が存在するかを確認します。"""
+
+        assert args.command == "delete"
+
+        if not self.record_read_service.exists_id(args.id):
+            self.errors.append(f"Record not found in the database: id = {args.id}")
+
+        return self.is_valid()
+
+
 class ViewValidator(CommandValidatorBase):
     """'view' コマンド用のバリデータクラス。"""
 
@@ -12,6 +12,7 @@ from ahc_local_leaderboard.models.summary_score_record import (
     SummaryScoreRecord,
     TopSummaryScoreRecord,
 )
+from ahc_local_leaderboard.profiling.trace_report import TraceSummary
 from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
 from ahc_local_leaderboard.utils.relative_score_calculater import (
     RelativeScoreCalculaterInterface,
@@ -67,7 +68,8 @@ class SummaryTableBuilder(TableBuilder[SummaryScoreRecord]):
         """スコア概要の各レコードを挿入します。"""
         self.table.add_row(
             str(record.id),
-            str(record.relative_rank),
+            # 相対スコアの遅延計算では、提出直後の順位は未計算
+            "-" if record.relative_rank is None else str(record.relative_rank),
             record.submission_time.strftime(get_datetime_format()),
             ScoreFormatter.format_total_absolute_score(record.total_absolute_score, record.invalid_score_count),
             ScoreFormatter.format_relative_score(record.total_relative_score, self.max_relative_score),
@@ -137,3 +139,32 @@ class TopDetailTableBuilder(TableBuilder[TopDetailScoreRecord]):
             ScoreFormatter.format_absolute_score(record.absolute_score),
             str(record.submittion_id),
         )
+
+
+class TraceSummaryTableBuilder(TableBuilder[TraceSummary]):
+    """処理ごとの経過時間と SQL の実行回数の集計を表示するテーブルを構築するクラス。"""
+
+    def __init__(self, title: str):
+        super().__init__(title)
+
+    def define_header(self) -> None:
+        """集計テーブルのヘッダーを定義します。"""
+        self.table.add_column("Kind", justify="left")
+        self.table.add_column("Name", justify="left")
+        self.table.add_column("Calls", justify="right")
+        self.table.add_column("Total [ms]", justify="right")
+        self.table.add_column("Mean [ms]", justify="right")
+        self.table.add_column("Max [ms]", justify="right")
+        self.table.add_column("Queries", justify="right")
+
+    def insert_record(self, record: TraceSummary) -> None:
+        """処理ごとの集計を挿入します。"""
+        self.table.add_row(
+            record["kind"],
+            record["name"],
+            str(record["calls"]),
+            f"{record['total'] * 1000:.3f}",
+            f"{record['total'] / record['calls'] * 1000:.3f}",
+            f"{record['max'] * 1000:.3f}",
+            str(record["queries"]),
+        )
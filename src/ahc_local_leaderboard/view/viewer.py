@@ -1,3 +1,5 @@
+from typing import Optional
+
 from ahc_local_leaderboard.database.record_read_service import RecordReadService
 from ahc_local_leaderboard.models.detail_score_record import (
     DetailScoreRecord,
@@ -9,6 +11,10 @@ from ahc_local_leaderboard.models.sort_config import (
     SummaryScoreRecordsSortConfig,
 )
 from ahc_local_leaderboard.models.summary_score_record import SummaryScoreRecord
+from ahc_local_leaderboard.profiling.stage_tracer import get_stage_tracer
+from ahc_local_leaderboard.rebuild.relative_score_materializer import (
+    RelativeScoreMaterializer,
+)
 from ahc_local_leaderboard.utils.relative_score_calculater import (
     RelativeScoreCalculaterInterface,
 )
@@ -20,33 +26,49 @@ from ahc_local_leaderboard.view.table_builder import (
 
 
 class Viewer:
-    """スコア履歴やテストケースの詳細を表示するクラス。"""
+    """スコア履歴やテストケースの詳細を表示するクラス。
+
+    'relative_score_materializer' を指定した場合は、未反映の相対スコアと順位を表示の前に計算し直します。
+    """
 
     MAX_SINGLE_RELATIVE_SCORE = 1000000000
 
     def __init__(
-        self, record_read_service: RecordReadService, relative_score_calculator: RelativeScoreCalculaterInterface
+        self,
+        record_read_service: RecordReadService,
+        relative_score_calculator: RelativeScoreCalculaterInterface,
+        relative_score_materializer: Optional[RelativeScoreMaterializer] = None,
     ):
         self.record_read_service = record_read_service
         self.relative_score_calculator = relative_score_calculator
+        self.relative_score_materializer = relative_score_materializer
         self.MAX_SUM_RELATIVE_SCORE = self.record_read_service.fetch_test_case_count() * self.MAX_SINGLE_RELATIVE_SCORE
 
+    def refresh_relative_scores(self) -> None:
+        """相対スコアの遅延計算で未反映となっている相対スコアと順位を計算し直します。"""
+        if self.relative_score_materializer is not None:
+            with get_stage_tracer().stage("view.refresh_relative_scores"):
+                self.relative_score_materializer.materialize()
+
     def show_summary_list(self, list_length: int, sort_config: SummaryScoreRecordsSortConfig) -> None:
         """指定された件数（list_length）の最新スコア履歴とトップスコアを取得し、テーブル形式で表示します。"""
         assert 0 <= list_length
+        self.refresh_relative_scores()
 
-        top_record = self.record_read_service.fetch_top_summary_record()
-        score_records = self.record_read_service.fetch_recent_summary_records(list_length)
-        score_records.sort_records(sort_config)
+        with get_stage_tracer().stage("view.fetch"):
+            top_record = self.record_read_service.fetch_top_summary_record()
+            score_records = self.record_read_service.fetch_recent_summary_records(list_length)
+            score_records.sort_records(sort_config)
 
-        table_builder = SummaryTableBuilder(
-            f"Latest {len(score_records.records)} Scores (Including Top Score)", self.MAX_SUM_RELATIVE_SCORE
-        )
+        with get_stage_tracer().stage("view.render"):
+            table_builder = SummaryTableBuilder(
+                f"Latest {len(score_records.records)} Scores (Including Top Score)", self.MAX_SUM_RELATIVE_SCORE
+            )
 
-        table_builder.insert_top_record(top_record)
-        table_builder.add_separator_row()
-        table_builder.insert_records(score_records.records)
-        table_builder.display()
+            table_builder.insert_top_record(top_record)
+            table_builder.add_separator_row()
+            table_builder.insert_records(score_records.records)
+            table_builder.display()
 
     def show_summary_table(self, summary_record: SummaryScoreRecord) -> None:
         """テストケースの概要情報テーブルを表示します。"""
@@ -76,14 +98,16 @@ class Viewer:
     def show_detail(self, submission_id: int, sort_config: DetailScoreRecordsSortConfig) -> None:
         """指定された提出IDの詳細テーブルを表示します。"""
         assert 0 < submission_id
+        self.refresh_relative_scores()
 
-        detail_records = self.record_read_service.fetch_detail_records_by_id(submission_id)
-        detail_records.sort_records(sort_config)
+        with get_stage_tracer().stage("view.fetch"):
+            detail_records = self.record_read_service.fetch_detail_records_by_id(submission_id)
+            detail_records.sort_records(sort_config)
+            summary_record = self.record_read_service.fetch_summary_record_by_id(submission_id)
 
-        self.show_test_case_table(detail_records)
-
-        summary_record = self.record_read_service.fetch_summary_record_by_id(submission_id)
-        self.show_summary_table(summary_record)
+        with get_stage_tracer().stage("view.render"):
+            self.show_test_case_table(detail_records)
+            self.show_summary_table(summary_record)
 
     def show_latest_detail(self, sort_config: DetailScoreRecordsSortConfig) -> None:
         """最新の提出の詳細テーブルを表示します。"""
@@ -99,5 +123,8 @@ class Viewer:
 
     def show_top_detail(self) -> None:
         """トップテストケースの詳細テーブルを表示します。"""
-        detail_records = self.record_read_service.fetch_sorted_top_detail_records()
-        self.show_top_test_case_table(detail_records)
+        with get_stage_tracer().stage("view.fetch"):
+            detail_records = self.record_read_service.fetch_sorted_top_detail_records()
+
+        with get_stage_tracer().stage("view.render"):
+            self.show_top_test_case_table(detail_records)
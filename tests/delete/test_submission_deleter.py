@@ -0,0 +1,190 @@
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Generator, Optional
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ahc_local_leaderboard.database.database_manager import (
+    DatabaseManager,
+    ScoreHistoryRepository,
+    TestCaseRepository,
+    TopScoresRepository,
+)
+from ahc_local_leaderboard.database.record_read_service import RecordReadService
+from ahc_local_leaderboard.database.record_write_service import RecordWriteService
+from ahc_local_leaderboard.delete.submission_deleter import SubmissionDeleter
+from ahc_local_leaderboard.models.test_case import TestCase, TestCases
+from ahc_local_leaderboard.models.top_score_record import TopScoreRecord
+from ahc_local_leaderboard.rebuild.leaderboard_rebuilder import LeaderboardRebuilder
+from ahc_local_leaderboard.submit.relative_score_updater import RelativeScoreUpdater
+from ahc_local_leaderboard.submit.reserved_record_updater import ReservedRecordUpdater
+from ahc_local_leaderboard.submit.test_case_processor import TestCaseProcessor
+from ahc_local_leaderboard.utils.file_utility import FileUtility
+from ahc_local_leaderboard.utils.relative_score_calculater import (
+    MaximizationScoring,
+    MinimizationScoring,
+    RelativeScoreCalculaterInterface,
+)
+
+
+@pytest.fixture
+def root_dir(tmp_path: Path) -> Generator[Path, None, None]:
+    (tmp_path / "leader_board" / "top").mkdir(parents=True)
+    with patch("ahc_local_leaderboard.consts.ROOT_DIR", tmp_path):
+        DatabaseManager.setup()
+        yield tmp_path
+
+
+@pytest.fixture(params=[False, True], ids=["rows", "score_vectors"])
+def services(
+    request: pytest.FixtureRequest, root_dir: Path
+) -> Generator[tuple[RecordReadService, RecordWriteService], None, None]:
+    db_manager = DatabaseManager()
+    test_case_repository = TestCaseRepository(db_manager, request.param)
+    score_history_repository = ScoreHistoryRepository(db_manager)
+    top_scores_repository = TopScoresRepository(db_manager)
+    yield (
+        RecordReadService(score_history_repository, test_case_repository, top_scores_repository),
+        RecordWriteService(db_manager, score_history_repository, test_case_repository, top_scores_repository),
+    )
+    db_manager.close()
+
+
+def submit(
+    services: tuple[RecordReadService, RecordWriteService],
+    calculator: RelativeScoreCalculaterInterface,
+    scores: dict[str, Optional[int]],
+    submit_dir: Path = Path("out"),
+) -> int:
+    """提出時と同じ差分更新の処理でスコアを記録し、提出IDを返します。"""
+    record_read_service, record_write_service = services
+    submission_time = datetime(2024, 1, 1) + timedelta(seconds=record_read_service.fetch_total_record_count())
+
+    test_cases = TestCases()
+    for file_name, score in scores.items():
+        test_cases.add_test_case(TestCase(file_name, score, submit_dir / file_name))
+
+    reserved_record = record_write_service.reserve_empty_score_history_record(
+        submission_time, None, str(test_cases.get_submit_dir())
+    )
+    TestCaseProcessor(
+        record_read_service, record_write_service, calculator, Mock(spec=FileUtility)
+    ).process_test_cases(test_cases, reserved_record.id)
+    ReservedRecordUpdater(record_read_service, record_write_service, calculator).update_reserved_record(
+        reserved_record
+    )
+    RelativeScoreUpdater(record_read_service, record_write_service, calculator).apply_relative_score_updates(
+        [reserved_record.id]
+    )
+    return reserved_record.id
+
+
+def create_deleter(
+    services: tuple[RecordReadService, RecordWriteService],
+    calculator: RelativeScoreCalculaterInterface,
+    file_utility: FileUtility,
+) -> SubmissionDeleter:
+    return SubmissionDeleter(*services, RelativeScoreUpdater(*services, calculator), calculator, file_utility)
+
+
+@pytest.mark.parametrize("calculator", [MaximizationScoring(), MinimizationScoring()])
+@pytest.mark.parametrize("seed", range(5))
+def test_delete_submission_agrees_with_rebuild(
+    services: tuple[RecordReadService, RecordWriteService], calculator: RelativeScoreCalculaterInterface, seed: int
+) -> None:
+    generator = random.Random(seed)
+    file_names = [f"{index:04}.txt" for index in range(6)]
+    for _ in range(10):
+        submit(
+            services,
+            calculator,
+            {
+                file_name: generator.choice([None, generator.randint(1, 10)])
+                for file_name in file_names
+                if generator.random() < 0.8
+            },
+        )
+
+    deleter = create_deleter(services, calculator, Mock(spec=FileUtility))
+    rebuilder = LeaderboardRebuilder(*services, calculator)
+    for submission_id in generator.sample(range(1, 11), 10):
+        deleter.delete_submission(submission_id)
+
+        assert not services[0].exists_id(submission_id)
+        assert rebuilder.check() == []
+        assert services[0].fetch_recently_updated_top_scores() == []
+
+
+def test_delete_submission_updates_only_held_top_scores(
+    services: tuple[RecordReadService, RecordWriteService],
+) -> None:
+    calculator = MinimizationScoring()
+    submit(services, calculator, {"a": 10, "b": 30, "c": None})
+    submit(services, calculator, {"a": 20, "b": 20, "c": None})
+    submit(services, calculator, {"a": 20, "b": None, "d": 5})
+
+    updated_top_scores, removed_file_names = create_deleter(
+        services, calculator, Mock(spec=FileUtility)
+    ).delete_submission(2)
+
+    # 有効なスコアがない c は、そのテストケースを含む最後の提出である提出2がトップスコアを保持していた
+    assert sorted(
+        (top_score.file_name, top_score.top_score, top_score.second_top_score, top_score.submission_id)
+        for top_score in updated_top_scores
+    ) == [("b", 30, 20, 1), ("c", None, None, 1)]
+    assert removed_file_names == []
+    assert {
+        top_score.file_name: (top_score.top_score, top_score.submission_id)
+        for top_score in services[0].fetch_top_score_records()
+    } == {"a": (10, 1), "b": (30, 1), "c": (None, 1), "d": (5, 3)}
+
+
+def test_delete_submission_removes_unused_top_scores(services: tuple[RecordReadService, RecordWriteService]) -> None:
+    calculator = MaximizationScoring()
+    submit(services, calculator, {"a": 10})
+    submit(services, calculator, {"a": 5, "b": 1})
+
+    _, removed_file_names = create_deleter(services, calculator, Mock(spec=FileUtility)).delete_submission(2)
+
+    assert removed_file_names == ["b"]
+    assert services[0].fetch_top_scores() == {"a": 10}
+
+
+def test_restore_top_files(root_dir: Path, services: tuple[RecordReadService, RecordWriteService]) -> None:
+    calculator = MaximizationScoring()
+    for submit_dir in ["out1", "out2"]:
+        (root_dir / submit_dir).mkdir()
+        for file_name in ["a", "b"]:
+            (root_dir / submit_dir / file_name).write_text(f"{submit_dir}/{file_name}")
+    # 提出日時より前に書き込まれた出力ファイルのみ復元できる
+    submitted_at = datetime(2024, 1, 1).timestamp()
+    os.utime(root_dir / "out1" / "a", (submitted_at, submitted_at))
+    os.utime(root_dir / "out1" / "b", (time.time(), time.time()))
+
+    submit(services, calculator, {"a": 10, "b": 10}, root_dir / "out1")
+    submit(services, calculator, {"a": 20, "b": 20, "c": 20}, root_dir / "out2")
+    for file_name in ["a", "b", "c"]:
+        (root_dir / "leader_board" / "top" / file_name).write_text(f"out2/{file_name}")
+
+    deleter = create_deleter(services, calculator, FileUtility())
+    updated_top_scores, removed_file_names = deleter.delete_submission(2)
+
+    assert deleter.restore_top_files(updated_top_scores, removed_file_names) == ["b"]
+    assert sorted(path.name for path in (root_dir / "leader_board" / "top").iterdir()) == ["a"]
+    assert (root_dir / "leader_board" / "top" / "a").read_text() == "out1/a"
+
+
+@pytest.mark.parametrize("submit_dir", [None, "missing"])
+def test_find_submit_file_without_submit_dir(
+    services: tuple[RecordReadService, RecordWriteService], submit_dir: Optional[str]
+) -> None:
+    record_read_service, record_write_service = services
+    record = record_write_service.reserve_empty_score_history_record(datetime(2024, 1, 1), None, submit_dir)
+
+    deleter = create_deleter(services, MaximizationScoring(), FileUtility())
+
+    assert deleter.find_submit_file(TopScoreRecord("a", 1, None, record.id)) is None
@@ -2,24 +2,27 @@ import sqlite3
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Generator, Optional, cast
 from unittest.mock import Mock, patch
 
 import pytest
 
 from ahc_local_leaderboard.consts import get_datetime_format
 from ahc_local_leaderboard.database.database_manager import (
+    CachedTopScoresRepository,
     DatabaseManager,
     ScoreHistoryRepository,
     TestCaseRepository,
     TopScoresRepository,
 )
+from ahc_local_leaderboard.database.transaction_hook import TransactionHookInterface
 from ahc_local_leaderboard.models.detail_score_record import DetailScoreRecords
 from ahc_local_leaderboard.models.summary_score_record import (
     SummaryScoreRecord,
     TopSummaryScoreRecord,
 )
 from ahc_local_leaderboard.models.test_case import TestCase
+from ahc_local_leaderboard.models.top_score_record import TopScoreRecord
 
 
 @pytest.fixture
@@ -51,6 +54,122 @@ def test_database_connection(temp_database: Generator[DatabaseManager, None, Non
         assert isinstance(conn, sqlite3.Connection)
 
 
+def test_database_connection_is_reused(temp_database: DatabaseManager) -> None:
+    db_manager = DatabaseManager()
+    with db_manager as conn1:
+        pass
+    with db_manager as conn2:
+        assert conn1 is conn2
+        conn2.execute("SELECT 1")
+
+    db_manager.close()
+    assert db_manager.connection is None
+
+
+@pytest.mark.parametrize(
+    "pragma, expected_value",
+    [("journal_mode", "wal"), ("synchronous", 1), ("cache_size", -65536), ("temp_store", 2)],
+)
+def test_database_pragmas(temp_database: DatabaseManager, pragma: str, expected_value: object) -> None:
+    db_manager = DatabaseManager()
+    with db_manager as conn:
+        assert conn.execute(f"PRAGMA {pragma}").fetchone()[0] == expected_value
+    db_manager.close()
+
+
+def test_commit_keeps_connection() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir, patch("ahc_local_leaderboard.consts.ROOT_DIR", Path(temp_dir)):
+        (Path(temp_dir) / "leader_board").mkdir()
+        DatabaseManager.setup()
+        db_manager = DatabaseManager()
+
+        db_manager.begin_transaction()
+        conn = db_manager.open()
+        conn.execute("INSERT INTO score_history (submission_time) VALUES ('2024-01-01 00:00:00')")
+        db_manager.commit()
+
+        assert db_manager.connection is conn
+        # 別の接続からもコミットした内容が読める
+        with sqlite3.connect(Path(temp_dir) / "leader_board" / "leader_board.db") as other_conn:
+            assert other_conn.execute("SELECT COUNT(*) FROM score_history").fetchone()[0] == 1
+        db_manager.close()
+
+
+def test_transaction_hooks_are_called_around_transaction() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir, patch("ahc_local_leaderboard.consts.ROOT_DIR", Path(temp_dir)):
+        (Path(temp_dir) / "leader_board").mkdir()
+        DatabaseManager.setup()
+        db_manager = DatabaseManager()
+        hook = Mock(spec=TransactionHookInterface)
+        hook.before_transaction.side_effect = lambda: assert_not_in_transaction(db_manager)
+        hook.after_transaction.side_effect = lambda: assert_not_in_transaction(db_manager)
+        db_manager.add_transaction_hook(hook)
+
+        db_manager.begin_transaction()
+        hook.before_transaction.assert_called_once()
+        hook.after_transaction.assert_not_called()
+        db_manager.commit()
+        hook.after_transaction.assert_called_once()
+
+        hook.after_rollback.assert_not_called()
+
+        db_manager.begin_transaction()
+        db_manager.rollback()
+        assert hook.before_transaction.call_count == 2
+        assert hook.after_transaction.call_count == 2
+        hook.after_rollback.assert_called_once()
+        db_manager.close()
+
+
+def test_set_trace_callback() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir, patch("ahc_local_leaderboard.consts.ROOT_DIR", Path(temp_dir)):
+        (Path(temp_dir) / "leader_board").mkdir()
+        DatabaseManager.setup()
+        db_manager = DatabaseManager()
+        statements: list[str] = []
+
+        # 接続済みの接続と、設定後に開いた接続の両方に設定される
+        db_manager.open().execute("SELECT 1")
+        db_manager.set_trace_callback(statements.append)
+        db_manager.open().execute("SELECT 2")
+        db_manager.close()
+        db_manager.open().execute("SELECT 3")
+        assert "SELECT 2" in statements
+        assert "SELECT 3" in statements
+        assert "SELECT 1" not in statements
+
+        db_manager.set_trace_callback(None)
+        db_manager.open().execute("SELECT 4")
+        assert "SELECT 4" not in statements
+        db_manager.close()
+
+
+def assert_not_in_transaction(db_manager: DatabaseManager) -> None:
+    assert not db_manager.transaction_mode
+    assert db_manager.connection is None or not db_manager.connection.in_transaction
+
+
+def test_close_is_deferred_during_transaction(temp_database: DatabaseManager) -> None:
+    temp_database.close()
+    assert temp_database.connection is not None
+
+
+def test_reconnects_when_database_path_changes() -> None:
+    db_manager = DatabaseManager()
+    with tempfile.TemporaryDirectory() as temp_dir1, tempfile.TemporaryDirectory() as temp_dir2:
+        for temp_dir in [temp_dir1, temp_dir2]:
+            (Path(temp_dir) / "leader_board").mkdir()
+
+        with patch("ahc_local_leaderboard.consts.ROOT_DIR", Path(temp_dir1)):
+            conn1 = db_manager.open()
+        with patch("ahc_local_leaderboard.consts.ROOT_DIR", Path(temp_dir2)):
+            conn2 = db_manager.open()
+
+        assert conn1 is not conn2
+        assert (Path(temp_dir2) / "leader_board" / "leader_board.db").exists()
+        db_manager.close()
+
+
 def test_score_history_table_exists(temp_database: Generator[DatabaseManager, None, None]) -> None:
 
     with DatabaseManager() as conn:
@@ -113,6 +232,32 @@ def test_update_score_history(score_history_repository: ScoreHistoryRepository)
     assert updated_record.relative_rank == 10
 
 
+def test_update_score_histories(score_history_repository: ScoreHistoryRepository) -> None:
+
+    records = [
+        score_history_repository.reserve_empty_score_history_record(datetime(2024, 1, 1) + timedelta(seconds=i))
+        for i in range(3)
+    ]
+
+    for rank, record in enumerate(records, 1):
+        record.total_relative_score = 100 * rank
+        record.relative_rank = rank
+    score_history_repository.update_score_histories(records)
+
+    # 指定したレコードのみが更新される
+    records[0].relative_rank = 3
+    records[2].relative_rank = 1
+    score_history_repository.update_score_histories([records[0], records[2]])
+    score_history_repository.update_score_histories([])
+
+    fetched_records = score_history_repository.fetch_all_records()
+    assert [(record.total_relative_score, record.relative_rank) for record in fetched_records] == [
+        (100, 3),
+        (200, 2),
+        (300, 1),
+    ]
+
+
 def test_fetch_summary_record_by_id(score_history_repository: ScoreHistoryRepository) -> None:
 
     submission_time = get_now_time()
@@ -209,6 +354,24 @@ def test_fetch_recent_summary_records(score_history_repository: ScoreHistoryRepo
     assert recent_records.records[0].relative_rank == record2.relative_rank
 
 
+def test_fetch_top_ranked_summary_records(score_history_repository: ScoreHistoryRepository) -> None:
+
+    ranks = [2, None, 1, 3]
+    records = []
+    for i, rank in enumerate(ranks):
+        record = score_history_repository.reserve_empty_score_history_record(get_now_time() + timedelta(seconds=i))
+        record.relative_rank = rank
+        score_history_repository.update_score_history(record)
+        records.append(record)
+
+    top_records = score_history_repository.fetch_top_ranked_summary_records(2)
+    assert [record.id for record in top_records] == [records[2].id, records[0].id]
+
+    # 順位が付いていない提出は含めない
+    top_records = score_history_repository.fetch_top_ranked_summary_records(10)
+    assert [record.relative_rank for record in top_records] == [1, 2, 3]
+
+
 def test_exists_id(score_history_repository: ScoreHistoryRepository) -> None:
 
     submission_time = get_now_time()
@@ -218,6 +381,17 @@ def test_exists_id(score_history_repository: ScoreHistoryRepository) -> None:
     assert score_history_repository.exists_id(record.id + 1) is False
 
 
+def test_exists_fingerprint(score_history_repository: ScoreHistoryRepository) -> None:
+
+    score_history_repository.reserve_empty_score_history_record(datetime(2024, 1, 1), "fingerprint1")
+    score_history_repository.reserve_empty_score_history_record(datetime(2024, 1, 2))
+    # ハッシュ値が同じ提出も記録できる
+    score_history_repository.reserve_empty_score_history_record(datetime(2024, 1, 3), "fingerprint1")
+
+    assert score_history_repository.exists_fingerprint("fingerprint1")
+    assert not score_history_repository.exists_fingerprint("fingerprint2")
+
+
 @pytest.mark.parametrize("total_record_count", [0, 1, 100])
 def test_fetch_total_record_count(score_history_repository: ScoreHistoryRepository, total_record_count: int) -> None:
 
@@ -283,9 +457,10 @@ def test_insert_test_case(test_case_repository: TestCaseRepository) -> None:
         cursor = conn.cursor()
         cursor.execute(
             """
-            SELECT test_case_input, absolute_score, score_history_id
-            FROM test_cases
-            WHERE test_case_input = ? AND score_history_id = ?
+            SELECT c.name, tc.absolute_score, tc.score_history_id
+            FROM test_cases AS tc
+            JOIN cases AS c ON tc.case_id = c.id
+            WHERE c.name = ? AND tc.score_history_id = ?
             """,
             (test_case.file_name, score_history_id),
         )
@@ -297,6 +472,26 @@ def test_insert_test_case(test_case_repository: TestCaseRepository) -> None:
     assert result[2] == score_history_id
 
 
+def test_insert_test_cases(test_case_repository: TestCaseRepository) -> None:
+
+    test_cases = [generate_mock_test_case(f"{i:04}.txt", i if i % 3 else None) for i in range(100)]
+    score_history_id = 1
+
+    test_case_repository.insert_test_cases(cast(list[TestCase], test_cases), score_history_id)  # mypy用のcast
+    test_case_repository.insert_test_cases([], score_history_id)
+
+    with test_case_repository.db_manager as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT c.name, tc.absolute_score FROM test_cases AS tc JOIN cases AS c ON tc.case_id = c.id "
+            "WHERE tc.score_history_id = ? ORDER BY tc.id",
+            (score_history_id,),
+        )
+        rows = cursor.fetchall()
+
+    assert rows == [(test_case.file_name, test_case.score) for test_case in test_cases]
+
+
 def test_fetch_absolute_score_for_test_case(test_case_repository: TestCaseRepository) -> None:
 
     expected_score = 75
@@ -312,6 +507,26 @@ def test_fetch_absolute_score_for_test_case(test_case_repository: TestCaseReposi
         test_case_repository.fetch_absolute_score_for_test_case("non_existent.txt", score_history_id)
 
 
+def test_fetch_absolute_scores_for_updated_top_scores(test_case_repository: TestCaseRepository) -> None:
+
+    top_scores_repository = TopScoresRepository(test_case_repository.db_manager)
+    top_scores_repository.update_top_score(generate_mock_test_case("test1.txt", 10), 1)
+    top_scores_repository.update_top_score(generate_mock_test_case("test2.txt", 20), 1)
+    top_scores_repository.reset_is_updated_flags()
+    top_scores_repository.update_top_score(generate_mock_test_case("test1.txt", 5), 3)
+
+    test_case_repository.insert_test_case(generate_mock_test_case("test1.txt", 10), 1)
+    test_case_repository.insert_test_case(generate_mock_test_case("test2.txt", 20), 1)
+    test_case_repository.insert_test_case(generate_mock_test_case("test1.txt", None), 2)
+    test_case_repository.insert_test_case(generate_mock_test_case("test2.txt", 30), 2)
+    test_case_repository.insert_test_case(generate_mock_test_case("test1.txt", 5), 3)
+
+    absolute_scores = test_case_repository.fetch_absolute_scores_for_updated_top_scores()
+
+    # トップスコアが更新された test1.txt のみ取得される
+    assert absolute_scores == {1: {"test1.txt": 10}, 2: {"test1.txt": None}, 3: {"test1.txt": 5}}
+
+
 def test_fetch_records_by_id(test_case_repository: TestCaseRepository) -> None:
 
     test_case1 = generate_mock_test_case("test3.txt", 20)
@@ -330,6 +545,73 @@ def test_fetch_records_by_id(test_case_repository: TestCaseRepository) -> None:
     assert records.records[1].absolute_score == 40
 
 
+@pytest.fixture
+def score_vector_repository(temp_database: DatabaseManager) -> TestCaseRepository:
+    score_history_repository = ScoreHistoryRepository(temp_database)
+    for i in range(3):
+        score_history_repository.reserve_empty_score_history_record(datetime(2024, 1, 1) + timedelta(seconds=i))
+    return TestCaseRepository(temp_database, score_vector_storage=True)
+
+
+def test_insert_test_cases_as_score_vector(score_vector_repository: TestCaseRepository) -> None:
+
+    score_vector_repository.insert_test_cases(
+        [generate_mock_test_case("test1.txt", 10), generate_mock_test_case("test2.txt", None)], 1
+    )
+    score_vector_repository.insert_test_case(generate_mock_test_case("test3.txt", 30), 1)
+
+    with score_vector_repository.db_manager as conn:
+        assert conn.execute("SELECT COUNT(*) FROM test_cases").fetchone()[0] == 0
+
+    records = score_vector_repository.fetch_records_by_id(1)
+    assert [(record.file_name, record.absolute_score) for record in records.records] == [
+        ("test1.txt", 10),
+        ("test2.txt", None),
+        ("test3.txt", 30),
+    ]
+    assert score_vector_repository.fetch_absolute_score_for_test_case("test2.txt", 1) is None
+    assert score_vector_repository.fetch_absolute_score_for_test_case("test3.txt", 1) == 30
+
+    with pytest.raises(ValueError):
+        score_vector_repository.fetch_absolute_score_for_test_case("test3.txt", 2)
+    with pytest.raises(ValueError):
+        score_vector_repository.fetch_absolute_score_for_test_case("missing.txt", 1)
+    with pytest.raises(sqlite3.IntegrityError):
+        score_vector_repository.insert_test_case(generate_mock_test_case("test1.txt", 20), 1)
+    with pytest.raises(ValueError):
+        score_vector_repository.insert_test_case(generate_mock_test_case("test1.txt", 20), 100)
+
+
+def test_fetch_absolute_scores_for_updated_top_scores_with_mixed_storage(
+    score_vector_repository: TestCaseRepository,
+) -> None:
+
+    top_scores_repository = TopScoresRepository(score_vector_repository.db_manager)
+    top_scores_repository.update_top_scores(
+        [generate_mock_test_case("test1.txt", 10), generate_mock_test_case("test2.txt", 20)], 1
+    )
+    top_scores_repository.reset_is_updated_flags()
+    top_scores_repository.update_top_scores([generate_mock_test_case("test2.txt", 5)], 3)
+
+    # 提出1は行として、提出2と3は ScoreVector として記録されている
+    row_repository = TestCaseRepository(score_vector_repository.db_manager)
+    row_repository.insert_test_cases(
+        [generate_mock_test_case("test1.txt", 10), generate_mock_test_case("test2.txt", 20)], 1
+    )
+    score_vector_repository.insert_test_cases([generate_mock_test_case("test1.txt", 15)], 2)
+    score_vector_repository.insert_test_cases(
+        [generate_mock_test_case("test1.txt", 30), generate_mock_test_case("test2.txt", 5)], 3
+    )
+
+    absolute_scores = score_vector_repository.fetch_absolute_scores_for_updated_top_scores()
+
+    assert absolute_scores == {1: {"test2.txt": 20}, 3: {"test2.txt": 5}}
+    assert [
+        (record.file_name, record.absolute_score, record.top_score)
+        for record in score_vector_repository.fetch_records_by_id(3).records
+    ] == [("test1.txt", 30, 10), ("test2.txt", 5, 5)]
+
+
 @pytest.fixture
 def top_scores_repository(temp_database: DatabaseManager) -> TopScoresRepository:
     return TopScoresRepository(temp_database)
@@ -346,7 +628,8 @@ def test_update_top_score(top_scores_repository: TopScoresRepository) -> None:
     with top_scores_repository.db_manager as conn:
         cursor = conn.cursor()
         cursor.execute(
-            "SELECT top_absolute_score, score_history_id FROM top_scores WHERE test_case_input = ?",
+            "SELECT ts.top_absolute_score, ts.score_history_id FROM top_scores AS ts "
+            "JOIN cases AS c ON ts.case_id = c.id WHERE c.name = ?",
             (test_case.file_name,),
         )
         result = cursor.fetchone()
@@ -356,6 +639,57 @@ def test_update_top_score(top_scores_repository: TopScoresRepository) -> None:
     assert result[1] == score_history_id
 
 
+def test_update_top_score_keeps_second_top_score_until_reset(top_scores_repository: TopScoresRepository) -> None:
+
+    top_scores_repository.update_top_score(generate_mock_test_case("test1.txt", 100), 1)
+    top_scores_repository.reset_is_updated_flags()
+
+    # 同じ更新の間に複数回更新された場合、セカンドトップスコアは更新前のトップスコアのまま
+    top_scores_repository.update_top_score(generate_mock_test_case("test1.txt", 90), 2)
+    top_scores_repository.update_top_score(generate_mock_test_case("test1.txt", 80), 3)
+
+    updated_top_scores = top_scores_repository.fetch_recently_updated_top_scores()
+    assert [(score.top_score, score.second_top_score) for score in updated_top_scores] == [(80, 100)]
+
+    top_scores_repository.reset_is_updated_flags()
+    top_scores_repository.update_top_score(generate_mock_test_case("test1.txt", 70), 4)
+
+    updated_top_scores = top_scores_repository.fetch_recently_updated_top_scores()
+    assert [(score.top_score, score.second_top_score) for score in updated_top_scores] == [(70, 80)]
+
+
+def test_update_top_scores(top_scores_repository: TopScoresRepository) -> None:
+
+    top_scores_repository.update_top_scores(
+        [generate_mock_test_case("test1.txt", 100), generate_mock_test_case("test2.txt", None)], 1
+    )
+    top_scores_repository.reset_is_updated_flags()
+
+    # 同じ更新の間に複数回更新された場合、セカンドトップスコアは更新前のトップスコアのまま
+    top_scores_repository.update_top_scores(
+        [generate_mock_test_case("test1.txt", 90), generate_mock_test_case("test3.txt", 10)], 2
+    )
+    top_scores_repository.update_top_scores([generate_mock_test_case("test1.txt", 80)], 3)
+
+    updated_top_scores = top_scores_repository.fetch_recently_updated_top_scores()
+    assert sorted((score.file_name, score.top_score, score.second_top_score) for score in updated_top_scores) == [
+        ("test1.txt", 80, 100),
+        ("test3.txt", 10, None),
+    ]
+    assert top_scores_repository.fetch_top_scores() == {"test1.txt": 80, "test2.txt": None, "test3.txt": 10}
+
+    with top_scores_repository.db_manager as conn:
+        rows = conn.execute(
+            "SELECT c.name, ts.score_history_id FROM top_scores AS ts JOIN cases AS c ON ts.case_id = c.id "
+            "ORDER BY c.name"
+        )
+        assert rows.fetchall() == [("test1.txt", 3), ("test2.txt", 1), ("test3.txt", 2)]
+
+
+def test_fetch_top_scores_empty(top_scores_repository: TopScoresRepository) -> None:
+    assert top_scores_repository.fetch_top_scores() == {}
+
+
 def test_fetch_top_score_for_test_case(top_scores_repository: TopScoresRepository) -> None:
 
     expected_top_score = 150
@@ -443,3 +777,85 @@ def test_fetch_top_detail_records(top_scores_repository: TopScoresRepository) ->
     assert detail_records.records[0].top_score == 500
     assert detail_records.records[1].file_name == "test11.txt"
     assert detail_records.records[1].top_score == 550
+
+
+@pytest.fixture
+def cached_top_scores_repository() -> Generator[CachedTopScoresRepository, None, None]:
+
+    with tempfile.TemporaryDirectory() as temp_dir, patch("ahc_local_leaderboard.consts.ROOT_DIR", Path(temp_dir)):
+        (Path(temp_dir) / "leader_board").mkdir(parents=True, exist_ok=True)
+        db_manager = DatabaseManager()
+        db_manager.setup()
+        repository = CachedTopScoresRepository(db_manager)
+        db_manager.add_transaction_hook(repository)
+        yield repository
+        db_manager.close()
+
+
+def test_cached_top_scores_are_not_read_again(cached_top_scores_repository: CachedTopScoresRepository) -> None:
+
+    cached_top_scores_repository.update_top_scores([generate_mock_test_case("test1.txt", 100)], 1)
+    assert cached_top_scores_repository.fetch_top_scores() == {"test1.txt": 100}
+
+    statements: list[str] = []
+    cached_top_scores_repository.db_manager.set_trace_callback(statements.append)
+    assert cached_top_scores_repository.fetch_top_scores() == {"test1.txt": 100}
+    assert cached_top_scores_repository.fetch_top_score_for_test_case(generate_mock_test_case("test1.txt", 0)) == 100
+    assert not any("FROM top_scores" in statement for statement in statements)
+
+    # 返した辞書を変更してもキャッシュには影響しない
+    cached_top_scores_repository.fetch_top_scores()["test1.txt"] = 0
+    assert cached_top_scores_repository.fetch_top_scores() == {"test1.txt": 100}
+
+
+def test_cached_top_scores_follow_own_writes(cached_top_scores_repository: CachedTopScoresRepository) -> None:
+
+    db_manager = cached_top_scores_repository.db_manager
+    uncached_repository = TopScoresRepository(db_manager)
+    assert cached_top_scores_repository.fetch_top_scores() == {}
+
+    db_manager.begin_transaction()
+    cached_top_scores_repository.update_top_scores(
+        [generate_mock_test_case("test1.txt", 100), generate_mock_test_case("test2.txt", None)], 1
+    )
+    cached_top_scores_repository.update_top_score(generate_mock_test_case("test3.txt", 30), 1)
+    db_manager.commit()
+    assert cached_top_scores_repository.fetch_top_scores() == uncached_repository.fetch_top_scores()
+
+    cached_top_scores_repository.replace_top_scores([TopScoreRecord("test1.txt", 50, None, 1)])
+    assert cached_top_scores_repository.fetch_top_scores() == {"test1.txt": 50}
+
+    cached_top_scores_repository.update_top_score_records([TopScoreRecord("test2.txt", 20, None, 1)])
+    cached_top_scores_repository.delete_top_scores(["test1.txt"])
+    assert cached_top_scores_repository.fetch_top_scores() == {"test2.txt": 20}
+
+
+def test_cached_top_scores_are_discarded_on_rollback(
+    cached_top_scores_repository: CachedTopScoresRepository,
+) -> None:
+
+    db_manager = cached_top_scores_repository.db_manager
+    cached_top_scores_repository.update_top_scores([generate_mock_test_case("test1.txt", 100)], 1)
+    assert cached_top_scores_repository.fetch_top_scores() == {"test1.txt": 100}
+
+    db_manager.begin_transaction()
+    cached_top_scores_repository.update_top_scores([generate_mock_test_case("test1.txt", 90)], 2)
+    assert cached_top_scores_repository.fetch_top_scores() == {"test1.txt": 90}
+    db_manager.rollback()
+
+    assert cached_top_scores_repository.fetch_top_scores() == {"test1.txt": 100}
+
+
+def test_cached_top_scores_are_reloaded_after_other_connection_commits(
+    cached_top_scores_repository: CachedTopScoresRepository,
+) -> None:
+
+    cached_top_scores_repository.update_top_scores([generate_mock_test_case("test1.txt", 100)], 1)
+    assert cached_top_scores_repository.fetch_top_scores() == {"test1.txt": 100}
+
+    # 別のプロセスからの提出を、別の DatabaseManager の接続で再現する
+    other_db_manager = DatabaseManager()
+    TopScoresRepository(other_db_manager).update_top_scores([generate_mock_test_case("test1.txt", 80)], 2)
+    other_db_manager.close()
+
+    assert cached_top_scores_repository.fetch_top_scores() == {"test1.txt": 80}
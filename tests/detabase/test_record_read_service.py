@@ -65,6 +65,19 @@ def test_fetch_recent_summary_records(
     score_history_repo.fetch_recent_summary_records.assert_called_once_with(limit)
 
 
+@pytest.mark.parametrize("limit", [1, 10, 100])
+def test_fetch_top_ranked_summary_records(
+    service: RecordReadService, mock_repos: tuple[MagicMock, MagicMock, MagicMock], limit: int
+) -> None:
+    score_history_repo, _, _ = mock_repos
+    mock_data = Mock(spec=SummaryScoreRecords)
+    score_history_repo.fetch_top_ranked_summary_records.return_value = mock_data
+
+    result = service.fetch_top_ranked_summary_records(limit)
+    assert result == mock_data
+    score_history_repo.fetch_top_ranked_summary_records.assert_called_once_with(limit)
+
+
 @pytest.mark.parametrize("limit", [-100, -10, 0])
 def test_fetch_recent_summary_records_assertions(
     service: RecordReadService, mock_repos: tuple[MagicMock, MagicMock, MagicMock], limit: int
@@ -114,6 +127,17 @@ def test_exists_id(
     assert service.exists_id(temp_id) == result
 
 
+@pytest.mark.parametrize("exists", [True, False])
+def test_exists_fingerprint(
+    service: RecordReadService, mock_repos: tuple[MagicMock, MagicMock, MagicMock], exists: bool
+) -> None:
+    score_history_repo, _, _ = mock_repos
+    score_history_repo.exists_fingerprint.return_value = exists
+
+    assert service.exists_fingerprint("fingerprint") is exists
+    score_history_repo.exists_fingerprint.assert_called_once_with("fingerprint")
+
+
 @pytest.mark.parametrize("total_record_count", [0, 1, 100])
 def test_fetch_total_record_count(
     service: RecordReadService, mock_repos: tuple[MagicMock, MagicMock, MagicMock], total_record_count: int
@@ -188,6 +212,18 @@ def test_fetch_absolute_score_for_test_case_assertions(
         service.fetch_absolute_score_for_test_case("test_case_name", submission_id)
 
 
+def test_fetch_absolute_scores_for_updated_top_scores(
+    service: RecordReadService, mock_repos: tuple[MagicMock, MagicMock, MagicMock]
+) -> None:
+    _, test_case_repo, _ = mock_repos
+    mock_data = {1: {"test_case_name": 100}}
+    test_case_repo.fetch_absolute_scores_for_updated_top_scores.return_value = mock_data
+
+    result = service.fetch_absolute_scores_for_updated_top_scores()
+    assert result == mock_data
+    test_case_repo.fetch_absolute_scores_for_updated_top_scores.assert_called_once()
+
+
 def test_fetch_top_summary_record(
     service: RecordReadService, mock_repos: tuple[MagicMock, MagicMock, MagicMock]
 ) -> None:
@@ -248,6 +284,16 @@ def test_fetch_top_score_for_test_case(
     top_score_repo.fetch_top_score_for_test_case.assert_called_once_with(test_case)
 
 
+def test_fetch_top_scores(service: RecordReadService, mock_repos: tuple[MagicMock, MagicMock, MagicMock]) -> None:
+    _, _, top_score_repo = mock_repos
+    mock_data = {"0000.txt": 200, "0001.txt": None}
+    top_score_repo.fetch_top_scores.return_value = mock_data
+
+    result = service.fetch_top_scores()
+    assert result == mock_data
+    top_score_repo.fetch_top_scores.assert_called_once()
+
+
 def test_fetch_recently_updated_top_scores(
     service: RecordReadService, mock_repos: tuple[MagicMock, MagicMock, MagicMock]
 ) -> None:
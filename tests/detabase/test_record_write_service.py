@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import cast
 from unittest.mock import MagicMock, Mock
 
 import pytest
@@ -31,6 +32,16 @@ def test_setup_database(
     database_manager.setup.assert_called_once()
 
 
+@pytest.mark.parametrize("enabled", [True, False])
+def test_set_score_vector_storage(
+    service: RecordWriteService, mock_repos: tuple[MagicMock, MagicMock, MagicMock, MagicMock], enabled: bool
+) -> None:
+    _, _, test_case_repo, _ = mock_repos
+
+    service.set_score_vector_storage(enabled)
+    assert test_case_repo.score_vector_storage == enabled
+
+
 def test_reserve_empty_score_history_record(
     service: RecordWriteService, mock_repos: tuple[MagicMock, MagicMock, MagicMock, MagicMock]
 ) -> None:
@@ -41,7 +52,10 @@ def test_reserve_empty_score_history_record(
 
     result = service.reserve_empty_score_history_record(submission_time)
     assert result == mock_record
-    score_history_repo.reserve_empty_score_history_record.assert_called_once_with(submission_time)
+    score_history_repo.reserve_empty_score_history_record.assert_called_once_with(submission_time, None, None)
+
+    service.reserve_empty_score_history_record(submission_time, "fingerprint", "out")
+    score_history_repo.reserve_empty_score_history_record.assert_called_with(submission_time, "fingerprint", "out")
 
 
 @pytest.mark.parametrize("submission_id", [1, 10, 100])
@@ -56,6 +70,19 @@ def test_update_score_history(
     score_history_repo.update_score_history.assert_called_once_with(mock_record)
 
 
+def test_update_score_histories(
+    service: RecordWriteService, mock_repos: tuple[MagicMock, MagicMock, MagicMock, MagicMock]
+) -> None:
+    _, score_history_repo, _, _ = mock_repos
+    mock_records = [Mock(SummaryScoreRecord, id=1), Mock(SummaryScoreRecord, id=2)]
+
+    service.update_score_histories(cast(list[SummaryScoreRecord], mock_records))  # mypy用のcast
+    score_history_repo.update_score_histories.assert_called_once_with(mock_records)
+
+    with pytest.raises(AssertionError):
+        service.update_score_histories([Mock(SummaryScoreRecord, id=0)])
+
+
 @pytest.mark.parametrize("submission_id", [-100, -10, 0])
 def test_update_score_history_assertions(
     service: RecordWriteService, mock_repos: tuple[MagicMock, MagicMock, MagicMock, MagicMock], submission_id: int
@@ -88,6 +115,17 @@ def test_insert_test_case_assertions(
         service.insert_test_case(mock_test_case, submission_id)
 
 
+@pytest.mark.parametrize("submission_id", [1, 10, 100])
+def test_insert_test_cases(
+    service: RecordWriteService, mock_repos: tuple[MagicMock, MagicMock, MagicMock, MagicMock], submission_id: int
+) -> None:
+    _, _, test_case_repo, _ = mock_repos
+    mock_test_cases = [Mock(spec=TestCase), Mock(spec=TestCase)]
+
+    service.insert_test_cases(cast(list[TestCase], mock_test_cases), submission_id)  # mypy用のcast
+    test_case_repo.insert_test_cases.assert_called_once_with(mock_test_cases, submission_id)
+
+
 @pytest.mark.parametrize("submission_id", [1, 10, 100])
 def test_update_top_score(
     service: RecordWriteService, mock_repos: tuple[MagicMock, MagicMock, MagicMock, MagicMock], submission_id: int
@@ -109,6 +147,28 @@ def test_update_top_score_assertions(
         service.update_top_score(mock_test_case, submission_id)
 
 
+@pytest.mark.parametrize("submission_id", [1, 10, 100])
+def test_update_top_scores(
+    service: RecordWriteService, mock_repos: tuple[MagicMock, MagicMock, MagicMock, MagicMock], submission_id: int
+) -> None:
+    _, _, _, top_score_repo = mock_repos
+    mock_test_cases = [Mock(spec=TestCase), Mock(spec=TestCase)]
+
+    service.update_top_scores(cast(list[TestCase], mock_test_cases), submission_id)  # mypy用のcast
+    top_score_repo.update_top_scores.assert_called_once_with(mock_test_cases, submission_id)
+
+
+@pytest.mark.parametrize("submission_id", [-100, -10, 0])
+def test_bulk_write_assertions(
+    service: RecordWriteService, mock_repos: tuple[MagicMock, MagicMock, MagicMock, MagicMock], submission_id: int
+) -> None:
+
+    with pytest.raises(AssertionError):
+        service.insert_test_cases([], submission_id)
+    with pytest.raises(AssertionError):
+        service.update_top_scores([], submission_id)
+
+
 def test_reset_is_updated_flags(
     service: RecordWriteService, mock_repos: tuple[MagicMock, MagicMock, MagicMock, MagicMock]
 ) -> None:
@@ -0,0 +1,201 @@
+import sqlite3
+from pathlib import Path
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+from ahc_local_leaderboard.database.database_manager import (
+    DatabaseManager,
+    TestCaseRepository,
+    TopScoresRepository,
+)
+from ahc_local_leaderboard.database.schema_migrator import Migration, SchemaMigrator
+from ahc_local_leaderboard.database.score_vector import ScoreVector
+from ahc_local_leaderboard.models.test_case import TestCases
+
+
+@pytest.fixture
+def root_dir(tmp_path: Path) -> Generator[Path, None, None]:
+    (tmp_path / "leader_board").mkdir()
+    with patch("ahc_local_leaderboard.consts.ROOT_DIR", tmp_path):
+        yield tmp_path
+
+
+def create_legacy_database(root_dir: Path) -> Path:
+    db_path = root_dir / "leader_board" / "leader_board.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(DatabaseManager.SCORE_HISTORY_TABLE)
+        conn.execute(DatabaseManager.TEST_CASES_TABLE)
+        conn.execute(DatabaseManager.TOP_SCORES_TABLE)
+        conn.execute("INSERT INTO score_history (submission_time) VALUES ('2024-01-01 00:00:00')")
+    conn.close()
+    return db_path
+
+
+def fetch_index_names(conn: sqlite3.Connection) -> set[str]:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_setup_applies_all_migrations(root_dir: Path) -> None:
+    DatabaseManager.setup()
+
+    with sqlite3.connect(root_dir / "leader_board" / "leader_board.db") as conn:
+        assert SchemaMigrator.fetch_version(conn) == SchemaMigrator.get_latest_version()
+        assert {"idx_test_cases_score_history_id", "idx_score_history_total_absolute_score"} <= fetch_index_names(conn)
+    conn.close()
+
+
+def test_open_upgrades_legacy_database(root_dir: Path) -> None:
+    create_legacy_database(root_dir)
+
+    db_manager = DatabaseManager()
+    with db_manager as conn:
+        assert SchemaMigrator.fetch_version(conn) == SchemaMigrator.get_latest_version()
+        assert "idx_test_cases_score_history_id" in fetch_index_names(conn)
+        # 既存のデータは保持される
+        assert conn.execute("SELECT COUNT(*) FROM score_history").fetchone()[0] == 1
+    db_manager.close()
+
+
+def test_open_normalizes_case_names(root_dir: Path) -> None:
+    db_path = create_legacy_database(root_dir)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO score_history (submission_time) VALUES ('2024-01-02 00:00:00')")
+        conn.executemany(
+            "INSERT INTO test_cases (test_case_input, absolute_score, score_history_id) VALUES (?, ?, ?)",
+            [("0001.txt", 10, 1), ("0000.txt", None, 1), ("0001.txt", 30, 2), ("0000.txt", 20, 2)],
+        )
+        conn.executemany(
+            "INSERT INTO top_scores (test_case_input, top_absolute_score, second_top_score, is_updated, "
+            "score_history_id) VALUES (?, ?, ?, ?, ?)",
+            [("0001.txt", 30, 10, True, 2), ("0000.txt", 20, None, False, 2)],
+        )
+    conn.close()
+
+    db_manager = DatabaseManager()
+    test_case_repository = TestCaseRepository(db_manager)
+    top_scores_repository = TopScoresRepository(db_manager)
+
+    with db_manager as conn:
+        assert conn.execute("SELECT name FROM cases ORDER BY id").fetchall() == [("0000.txt",), ("0001.txt",)]
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(test_cases)")}
+        assert "case_id" in columns and "test_case_input" not in columns
+
+    assert {
+        record.file_name: record.absolute_score for record in test_case_repository.fetch_records_by_id(1).records
+    } == {
+        "0000.txt": None,
+        "0001.txt": 10,
+    }
+    assert test_case_repository.fetch_absolute_scores_for_updated_top_scores() == {
+        1: {"0001.txt": 10},
+        2: {"0001.txt": 30},
+    }
+    assert top_scores_repository.fetch_top_scores() == {"0000.txt": 20, "0001.txt": 30}
+    assert [
+        (score.file_name, score.top_score, score.second_top_score)
+        for score in top_scores_repository.fetch_recently_updated_top_scores()
+    ] == [("0001.txt", 30, 10)]
+    db_manager.close()
+
+
+def test_migrate_backfills_fingerprints(root_dir: Path) -> None:
+    conn = sqlite3.connect(create_legacy_database(root_dir), isolation_level=None)
+    conn.execute("INSERT INTO score_history (submission_time) VALUES ('2024-01-02 00:00:00')")
+    conn.executemany(
+        "INSERT INTO test_cases (test_case_input, absolute_score, score_history_id) VALUES (?, ?, ?)",
+        [("0001.txt", 10, 1), ("0000.txt", None, 1)],
+    )
+
+    # 提出2は ScoreVector として記録されている
+    with patch.object(
+        SchemaMigrator, "MIGRATIONS", [migration for migration in SchemaMigrator.MIGRATIONS if migration.version <= 3]
+    ):
+        SchemaMigrator.migrate(conn)
+    conn.execute("UPDATE score_history SET score_vector = ? WHERE id = 2", (ScoreVector.pack({1: 5, 2: 10}),))
+
+    SchemaMigrator.migrate(conn)
+
+    fingerprints = dict(conn.execute("SELECT id, fingerprint FROM score_history").fetchall())
+    assert fingerprints[1] == TestCases.generate_fingerprint([("0000.txt", None), ("0001.txt", 10)])
+    assert fingerprints[2] == TestCases.generate_fingerprint([("0000.txt", 5), ("0001.txt", 10)])
+    conn.close()
+
+
+def test_backfilled_fingerprints_do_not_depend_on_current_algorithm(root_dir: Path) -> None:
+    conn = sqlite3.connect(create_legacy_database(root_dir), isolation_level=None)
+    conn.execute("INSERT INTO score_history (submission_time) VALUES ('2024-01-02 00:00:00')")
+    conn.executemany(
+        "INSERT INTO test_cases (test_case_input, absolute_score, score_history_id) VALUES (?, ?, ?)",
+        [("0001.txt", 10, 1), ("0000.txt", None, 1)],
+    )
+
+    # 現在のハッシュ値の計算方法が変わっても、マイグレーション4の時点と同じ値を設定する
+    with patch.object(TestCases, "generate_fingerprint", return_value="changed"):
+        SchemaMigrator.migrate(conn)
+
+    fingerprints = dict(conn.execute("SELECT id, fingerprint FROM score_history").fetchall())
+    assert fingerprints[1] == "5a8165828d6190f36ec62697b740d5ab099f28c3590a141b342444a86aab380a"
+    conn.close()
+
+
+def test_migrate_skips_uninitialized_database() -> None:
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+
+    assert SchemaMigrator.migrate(conn) == []
+    assert SchemaMigrator.fetch_version(conn) == 0
+    conn.close()
+
+
+def test_migrate_is_idempotent(root_dir: Path) -> None:
+    conn = sqlite3.connect(create_legacy_database(root_dir), isolation_level=None)
+
+    assert [migration.version for migration in SchemaMigrator.migrate(conn)] == [
+        migration.version for migration in SchemaMigrator.MIGRATIONS
+    ]
+    assert SchemaMigrator.migrate(conn) == []
+    conn.close()
+
+
+def test_failed_migration_is_rolled_back(root_dir: Path) -> None:
+    conn = sqlite3.connect(create_legacy_database(root_dir), isolation_level=None)
+    latest_version = SchemaMigrator.get_latest_version()
+    broken_migration = Migration(
+        latest_version + 1,
+        "broken",
+        ["CREATE INDEX idx_broken ON score_history (submission_time)", "CREATE INDEX idx_broken ON missing (id)"],
+    )
+
+    with patch.object(SchemaMigrator, "MIGRATIONS", SchemaMigrator.MIGRATIONS + [broken_migration]):
+        with pytest.raises(sqlite3.OperationalError):
+            SchemaMigrator.migrate(conn)
+
+    assert SchemaMigrator.fetch_version(conn) == latest_version
+    assert "idx_broken" not in fetch_index_names(conn)
+    conn.close()
+
+
+@pytest.mark.parametrize(
+    "query, expected_index",
+    [
+        ("SELECT * FROM test_cases WHERE score_history_id = 1", "idx_test_cases_score_history_id"),
+        ("SELECT * FROM top_scores WHERE case_id = 1", "sqlite_autoindex_top_scores_1"),
+        ("SELECT * FROM score_history WHERE total_absolute_score = 1", "idx_score_history_total_absolute_score"),
+        ("SELECT id FROM score_history ORDER BY submission_time DESC LIMIT 1", "sqlite_autoindex_score_history_1"),
+        (
+            "SELECT score_history_id FROM test_cases WHERE case_id = 1 AND absolute_score IS NOT NULL "
+            "ORDER BY absolute_score DESC LIMIT 1",
+            "idx_test_cases_case_id_absolute_score",
+        ),
+    ],
+)
+def test_hot_queries_use_indexes(root_dir: Path, query: str, expected_index: str) -> None:
+    DatabaseManager.setup()
+
+    db_manager = DatabaseManager()
+    with db_manager as conn:
+        plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+    db_manager.close()
+
+    assert expected_index in plan
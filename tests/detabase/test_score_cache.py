@@ -0,0 +1,85 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+from ahc_local_leaderboard.database.score_cache import ScoreCache
+
+
+@pytest.fixture
+def temp_dir() -> Generator[Path, None, None]:
+    with tempfile.TemporaryDirectory() as temp_dir_path:
+        yield Path(temp_dir_path)
+
+
+@pytest.fixture
+def score_cache(temp_dir: Path) -> ScoreCache:
+    return ScoreCache(temp_dir / "score_cache.db", max_entries=3, max_age_days=1)
+
+
+def write_file(path: Path, content: str) -> Path:
+    path.write_text(content)
+    return path
+
+
+def test_generate_key_depends_on_all_inputs(temp_dir: Path) -> None:
+    input_path = write_file(temp_dir / "in.txt", "input")
+    submit_path = write_file(temp_dir / "out.txt", "output")
+    other_path = write_file(temp_dir / "other.txt", "other")
+    same_path = write_file(temp_dir / "same.txt", "output")
+
+    key = ScoreCache.generate_key("vis:1", input_path, submit_path)
+
+    assert key is not None
+    assert key == ScoreCache.generate_key("vis:1", input_path, same_path)
+    assert key != ScoreCache.generate_key("vis:2", input_path, submit_path)
+    assert key != ScoreCache.generate_key("vis:1", input_path, other_path)
+    assert key != ScoreCache.generate_key("vis:1", other_path, submit_path)
+
+
+def test_generate_key_missing_file(temp_dir: Path) -> None:
+    input_path = write_file(temp_dir / "in.txt", "input")
+    assert ScoreCache.generate_key("vis:1", input_path, temp_dir / "missing.txt") is None
+
+
+def test_store_and_fetch_scores(score_cache: ScoreCache) -> None:
+    assert score_cache.fetch_scores([]) == {}
+    assert score_cache.fetch_scores(["a"]) == {}
+
+    score_cache.store_scores({"a": 1, "b": 2})
+
+    assert score_cache.fetch_scores(["a", "b", "c"]) == {"a": 1, "b": 2}
+
+
+def test_fetch_scores_in_chunks(score_cache: ScoreCache) -> None:
+    score_cache.max_entries = 2000
+    scores = {f"key{i}": i for i in range(1200)}
+    score_cache.store_scores(scores)
+
+    assert score_cache.fetch_scores(list(scores)) == scores
+
+
+def test_evict_by_max_entries(score_cache: ScoreCache) -> None:
+    with patch("time.time", return_value=1000.0):
+        score_cache.store_scores({"a": 1, "b": 2})
+    with patch("time.time", return_value=2000.0):
+        score_cache.fetch_scores(["a"])
+    with patch("time.time", return_value=3000.0):
+        score_cache.store_scores({"c": 3, "d": 4})
+
+    # 最も長く使われていない b が削除される
+    assert score_cache.fetch_scores(["a", "b", "c", "d"]) == {"a": 1, "c": 3, "d": 4}
+
+
+def test_evict_by_max_age(score_cache: ScoreCache) -> None:
+    with patch("time.time", return_value=0.0):
+        score_cache.store_scores({"a": 1})
+    with patch("time.time", return_value=2 * 24 * 60 * 60.0):
+        score_cache.store_scores({"b": 2})
+
+    with sqlite3.connect(score_cache.cache_path) as conn:
+        keys = [row[0] for row in conn.execute("SELECT cache_key FROM score_cache")]
+    assert keys == ["b"]
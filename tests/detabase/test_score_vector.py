@@ -0,0 +1,44 @@
+from typing import Generator, Optional
+from unittest.mock import patch
+
+import pytest
+
+from ahc_local_leaderboard.database.score_vector import ScoreVector
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "array"])
+def use_numpy(request: pytest.FixtureRequest) -> Generator[bool, None, None]:
+    with patch("ahc_local_leaderboard.database.score_vector.HAS_NUMPY", request.param):
+        yield request.param
+
+
+@pytest.mark.parametrize(
+    "scores",
+    [{}, {1: 100}, {1: None, 2: 200, 3: 300}, {2: 5, 5: None}, {i: i * 1000 for i in range(1, 5001)}],
+)
+def test_pack_and_unpack(use_numpy: bool, scores: dict[int, Optional[int]]) -> None:
+    blob = ScoreVector.pack(scores)
+
+    assert len(blob) == 8 * max(scores, default=0)
+    assert ScoreVector.unpack(blob) == scores
+
+
+def test_pack_layout() -> None:
+    blob = ScoreVector.pack({1: 1, 3: None, 4: 2**40})
+
+    assert blob == (
+        (1).to_bytes(8, "little")
+        + (-1).to_bytes(8, "little", signed=True)
+        + (0).to_bytes(8, "little")
+        + (2**40).to_bytes(8, "little")
+    )
+
+
+@pytest.mark.parametrize(
+    "case_ids, expected_scores",
+    [([], {}), ([1, 3], {1: 10, 3: None}), ([2, 4, 100], {4: 40}), ([4, 1], {4: 40, 1: 10})],
+)
+def test_select(use_numpy: bool, case_ids: list[int], expected_scores: dict[int, Optional[int]]) -> None:
+    blob = ScoreVector.pack({1: 10, 3: None, 4: 40})
+
+    assert ScoreVector.select(blob, case_ids) == expected_scores
@@ -0,0 +1,15 @@
+from ahc_local_leaderboard.models.scoring_result import ScoringResult
+
+
+def test_scoring_result() -> None:
+    result = ScoringResult(100)
+    assert result.score == 100
+    assert not result.is_failed()
+
+    result = ScoringResult(None)
+    assert result.score is None
+    assert not result.is_failed()
+
+    result = ScoringResult(None, "timed out")
+    assert result.error_message == "timed out"
+    assert result.is_failed()
@@ -1,3 +1,4 @@
+import random
 from datetime import datetime
 from unittest.mock import Mock
 
@@ -159,6 +160,60 @@ def test_update_relative_ranks() -> None:
     assert record2.relative_rank == 3
 
 
+def generate_ranked_records(relative_scores: list[int]) -> list[SummaryScoreRecord]:
+    records = [
+        SummaryScoreRecord(id, datetime(2024, 1, 1), 0, relative_score, 0, None)
+        for id, relative_score in enumerate(relative_scores, 1)
+    ]
+    SummaryScoreRecords(list(records)).update_relative_ranks()
+    return records
+
+
+def test_update_relative_ranks_incrementally() -> None:
+    records = generate_ranked_records([500, 400, 300, 200, 100])
+    new_record = SummaryScoreRecord(6, datetime(2024, 1, 1), 0, 250, 0, None)
+    ranked_records = SummaryScoreRecords(sorted(records, key=lambda record: record.relative_rank or 0))
+
+    changed_records = ranked_records.update_relative_ranks_incrementally([new_record])
+
+    # 挿入した位置より上位のレコードは変わらない
+    assert [record.id for record in changed_records] == [6, 4, 5]
+    assert [record.id for record in ranked_records] == [1, 2, 3, 6, 4, 5]
+    assert [record.relative_rank for record in ranked_records] == [1, 2, 3, 4, 5, 6]
+
+
+def test_update_relative_ranks_incrementally_moves_records() -> None:
+    records = generate_ranked_records([500, 400, 300, 200, 100])
+    ranked_records = SummaryScoreRecords(sorted(records, key=lambda record: record.relative_rank or 0))
+    records[3].total_relative_score = 450
+
+    changed_records = ranked_records.update_relative_ranks_incrementally([records[3]])
+
+    assert [record.id for record in changed_records] == [4, 2, 3]
+    assert [record.id for record in ranked_records] == [1, 4, 2, 3, 5]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_update_relative_ranks_incrementally_matches_update_relative_ranks(seed: int) -> None:
+    generator = random.Random(seed)
+    records = generate_ranked_records([generator.randint(0, 10) for _ in range(30)])
+    ranked_records = SummaryScoreRecords(sorted(records, key=lambda record: record.relative_rank or 0))
+
+    moved_records = generator.sample(records, generator.randint(0, 5))
+    for record in moved_records:
+        record.total_relative_score = generator.randint(0, 10)
+    new_records = [
+        SummaryScoreRecord(id, datetime(2024, 1, 1), 0, generator.randint(0, 10), 0, None) for id in [31, 32]
+    ]
+
+    ranked_records.update_relative_ranks_incrementally(moved_records + new_records)
+
+    expected_records = SummaryScoreRecords(sorted(records + new_records, key=lambda record: record.id))
+    expected_records.update_relative_ranks()
+    assert [record.id for record in ranked_records] == [record.id for record in expected_records]
+    assert [record.relative_rank for record in ranked_records] == list(range(1, 33))
+
+
 def test_get_latest_record() -> None:
     record1 = Mock(spec=SummaryScoreRecord, submission_time="2023-01-01 10:00:00")
     record2 = Mock(spec=SummaryScoreRecord, submission_time="2023-01-02 10:00:00")
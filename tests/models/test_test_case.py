@@ -42,3 +42,14 @@ def test_contains_test_case() -> None:
     assert test_cases.contains_test_case("test", None)
     assert not test_cases.contains_test_case("test1", 0)
     assert not test_cases.contains_test_case("test", 100)
+
+
+def test_fetch_failed_test_cases() -> None:
+
+    test_cases = TestCases()
+    test_cases.add_test_case(TestCase("test1", 100, Path("path")))
+    test_cases.add_test_case(TestCase("test2", None, Path("path")))
+    test_cases.add_test_case(TestCase("test3", None, Path("path"), "timed out"))
+
+    failed_test_cases = test_cases.fetch_failed_test_cases()
+    assert [test_case.file_name for test_case in failed_test_cases] == ["test3"]
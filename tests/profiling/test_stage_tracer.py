@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from ahc_local_leaderboard.profiling.stage_tracer import StageTracer
+
+
+class Repository:
+    LIMIT = 10
+
+    def fetch(self, value: int) -> int:
+        return value * 2
+
+    def _helper(self) -> None:
+        pass
+
+
+@pytest.fixture
+def tracer() -> StageTracer:
+    tracer = StageTracer()
+    tracer.start()
+    return tracer
+
+
+def test_stage_is_not_recorded_when_disabled() -> None:
+    tracer = StageTracer()
+    with tracer.stage("submit"):
+        tracer.count_query("SELECT 1")
+
+    tracer.start()
+    assert tracer.stop() == []
+
+
+def test_stage(tracer: StageTracer) -> None:
+    with tracer.stage("submit", "command"):
+        tracer.count_query("BEGIN")
+        with tracer.stage("submit.update_top_scores"):
+            tracer.count_query("SELECT 1")
+            tracer.count_query("INSERT INTO test_cases VALUES (1)")
+        with tracer.stage("submit.update_relative_scores"):
+            pass
+
+    events = tracer.stop()
+    assert [(event["name"], event["kind"], event["depth"], event["queries"]) for event in events] == [
+        ("submit", "command", 0, 3),
+        ("submit.update_top_scores", "stage", 1, 2),
+        ("submit.update_relative_scores", "stage", 1, 0),
+    ]
+    assert events[0]["elapsed"] >= events[1]["elapsed"] + events[2]["elapsed"]
+    assert events[0]["start"] <= events[1]["start"] <= events[2]["start"]
+    assert all(event["thread"] == threading.current_thread().name for event in events)
+
+
+def test_stage_is_recorded_when_exception_is_raised(tracer: StageTracer) -> None:
+    with pytest.raises(ValueError):
+        with tracer.stage("submit"):
+            raise ValueError
+
+    assert [event["name"] for event in tracer.stop()] == ["submit"]
+    assert tracer.get_open_stages() == []
+
+
+def test_queries_are_counted_per_thread(tracer: StageTracer) -> None:
+    def score() -> None:
+        with tracer.stage("scorer", "scorer"):
+            tracer.count_query("SELECT 1")
+
+    with tracer.stage("submit"):
+        thread = threading.Thread(target=score, name="worker")
+        thread.start()
+        thread.join()
+
+    events = {event["name"]: event for event in tracer.stop()}
+    assert events["submit"]["queries"] == 0
+    assert events["scorer"]["queries"] == 1
+    assert events["scorer"]["depth"] == 0
+    assert events["scorer"]["thread"] == "worker"
+
+
+def test_instrument(tracer: StageTracer) -> None:
+    repository = Repository()
+    other_repository = Repository()
+    tracer.instrument(repository, "repository")
+
+    assert repository.fetch(1) == 2
+    assert other_repository.fetch(2) == 4
+    events = tracer.stop()
+    assert [(event["name"], event["kind"]) for event in events] == [("Repository.fetch", "repository")]
+
+    # stop() で元のメソッドに戻る
+    assert "fetch" not in vars(repository)
+    tracer.start()
+    assert repository.fetch(3) == 6
+    assert tracer.stop() == []
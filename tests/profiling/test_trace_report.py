@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+from ahc_local_leaderboard.profiling.stage_tracer import TraceEvent
+from ahc_local_leaderboard.profiling.trace_report import TraceReport
+
+
+def create_event(name: str, kind: str, elapsed: float, queries: int) -> TraceEvent:
+    return {
+        "name": name,
+        "kind": kind,
+        "start": 0.0,
+        "elapsed": elapsed,
+        "queries": queries,
+        "depth": 0,
+        "thread": "MainThread",
+    }
+
+
+def test_write(tmp_path: Path) -> None:
+    events = [
+        create_event("submit", "command", 0.5, 3),
+        create_event("TopScoresRepository.fetch", "repository", 0.1, 1),
+    ]
+    TraceReport(events).write(tmp_path / "trace.jsonl")
+
+    lines = (tmp_path / "trace.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == events
+
+
+def test_summarize() -> None:
+    report = TraceReport(
+        [
+            create_event("vis.process_test_file", "scorer", 0.1, 0),
+            create_event("submit", "command", 0.5, 3),
+            create_event("vis.process_test_file", "scorer", 0.3, 0),
+            create_event("TopScoresRepository.fetch_top_scores", "repository", 0.05, 1),
+            create_event("TopScoresRepository.fetch_top_scores", "repository", 0.05, 1),
+        ]
+    )
+
+    assert report.summarize() == [
+        {"name": "submit", "kind": "command", "calls": 1, "total": 0.5, "max": 0.5, "queries": 3},
+        {"name": "vis.process_test_file", "kind": "scorer", "calls": 2, "total": 0.4, "max": 0.3, "queries": 0},
+        {
+            "name": "TopScoresRepository.fetch_top_scores",
+            "kind": "repository",
+            "calls": 2,
+            "total": 0.1,
+            "max": 0.05,
+            "queries": 2,
+        },
+    ]
@@ -0,0 +1,214 @@
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Generator, Optional
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ahc_local_leaderboard.database.database_manager import (
+    DatabaseManager,
+    ScoreHistoryRepository,
+    TestCaseRepository,
+    TopScoresRepository,
+)
+from ahc_local_leaderboard.database.record_read_service import RecordReadService
+from ahc_local_leaderboard.database.record_write_service import RecordWriteService
+from ahc_local_leaderboard.models.test_case import TestCase, TestCases
+from ahc_local_leaderboard.rebuild.leaderboard_rebuilder import LeaderboardRebuilder
+from ahc_local_leaderboard.submit.relative_score_updater import RelativeScoreUpdater
+from ahc_local_leaderboard.submit.reserved_record_updater import ReservedRecordUpdater
+from ahc_local_leaderboard.submit.test_case_processor import TestCaseProcessor
+from ahc_local_leaderboard.utils.file_utility import FileUtility
+from ahc_local_leaderboard.utils.relative_score_calculater import (
+    MaximizationScoring,
+    MinimizationScoring,
+    RelativeScoreCalculaterInterface,
+)
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "python"])
+def use_numpy(request: pytest.FixtureRequest) -> Generator[bool, None, None]:
+    with patch("ahc_local_leaderboard.rebuild.leaderboard_rebuilder.HAS_NUMPY", request.param):
+        yield request.param
+
+
+@pytest.fixture
+def db_manager(tmp_path: Path) -> Generator[DatabaseManager, None, None]:
+    (tmp_path / "leader_board").mkdir()
+    with patch("ahc_local_leaderboard.consts.ROOT_DIR", tmp_path):
+        DatabaseManager.setup()
+        db_manager = DatabaseManager()
+        yield db_manager
+        db_manager.close()
+
+
+@pytest.fixture(params=[False, True], ids=["rows", "score_vectors"])
+def services(
+    request: pytest.FixtureRequest, db_manager: DatabaseManager
+) -> tuple[RecordReadService, RecordWriteService]:
+    test_case_repository = TestCaseRepository(db_manager, request.param)
+    score_history_repository = ScoreHistoryRepository(db_manager)
+    top_scores_repository = TopScoresRepository(db_manager)
+    return (
+        RecordReadService(score_history_repository, test_case_repository, top_scores_repository),
+        RecordWriteService(db_manager, score_history_repository, test_case_repository, top_scores_repository),
+    )
+
+
+def submit(
+    services: tuple[RecordReadService, RecordWriteService],
+    calculator: RelativeScoreCalculaterInterface,
+    scores: dict[str, Optional[int]],
+) -> None:
+    """提出時と同じ差分更新の処理でスコアを記録します。"""
+    record_read_service, record_write_service = services
+    submission_time = datetime(2024, 1, 1) + timedelta(seconds=record_read_service.fetch_total_record_count())
+
+    test_cases = TestCases()
+    for file_name, score in scores.items():
+        test_cases.add_test_case(TestCase(file_name, score, Path("out") / file_name))
+
+    reserved_record = record_write_service.reserve_empty_score_history_record(submission_time)
+    TestCaseProcessor(
+        record_read_service, record_write_service, calculator, Mock(spec=FileUtility)
+    ).process_test_cases(test_cases, reserved_record.id)
+    ReservedRecordUpdater(record_read_service, record_write_service, calculator).update_reserved_record(
+        reserved_record
+    )
+    RelativeScoreUpdater(record_read_service, record_write_service, calculator).apply_relative_score_updates(
+        [reserved_record.id]
+    )
+
+
+def generate_submissions(seed: int) -> list[dict[str, Optional[int]]]:
+    generator = random.Random(seed)
+    file_names = [f"{index:04}.txt" for index in range(8)]
+    return [
+        {
+            file_name: generator.choice([None, generator.randint(1, 20)])
+            for file_name in file_names
+            if generator.random() < 0.8
+        }
+        for _ in range(12)
+    ]
+
+
+@pytest.mark.parametrize("calculator", [MaximizationScoring(), MinimizationScoring()])
+@pytest.mark.parametrize("seed", range(5))
+def test_check_agrees_with_incremental_updates(
+    use_numpy: bool,
+    services: tuple[RecordReadService, RecordWriteService],
+    calculator: RelativeScoreCalculaterInterface,
+    seed: int,
+) -> None:
+    for scores in generate_submissions(seed):
+        submit(services, calculator, scores)
+
+    rebuilder = LeaderboardRebuilder(*services, calculator)
+
+    assert rebuilder.check() == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, LeaderboardRebuilder.SCORE_ROW_CHUNK_SIZE])
+def test_recompute_is_independent_of_chunk_size(
+    use_numpy: bool, services: tuple[RecordReadService, RecordWriteService], chunk_size: int
+) -> None:
+    calculator = MaximizationScoring()
+    for scores in generate_submissions(0):
+        submit(services, calculator, scores)
+
+    expected_summary_records, expected_top_scores = LeaderboardRebuilder(*services, calculator).recompute()
+    rebuilder = LeaderboardRebuilder(*services, calculator)
+    rebuilder.SCORE_ROW_CHUNK_SIZE = chunk_size
+    summary_records, top_scores = rebuilder.recompute()
+
+    assert [
+        (record.id, record.total_absolute_score, record.total_relative_score, record.relative_rank)
+        for record in summary_records
+    ] == [
+        (record.id, record.total_absolute_score, record.total_relative_score, record.relative_rank)
+        for record in expected_summary_records
+    ]
+    assert [(record.file_name, record.top_score, record.submission_id) for record in top_scores] == [
+        (record.file_name, record.top_score, record.submission_id) for record in expected_top_scores
+    ]
+
+
+def test_recompute_top_scores(use_numpy: bool, services: tuple[RecordReadService, RecordWriteService]) -> None:
+    calculator = MaximizationScoring()
+    submissions: list[dict[str, Optional[int]]] = [
+        {"a": 10, "b": None, "c": 5},
+        {"a": 30, "b": None},
+        {"a": 20, "b": None, "c": 5},
+        {"a": 30, "c": 8},
+    ]
+    for scores in submissions:
+        submit(services, calculator, scores)
+
+    summary_records, top_scores = LeaderboardRebuilder(*services, calculator).recompute()
+
+    assert [
+        (record.file_name, record.top_score, record.second_top_score, record.submission_id) for record in top_scores
+    ] == [("a", 30, 10, 2), ("b", None, None, 3), ("c", 8, 5, 4)]
+    # 相対スコアが同じ提出2と提出4は、先の提出が上位になる
+    assert [
+        (
+            record.id,
+            record.total_absolute_score,
+            record.total_relative_score,
+            record.invalid_score_count,
+            record.relative_rank,
+        )
+        for record in summary_records
+    ] == [
+        (1, 15, 1958333333, 1, 4),
+        (2, 30, 2000000000, 1, 2),
+        (3, 25, 2291666667, 1, 1),
+        (4, 38, 2000000000, 0, 3),
+    ]
+
+
+def test_rebuild_applies_changed_scoring_type(
+    use_numpy: bool, services: tuple[RecordReadService, RecordWriteService]
+) -> None:
+    submissions: list[dict[str, Optional[int]]] = [{"a": 10, "b": 20}, {"a": 20, "b": None}, {"a": 5, "b": 40}]
+    for scores in submissions:
+        submit(services, MinimizationScoring(), scores)
+    record_read_service, _ = services
+
+    rebuilder = LeaderboardRebuilder(*services, MaximizationScoring())
+    discrepancies = rebuilder.check()
+
+    assert "Top score of a: 5 (id 3) -> 20 (id 2)" in discrepancies
+    assert "Top score of b: 20 (id 1) -> 40 (id 3)" in discrepancies
+    assert rebuilder.rebuild() == discrepancies
+    assert rebuilder.check() == []
+
+    assert record_read_service.fetch_top_scores() == {"a": 20, "b": 40}
+    assert record_read_service.fetch_recently_updated_top_scores() == []
+    assert {
+        record.id: (record.total_relative_score, record.relative_rank)
+        for record in record_read_service.fetch_all_summary_records()
+    } == {1: (1000000000, 2), 2: (1000000000, 3), 3: (1250000000, 1)}
+
+
+def test_check_reports_drift(use_numpy: bool, services: tuple[RecordReadService, RecordWriteService]) -> None:
+    calculator = MinimizationScoring()
+    submit(services, calculator, {"a": 10})
+    submit(services, calculator, {"a": 20})
+    record_read_service, record_write_service = services
+
+    drifted_record = record_read_service.fetch_summary_record_by_id(2)
+    drifted_record.total_relative_score += 1
+    record_write_service.update_score_history(drifted_record)
+
+    assert LeaderboardRebuilder(*services, calculator).check() == [
+        "Submission 2: total_relative_score 500000001 -> 500000000"
+    ]
+
+
+def test_recompute_without_submissions(
+    use_numpy: bool, services: tuple[RecordReadService, RecordWriteService]
+) -> None:
+    assert LeaderboardRebuilder(*services, MinimizationScoring()).recompute() == ([], [])
@@ -0,0 +1,190 @@
+import random
+from pathlib import Path
+from typing import Generator, Optional
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ahc_local_leaderboard.database.database_manager import (
+    DatabaseManager,
+    ScoreHistoryRepository,
+    TestCaseRepository,
+    TopScoresRepository,
+)
+from ahc_local_leaderboard.database.record_read_service import RecordReadService
+from ahc_local_leaderboard.database.record_write_service import RecordWriteService
+from ahc_local_leaderboard.models.test_case import TestCase, TestCases
+from ahc_local_leaderboard.rebuild.leaderboard_rebuilder import LeaderboardRebuilder
+from ahc_local_leaderboard.rebuild.relative_score_materializer import (
+    RelativeScoreMaterializer,
+)
+from ahc_local_leaderboard.submit.relative_score_updater import RelativeScoreUpdater
+from ahc_local_leaderboard.submit.reserved_record_updater import ReservedRecordUpdater
+from ahc_local_leaderboard.submit.submission_matcher import SubmissionMatcher
+from ahc_local_leaderboard.submit.submitter import Submitter
+from ahc_local_leaderboard.submit.test_case_processor import (
+    TestCaseProcessor,
+    TestCasesProcessor,
+)
+from ahc_local_leaderboard.submit.test_file_processor import TestFilesProcessor
+from ahc_local_leaderboard.utils.file_utility import FileUtility
+from ahc_local_leaderboard.utils.relative_score_calculater import (
+    MaximizationScoring,
+    MinimizationScoring,
+    RelativeScoreCalculaterInterface,
+)
+
+
+@pytest.fixture
+def db_manager(tmp_path: Path) -> Generator[DatabaseManager, None, None]:
+    (tmp_path / "leader_board").mkdir()
+    with patch("ahc_local_leaderboard.consts.ROOT_DIR", tmp_path):
+        DatabaseManager.setup()
+        db_manager = DatabaseManager()
+        yield db_manager
+        db_manager.close()
+
+
+@pytest.fixture(params=[False, True], ids=["rows", "score_vectors"])
+def services(
+    request: pytest.FixtureRequest, db_manager: DatabaseManager
+) -> tuple[RecordReadService, RecordWriteService]:
+    test_case_repository = TestCaseRepository(db_manager, request.param)
+    score_history_repository = ScoreHistoryRepository(db_manager)
+    top_scores_repository = TopScoresRepository(db_manager)
+    return (
+        RecordReadService(score_history_repository, test_case_repository, top_scores_repository),
+        RecordWriteService(db_manager, score_history_repository, test_case_repository, top_scores_repository),
+    )
+
+
+def create_materializer(
+    db_manager: DatabaseManager,
+    services: tuple[RecordReadService, RecordWriteService],
+    calculator: RelativeScoreCalculaterInterface,
+) -> RelativeScoreMaterializer:
+    return RelativeScoreMaterializer(db_manager, *services, LeaderboardRebuilder(*services, calculator))
+
+
+def create_submitter(
+    services: tuple[RecordReadService, RecordWriteService],
+    calculator: RelativeScoreCalculaterInterface,
+    relative_score_materializer: Optional[RelativeScoreMaterializer],
+) -> Submitter:
+    return Submitter(
+        *services,
+        Mock(spec=TestFilesProcessor),
+        TestCasesProcessor(TestCaseProcessor(*services, calculator, Mock(spec=FileUtility))),
+        ReservedRecordUpdater(*services, calculator),
+        RelativeScoreUpdater(*services, calculator),
+        SubmissionMatcher(services[0]),
+        relative_score_materializer,
+    )
+
+
+def create_test_cases(scores: dict[str, Optional[int]]) -> TestCases:
+    test_cases = TestCases()
+    for file_name, score in scores.items():
+        test_cases.add_test_case(TestCase(file_name, score, Path("out") / file_name))
+    return test_cases
+
+
+def generate_submissions(seed: int) -> list[dict[str, Optional[int]]]:
+    generator = random.Random(seed)
+    file_names = [f"{index:04}.txt" for index in range(6)]
+    return [
+        {
+            file_name: generator.choice([None, generator.randint(1, 20)])
+            for file_name in file_names
+            if generator.random() < 0.8
+        }
+        for _ in range(10)
+    ]
+
+
+def fetch_summary_states(record_read_service: RecordReadService) -> dict[int, tuple[int, int, int, Optional[int]]]:
+    return {
+        record.id: (
+            record.total_absolute_score,
+            record.total_relative_score,
+            record.invalid_score_count,
+            record.relative_rank,
+        )
+        for record in record_read_service.fetch_all_summary_records()
+    }
+
+
+@pytest.mark.parametrize("calculator", [MaximizationScoring(), MinimizationScoring()])
+@pytest.mark.parametrize("seed", range(3))
+def test_materialize_matches_eager_updates(
+    tmp_path: Path,
+    db_manager: DatabaseManager,
+    services: tuple[RecordReadService, RecordWriteService],
+    calculator: RelativeScoreCalculaterInterface,
+    seed: int,
+) -> None:
+    materializer = create_materializer(db_manager, services, calculator)
+    lazy_submitter = create_submitter(services, calculator, materializer)
+    generator = random.Random(seed)
+    for scores in generate_submissions(seed):
+        lazy_submitter.record_test_cases_batch([create_test_cases(scores)], False)
+        # 途中で表示された場合も、以降の提出を正しく反映できる
+        if generator.random() < 0.3:
+            materializer.materialize()
+
+    materializer.materialize()
+    lazy_states = fetch_summary_states(services[0])
+
+    assert LeaderboardRebuilder(*services, calculator).check() == []
+    assert services[0].fetch_recently_updated_top_scores() == []
+
+    # 同じ提出を提出ごとの差分更新で記録した場合と一致する
+    (tmp_path / "eager" / "leader_board").mkdir(parents=True)
+    with patch("ahc_local_leaderboard.consts.ROOT_DIR", tmp_path / "eager"):
+        DatabaseManager.setup()
+        eager_submitter = create_submitter(services, calculator, None)
+        for scores in generate_submissions(seed):
+            eager_submitter.record_test_cases_batch([create_test_cases(scores)], False)
+
+        assert fetch_summary_states(services[0]) == lazy_states
+        db_manager.close()
+
+
+def test_lazy_submit_does_not_update_previous_submissions(
+    db_manager: DatabaseManager, services: tuple[RecordReadService, RecordWriteService]
+) -> None:
+    calculator = MinimizationScoring()
+    record_read_service, _ = services
+    materializer = create_materializer(db_manager, services, calculator)
+    submitter = create_submitter(services, calculator, materializer)
+
+    submitter.record_test_cases_batch([create_test_cases({"a": 20})], False)
+    assert materializer.materialize() is True
+    assert materializer.materialize() is False
+
+    submitter.record_test_cases_batch([create_test_cases({"a": 10})], False)
+
+    # 新しい提出の相対スコアは提出時のトップスコアで計算し、順位と過去の提出は表示時まで更新しない
+    assert fetch_summary_states(record_read_service) == {1: (20, 1000000000, 0, 1), 2: (10, 1000000000, 0, None)}
+    assert record_read_service.fetch_top_scores() == {"a": 10}
+    assert LeaderboardRebuilder(*services, calculator).check() == []
+
+    assert materializer.materialize() is True
+    assert fetch_summary_states(record_read_service) == {1: (20, 500000000, 0, 2), 2: (10, 1000000000, 0, 1)}
+    assert materializer.materialize() is False
+
+
+def test_rebuild_marks_relative_scores_materialized(
+    db_manager: DatabaseManager, services: tuple[RecordReadService, RecordWriteService]
+) -> None:
+    calculator = MaximizationScoring()
+    materializer = create_materializer(db_manager, services, calculator)
+    submitter = create_submitter(services, calculator, materializer)
+    for score in [10, 20]:
+        submitter.record_test_cases_batch([create_test_cases({"a": score})], False)
+
+    # 未反映の相対スコアと順位は差異として報告しない
+    assert LeaderboardRebuilder(*services, calculator).rebuild() == []
+
+    assert materializer.materialize() is False
+    assert fetch_summary_states(services[0]) == {1: (10, 500000000, 0, 2), 2: (20, 1000000000, 0, 1)}
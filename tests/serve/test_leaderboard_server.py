@@ -0,0 +1,139 @@
+import os
+import shutil
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Generator
+from unittest.mock import patch
+
+import pytest
+
+from ahc_local_leaderboard.serve.leaderboard_client import LeaderboardClient
+from ahc_local_leaderboard.serve.leaderboard_server import (
+    LeaderboardServer,
+    ServerAlreadyRunningError,
+)
+from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
+
+
+@pytest.fixture
+def root_dir(monkeypatch: pytest.MonkeyPatch) -> Generator[Path, None, None]:
+    # Unix ソケットのパスは 100 文字程度までしか使えないため、短いパスの一時ディレクトリを使う
+    root_dir = Path(tempfile.mkdtemp(prefix="llb", dir="/tmp"))
+    monkeypatch.chdir(root_dir)
+    with patch("ahc_local_leaderboard.consts.ROOT_DIR", root_dir):
+        yield root_dir
+    shutil.rmtree(root_dir)
+
+
+def request_command(
+    socket_path: Path, argv: list[str], command_executor: Callable[[list[str]], None]
+) -> tuple[bool, list[list[str]]]:
+    executed_commands: list[list[str]] = []
+
+    def execute_command(argv: list[str]) -> None:
+        executed_commands.append(argv)
+        command_executor(argv)
+
+    server = LeaderboardServer(socket_path, execute_command)
+    server.start()
+    try:
+        thread = threading.Thread(target=server.handle_next_connection)
+        thread.start()
+        result = LeaderboardClient(socket_path).run(argv)
+        thread.join()
+    finally:
+        server.close()
+
+    return result, executed_commands
+
+
+def test_run_forwards_output(root_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    def command_executor(argv: list[str]) -> None:
+        print("plain output")
+        ConsoleHandler.print_success("コマンドを実行しました")
+
+    result, executed_commands = request_command(root_dir / "server.sock", ["view", "--detail", "1"], command_executor)
+
+    assert result is True
+    assert executed_commands == [["view", "--detail", "1"]]
+    assert capsys.readouterr().out == "plain output\nコマンドを実行しました\n"
+    assert not (root_dir / "server.sock").exists()
+
+
+def test_socket_is_accessible_only_by_owner(root_dir: Path) -> None:
+    server = LeaderboardServer(root_dir / "server.sock", lambda argv: None)
+    umask = os.umask(0o022)
+    try:
+        server.start()
+        assert stat.S_IMODE((root_dir / "server.sock").stat().st_mode) == 0o600
+        # プロセスの umask は元に戻る
+        assert os.umask(0o022) == 0o022
+    finally:
+        os.umask(umask)
+        server.close()
+
+
+def test_run_keeps_server_alive_after_error(root_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    def command_executor(argv: list[str]) -> None:
+        raise SystemExit(2)
+
+    result, executed_commands = request_command(root_dir / "server.sock", ["submit"], command_executor)
+
+    assert result is True
+    assert executed_commands == [["submit"]]
+    assert capsys.readouterr().out == ""
+
+
+def test_run_rejects_commands_not_forwarded(root_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    result, executed_commands = request_command(root_dir / "server.sock", ["delete", "1"], lambda argv: None)
+
+    assert result is True
+    assert executed_commands == []
+    assert "the server cannot run this command: delete 1" in capsys.readouterr().out
+
+
+def test_run_rejects_different_directory(
+    root_dir: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    (root_dir / "other").mkdir()
+    monkeypatch.chdir(root_dir / "other")
+
+    result, executed_commands = request_command(root_dir / "server.sock", ["view"], lambda argv: None)
+
+    assert result is True
+    assert executed_commands == []
+    assert "the server is serving a different directory" in capsys.readouterr().out
+
+
+def test_run_without_server(root_dir: Path) -> None:
+    assert LeaderboardClient(root_dir / "server.sock").run(["view"]) is False
+
+    # 異常終了したサーバーのソケットファイルが残っている場合
+    (root_dir / "server.sock").touch()
+    assert LeaderboardClient(root_dir / "server.sock").run(["view"]) is False
+
+
+def test_start_replaces_stale_socket(root_dir: Path) -> None:
+    (root_dir / "server.sock").touch()
+
+    server = LeaderboardServer(root_dir / "server.sock", lambda argv: None)
+    server.start()
+    try:
+        client_socket = LeaderboardClient(root_dir / "server.sock").connect()
+        assert client_socket is not None
+        client_socket.close()
+    finally:
+        server.close()
+
+
+def test_start_fails_when_server_is_running(root_dir: Path) -> None:
+    server = LeaderboardServer(root_dir / "server.sock", lambda argv: None)
+    server.start()
+    try:
+        with pytest.raises(ServerAlreadyRunningError):
+            LeaderboardServer(root_dir / "server.sock", lambda argv: None).start()
+        assert (root_dir / "server.sock").exists()
+    finally:
+        server.close()
@@ -0,0 +1,105 @@
+import sqlite3
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+
+from ahc_local_leaderboard.database.database_manager import DatabaseManager
+from ahc_local_leaderboard.status.leaderboard_status import LeaderboardStatus
+from ahc_local_leaderboard.status.status_snapshot import StatusSnapshotFile
+
+
+@pytest.fixture
+def database_path(tmp_path: Path) -> Path:
+    (tmp_path / "leader_board").mkdir()
+    with patch("ahc_local_leaderboard.consts.ROOT_DIR", tmp_path):
+        DatabaseManager.setup()
+    return tmp_path / "leader_board" / "leader_board.db"
+
+
+def insert_submissions(database_path: Path, submissions: list[tuple[int, int, int, Optional[int]]]) -> None:
+    with sqlite3.connect(database_path) as conn:
+        conn.executemany(
+            "INSERT INTO score_history "
+            "(id, total_absolute_score, total_relative_score, relative_rank, submission_time) "
+            "VALUES (?, ?, ?, ?, datetime('2024-01-01', '+' || ? || ' minutes'))",
+            [(*submission, submission[0]) for submission in submissions],
+        )
+    conn.close()
+
+
+def test_format_status_without_submissions(database_path: Path) -> None:
+    assert LeaderboardStatus(database_path).format_status() == "No submissions"
+
+
+def test_format_status(database_path: Path) -> None:
+    insert_submissions(database_path, [(1, 300, 1500000000, 2), (2, 200, 2000000000, 1), (3, 400, 1000000000, 3)])
+
+    assert (
+        LeaderboardStatus(database_path).format_status()
+        == "Best: #2 (relative 2000000000, absolute 200) | Latest: #3 rank 3/3"
+    )
+
+
+def test_format_status_with_lazy_relative_scores(database_path: Path) -> None:
+    insert_submissions(database_path, [(1, 300, 2000000000, 1), (2, 200, 2000000000, None)])
+    with sqlite3.connect(database_path) as conn:
+        conn.execute("UPDATE relative_score_state SET epoch = epoch + 1")
+    conn.close()
+
+    assert (
+        LeaderboardStatus(database_path).format_status()
+        == "Best: #1 (relative 2000000000, absolute 300) | Latest: #2 rank -/2 (not ranked yet)"
+    )
+
+
+def test_format_status_before_migration(database_path: Path) -> None:
+    insert_submissions(database_path, [(1, 300, 1000000000, 1)])
+    with sqlite3.connect(database_path) as conn:
+        conn.execute("DROP TABLE relative_score_state")
+    conn.close()
+
+    assert (
+        LeaderboardStatus(database_path).format_status()
+        == "Best: #1 (relative 1000000000, absolute 300) | Latest: #1 rank 1/1"
+    )
+
+
+def test_format_status_from_snapshot(database_path: Path) -> None:
+    snapshot_path = database_path.parent / "status.json"
+    StatusSnapshotFile(snapshot_path).write(
+        {
+            "version": StatusSnapshotFile.VERSION,
+            "submission_count": 3,
+            "latest_id": 3,
+            "latest_rank": 2,
+            "is_materialized": True,
+            "top_summary": {"total_absolute_score": 200, "total_relative_score": 2000000000, "invalid_score_count": 0},
+            "ranking": [
+                {
+                    "id": 2,
+                    "submission_time": "2024-01-01 00:02:00",
+                    "total_absolute_score": 200,
+                    "total_relative_score": 2000000000,
+                    "invalid_score_count": 0,
+                    "relative_rank": 1,
+                }
+            ],
+        }
+    )
+
+    # データベースは空のため、スナップショットから読み取っていることが分かる
+    assert (
+        LeaderboardStatus(database_path, snapshot_path).format_status()
+        == "Best: #2 (relative 2000000000, absolute 200) | Latest: #3 rank 2/3"
+    )
+
+
+def test_format_status_without_snapshot(database_path: Path) -> None:
+    insert_submissions(database_path, [(1, 300, 1000000000, 1)])
+
+    assert (
+        LeaderboardStatus(database_path, database_path.parent / "status.json").format_status()
+        == "Best: #1 (relative 1000000000, absolute 300) | Latest: #1 rank 1/1"
+    )
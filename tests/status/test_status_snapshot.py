@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from ahc_local_leaderboard.status.status_snapshot import (
+    StatusSnapshot,
+    StatusSnapshotFile,
+)
+
+
+@pytest.fixture
+def snapshot() -> StatusSnapshot:
+    return {
+        "version": StatusSnapshotFile.VERSION,
+        "submission_count": 1,
+        "latest_id": 1,
+        "latest_rank": 1,
+        "is_materialized": True,
+        "top_summary": {"total_absolute_score": 100, "total_relative_score": 1000000000, "invalid_score_count": 0},
+        "ranking": [
+            {
+                "id": 1,
+                "submission_time": "2024-01-01 00:00:00",
+                "total_absolute_score": 100,
+                "total_relative_score": 1000000000,
+                "invalid_score_count": 0,
+                "relative_rank": 1,
+            }
+        ],
+    }
+
+
+def test_write_and_load(tmp_path: Path, snapshot: StatusSnapshot) -> None:
+    snapshot_file = StatusSnapshotFile(tmp_path / "status.json")
+    snapshot_file.write(snapshot)
+
+    assert snapshot_file.load() == snapshot
+    # 一時ファイルは残らない
+    assert [path.name for path in tmp_path.iterdir()] == ["status.json"]
+
+
+def test_write_overwrites(tmp_path: Path, snapshot: StatusSnapshot) -> None:
+    snapshot_file = StatusSnapshotFile(tmp_path / "status.json")
+    snapshot_file.write(snapshot)
+    snapshot["submission_count"] = 2
+    snapshot_file.write(snapshot)
+
+    loaded_snapshot = snapshot_file.load()
+    assert loaded_snapshot is not None
+    assert loaded_snapshot["submission_count"] == 2
+
+
+def test_load_missing_file(tmp_path: Path) -> None:
+    assert StatusSnapshotFile(tmp_path / "status.json").load() is None
+
+
+@pytest.mark.parametrize("content", ["", "{broken", "[]", json.dumps({"version": StatusSnapshotFile.VERSION + 1})])
+def test_load_invalid_file(tmp_path: Path, content: str) -> None:
+    (tmp_path / "status.json").write_text(content, encoding="utf-8")
+    assert StatusSnapshotFile(tmp_path / "status.json").load() is None
+
+
+def test_remove(tmp_path: Path, snapshot: StatusSnapshot) -> None:
+    snapshot_file = StatusSnapshotFile(tmp_path / "status.json")
+    snapshot_file.write(snapshot)
+    snapshot_file.remove()
+
+    assert not (tmp_path / "status.json").exists()
+    # 存在しない場合も例外にならない
+    snapshot_file.remove()
@@ -0,0 +1,102 @@
+import sqlite3
+from pathlib import Path
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+from ahc_local_leaderboard.database.database_manager import (
+    DatabaseManager,
+    ScoreHistoryRepository,
+    TestCaseRepository,
+    TopScoresRepository,
+)
+from ahc_local_leaderboard.database.record_read_service import RecordReadService
+from ahc_local_leaderboard.status.status_snapshot import StatusSnapshotFile
+from ahc_local_leaderboard.status.status_snapshot_writer import StatusSnapshotWriter
+
+
+@pytest.fixture
+def db_manager(tmp_path: Path) -> Generator[DatabaseManager, None, None]:
+    (tmp_path / "leader_board").mkdir()
+    with patch("ahc_local_leaderboard.consts.ROOT_DIR", tmp_path):
+        DatabaseManager.setup()
+        db_manager = DatabaseManager()
+        record_read_service = RecordReadService(
+            ScoreHistoryRepository(db_manager), TestCaseRepository(db_manager), TopScoresRepository(db_manager)
+        )
+        db_manager.add_transaction_hook(
+            StatusSnapshotWriter(record_read_service, StatusSnapshotFile(tmp_path / "leader_board" / "status.json"))
+        )
+        yield db_manager
+        db_manager.close()
+
+
+@pytest.fixture
+def snapshot_file(tmp_path: Path) -> StatusSnapshotFile:
+    return StatusSnapshotFile(tmp_path / "leader_board" / "status.json")
+
+
+def insert_submission(conn: sqlite3.Connection, submission_id: int, relative_rank: int) -> None:
+    conn.execute(
+        "INSERT INTO score_history (id, submission_time, total_absolute_score, total_relative_score, relative_rank) "
+        "VALUES (?, datetime('2024-01-01', '+' || ? || ' minutes'), ?, ?, ?)",
+        (submission_id, submission_id, submission_id * 100, 1000000000 // relative_rank, relative_rank),
+    )
+
+
+def test_snapshot_is_written_after_commit(db_manager: DatabaseManager, snapshot_file: StatusSnapshotFile) -> None:
+    db_manager.begin_transaction()
+    with db_manager as conn:
+        insert_submission(conn, 1, 2)
+        insert_submission(conn, 2, 1)
+    db_manager.commit()
+
+    snapshot = snapshot_file.load()
+    assert snapshot is not None
+    assert snapshot["submission_count"] == 2
+    assert snapshot["latest_id"] == 2
+    assert snapshot["latest_rank"] == 1
+    assert snapshot["is_materialized"]
+    assert [summary["id"] for summary in snapshot["ranking"]] == [2, 1]
+    assert snapshot["ranking"][0]["submission_time"] == "2024-01-01 00:02:00"
+
+
+def test_snapshot_is_removed_during_transaction(
+    db_manager: DatabaseManager, snapshot_file: StatusSnapshotFile
+) -> None:
+    db_manager.begin_transaction()
+    db_manager.commit()
+    assert snapshot_file.load() is not None
+
+    db_manager.begin_transaction()
+    assert snapshot_file.load() is None
+    db_manager.rollback()
+
+
+def test_snapshot_is_written_after_rollback(db_manager: DatabaseManager, snapshot_file: StatusSnapshotFile) -> None:
+    db_manager.begin_transaction()
+    with db_manager as conn:
+        insert_submission(conn, 1, 1)
+    db_manager.rollback()
+
+    snapshot = snapshot_file.load()
+    assert snapshot is not None
+    assert snapshot["submission_count"] == 0
+    assert snapshot["latest_id"] is None
+    assert snapshot["latest_rank"] is None
+    assert snapshot["ranking"] == []
+
+
+def test_snapshot_is_removed_when_write_fails(
+    db_manager: DatabaseManager, snapshot_file: StatusSnapshotFile, capsys: pytest.CaptureFixture[str]
+) -> None:
+    db_manager.begin_transaction()
+    db_manager.commit()
+
+    db_manager.begin_transaction()
+    with patch.object(StatusSnapshotFile, "write", side_effect=OSError("disk full")):
+        db_manager.commit()
+
+    assert snapshot_file.load() is None
+    assert "Failed to write the status snapshot" in capsys.readouterr().out
@@ -0,0 +1,119 @@
+import sys
+from pathlib import Path
+from typing import Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from ahc_local_leaderboard.models.test_file import TestFile
+from ahc_local_leaderboard.submit.async_test_files_processor import (
+    AsyncTestFilesProcessor,
+)
+from ahc_local_leaderboard.submit.test_file_processor import (
+    CommandTestFileProcessorInterface,
+)
+
+
+class PythonScriptTestFileProcessor(CommandTestFileProcessorInterface):
+    """ファイル名ごとに指定された Python スクリプトをスコア計算コマンドとして実行するテスト用クラス。"""
+
+    def __init__(self, scripts: dict[str, str]) -> None:
+        self.scripts = scripts
+
+    def build_command(self, test_file: TestFile) -> list[str]:
+        return [sys.executable, "-c", self.scripts[test_file.file_name]]
+
+    def parse_stdout(self, decoded_output: str) -> Optional[int]:
+        lines = decoded_output.strip().splitlines()
+        return int(lines[-1]) if lines and lines[-1].isdigit() else None
+
+
+def generate_test_file(file_name: str) -> TestFile:
+    return TestFile(file_name, Path("in") / file_name, Path("out") / file_name)
+
+
+def generate_mock_test_files(file_names: list[str]) -> MagicMock:
+    mock_files = MagicMock()
+    mock_files.__iter__.return_value = iter([generate_test_file(file_name) for file_name in file_names])
+    return mock_files
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_process_test_files_keeps_order(max_workers: int) -> None:
+    scripts = {f"{i:04}.txt": f"import time; time.sleep({0.05 * (4 - i)}); print({i + 1})" for i in range(4)}
+    processor = AsyncTestFilesProcessor(PythonScriptTestFileProcessor(scripts), max_workers)
+
+    test_cases = processor.process_test_files(generate_mock_test_files(list(scripts)))
+
+    assert [test_case.file_name for test_case in test_cases] == list(scripts)
+    assert [test_case.score for test_case in test_cases] == [1, 2, 3, 4]
+    assert test_cases.fetch_failed_test_cases() == []
+
+
+def test_invalid_output_is_not_a_failure() -> None:
+    processor = AsyncTestFilesProcessor(PythonScriptTestFileProcessor({"0000.txt": "print('WA')"}))
+
+    test_cases = processor.process_test_files(generate_mock_test_files(["0000.txt"]))
+
+    assert test_cases.test_cases[0].score is None
+    assert test_cases.test_cases[0].error_message is None
+
+
+def test_nonzero_exit_is_recorded_without_retry() -> None:
+    script = "import sys; print('panicked at src/lib.rs'); sys.exit(101)"
+    processor = AsyncTestFilesProcessor(PythonScriptTestFileProcessor({"0000.txt": script}), retries=3)
+
+    test_cases = processor.process_test_files(generate_mock_test_files(["0000.txt"]))
+
+    assert test_cases.test_cases[0].score is None
+    assert test_cases.test_cases[0].error_message == "scorer exited with code 101: panicked at src/lib.rs"
+
+
+def test_timeout_is_retried() -> None:
+    processor = AsyncTestFilesProcessor(
+        PythonScriptTestFileProcessor({"0000.txt": "import time; time.sleep(10)", "0001.txt": "print(7)"}),
+        max_workers=2,
+        timeout=0.2,
+        retries=1,
+    )
+
+    test_cases = processor.process_test_files(generate_mock_test_files(["0000.txt", "0001.txt"]))
+
+    assert test_cases.test_cases[0].score is None
+    assert test_cases.test_cases[0].error_message == "timed out after 0.2 seconds (attempted 2 times)"
+    assert test_cases.test_cases[1].score == 7
+
+
+def test_transient_failure_succeeds_on_retry(tmp_path: Path) -> None:
+    marker = tmp_path / "marker"
+    script = (
+        "import os, signal, pathlib\n"
+        f"marker = pathlib.Path({str(marker)!r})\n"
+        "if not marker.exists():\n"
+        "    marker.touch()\n"
+        "    os.kill(os.getpid(), signal.SIGKILL)\n"
+        "print(5)\n"
+    )
+    if sys.platform == "win32":
+        pytest.skip("SIGKILL is not available on Windows")
+
+    processor = AsyncTestFilesProcessor(PythonScriptTestFileProcessor({"0000.txt": script}), retries=1)
+
+    test_cases = processor.process_test_files(generate_mock_test_files(["0000.txt"]))
+
+    assert test_cases.test_cases[0].score == 5
+    assert test_cases.test_cases[0].error_message is None
+
+
+def test_missing_scorer_is_recorded() -> None:
+    class MissingCommandTestFileProcessor(PythonScriptTestFileProcessor):
+        def build_command(self, test_file: TestFile) -> list[str]:
+            return ["/nonexistent/scorer"]
+
+    processor = AsyncTestFilesProcessor(MissingCommandTestFileProcessor({}))
+
+    test_cases = processor.process_test_files(generate_mock_test_files(["0000.txt"]))
+
+    assert test_cases.test_cases[0].score is None
+    error_message = test_cases.test_cases[0].error_message
+    assert error_message is not None and error_message.startswith("failed to start scorer")
@@ -0,0 +1,184 @@
+import sys
+from pathlib import Path
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from ahc_local_leaderboard.database.score_cache import ScoreCache
+from ahc_local_leaderboard.models.test_file import TestFile, TestFiles
+from ahc_local_leaderboard.submit.persistent_scorer import (
+    PersistentScorerWorker,
+    PersistentTestFileProcessor,
+    ScorerProtocolError,
+)
+from ahc_local_leaderboard.submit.test_file_processor import (
+    TestFileProcessorInterface,
+    TestFilesProcessor,
+)
+
+# 出力ファイルの中身をスコアとして返すワーカー
+ECHO_WORKER = """
+import sys
+for line in sys.stdin:
+    input_path, output_path = line.rstrip("\\n").split("\\t")
+    print(open(output_path).read().strip(), flush=True)
+"""
+
+
+def write_worker(tmp_path: Path, source: str) -> str:
+    worker_path = tmp_path / "worker.py"
+    worker_path.write_text(source)
+    return f"{sys.executable} {worker_path}"
+
+
+def generate_test_file(tmp_path: Path, file_name: str, output: str) -> TestFile:
+    (tmp_path / "in").mkdir(exist_ok=True)
+    (tmp_path / "out").mkdir(exist_ok=True)
+    (tmp_path / "in" / file_name).write_text("")
+    (tmp_path / "out" / file_name).write_text(output)
+    return TestFile(file_name, tmp_path / "in" / file_name, tmp_path / "out" / file_name)
+
+
+@pytest.mark.parametrize("output, expected_score", [("100", 100), ("0", None), ("-5", None)])
+def test_worker_request(tmp_path: Path, output: str, expected_score: Optional[int]) -> None:
+    worker = PersistentScorerWorker([sys.executable, "-c", ECHO_WORKER], timeout=10)
+    test_file = generate_test_file(tmp_path, "0000.txt", output)
+
+    assert worker.request(test_file.input_file_path, test_file.submit_file_path) == expected_score
+    assert worker.request(test_file.input_file_path, test_file.submit_file_path) == expected_score
+
+    worker.close()
+    assert worker.process.poll() is not None
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "print('Score = 100')",  # プロトコル非対応のビジュアライザ
+        "import sys; sys.stdin.readline(); print('Score = 100', flush=True)",
+        "import time; time.sleep(10)",
+    ],
+)
+def test_worker_request_protocol_error(tmp_path: Path, source: str) -> None:
+    worker = PersistentScorerWorker([sys.executable, "-c", source], timeout=1)
+    test_file = generate_test_file(tmp_path, "0000.txt", "100")
+
+    with pytest.raises(ScorerProtocolError):
+        worker.request(test_file.input_file_path, test_file.submit_file_path)
+
+    worker.close()
+
+
+def test_worker_start_failure() -> None:
+    with pytest.raises(ScorerProtocolError):
+        PersistentScorerWorker(["/nonexistent/worker"], timeout=1)
+
+
+def test_process_test_files_with_workers(tmp_path: Path) -> None:
+    fallback_processor = Mock(spec=TestFileProcessorInterface)
+    processor = PersistentTestFileProcessor(write_worker(tmp_path, ECHO_WORKER), fallback_processor, tmp_path, 10)
+    test_files = [generate_test_file(tmp_path, f"{i:04}.txt", str(i + 1)) for i in range(20)]
+
+    mock_files = Mock()
+    mock_files.add_all_files = Mock()
+    mock_files.__iter__ = Mock(return_value=iter(test_files))
+
+    started_workers: list[PersistentScorerWorker] = []
+    acquire_worker = processor.acquire_worker
+
+    def record_worker() -> PersistentScorerWorker:
+        worker = acquire_worker()
+        if worker not in started_workers:
+            started_workers.append(worker)
+        return worker
+
+    processor.acquire_worker = record_worker  # type: ignore[method-assign]
+
+    test_cases = TestFilesProcessor(processor, max_workers=4).process_test_files(mock_files)
+
+    assert [test_case.score for test_case in test_cases] == list(range(1, 21))
+    assert 1 <= len(started_workers) <= 4
+    assert all(worker.process.poll() is not None for worker in started_workers)
+    fallback_processor.process_test_file.assert_not_called()
+    fallback_processor.prepare.assert_called_once()
+    fallback_processor.cleanup.assert_called_once()
+    assert processor.workers == []
+
+
+def test_process_test_file_falls_back(tmp_path: Path) -> None:
+    fallback_processor = Mock(spec=TestFileProcessorInterface)
+    fallback_processor.process_test_file.return_value = 42
+    processor = PersistentTestFileProcessor(
+        write_worker(tmp_path, "print('Score = 100')"), fallback_processor, tmp_path, 10
+    )
+    test_file1 = generate_test_file(tmp_path, "0000.txt", "1")
+    test_file2 = generate_test_file(tmp_path, "0001.txt", "2")
+
+    assert processor.process_test_file(test_file1) == 42
+    assert processor.process_test_file(test_file2) == 42
+    assert not processor.is_protocol_supported
+    assert processor.restart_count == PersistentTestFileProcessor.MAX_RESTARTS
+    assert processor.workers == []
+    assert fallback_processor.process_test_file.call_count == 2
+
+
+def test_process_test_file_restarts_worker(tmp_path: Path) -> None:
+    fallback_processor = Mock(spec=TestFileProcessorInterface)
+    # 最初に起動したワーカーだけが、応答せずに終了する
+    marker_path = tmp_path / "started"
+    source = f"""
+import os
+import sys
+if not os.path.exists({str(marker_path)!r}):
+    open({str(marker_path)!r}, "w").close()
+    sys.exit(1)
+""" + ECHO_WORKER
+    processor = PersistentTestFileProcessor(write_worker(tmp_path, source), fallback_processor, tmp_path, 10)
+    test_file1 = generate_test_file(tmp_path, "0000.txt", "1")
+    test_file2 = generate_test_file(tmp_path, "0001.txt", "2")
+
+    assert processor.process_test_file(test_file1) == 1
+    assert processor.process_test_file(test_file2) == 2
+    assert processor.is_protocol_supported
+    assert processor.restart_count == 1
+    assert len(processor.workers) == 1
+    fallback_processor.process_test_file.assert_not_called()
+    processor.cleanup()
+
+
+def test_scorer_fingerprint(tmp_path: Path) -> None:
+    fallback_processor = Mock(spec=TestFileProcessorInterface)
+    processor1 = PersistentTestFileProcessor(write_worker(tmp_path, ECHO_WORKER), fallback_processor, tmp_path)
+    processor2 = PersistentTestFileProcessor(
+        write_worker(tmp_path, ECHO_WORKER) + " --fast", fallback_processor, tmp_path
+    )
+
+    fingerprint = processor1.get_scorer_fingerprint()
+    assert fingerprint is not None and fingerprint.startswith("persistent")
+    assert fingerprint != processor2.get_scorer_fingerprint()
+
+
+def test_score_cache_misses_after_editing_worker(tmp_path: Path) -> None:
+    fallback_processor = Mock(spec=TestFileProcessorInterface)
+    score_cache = ScoreCache(tmp_path / "score_cache.db", max_entries=100, max_age_days=1)
+    generate_test_file(tmp_path, "0000.txt", "10")
+
+    def score_test_files() -> list[Optional[int]]:
+        # README の例と同じく、インタプリタと相対パスのスクリプトでワーカーを指定する
+        processor = PersistentTestFileProcessor(f"{sys.executable} worker.py", fallback_processor, tmp_path, 10)
+        test_cases = TestFilesProcessor(processor, score_cache=score_cache).process_test_files(
+            TestFiles(tmp_path / "in", tmp_path / "out")
+        )
+        return [test_case.score for test_case in test_cases]
+
+    write_worker(tmp_path, ECHO_WORKER)
+    assert score_test_files() == [10]
+    assert score_test_files() == [10]
+
+    write_worker(
+        tmp_path,
+        ECHO_WORKER.replace("print(open(output_path).read().strip()", "print(2 * int(open(output_path).read())"),
+    )
+    assert score_test_files() == [20]
+    fallback_processor.process_test_file.assert_not_called()
@@ -0,0 +1,131 @@
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from ahc_local_leaderboard.models.test_file import TestFile
+from ahc_local_leaderboard.submit.plugin_test_files_processor import (
+    PluginTestFilesProcessor,
+)
+from ahc_local_leaderboard.submit.test_file_processor import (
+    PluginTestFileProcessor,
+    load_plugin_scorer,
+)
+
+PLUGIN_SOURCE = """
+import mmap
+
+def score(input_data, output_data):
+    assert isinstance(output_data, (mmap.mmap, bytes))
+    if output_data[:5] == b"error":
+        raise RuntimeError("broken output")
+    return int(output_data[:].strip() or 0)
+
+not_callable = 1
+"""
+
+
+@pytest.fixture
+def plugin_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    module_name = f"scorer_plugin_{uuid.uuid4().hex}"
+    (tmp_path / f"{module_name}.py").write_text(PLUGIN_SOURCE)
+    return module_name
+
+
+def generate_test_files(tmp_path: Path, outputs: list[str]) -> list[TestFile]:
+    (tmp_path / "in").mkdir()
+    (tmp_path / "out").mkdir()
+    test_files = []
+    for i, output in enumerate(outputs):
+        file_name = f"{i:04}.txt"
+        (tmp_path / "in" / file_name).write_text(f"{i}\n")
+        (tmp_path / "out" / file_name).write_text(output)
+        test_files.append(TestFile(file_name, tmp_path / "in" / file_name, tmp_path / "out" / file_name))
+    return test_files
+
+
+def generate_mock_test_files(test_files: list[TestFile]) -> MagicMock:
+    mock_files = MagicMock()
+    mock_files.__iter__.return_value = iter(test_files)
+    return mock_files
+
+
+@pytest.mark.parametrize(
+    "plugin_spec", ["{module}", "{module}:", ":score", "{module}:missing", "{module}:not_callable"]
+)
+def test_load_plugin_scorer_invalid(tmp_path: Path, plugin_module: str, plugin_spec: str) -> None:
+    with pytest.raises(ValueError):
+        load_plugin_scorer(plugin_spec.format(module=plugin_module), tmp_path)
+
+
+def test_load_plugin_scorer_missing_module(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    with pytest.raises(ValueError):
+        load_plugin_scorer(f"missing_{uuid.uuid4().hex}:score", tmp_path)
+
+
+@pytest.mark.parametrize("output, expected_score", [("100\n", 100), ("0", None), ("", None)])
+def test_process_test_file(tmp_path: Path, plugin_module: str, output: str, expected_score: int) -> None:
+    processor = PluginTestFileProcessor(f"{plugin_module}:score", tmp_path)
+    test_file = generate_test_files(tmp_path, [output])[0]
+
+    assert processor.process_test_file(test_file) == expected_score
+
+
+def test_process_test_files_batch_records_exceptions(tmp_path: Path, plugin_module: str) -> None:
+    processor = PluginTestFileProcessor(f"{plugin_module}:score", tmp_path)
+    test_files = generate_test_files(tmp_path, ["1", "error", "3"])
+
+    results = processor.process_test_files_batch(test_files)
+
+    assert [result.score for result in results] == [1, None, 3]
+    assert [result.error_message for result in results] == [None, "RuntimeError: broken output", None]
+
+
+def test_scorer_fingerprint_changes_with_source(tmp_path: Path, plugin_module: str) -> None:
+    processor = PluginTestFileProcessor(f"{plugin_module}:score", tmp_path)
+    fingerprint = processor.get_scorer_fingerprint()
+    assert fingerprint is not None and fingerprint.startswith("plugin")
+
+    (tmp_path / f"{plugin_module}.py").write_text(PLUGIN_SOURCE + "\n# changed\n")
+    assert processor.get_scorer_fingerprint() != fingerprint
+
+
+@pytest.mark.parametrize("max_workers, batch_size", [(1, None), (2, None), (2, 3), (3, 1)])
+def test_process_test_files_keeps_order(tmp_path: Path, plugin_module: str, max_workers: int, batch_size: int) -> None:
+    outputs = [str(i + 1) for i in range(10)]
+    outputs[4] = "error"
+    processor = PluginTestFilesProcessor(
+        PluginTestFileProcessor(f"{plugin_module}:score", tmp_path), max_workers, batch_size=batch_size
+    )
+
+    test_cases = processor.process_test_files(generate_mock_test_files(generate_test_files(tmp_path, outputs)))
+
+    assert [test_case.score for test_case in test_cases] == [1, 2, 3, 4, None, 6, 7, 8, 9, 10]
+    assert [test_case.file_name for test_case in test_cases.fetch_failed_test_cases()] == ["0004.txt"]
+
+
+@pytest.mark.parametrize(
+    "test_file_count, max_workers, batch_size, expected_sizes",
+    [
+        (10, 1, None, [3, 3, 3, 1]),
+        (10, 2, 4, [4, 4, 2]),
+        (1000, 2, None, [64] * 15 + [40]),
+        (0, 2, None, []),
+    ],
+)
+def test_split_into_batches(
+    tmp_path: Path, test_file_count: int, max_workers: int, batch_size: int, expected_sizes: list[int]
+) -> None:
+    processor = PluginTestFilesProcessor(
+        PluginTestFileProcessor("plugin:score", tmp_path), max_workers, None, batch_size
+    )
+    test_files = [TestFile(f"{i:04}.txt", Path("in"), Path("out")) for i in range(test_file_count)]
+
+    batches = processor.split_into_batches(test_files)
+
+    assert [len(batch) for batch in batches] == expected_sizes
+    assert [test_file for batch in batches for test_file in batch] == test_files
@@ -1,4 +1,5 @@
-from typing import cast
+from datetime import datetime
+from typing import Optional, cast
 from unittest.mock import Mock, patch
 
 import pytest
@@ -36,9 +37,7 @@ def mock_updated_top_score() -> Mock:
     return Mock(spec=UpdatedTopScore)
 
 
-@pytest.mark.parametrize("file_name", ["test_case"])
-@pytest.mark.parametrize("id", [1])
-@pytest.mark.parametrize("abs_score", [10])
+@pytest.mark.parametrize("abs_score", [10, None])
 @pytest.mark.parametrize("top_score", [100])
 @pytest.mark.parametrize("prev_score", [90])
 @pytest.mark.parametrize("score_diff", [-10, 0, 10])
@@ -47,9 +46,7 @@ def test_calculate_individual_relative_score_diff(
     mock_record_write_service: Mock,
     mock_relative_score_calculator: Mock,
     mock_updated_top_score: Mock,
-    file_name: str,
-    id: int,
-    abs_score: int,
+    abs_score: Optional[int],
     top_score: int,
     prev_score: int,
     score_diff: int,
@@ -57,26 +54,22 @@ def test_calculate_individual_relative_score_diff(
 
     updater = RelativeScoreUpdater(mock_record_read_service, mock_record_write_service, mock_relative_score_calculator)
 
-    non_latest_record = Mock(spec=SummaryScoreRecord)
-    non_latest_record.id = id
-
-    mock_updated_top_score.file_name = file_name
+    mock_updated_top_score.file_name = "test_case"
     mock_updated_top_score.top_score = top_score
     mock_updated_top_score.second_top_score = prev_score
 
-    mock_record_read_service.fetch_absolute_score_for_test_case.return_value = abs_score
     mock_relative_score_calculator.calculate_diff_relative_score.return_value = score_diff
 
-    result = updater.calculate_individual_relative_score_diff(non_latest_record, mock_updated_top_score)
+    result = updater.calculate_individual_relative_score_diff(abs_score, mock_updated_top_score)
 
     assert result == score_diff
-    mock_record_read_service.fetch_absolute_score_for_test_case.assert_called_once_with(file_name, id)
+    mock_record_read_service.fetch_absolute_score_for_test_case.assert_not_called()
     mock_relative_score_calculator.calculate_diff_relative_score.assert_called_once_with(
         abs_score, top_score, prev_score
     )
 
 
-@pytest.mark.parametrize("score_diffs", [{}, {10}, {-100, 10, 0}, {1, 10, 100}])
+@pytest.mark.parametrize("score_diffs", [[], [10], [-100, 10, 0], [1, 10, 100]])
 def test_calculate_total_relative_score_diff(
     mock_record_read_service: Mock,
     mock_record_write_service: Mock,
@@ -85,17 +78,34 @@ def test_calculate_total_relative_score_diff(
 ) -> None:
 
     updater = RelativeScoreUpdater(mock_record_read_service, mock_record_write_service, mock_relative_score_calculator)
-    non_latest_record = Mock(spec=SummaryScoreRecord)
-    updated_top_scores = [UpdatedTopScore("test_case_1", 100, 90) for _ in score_diffs]
+    absolute_scores: dict[str, Optional[int]] = {f"test_case_{i}": 10 * i for i in range(len(score_diffs))}
+    updated_top_scores = [UpdatedTopScore(f"test_case_{i}", 100, 90) for i in range(len(score_diffs))]
 
     with patch.object(updater, "calculate_individual_relative_score_diff", side_effect=score_diffs) as mock_cal_diff:
 
-        result = updater.calculate_total_relative_score_diff(non_latest_record, updated_top_scores)
+        result = updater.calculate_total_relative_score_diff(absolute_scores, updated_top_scores)
 
         assert result == sum(score_diffs)
         assert mock_cal_diff.call_count == len(score_diffs)
 
 
+def test_calculate_total_relative_score_diff_skips_missing_test_cases(
+    mock_record_read_service: Mock,
+    mock_record_write_service: Mock,
+    mock_relative_score_calculator: Mock,
+) -> None:
+
+    updater = RelativeScoreUpdater(mock_record_read_service, mock_record_write_service, mock_relative_score_calculator)
+    updated_top_scores = [UpdatedTopScore("test_case_1", 100, 90), UpdatedTopScore("test_case_2", 100, 90)]
+
+    with patch.object(updater, "calculate_individual_relative_score_diff", return_value=5) as mock_cal_diff:
+
+        result = updater.calculate_total_relative_score_diff({"test_case_2": None}, updated_top_scores)
+
+        assert result == 5
+        mock_cal_diff.assert_called_once_with(None, updated_top_scores[1])
+
+
 @pytest.mark.parametrize(
     "initial_scores, diff_scores",
     [
@@ -112,9 +122,14 @@ def test_update_relative_scores(
 
     updater = RelativeScoreUpdater(mock_record_read_service, mock_record_write_service, mock_relative_score_calculator)
 
-    records = [Mock(spec=SummaryScoreRecord, total_relative_score=score) for score in initial_scores]
+    records = [
+        Mock(spec=SummaryScoreRecord, id=id, total_relative_score=score) for id, score in enumerate(initial_scores, 1)
+    ]
+    absolute_scores = {1: {"test_case": 10}, 2: {"test_case": 20}}
+    mock_record_read_service.fetch_recently_updated_top_scores.return_value = [UpdatedTopScore("test_case", 5, 10)]
+    mock_record_read_service.fetch_absolute_scores_for_updated_top_scores.return_value = absolute_scores
 
-    with patch.object(updater, "calculate_total_relative_score_diff", side_effect=diff_scores):
+    with patch.object(updater, "calculate_total_relative_score_diff", side_effect=diff_scores) as mock_total_diff:
 
         updater.update_relative_scores(cast(list[SummaryScoreRecord], records))  # mypy用のcast
 
@@ -122,6 +137,27 @@ def test_update_relative_scores(
         actual_scores = [record.total_relative_score for record in records]
 
         assert actual_scores == expected_scores
+        assert [c.args[0] for c in mock_total_diff.call_args_list] == [{"test_case": 10}, {"test_case": 20}, {}]
+
+    # 提出数によらず、絶対スコアの取得は一度だけ行われる
+    mock_record_read_service.fetch_absolute_scores_for_updated_top_scores.assert_called_once()
+    mock_record_read_service.fetch_absolute_score_for_test_case.assert_not_called()
+
+
+def test_update_relative_scores_without_updated_top_scores(
+    mock_record_read_service: Mock,
+    mock_record_write_service: Mock,
+    mock_relative_score_calculator: Mock,
+) -> None:
+
+    updater = RelativeScoreUpdater(mock_record_read_service, mock_record_write_service, mock_relative_score_calculator)
+    records = [Mock(spec=SummaryScoreRecord, id=1, total_relative_score=100)]
+    mock_record_read_service.fetch_recently_updated_top_scores.return_value = []
+
+    updater.update_relative_scores(cast(list[SummaryScoreRecord], records))
+
+    assert records[0].total_relative_score == 100
+    mock_record_read_service.fetch_absolute_scores_for_updated_top_scores.assert_not_called()
 
 
 @pytest.mark.parametrize("count_remaining_records", [0, 1, 10])
@@ -155,32 +191,123 @@ def test_apply_relative_score_updates(
 ) -> None:
 
     updater = RelativeScoreUpdater(mock_record_read_service, mock_record_write_service, mock_relative_score_calculator)
-    latest_record = Mock(spec=SummaryScoreRecord, total_relative_score=0)
-    remaining_records = [Mock(spec=SummaryScoreRecord)]
-
-    mock_record_write_service.update_score_history = Mock()
-    mock_record_write_service.reset_is_updated_flags = Mock()
-
-    with patch(
-        "ahc_local_leaderboard.submit.relative_score_updater.SummaryScoreRecords"
-    ) as mock_summary_score_records, patch.object(
+    latest_record = SummaryScoreRecord(3, datetime(2024, 1, 1, 0, 0, 3), 100, 250, 0, None)
+    first_record, second_record = [
+        SummaryScoreRecord(id, datetime(2024, 1, 1, 0, 0, id), 100, relative_score, 0, rank)
+        for id, relative_score, rank in [(1, 300, 1), (2, 200, 2)]
+    ]
+    remaining_records = [first_record, second_record]
+
+    with patch.object(
         updater,
         "fetch_latest_and_remaining_records",
         return_value=(latest_record, remaining_records),
-    ) as mock_fetch, patch.object(
-        updater, "update_relative_scores", return_value=Mock()
-    ) as mock_update:
-
-        mock_updated_records = mock_summary_score_records.return_value
-        mock_updated_records.__iter__.return_value = iter([latest_record] + remaining_records)
-        mock_updated_records.update_relative_ranks = Mock()
-        mock_updated_records.add_record = Mock()
+    ) as mock_fetch, patch.object(updater, "update_relative_scores") as mock_update:
 
         updater.apply_relative_score_updates()
 
         mock_fetch.assert_called_once()
         mock_update.assert_called_once_with(remaining_records)
-        mock_updated_records.add_record.assert_called_once_with(latest_record)
-        mock_updated_records.update_relative_ranks.assert_called_once()
-        mock_record_write_service.update_score_history.assert_called()
-        mock_record_write_service.reset_is_updated_flags.assert_called_once()
+
+    # 順位が変わらない提出1は書き込まれない
+    assert [record.relative_rank for record in [first_record, second_record, latest_record]] == [1, 3, 2]
+    mock_record_write_service.update_score_histories.assert_called_once_with([latest_record, second_record])
+    mock_record_write_service.update_score_history.assert_not_called()
+    mock_record_write_service.reset_is_updated_flags.assert_called_once()
+
+
+def test_apply_relative_score_updates_with_new_record_ids(
+    mock_record_read_service: Mock,
+    mock_record_write_service: Mock,
+    mock_relative_score_calculator: Mock,
+) -> None:
+
+    updater = RelativeScoreUpdater(mock_record_read_service, mock_record_write_service, mock_relative_score_calculator)
+    records = [
+        SummaryScoreRecord(id, datetime(2024, 1, 1, 0, 0, id), 100, relative_score, 0, None)
+        for id, relative_score in [(1, 300), (2, 100), (3, 200)]
+    ]
+    mock_record_read_service.fetch_all_summary_records.return_value = SummaryScoreRecords(list(records))
+
+    updated_record_ids: list[list[int]] = []
+    with patch.object(
+        updater,
+        "update_relative_scores",
+        side_effect=lambda records: updated_record_ids.append([record.id for record in records]),
+    ):
+        updater.apply_relative_score_updates([2, 3])
+
+    # 今回追加されたレコードは計算済みなので、それ以外のレコードのみ更新する
+    assert updated_record_ids == [[1]]
+    assert [record.relative_rank for record in records] == [1, 3, 2]
+    written_records = mock_record_write_service.update_score_histories.call_args.args[0]
+    assert sorted(record.id for record in written_records) == [1, 2, 3]
+    mock_record_write_service.reset_is_updated_flags.assert_called_once()
+
+
+def test_apply_relative_score_updates_writes_only_changed_records(
+    mock_record_read_service: Mock,
+    mock_record_write_service: Mock,
+    mock_relative_score_calculator: Mock,
+) -> None:
+
+    updater = RelativeScoreUpdater(mock_record_read_service, mock_record_write_service, mock_relative_score_calculator)
+    records = [
+        SummaryScoreRecord(id, datetime(2024, 1, 1, 0, 0, id), 100, relative_score, 0, rank)
+        for id, relative_score, rank in [(1, 500, 1), (2, 400, 2), (3, 300, 3), (4, 200, 4), (5, 100, 5)]
+    ]
+    new_record = SummaryScoreRecord(6, datetime(2024, 1, 1, 0, 0, 6), 100, 250, 0, None)
+    mock_record_read_service.fetch_all_summary_records.return_value = SummaryScoreRecords(records + [new_record])
+
+    def update_relative_scores(records: list[SummaryScoreRecord]) -> None:
+        # 提出2の相対スコアだけが変化し、順位は変わらない
+        records[1].total_relative_score += 50
+
+    with patch.object(updater, "update_relative_scores", side_effect=update_relative_scores):
+        updater.apply_relative_score_updates([6])
+
+    assert [record.relative_rank for record in records + [new_record]] == [1, 2, 3, 5, 6, 4]
+    written_records = mock_record_write_service.update_score_histories.call_args.args[0]
+    assert sorted(record.id for record in written_records) == [2, 4, 5, 6]
+
+
+@pytest.mark.parametrize(
+    "ranks, expected_ids",
+    [
+        ([2, 3, 1], [3, 1, 2]),
+        ([], []),
+        ([1, None, 2], []),
+        ([1, 1, 2], []),
+        ([1, 2, 4], []),
+    ],
+)
+def test_arrange_by_relative_rank(ranks: list[Optional[int]], expected_ids: list[int]) -> None:
+    records = [
+        SummaryScoreRecord(id, datetime(2024, 1, 1, 0, 0, id), 100, 100, 0, rank) for id, rank in enumerate(ranks, 1)
+    ]
+
+    assert [record.id for record in RelativeScoreUpdater.arrange_by_relative_rank(records)] == expected_ids
+
+
+@pytest.mark.parametrize(
+    "previous_states, expected_ids",
+    [
+        ({1: (300, 1), 2: (200, 2)}, []),
+        ({1: (300, 1), 2: (100, 2)}, [2]),
+        ({1: (300, 2), 2: (200, 1)}, [1, 2]),
+        ({1: (300, 1)}, [2]),
+    ],
+)
+def test_select_changed_records(
+    previous_states: dict[int, tuple[int, Optional[int]]], expected_ids: list[int]
+) -> None:
+    records = SummaryScoreRecords(
+        [
+            SummaryScoreRecord(id, datetime(2024, 1, 1, 0, 0, id), 100, relative_score, 0, rank)
+            for id, relative_score, rank in [(1, 300, 1), (2, 200, 2)]
+        ]
+    )
+
+    changed_records = RelativeScoreUpdater.select_changed_records(records, previous_states)
+
+    assert [record.id for record in changed_records] == expected_ids
@@ -0,0 +1,101 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Generator
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ahc_local_leaderboard.submit.scorer_builder import VisScorerBuilder
+
+
+@pytest.fixture
+def tools_dir() -> Generator[Path, None, None]:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        tools_dir_path = Path(temp_dir)
+        (tools_dir_path / "src" / "bin").mkdir(parents=True)
+        (tools_dir_path / "Cargo.toml").write_text("[package]")
+        (tools_dir_path / "src" / "lib.rs").write_text("")
+        (tools_dir_path / "src" / "bin" / "vis.rs").write_text("")
+        yield tools_dir_path
+
+
+def create_binary(builder: VisScorerBuilder, mtime: float) -> Path:
+    binary_path = builder.get_binary_path()
+    binary_path.parent.mkdir(parents=True, exist_ok=True)
+    binary_path.write_text("")
+    os.utime(binary_path, (mtime, mtime))
+    return binary_path
+
+
+def set_source_mtime(tools_dir: Path, mtime: float) -> None:
+    for path in [tools_dir / "Cargo.toml", tools_dir / "src" / "lib.rs", tools_dir / "src" / "bin" / "vis.rs"]:
+        os.utime(path, (mtime, mtime))
+
+
+def test_get_binary_path(tools_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("CARGO_TARGET_DIR", raising=False)
+    builder = VisScorerBuilder(tools_dir)
+    assert builder.get_binary_path().parent == tools_dir / "target" / "release"
+
+    monkeypatch.setenv("CARGO_TARGET_DIR", str(tools_dir / "custom"))
+    assert builder.get_binary_path().parent == tools_dir / "custom" / "release"
+
+
+def test_is_up_to_date(tools_dir: Path) -> None:
+    builder = VisScorerBuilder(tools_dir)
+    assert not builder.is_up_to_date()
+
+    set_source_mtime(tools_dir, 1000)
+    create_binary(builder, 2000)
+    assert builder.is_up_to_date()
+
+    os.utime(tools_dir / "src" / "lib.rs", (3000, 3000))
+    assert not builder.is_up_to_date()
+
+
+@patch("subprocess.run")
+def test_resolve_skips_build_when_up_to_date(mock_subprocess_run: Mock, tools_dir: Path) -> None:
+    builder = VisScorerBuilder(tools_dir)
+    set_source_mtime(tools_dir, 1000)
+    binary_path = create_binary(builder, 2000)
+
+    assert builder.resolve() == binary_path
+    mock_subprocess_run.assert_not_called()
+
+
+@patch("subprocess.run")
+def test_resolve_builds_only_once(mock_subprocess_run: Mock, tools_dir: Path) -> None:
+    builder = VisScorerBuilder(tools_dir)
+
+    def build(*args: object, **kwargs: object) -> Mock:
+        create_binary(builder, 2000)
+        return Mock(returncode=0, stdout=b"")
+
+    set_source_mtime(tools_dir, 1000)
+    mock_subprocess_run.side_effect = build
+
+    binary_path = builder.resolve()
+    assert binary_path == builder.get_binary_path()
+    assert builder.resolve() == binary_path
+    mock_subprocess_run.assert_called_once()
+    assert mock_subprocess_run.call_args.kwargs["cwd"] == tools_dir
+
+
+@patch("subprocess.run")
+def test_resolve_returns_none_when_build_fails(mock_subprocess_run: Mock, tools_dir: Path) -> None:
+    mock_subprocess_run.return_value = Mock(returncode=101, stdout=b"error")
+    builder = VisScorerBuilder(tools_dir)
+
+    assert builder.resolve() is None
+    assert builder.resolve() is None
+    mock_subprocess_run.assert_called_once()
+
+
+@patch("subprocess.run")
+def test_resolve_without_cargo_project(mock_subprocess_run: Mock, tools_dir: Path) -> None:
+    (tools_dir / "Cargo.toml").unlink()
+    builder = VisScorerBuilder(tools_dir)
+
+    assert builder.resolve() is None
+    mock_subprocess_run.assert_not_called()
@@ -0,0 +1,88 @@
+import os
+from pathlib import Path
+
+from ahc_local_leaderboard.models.scoring_result import ScoringResult
+from ahc_local_leaderboard.models.test_file import TestFile
+from ahc_local_leaderboard.submit.scoring_journal import ScoringJournal
+
+
+def generate_test_files(tmp_path: Path, file_names: list[str]) -> list[TestFile]:
+    (tmp_path / "in").mkdir(exist_ok=True)
+    (tmp_path / "out").mkdir(exist_ok=True)
+    for file_name in file_names:
+        (tmp_path / "in" / file_name).write_text("input")
+        (tmp_path / "out" / file_name).write_text("output")
+    return [TestFile(file_name, tmp_path / "in" / file_name, tmp_path / "out" / file_name) for file_name in file_names]
+
+
+def test_generate_key_depends_on_file_set(tmp_path: Path) -> None:
+    test_files = generate_test_files(tmp_path, ["0000.txt", "0001.txt"])
+    key = ScoringJournal.generate_key(test_files, "vis")
+
+    assert key == ScoringJournal.generate_key(list(reversed(test_files)), "vis")
+    assert key != ScoringJournal.generate_key(test_files, "other")
+    assert key != ScoringJournal.generate_key(test_files[:1], "vis")
+
+    (tmp_path / "out" / "0001.txt").write_text("changed output")
+    assert key != ScoringJournal.generate_key(test_files, "vis")
+
+    key = ScoringJournal.generate_key(test_files, "vis")
+    os.utime(tmp_path / "out" / "0000.txt", ns=(0, 0))
+    assert key != ScoringJournal.generate_key(test_files, "vis")
+
+
+def test_append_and_resume(tmp_path: Path) -> None:
+    test_files = generate_test_files(tmp_path, ["0000.txt", "0001.txt", "0002.txt"])
+    journal = ScoringJournal(tmp_path / "journal")
+    assert journal.open("key") == {}
+
+    journal.append(test_files[0], ScoringResult(100))
+    journal.append(test_files[1], ScoringResult(None))
+    journal.append(test_files[2], ScoringResult(None, "TimeoutError: timed out"))  # 失敗は再計算させる
+    journal.close()
+
+    # 書き込み途中で中断された行
+    with open(tmp_path / "journal" / "key.jsonl", "a") as file:
+        file.write('{"submit_file_path": "out/0003.txt", "sc')
+
+    resumed_journal = ScoringJournal(tmp_path / "journal")
+    results = resumed_journal.open("key")
+
+    entry_keys = [ScoringJournal.generate_entry_key(test_file) for test_file in test_files]
+    assert sorted(results) == entry_keys[:2]
+    assert results[entry_keys[0]].score == 100
+    assert results[entry_keys[1]].score is None
+    assert not results[entry_keys[1]].is_failed()
+    resumed_journal.close()
+
+
+def test_entry_key_distinguishes_submit_directories(tmp_path: Path) -> None:
+    test_file1 = TestFile("0000.txt", tmp_path / "in" / "0000.txt", tmp_path / "out1" / "0000.txt")
+    test_file2 = TestFile("0000.txt", tmp_path / "in" / "0000.txt", tmp_path / "out2" / "0000.txt")
+
+    assert ScoringJournal.generate_entry_key(test_file1) != ScoringJournal.generate_entry_key(test_file2)
+
+
+def test_open_keeps_other_journals(tmp_path: Path) -> None:
+    test_file = generate_test_files(tmp_path, ["0000.txt"])[0]
+    journal = ScoringJournal(tmp_path / "journal")
+    journal.open("old")
+    journal.append(test_file, ScoringResult(100))
+
+    # 別の提出を開いても、中断された提出は再開できる
+    assert journal.open("new") == {}
+    journal.delete()
+    assert [path.name for path in (tmp_path / "journal").iterdir()] == ["old.jsonl"]
+    assert journal.open("old")[ScoringJournal.generate_entry_key(test_file)].score == 100
+    journal.close()
+
+
+def test_delete(tmp_path: Path) -> None:
+    journal = ScoringJournal(tmp_path / "journal")
+    journal.open("key")
+    journal.append(generate_test_files(tmp_path, ["0000.txt"])[0], ScoringResult(100))
+
+    journal.delete()
+
+    assert list((tmp_path / "journal").iterdir()) == []
+    assert ScoringJournal(tmp_path / "journal").open("key") == {}
@@ -1,11 +1,20 @@
-from unittest.mock import Mock
+from datetime import datetime, timedelta
+from typing import cast
+from unittest.mock import Mock, call
 
 import pytest
 
+from ahc_local_leaderboard.database.record_read_service import RecordReadService
 from ahc_local_leaderboard.database.record_write_service import RecordWriteService
-from ahc_local_leaderboard.models.summary_score_record import SummaryScoreRecord
+from ahc_local_leaderboard.models.summary_score_record import (
+    SummaryScoreRecord,
+    SummaryScoreRecords,
+)
 from ahc_local_leaderboard.models.test_case import TestCases
 from ahc_local_leaderboard.models.test_file import TestFiles
+from ahc_local_leaderboard.rebuild.relative_score_materializer import (
+    RelativeScoreMaterializer,
+)
 from ahc_local_leaderboard.submit.relative_score_updater import RelativeScoreUpdater
 from ahc_local_leaderboard.submit.reserved_record_updater import ReservedRecordUpdater
 from ahc_local_leaderboard.submit.submission_matcher import SubmissionMatcher
@@ -14,6 +23,13 @@ from ahc_local_leaderboard.submit.test_case_processor import TestCasesProcessor
 from ahc_local_leaderboard.submit.test_file_processor import TestFilesProcessor
 
 
+@pytest.fixture
+def mock_record_read_service() -> Mock:
+    mock_record_read_service = Mock(spec=RecordReadService)
+    mock_record_read_service.fetch_recent_summary_records.return_value = SummaryScoreRecords([])
+    return mock_record_read_service
+
+
 @pytest.fixture
 def mock_record_write_service() -> Mock:
     return Mock(spec=RecordWriteService)
@@ -61,6 +77,7 @@ def mock_submission_matcher() -> Mock:
 
 @pytest.mark.parametrize("skip_duplicate", [False, True])
 def test_submitter_execute_calls_in_order(
+    mock_record_read_service: Mock,
     mock_record_write_service: Mock,
     mock_test_files_processor: Mock,
     mock_test_cases_processor: Mock,
@@ -73,6 +90,7 @@ def test_submitter_execute_calls_in_order(
     skip_duplicate: bool,
 ) -> None:
     submitter = Submitter(
+        record_read_service=mock_record_read_service,
         record_write_service=mock_record_write_service,
         test_files_processor=mock_test_files_processor,
         test_case_processor=mock_test_cases_processor,
@@ -95,6 +113,11 @@ def test_submitter_execute_calls_in_order(
 
     mock_test_files_processor.process_test_files.assert_called_once_with(mock_test_files)
     mock_record_write_service.reserve_empty_score_history_record.assert_called_once()
+    # 重複判定と提出の削除のため、提出のハッシュ値と提出ディレクトリも記録する
+    assert mock_record_write_service.reserve_empty_score_history_record.call_args.args[1:] == (
+        mock_test_cases.calculate_fingerprint.return_value,
+        str(mock_test_cases.get_submit_dir.return_value),
+    )
     mock_test_cases_processor.process_test_cases.assert_called_once_with(mock_test_cases, mock_reserved_record.id)
     mock_reserved_record_updater.update_reserved_record.assert_called_once_with(mock_reserved_record)
     mock_relative_score_updater.apply_relative_score_updates.assert_called_once()
@@ -103,6 +126,7 @@ def test_submitter_execute_calls_in_order(
 
 @pytest.mark.parametrize("skip_duplicate", [False, True])
 def test_submitter_execute_already_exists_submission(
+    mock_record_read_service: Mock,
     mock_record_write_service: Mock,
     mock_test_files_processor: Mock,
     mock_test_cases_processor: Mock,
@@ -115,6 +139,7 @@ def test_submitter_execute_already_exists_submission(
     skip_duplicate: bool,
 ) -> None:
     submitter = Submitter(
+        record_read_service=mock_record_read_service,
         record_write_service=mock_record_write_service,
         test_files_processor=mock_test_files_processor,
         test_case_processor=mock_test_cases_processor,
@@ -146,3 +171,165 @@ def test_submitter_execute_already_exists_submission(
         mock_reserved_record_updater.update_reserved_record.assert_called_once_with(mock_reserved_record)
         mock_relative_score_updater.apply_relative_score_updates.assert_called_once()
         assert result is True
+
+
+def test_submitter_record_test_cases_does_not_score(
+    mock_record_read_service: Mock,
+    mock_record_write_service: Mock,
+    mock_test_files_processor: Mock,
+    mock_test_cases_processor: Mock,
+    mock_reserved_record_updater: Mock,
+    mock_relative_score_updater: Mock,
+    mock_test_cases: Mock,
+    mock_reserved_record: Mock,
+    mock_submission_matcher: Mock,
+) -> None:
+    submitter = Submitter(
+        record_read_service=mock_record_read_service,
+        record_write_service=mock_record_write_service,
+        test_files_processor=mock_test_files_processor,
+        test_case_processor=mock_test_cases_processor,
+        reserved_record_updater=mock_reserved_record_updater,
+        relative_score_updater=mock_relative_score_updater,
+        submission_matcher=mock_submission_matcher,
+    )
+
+    mock_record_write_service.reserve_empty_score_history_record.return_value = mock_reserved_record
+    mock_reserved_record.id = 1
+
+    result = submitter.record_test_cases(mock_test_cases, False)
+
+    mock_test_files_processor.process_test_files.assert_not_called()
+    mock_test_cases_processor.process_test_cases.assert_called_once_with(mock_test_cases, mock_reserved_record.id)
+    mock_relative_score_updater.apply_relative_score_updates.assert_called_once()
+    assert result is True
+
+
+def test_submitter_record_test_cases_with_lazy_relative_scores(
+    mock_record_read_service: Mock,
+    mock_record_write_service: Mock,
+    mock_test_files_processor: Mock,
+    mock_test_cases_processor: Mock,
+    mock_reserved_record_updater: Mock,
+    mock_relative_score_updater: Mock,
+    mock_test_cases: Mock,
+    mock_reserved_record: Mock,
+    mock_submission_matcher: Mock,
+) -> None:
+    mock_relative_score_materializer = Mock(spec=RelativeScoreMaterializer)
+    submitter = Submitter(
+        record_read_service=mock_record_read_service,
+        record_write_service=mock_record_write_service,
+        test_files_processor=mock_test_files_processor,
+        test_case_processor=mock_test_cases_processor,
+        reserved_record_updater=mock_reserved_record_updater,
+        relative_score_updater=mock_relative_score_updater,
+        submission_matcher=mock_submission_matcher,
+        relative_score_materializer=mock_relative_score_materializer,
+    )
+
+    mock_record_write_service.reserve_empty_score_history_record.return_value = mock_reserved_record
+    mock_reserved_record.id = 1
+
+    assert submitter.record_test_cases(mock_test_cases, False) is True
+
+    # 過去の提出の相対スコアは更新せず、未反映であることだけを記録する
+    mock_reserved_record_updater.update_reserved_record.assert_called_once_with(mock_reserved_record)
+    mock_relative_score_updater.apply_relative_score_updates.assert_not_called()
+    mock_record_write_service.reset_is_updated_flags.assert_called_once()
+    mock_relative_score_materializer.invalidate.assert_called_once()
+
+
+@pytest.fixture
+def submitter(
+    mock_record_read_service: Mock,
+    mock_record_write_service: Mock,
+    mock_test_files_processor: Mock,
+    mock_test_cases_processor: Mock,
+    mock_reserved_record_updater: Mock,
+    mock_relative_score_updater: Mock,
+    mock_submission_matcher: Mock,
+) -> Submitter:
+    return Submitter(
+        record_read_service=mock_record_read_service,
+        record_write_service=mock_record_write_service,
+        test_files_processor=mock_test_files_processor,
+        test_case_processor=mock_test_cases_processor,
+        reserved_record_updater=mock_reserved_record_updater,
+        relative_score_updater=mock_relative_score_updater,
+        submission_matcher=mock_submission_matcher,
+    )
+
+
+@pytest.mark.parametrize("latest_offset_seconds, expected_offset_seconds", [(None, 0), (-10, 0), (0, 1), (30, 31)])
+def test_generate_submission_times(
+    submitter: Submitter,
+    mock_record_read_service: Mock,
+    latest_offset_seconds: int,
+    expected_offset_seconds: int,
+) -> None:
+    now = datetime.now().replace(microsecond=0)
+    records = []
+    if latest_offset_seconds is not None:
+        records.append(SummaryScoreRecord(1, now + timedelta(seconds=latest_offset_seconds), 0, 0, 0, None))
+    mock_record_read_service.fetch_recent_summary_records.return_value = SummaryScoreRecords(records)
+
+    submission_times = submitter.generate_submission_times(3)
+
+    # 実行中に秒をまたぐ場合を考慮する
+    assert submission_times[0] - now - timedelta(seconds=expected_offset_seconds) <= timedelta(seconds=1)
+    assert [time - submission_times[0] for time in submission_times] == [timedelta(seconds=i) for i in range(3)]
+
+
+@pytest.mark.parametrize("skip_duplicate", [False, True])
+def test_record_test_cases_batch(
+    submitter: Submitter,
+    mock_record_read_service: Mock,
+    mock_record_write_service: Mock,
+    mock_test_cases_processor: Mock,
+    mock_reserved_record_updater: Mock,
+    mock_relative_score_updater: Mock,
+    mock_submission_matcher: Mock,
+    skip_duplicate: bool,
+) -> None:
+    test_cases_list = [Mock(spec=TestCases) for _ in range(3)]
+    reserved_records = [Mock(spec=SummaryScoreRecord, id=id) for id in [11, 12, 13]]
+    mock_record_read_service.fetch_recent_summary_records.return_value = SummaryScoreRecords([])
+    mock_record_write_service.reserve_empty_score_history_record.side_effect = reserved_records
+    # 2番目の提出は既に記録されている
+    mock_submission_matcher.is_submission_already_recorded.side_effect = [False, True, False]
+
+    new_record_ids = submitter.record_test_cases_batch(cast(list[TestCases], test_cases_list), skip_duplicate)
+
+    if skip_duplicate:
+        assert new_record_ids == [11, 12]
+        assert mock_test_cases_processor.process_test_cases.call_args_list == [
+            call(test_cases_list[0], 11),
+            call(test_cases_list[2], 12),
+        ]
+        recorded_records = reserved_records[:2]
+    else:
+        assert new_record_ids == [11, 12, 13]
+        assert mock_test_cases_processor.process_test_cases.call_count == 3
+        recorded_records = reserved_records
+
+    # 記録時と、すべての提出を記録した後に集計し直す
+    updated_records = [c.args[0] for c in mock_reserved_record_updater.update_reserved_record.call_args_list]
+    assert updated_records == recorded_records + recorded_records[:-1]
+    mock_relative_score_updater.apply_relative_score_updates.assert_called_once_with(new_record_ids)
+
+
+def test_record_test_cases_batch_all_duplicates(
+    submitter: Submitter,
+    mock_record_read_service: Mock,
+    mock_record_write_service: Mock,
+    mock_relative_score_updater: Mock,
+    mock_submission_matcher: Mock,
+) -> None:
+    mock_record_read_service.fetch_recent_summary_records.return_value = SummaryScoreRecords([])
+    mock_submission_matcher.is_submission_already_recorded.return_value = True
+
+    assert submitter.record_test_cases_batch([Mock(spec=TestCases), Mock(spec=TestCases)], True) == []
+
+    mock_record_write_service.reserve_empty_score_history_record.assert_not_called()
+    mock_relative_score_updater.apply_relative_score_updates.assert_not_called()
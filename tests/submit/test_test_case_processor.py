@@ -1,4 +1,5 @@
-from unittest.mock import Mock, patch
+from pathlib import Path
+from unittest.mock import Mock, call, patch
 
 import pytest
 
@@ -11,6 +12,7 @@ from ahc_local_leaderboard.submit.test_case_processor import (
 )
 from ahc_local_leaderboard.utils.file_utility import FileUtility
 from ahc_local_leaderboard.utils.relative_score_calculater import (
+    MaximizationScoring,
     RelativeScoreCalculaterInterface,
 )
 
@@ -120,13 +122,42 @@ def test_process_test_case(
         mock_record_write_service.insert_test_case.assert_called_once_with(test_case, submission_id)
 
 
-@pytest.mark.parametrize("test_case_count", [0, 1, 100])
-def test_process_test_cases(mock_test_case_processor: Mock, mock_test_cases: Mock, test_case_count: int) -> None:
-    test_cases_processor = TestCasesProcessor(mock_test_case_processor)
+def test_process_test_cases_in_bulk(
+    mock_record_read_service: Mock,
+    mock_record_write_service: Mock,
+    mock_file_utility: Mock,
+) -> None:
+
+    test_case_processor = TestCaseProcessor(
+        mock_record_read_service, mock_record_write_service, MaximizationScoring(), mock_file_utility
+    )
 
-    mock_test_cases.__iter__ = Mock(return_value=iter([Mock(spec=TestCase) for _ in range(test_case_count)]))
+    test_cases = TestCases()
+    for file_name, score in [("0000.txt", 100), ("0001.txt", 50), ("0002.txt", None), ("0003.txt", 10)]:
+        test_cases.add_test_case(TestCase(file_name, score, Path("out") / file_name))
+    mock_record_read_service.fetch_top_scores.return_value = {"0000.txt": 90, "0001.txt": 60, "0002.txt": 70}
+    submission_id = 1
+
+    test_case_processor.process_test_cases(test_cases, submission_id)
+
+    mock_record_read_service.fetch_top_scores.assert_called_once_with()
+    mock_record_read_service.fetch_top_score_for_test_case.assert_not_called()
+
+    updated_test_cases = [test_cases.test_cases[0], test_cases.test_cases[3]]
+    mock_record_write_service.update_top_scores.assert_called_once_with(updated_test_cases, submission_id)
+    assert mock_file_utility.copy_submit_file_to_leaderboard.call_args_list == [
+        call(test_case) for test_case in updated_test_cases
+    ]
+    mock_record_write_service.insert_test_cases.assert_called_once_with(test_cases.test_cases, submission_id)
+    mock_record_write_service.insert_test_case.assert_not_called()
+    mock_record_write_service.update_top_score.assert_not_called()
+
+
+def test_process_test_cases(mock_test_case_processor: Mock, mock_test_cases: Mock) -> None:
+    test_cases_processor = TestCasesProcessor(mock_test_case_processor)
     submission_id = 1
 
     test_cases_processor.process_test_cases(mock_test_cases, submission_id)
 
-    assert mock_test_case_processor.process_test_case.call_count == test_case_count
+    mock_test_case_processor.process_test_cases.assert_called_once_with(mock_test_cases, submission_id)
+    mock_test_case_processor.process_test_case.assert_not_called()
@@ -1,12 +1,20 @@
+import sys
+import tempfile
+import time
 from pathlib import Path
 from typing import Optional
 from unittest.mock import MagicMock, Mock, mock_open, patch
 
 import pytest
 
+from ahc_local_leaderboard.database.score_cache import ScoreCache
+from ahc_local_leaderboard.models.test_file import TestFile
+from ahc_local_leaderboard.submit.scorer_builder import VisScorerBuilder
+from ahc_local_leaderboard.submit.scoring_journal import ScoringJournal
 from ahc_local_leaderboard.submit.test_file_processor import (
     AtCoderTestFileProcessor,
     PahcerTestFileProcessor,
+    ScorerCommandTestFileProcessor,
     TestFileProcessorInterface,
     TestFilesProcessor,
 )
@@ -106,6 +114,141 @@ def test_process_test_file_invalid(
     assert score is None
 
 
+@patch("builtins.open", new_callable=mock_open)
+@patch("subprocess.run")
+@pytest.mark.parametrize(
+    "binary_path, expected_command",
+    [
+        (Path("target/release/vis"), [str(Path("target/release/vis"))]),
+        (None, ["cargo", "run", "-r", "--bin", "vis"]),
+    ],
+)
+def test_prepare_resolves_scorer_command(
+    mock_subprocess_run: Mock,
+    mock_open_func: Mock,
+    binary_path: Optional[Path],
+    expected_command: list[str],
+) -> None:
+    mock_scorer_builder = Mock(spec=VisScorerBuilder)
+    mock_scorer_builder.resolve.return_value = binary_path
+    mock_open_func.return_value.name = "sample.txt"
+    mock_subprocess_run.return_value = Mock(stdout=b"Score = 1\n")
+
+    processor = AtCoderTestFileProcessor(mock_scorer_builder)
+    processor.prepare()
+    processor.process_test_file(generate_mock_test_file("sample"))
+
+    assert mock_subprocess_run.call_args.args[0] == [*expected_command, "sample.txt", "sample.txt"]
+
+
+@pytest.mark.parametrize(
+    "command, executable",
+    [
+        ("target/release/vis {input} {output}", "tools/target/release/vis"),
+        ("python3 score.py --in={input} --out={output}", "python3"),
+    ],
+)
+def test_scorer_command_build_command(tmp_path: Path, command: str, executable: str) -> None:
+    processor = ScorerCommandTestFileProcessor(command, r"Score = (\d+)", False, tmp_path / "tools")
+    test_file = TestFile("0000.txt", Path("in/0000.txt"), Path("out/0000.txt"))
+
+    built_command = processor.build_command(test_file)
+
+    if "/" in executable:
+        assert built_command[0] == str((tmp_path / executable).resolve())
+    else:
+        assert built_command[0] == executable
+    assert str(Path("in/0000.txt").resolve()) in built_command[-2]
+    assert str(Path("out/0000.txt").resolve()) in built_command[-1]
+
+
+@pytest.mark.parametrize("command", ["", "vis {input}", "vis {output}"])
+def test_scorer_command_requires_placeholders(tmp_path: Path, command: str) -> None:
+    with pytest.raises(ValueError):
+        ScorerCommandTestFileProcessor(command, r"Score = (\d+)", False, tmp_path)
+
+
+@pytest.mark.parametrize(
+    "score_regex, score_only, decoded_output, expected_score",
+    [
+        (r"Score = (\d+)", False, "Score = 100\n", 100),
+        (r"Score = (\d+)", False, "Score = 0\n", None),
+        (r"score: (\d+)", False, "len = 3\nscore: 42\n", 42),
+        (r"score: (\d+)", False, "Score = 42\n", None),
+        (r"Score = (\d+)", True, "123\n", 123),
+        (r"Score = (\d+)", True, "Score = 123\n", None),
+        (r"Score = (\d+)", True, "-1\n", None),
+    ],
+)
+def test_scorer_command_parse_stdout(
+    tmp_path: Path, score_regex: str, score_only: bool, decoded_output: str, expected_score: Optional[int]
+) -> None:
+    processor = ScorerCommandTestFileProcessor("vis {input} {output}", score_regex, score_only, tmp_path)
+    assert processor.parse_stdout(decoded_output) == expected_score
+
+
+def test_scorer_command_runs_in_isolated_working_directory(tmp_path: Path) -> None:
+    (tmp_path / "in").mkdir()
+    (tmp_path / "out").mkdir()
+    (tmp_path / "in" / "0000.txt").write_text("")
+    (tmp_path / "out" / "0000.txt").write_text("")
+    (tmp_path / "score.py").write_text(
+        "import sys\nopen('vis.html', 'w').write('')\nprint(f'Score = {len(sys.argv)}')\n"
+    )
+    processor = ScorerCommandTestFileProcessor(
+        f"{sys.executable} {tmp_path / 'score.py'} {{input}} {{output}}", r"Score = (\d+)", False, tmp_path
+    )
+
+    score = processor.process_test_file(
+        TestFile("0000.txt", tmp_path / "in" / "0000.txt", tmp_path / "out" / "0000.txt")
+    )
+
+    assert score == 3
+    assert not (Path.cwd() / "vis.html").exists()
+    assert not (tmp_path / "vis.html").exists()
+    assert processor.working_directory_pool is not None
+    created_directories = list(processor.working_directory_pool.created_directories)
+    assert len(created_directories) == 1
+    assert (created_directories[0] / "vis.html").exists()
+
+    processor.cleanup()
+    assert not created_directories[0].exists()
+
+
+def test_scorer_command_fingerprint_changes_with_settings(tmp_path: Path) -> None:
+    processor1 = ScorerCommandTestFileProcessor("vis {input} {output}", r"Score = (\d+)", False, tmp_path)
+    processor2 = ScorerCommandTestFileProcessor("vis {input} {output}", r"Score = (\d+)", True, tmp_path)
+    processor3 = ScorerCommandTestFileProcessor("vis2 {input} {output}", r"Score = (\d+)", False, tmp_path)
+
+    fingerprints = {processor.get_scorer_fingerprint() for processor in [processor1, processor2, processor3]}
+    assert len(fingerprints) == 3
+
+
+def test_scorer_command_fingerprint_changes_with_script(tmp_path: Path) -> None:
+    (tmp_path / "score.py").write_text("print('Score = 1')\n")
+    processor = ScorerCommandTestFileProcessor("python3 score.py {input} {output}", r"Score = (\d+)", False, tmp_path)
+
+    # 作業ディレクトリを分離しても実行できるよう、スクリプトはルートディレクトリ基準の絶対パスに置き換える
+    assert processor.build_command(TestFile("0000.txt", Path("in"), Path("out")))[1] == str(
+        (tmp_path / "score.py").resolve()
+    )
+
+    fingerprint = processor.get_scorer_fingerprint()
+    assert fingerprint is not None
+    (tmp_path / "score.py").write_text("print('Score = 2')\n")
+    assert processor.get_scorer_fingerprint() != fingerprint
+
+
+@pytest.mark.parametrize(
+    "command",
+    ["cargo run -r --bin vis {input} {output}", "python3 -m scorer {input} {output}", "go run . {input} {output}"],
+)
+def test_scorer_command_fingerprint_without_scorer_source(tmp_path: Path, command: str) -> None:
+    # 点数計算プログラムの変更を検出できないコマンドでは、スコアキャッシュを使わない
+    processor = ScorerCommandTestFileProcessor(command, r"Score = (\d+)", False, tmp_path)
+    assert processor.get_scorer_fingerprint() is None
+
+
 @pytest.mark.parametrize(
     "file_names, expected_scores",
     [
@@ -141,6 +284,145 @@ def test_process_test_files(
         assert test_case.score == expected_scores[i]
 
 
+@pytest.mark.parametrize("max_workers", [1, 2, 8])
+def test_process_test_files_parallel_keeps_order(max_workers: int, mock_test_file_processor: Mock) -> None:
+
+    file_names = [f"{i:04}.txt" for i in range(20)]
+    mock_test_files = generate_mock_test_files(file_names)
+
+    def process_test_file(test_file: MagicMock) -> int:
+        # 後ろのファイルほど早く計算が終わるようにする
+        seed = int(test_file.file_name[:4])
+        time.sleep(0.001 * (len(file_names) - seed))
+        return seed * 10
+
+    mock_test_file_processor.process_test_file.side_effect = process_test_file
+
+    processor = TestFilesProcessor(mock_test_file_processor, max_workers)
+
+    test_cases = processor.process_test_files(mock_test_files)
+
+    assert [test_case.file_name for test_case in test_cases] == file_names
+    assert [test_case.score for test_case in test_cases] == [i * 10 for i in range(20)]
+
+
+@pytest.mark.parametrize("keep_scorer_alive", [False, True])
+def test_process_test_files_keeps_scorer_alive(keep_scorer_alive: bool, mock_test_file_processor: Mock) -> None:
+
+    mock_test_file_processor.process_test_file.return_value = 1
+
+    processor = TestFilesProcessor(mock_test_file_processor)
+    processor.keep_scorer_alive = keep_scorer_alive
+    processor.process_test_files(generate_mock_test_files(["0000.txt"]))
+
+    assert mock_test_file_processor.cleanup.called is not keep_scorer_alive
+
+    processor.close()
+    mock_test_file_processor.cleanup.assert_called()
+
+
+def test_process_test_files_records_exceptions(
+    mock_test_file_processor: Mock, capsys: pytest.CaptureFixture[str]
+) -> None:
+
+    mock_test_file_processor.process_test_file.side_effect = [1, FileNotFoundError("vis"), 3]
+
+    processor = TestFilesProcessor(mock_test_file_processor)
+    test_cases = processor.process_test_files(generate_mock_test_files(["0000.txt", "0001.txt", "0002.txt"]))
+
+    assert [test_case.score for test_case in test_cases] == [1, None, 3]
+    assert [test_case.error_message for test_case in test_cases] == [None, "FileNotFoundError: vis", None]
+    assert "Failed to score 0001.txt" in capsys.readouterr().out
+
+
+def test_process_test_files_uses_score_cache(mock_test_file_processor: Mock) -> None:
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir_path = Path(temp_dir)
+        file_names = ["0000.txt", "0001.txt", "0002.txt"]
+        for file_name in file_names:
+            (temp_dir_path / f"in_{file_name}").write_text(f"input {file_name}")
+            (temp_dir_path / f"out_{file_name}").write_text(f"output {file_name}")
+
+        def generate_test_files() -> MagicMock:
+            mock_files = generate_mock_test_files(file_names)
+            mock_files.__iter__.return_value = iter(
+                [
+                    MagicMock(
+                        file_name=file_name,
+                        input_file_path=temp_dir_path / f"in_{file_name}",
+                        submit_file_path=temp_dir_path / f"out_{file_name}",
+                    )
+                    for file_name in file_names
+                ]
+            )
+            return mock_files
+
+        score_cache = ScoreCache(temp_dir_path / "score_cache.db", max_entries=100, max_age_days=1)
+        mock_test_file_processor.get_scorer_fingerprint.return_value = "vis:1"
+        mock_test_file_processor.process_test_file.side_effect = [10, None, 30]
+
+        processor = TestFilesProcessor(mock_test_file_processor, score_cache=score_cache)
+        test_cases = processor.process_test_files(generate_test_files())
+        assert [test_case.score for test_case in test_cases] == [10, None, 30]
+        assert mock_test_file_processor.process_test_file.call_count == 3
+
+        # 変更した出力と、スコア計算に失敗した出力だけが再計算される
+        (temp_dir_path / "out_0002.txt").write_text("changed")
+        mock_test_file_processor.process_test_file.side_effect = [20, 40]
+
+        test_cases = processor.process_test_files(generate_test_files())
+        assert [test_case.score for test_case in test_cases] == [10, 20, 40]
+        recalculated = [call.args[0].file_name for call in mock_test_file_processor.process_test_file.call_args_list]
+        assert recalculated[3:] == ["0001.txt", "0002.txt"]
+
+
+def test_process_test_files_without_scorer_fingerprint(mock_test_file_processor: Mock) -> None:
+
+    mock_score_cache = Mock(spec=ScoreCache)
+    mock_test_file_processor.get_scorer_fingerprint.return_value = None
+    mock_test_file_processor.process_test_file.side_effect = [1, 2]
+
+    processor = TestFilesProcessor(mock_test_file_processor, score_cache=mock_score_cache)
+    test_cases = processor.process_test_files(generate_mock_test_files(["0000.txt", "0001.txt"]))
+
+    assert [test_case.score for test_case in test_cases] == [1, 2]
+    mock_score_cache.fetch_scores.assert_not_called()
+    mock_score_cache.store_scores.assert_not_called()
+
+
+def test_process_test_files_resumes_from_journal(tmp_path: Path, mock_test_file_processor: Mock) -> None:
+
+    file_names = ["0000.txt", "0001.txt", "0002.txt"]
+    mock_test_file_processor.get_scorer_fingerprint.return_value = "vis:1"
+    mock_test_file_processor.process_test_file.side_effect = [1, None, RuntimeError("interrupted")]
+
+    def generate_test_files() -> MagicMock:
+        mock_files = generate_mock_test_files(file_names)
+        mock_files.__iter__.return_value = iter(
+            [
+                TestFile(file_name, tmp_path / "in" / file_name, tmp_path / "out" / file_name)
+                for file_name in file_names
+            ]
+        )
+        return mock_files
+
+    processor = TestFilesProcessor(mock_test_file_processor, journal=ScoringJournal(tmp_path / "journal"))
+    test_cases = processor.process_test_files(generate_test_files())
+    assert [test_case.score for test_case in test_cases] == [1, None, None]
+
+    # 提出が記録されなかった場合は、計算済みのテストケースを再利用して再開する
+    mock_test_file_processor.process_test_file.side_effect = [3]
+    test_cases = processor.process_test_files(generate_test_files())
+
+    assert [test_case.score for test_case in test_cases] == [1, None, 3]
+    recalculated = [call.args[0].file_name for call in mock_test_file_processor.process_test_file.call_args_list]
+    assert recalculated[3:] == ["0002.txt"]
+
+    processor.discard_journal()
+    assert list((tmp_path / "journal").iterdir()) == []
+
+
 def sample_pahcer_data() -> dict:  # type: ignore
     return {
         "wa_seeds": [1, 3],
@@ -0,0 +1,38 @@
+from ahc_local_leaderboard.submit.working_directory_pool import WorkingDirectoryPool
+
+
+def test_acquire_returns_exclusive_directories() -> None:
+    pool = WorkingDirectoryPool()
+
+    with pool.acquire() as directory1, pool.acquire() as directory2:
+        assert directory1.is_dir()
+        assert directory2.is_dir()
+        assert directory1 != directory2
+
+    pool.cleanup()
+
+
+def test_acquire_reuses_released_directory() -> None:
+    pool = WorkingDirectoryPool()
+
+    with pool.acquire() as directory1:
+        pass
+    with pool.acquire() as directory2:
+        pass
+
+    assert directory1 == directory2
+    assert len(pool.created_directories) == 1
+
+    pool.cleanup()
+
+
+def test_cleanup_removes_directories() -> None:
+    pool = WorkingDirectoryPool()
+
+    with pool.acquire() as directory:
+        (directory / "vis.html").write_text("")
+
+    pool.cleanup()
+
+    assert not directory.exists()
+    assert pool.created_directories == []
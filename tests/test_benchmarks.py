@@ -0,0 +1,84 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from benchmarks.run_benchmarks import main, parse_arguments
+from benchmarks.synthetic_leaderboard import SyntheticLeaderboard
+
+
+@pytest.fixture(autouse=True)
+def restore_root_dir(monkeypatch: pytest.MonkeyPatch) -> None:
+    # SyntheticLeaderboard は consts.ROOT_DIR を書き換えるため、テスト後に元に戻す
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", Path.cwd())
+
+
+def test_synthetic_leaderboard(tmp_path: Path) -> None:
+    dependencies = SyntheticLeaderboard(tmp_path, 5, 12).generate()
+    dependencies["db_manager"].close()
+
+    assert sorted(path.name for path in (tmp_path / "in").iterdir()) == [f"{seed:04}.txt" for seed in range(5)]
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == [f"{seed:04}.txt" for seed in range(5)]
+
+    with sqlite3.connect(tmp_path / "leader_board" / "leader_board.db") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM score_history").fetchone()[0] == 12
+        assert conn.execute("SELECT COUNT(*) FROM test_cases").fetchone()[0] == 5 * 12
+        assert sorted(row[0] for row in conn.execute("SELECT relative_rank FROM score_history")) == list(range(1, 13))
+    conn.close()
+
+
+def test_main(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    output_path = tmp_path / "result.json"
+    assert main(["--cases", "5", "--submissions", "3", "--repeat", "2", "--output", str(output_path)]) == 0
+
+    result = json.loads(output_path.read_text(encoding="utf-8"))
+    assert result["parameters"] == {"cases": 5, "submissions": 3, "scoring_type": "Maximization", "seed": 0}
+    assert list(result["results"]) == [
+        "TestFilesProcessor.process_test_files",
+        "TestCasesProcessor.process_test_cases",
+        "RelativeScoreUpdater.apply_relative_score_updates",
+        "SubmissionMatcher.is_submission_already_recorded",
+        "Viewer.show_summary_list",
+        "Viewer.show_detail",
+    ]
+    assert all(len(benchmark_result["runs"]) == 2 for benchmark_result in result["results"].values())
+    assert "Viewer.show_detail" in capsys.readouterr().out
+
+
+def test_main_with_baseline(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(
+        json.dumps(
+            {
+                "parameters": {"cases": 5, "submissions": 3, "scoring_type": "Maximization", "seed": 0},
+                "results": {"SubmissionMatcher.is_submission_already_recorded": {"median": 1e-9}},
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    assert main(["--cases", "5", "--submissions", "3", "--repeat", "1", "--baseline", str(baseline_path)]) == 1
+
+    captured = capsys.readouterr()
+    assert "SubmissionMatcher.is_submission_already_recorded" in captured.out
+    assert "(regression)" in captured.out
+    assert "1 benchmarks are slower than the baseline." in captured.err
+
+
+def test_committed_baseline_covers_all_benchmarks(tmp_path: Path) -> None:
+    # poe benchmark:compare は既定のパラメータで計測し、benchmarks/baseline.json と比較する
+    baseline = json.loads((Path(__file__).parents[1] / "benchmarks" / "baseline.json").read_text(encoding="utf-8"))
+    default_arguments = parse_arguments([])
+    assert baseline["parameters"] == {
+        "cases": default_arguments.cases,
+        "submissions": default_arguments.submissions,
+        "scoring_type": default_arguments.scoring_type,
+        "seed": default_arguments.seed,
+    }
+
+    output_path = tmp_path / "result.json"
+    assert main(["--cases", "5", "--submissions", "3", "--repeat", "1", "--output", str(output_path)]) == 0
+    result = json.loads(output_path.read_text(encoding="utf-8"))
+    assert list(baseline["results"]) == list(result["results"])
+    assert all(0 < benchmark_result["median"] for benchmark_result in baseline["results"].values())
@@ -1,3 +1,8 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
 import tempfile
 import time
 from pathlib import Path
@@ -5,9 +10,26 @@ from typing import Generator, Optional, Type
 
 import pytest
 
-from ahc_local_leaderboard.main import main
+import ahc_local_leaderboard
+from ahc_local_leaderboard.database.database_manager import (
+    CachedTopScoresRepository,
+    DatabaseManager,
+    TestCaseRepository,
+)
+from ahc_local_leaderboard.dependency_setup import (
+    DependencyCache,
+    setup_initial_dependencies,
+)
+from ahc_local_leaderboard.main import (
+    create_parser,
+    expand_submit_dirs,
+    main,
+    run_command,
+)
 from ahc_local_leaderboard.models.test_file import TestFile
+from ahc_local_leaderboard.status.status_snapshot import StatusSnapshotFile
 from ahc_local_leaderboard.submit.test_file_processor import AtCoderTestFileProcessor
+from ahc_local_leaderboard.utils.relative_score_calculater import MinimizationScoring
 
 
 @pytest.fixture
@@ -65,6 +87,7 @@ def test_main_workflow(
     main()
 
     captured = capsys.readouterr()
+    assert list((temp_dir / "leader_board" / "journal").glob("*.jsonl")) == []  # 提出後はジャーナルが削除される
 
     # view を実行
     monkeypatch.setattr("sys.argv", ["main.py", "view"])
@@ -105,6 +128,559 @@ def test_main_workflow(
     assert "300" in captured.out
 
 
+@pytest.mark.parametrize("score_vectors", [False, True])
+def test_main_batch_submit(
+    temp_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    score_vectors: bool,
+) -> None:
+
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    monkeypatch.setattr("sys.argv", ["main.py", "setup"])
+    monkeypatch.setattr("builtins.input", lambda _: "2")
+    main()
+
+    if score_vectors:
+        with open(temp_dir / "leader_board" / "config.yaml", "a") as file:
+            file.write("database:\n  score_vectors: true\n")
+
+    # 出力ファイルの内容をそのままスコアとして扱う
+    def mock_process_test_file(self: Type["AtCoderTestFileProcessor"], test_file: TestFile) -> Optional[int]:
+        score = int(Path(test_file.submit_file_path).read_text())
+        return score if 0 < score else None
+
+    monkeypatch.setattr(AtCoderTestFileProcessor, "process_test_file", mock_process_test_file)
+
+    file_names = ["0000.txt", "0001.txt", "0002.txt"]
+    submit_scores = {
+        "out": [100, 200, 300],
+        "out1": [50, 400, 0],
+        "out2": [80, 100, 250],
+        "out3": [50, 400, 0],
+    }
+    (temp_dir / "in").mkdir()
+    for file_name in file_names:
+        (temp_dir / "in" / file_name).write_text("")
+    for submit_dir, scores in submit_scores.items():
+        (temp_dir / submit_dir).mkdir()
+        for file_name, score in zip(file_names, scores):
+            (temp_dir / submit_dir / file_name).write_text(str(score))
+
+    monkeypatch.setattr("sys.argv", ["main.py", "submit"])
+    main()
+
+    # out1 と重複する out3 はスキップされる
+    monkeypatch.setattr("sys.argv", ["main.py", "submit", "--submit-file", "out[1-3]", "--skip-duplicate"])
+    main()
+
+    captured = capsys.readouterr()
+    assert "Skipping 1 duplicate submissions" in captured.out
+    assert "Faild" not in captured.out
+
+    with sqlite3.connect(temp_dir / "leader_board" / "leader_board.db") as conn:
+        top_scores = dict(
+            conn.execute(
+                "SELECT c.name, ts.top_absolute_score FROM top_scores AS ts JOIN cases AS c ON ts.case_id = c.id"
+            ).fetchall()
+        )
+        history = conn.execute(
+            "SELECT id, total_absolute_score, total_relative_score, invalid_score_count, relative_rank "
+            "FROM score_history ORDER BY id"
+        ).fetchall()
+        test_case_count = conn.execute("SELECT COUNT(*) FROM test_cases").fetchone()[0]
+
+    db_manager = DatabaseManager()
+    test_case_repository = TestCaseRepository(db_manager)
+    test_cases = [
+        (row[0], record.file_name, record.absolute_score)
+        for row in history
+        for record in test_case_repository.fetch_records_by_id(row[0]).records
+    ]
+    db_manager.close()
+
+    assert len(test_cases) == 9
+    assert test_case_count == (0 if score_vectors else 9)
+
+    assert top_scores == {"0000.txt": 50, "0001.txt": 100, "0002.txt": 250}
+    assert [row[0] for row in history] == [1, 2, 3]
+
+    # 一度ずつ提出した場合と同じく、最終的なトップスコアに対する相対スコアと順位が記録される
+    calculator = MinimizationScoring()
+    expected_relative_scores = {row[0]: 0 for row in history}
+    for score_history_id, test_case_input, absolute_score in test_cases:
+        expected_relative_scores[score_history_id] += calculator(absolute_score, top_scores[test_case_input])
+    assert {row[0]: row[2] for row in history} == expected_relative_scores
+    assert {row[0]: row[3] for row in history} == {1: 0, 2: 1, 3: 0}
+    ranked_ids = sorted(expected_relative_scores, key=lambda id: -expected_relative_scores[id])
+    assert {row[0]: row[4] for row in history} == {id: rank for rank, id in enumerate(ranked_ids, 1)}
+
+
+def test_main_submit_after_batch_submit(
+    temp_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    monkeypatch.setattr("sys.argv", ["main.py", "setup"])
+    monkeypatch.setattr("builtins.input", lambda _: "2")
+    main()
+
+    def mock_process_test_file(self: Type["AtCoderTestFileProcessor"], test_file: TestFile) -> Optional[int]:
+        return int(Path(test_file.submit_file_path).read_text())
+
+    monkeypatch.setattr(AtCoderTestFileProcessor, "process_test_file", mock_process_test_file)
+
+    (temp_dir / "in").mkdir()
+    (temp_dir / "in" / "0000.txt").write_text("")
+    for submit_dir, score in [("out", 400), ("out1", 100), ("out2", 200), ("out3", 300)]:
+        (temp_dir / submit_dir).mkdir()
+        (temp_dir / submit_dir / "0000.txt").write_text(str(score))
+
+    # まとめて提出した記録には現在時刻以降の提出日時が割り当てられるが、直後の提出も時間をずらさずに記録できる
+    monkeypatch.setattr("sys.argv", ["main.py", "submit", "--submit-file", "out1", "out2", "out3"])
+    main()
+    monkeypatch.setattr("sys.argv", ["main.py", "submit"])
+    main()
+    assert "Faild" not in capsys.readouterr().out
+
+    with sqlite3.connect(temp_dir / "leader_board" / "leader_board.db") as conn:
+        history = conn.execute("SELECT id, submission_time FROM score_history ORDER BY id").fetchall()
+    conn.close()
+
+    assert [row[0] for row in history] == [1, 2, 3, 4]
+    submission_times = [row[1] for row in history]
+    assert submission_times == sorted(set(submission_times))
+
+
+def test_main_rebuild(
+    temp_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    monkeypatch.setattr("sys.argv", ["main.py", "setup"])
+    monkeypatch.setattr("builtins.input", lambda _: "2")
+    main()
+
+    def mock_process_test_file(self: Type["AtCoderTestFileProcessor"], test_file: TestFile) -> Optional[int]:
+        return int(Path(test_file.submit_file_path).read_text())
+
+    monkeypatch.setattr(AtCoderTestFileProcessor, "process_test_file", mock_process_test_file)
+
+    (temp_dir / "in").mkdir()
+    (temp_dir / "in" / "0000.txt").write_text("")
+    for submit_dir, score in [("out1", 100), ("out2", 200)]:
+        (temp_dir / submit_dir).mkdir()
+        (temp_dir / submit_dir / "0000.txt").write_text(str(score))
+
+    monkeypatch.setattr("sys.argv", ["main.py", "submit", "--submit-file", "out1", "out2"])
+    main()
+    capsys.readouterr()
+
+    monkeypatch.setattr("sys.argv", ["main.py", "rebuild", "--check"])
+    main()
+    assert "consistent" in capsys.readouterr().out
+
+    # scoring_type を変更すると、トップスコアと順位が変わる
+    config_path = temp_dir / "leader_board" / "config.yaml"
+    config_path.write_text(config_path.read_text().replace("Minimization", "Maximization"))
+
+    main()
+    captured = capsys.readouterr()
+    assert "Found 3 discrepancies" in captured.out
+
+    monkeypatch.setattr("sys.argv", ["main.py", "rebuild"])
+    main()
+    assert "3 discrepancies fixed" in capsys.readouterr().out
+
+    with sqlite3.connect(temp_dir / "leader_board" / "leader_board.db") as conn:
+        assert conn.execute("SELECT top_absolute_score, score_history_id FROM top_scores").fetchall() == [(200, 2)]
+        assert conn.execute("SELECT id, relative_rank FROM score_history ORDER BY id").fetchall() == [(1, 2), (2, 1)]
+    conn.close()
+
+
+def test_main_delete(
+    temp_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    monkeypatch.setattr("sys.argv", ["main.py", "setup"])
+    monkeypatch.setattr("builtins.input", lambda _: "2")
+    main()
+
+    def mock_process_test_file(self: Type["AtCoderTestFileProcessor"], test_file: TestFile) -> Optional[int]:
+        return int(Path(test_file.submit_file_path).read_text())
+
+    monkeypatch.setattr(AtCoderTestFileProcessor, "process_test_file", mock_process_test_file)
+
+    (temp_dir / "in").mkdir()
+    (temp_dir / "in" / "0000.txt").write_text("")
+    for submit_dir, score in [("out1", 200), ("out2", 100)]:
+        (temp_dir / submit_dir).mkdir()
+        (temp_dir / submit_dir / "0000.txt").write_text(str(score))
+        monkeypatch.setattr("sys.argv", ["main.py", "submit", "--submit-file", submit_dir])
+        main()
+        # 提出日時は秒単位で記録されるため、同じ秒に提出しないようにする
+        time.sleep(1)
+    capsys.readouterr()
+
+    monkeypatch.setattr("sys.argv", ["main.py", "delete", "2"])
+    main()
+    assert "Deleted submission 2 (1 top scores updated)" in capsys.readouterr().out
+
+    with sqlite3.connect(temp_dir / "leader_board" / "leader_board.db") as conn:
+        assert conn.execute("SELECT top_absolute_score, score_history_id FROM top_scores").fetchall() == [(200, 1)]
+        assert conn.execute("SELECT id, total_relative_score, relative_rank FROM score_history").fetchall() == [
+            (1, 1000000000, 1)
+        ]
+    conn.close()
+    assert (temp_dir / "leader_board" / "top" / "0000.txt").read_text() == "200"
+
+    main()
+    assert "Record not found in the database: id = 2" in capsys.readouterr().out
+
+
+def test_main_lazy_relative_scores(
+    temp_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    monkeypatch.setattr("sys.argv", ["main.py", "setup"])
+    monkeypatch.setattr("builtins.input", lambda _: "2")
+    main()
+
+    config_path = temp_dir / "leader_board" / "config.yaml"
+    config_path.write_text(config_path.read_text() + "relative_scores:\n  mode: lazy\n")
+
+    def mock_process_test_file(self: Type["AtCoderTestFileProcessor"], test_file: TestFile) -> Optional[int]:
+        return int(Path(test_file.submit_file_path).read_text())
+
+    monkeypatch.setattr(AtCoderTestFileProcessor, "process_test_file", mock_process_test_file)
+
+    (temp_dir / "in").mkdir()
+    (temp_dir / "in" / "0000.txt").write_text("")
+    for submit_dir, score in [("out1", 200), ("out2", 100)]:
+        (temp_dir / submit_dir).mkdir()
+        (temp_dir / submit_dir / "0000.txt").write_text(str(score))
+
+    monkeypatch.setattr("sys.argv", ["main.py", "submit", "--submit-file", "out1", "out2"])
+    main()
+    capsys.readouterr()
+
+    database_path = temp_dir / "leader_board" / "leader_board.db"
+    with sqlite3.connect(database_path) as conn:
+        # 提出時には順位を計算しない
+        assert conn.execute("SELECT relative_rank FROM score_history ORDER BY id").fetchall() == [(None,), (None,)]
+    conn.close()
+
+    monkeypatch.setattr("sys.argv", ["main.py", "view"])
+    main()
+    capsys.readouterr()
+
+    with sqlite3.connect(database_path) as conn:
+        assert conn.execute("SELECT id, total_relative_score, relative_rank FROM score_history").fetchall() == [
+            (1, 500000000, 2),
+            (2, 1000000000, 1),
+        ]
+    conn.close()
+
+
+def test_run_command_with_dependency_cache(
+    temp_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    monkeypatch.setattr("sys.argv", ["main.py", "setup"])
+    monkeypatch.setattr("builtins.input", lambda _: "2")
+    main()
+
+    def mock_process_test_file(self: Type["AtCoderTestFileProcessor"], test_file: TestFile) -> Optional[int]:
+        return int(Path(test_file.submit_file_path).read_text())
+
+    monkeypatch.setattr(AtCoderTestFileProcessor, "process_test_file", mock_process_test_file)
+
+    (temp_dir / "in").mkdir()
+    (temp_dir / "in" / "0000.txt").write_text("")
+    for submit_dir, score in [("out1", 200), ("out2", 100)]:
+        (temp_dir / submit_dir).mkdir()
+        (temp_dir / submit_dir / "0000.txt").write_text(str(score))
+
+    parser = create_parser()
+    initial_dependencies = setup_initial_dependencies(cache_top_scores=True)
+    assert isinstance(initial_dependencies["record_read_service"].top_score_repo, CachedTopScoresRepository)
+    config_path = temp_dir / "leader_board" / "config.yaml"
+    dependency_cache = DependencyCache(config_path, initial_dependencies)
+    try:
+        # 常駐サーバーと同様に、1つの依存関係でコマンドを続けて実行する
+        run_command(
+            parser, parser.parse_args(["submit", "--submit-file", "out1"]), initial_dependencies, dependency_cache
+        )
+        time.sleep(1)  # submission timeが同じ提出はできないので時間をずらす
+        run_command(
+            parser,
+            parser.parse_args(["submit", "--submit-file", "out2", "--jobs", "2"]),
+            initial_dependencies,
+            dependency_cache,
+        )
+        dependencies = dependency_cache.get()
+        assert dependencies["test_files_processor"].keep_scorer_alive is True
+        assert dependencies["test_files_processor"].max_workers != 2
+        assert dependency_cache.get()["test_files_processor"] is dependencies["test_files_processor"]
+        assert isinstance(dependencies["relative_score_calculator"], MinimizationScoring)
+
+        capsys.readouterr()
+        run_command(parser, parser.parse_args(["view"]), initial_dependencies, dependency_cache)
+        assert "Latest 2 Scores" in capsys.readouterr().out
+
+        # config.yaml が変更されると依存関係を生成し直す
+        config_path.write_text(config_path.read_text().replace("Minimization", "Maximization"))
+        os.utime(config_path, (time.time() + 10, time.time() + 10))
+        assert not isinstance(dependency_cache.get()["relative_score_calculator"], MinimizationScoring)
+    finally:
+        dependency_cache.close()
+        initial_dependencies["db_manager"].close()
+
+    with sqlite3.connect(temp_dir / "leader_board" / "leader_board.db") as conn:
+        assert conn.execute("SELECT id, relative_rank FROM score_history ORDER BY id").fetchall() == [(1, 2), (2, 1)]
+    conn.close()
+
+
+def test_main_status(
+    temp_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    monkeypatch.setattr("sys.argv", ["main.py", "status"])
+    main()
+    assert "local-leaderboard setup" in capsys.readouterr().err
+
+    monkeypatch.setattr("sys.argv", ["main.py", "setup"])
+    monkeypatch.setattr("builtins.input", lambda _: "2")
+    main()
+    capsys.readouterr()
+
+    monkeypatch.setattr("sys.argv", ["main.py", "status"])
+    main()
+    assert capsys.readouterr().out == "No submissions\n"
+
+    def mock_process_test_file(self: Type["AtCoderTestFileProcessor"], test_file: TestFile) -> Optional[int]:
+        return int(Path(test_file.submit_file_path).read_text())
+
+    monkeypatch.setattr(AtCoderTestFileProcessor, "process_test_file", mock_process_test_file)
+
+    (temp_dir / "in").mkdir()
+    (temp_dir / "in" / "0000.txt").write_text("")
+    (temp_dir / "out").mkdir()
+    (temp_dir / "out" / "0000.txt").write_text("100")
+    monkeypatch.setattr("sys.argv", ["main.py", "submit"])
+    main()
+    capsys.readouterr()
+
+    # 提出のコミット後に書き直されたスナップショットから読み取る
+    snapshot = StatusSnapshotFile(temp_dir / "leader_board" / "status.json").load()
+    assert snapshot is not None
+    assert snapshot["latest_id"] == 1
+
+    monkeypatch.setattr("sys.argv", ["main.py", "status"])
+    main()
+    assert capsys.readouterr().out == "Best: #1 (relative 1000000000, absolute 100) | Latest: #1 rank 1/1\n"
+
+
+def test_main_trace_and_profile(
+    temp_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    monkeypatch.setattr("sys.argv", ["main.py", "setup"])
+    monkeypatch.setattr("builtins.input", lambda _: "2")
+    main()
+
+    def mock_process_test_file(self: Type["AtCoderTestFileProcessor"], test_file: TestFile) -> Optional[int]:
+        return int(Path(test_file.submit_file_path).read_text())
+
+    monkeypatch.setattr(AtCoderTestFileProcessor, "process_test_file", mock_process_test_file)
+
+    (temp_dir / "in").mkdir()
+    (temp_dir / "out").mkdir()
+    for seed in range(3):
+        (temp_dir / "in" / f"{seed:04}.txt").write_text("")
+        (temp_dir / "out" / f"{seed:04}.txt").write_text("100")
+    capsys.readouterr()
+
+    monkeypatch.setattr("sys.argv", ["main.py", "submit", "--trace", "--profile"])
+    main()
+    assert "Trace Summary" in capsys.readouterr().out
+
+    trace_path = temp_dir / "leader_board" / "trace.jsonl"
+    events = [json.loads(line) for line in trace_path.read_text(encoding="utf-8").splitlines()]
+    assert events[0]["name"] == "submit"
+    assert events[0]["kind"] == "command"
+    names = {event["name"] for event in events}
+    assert {
+        "submit.score_test_files",
+        "submit.reserve_record",
+        "submit.update_top_scores",
+        "submit.update_reserved_record",
+        "submit.update_relative_scores",
+        "view.fetch",
+        "view.render",
+        "TopScoresRepository.fetch_top_scores",
+    } <= names
+    assert [event["kind"] for event in events if event["name"] == "AtCoderTestFileProcessor.process_test_file"] == [
+        "scorer"
+    ] * 3
+    assert 0 < events[0]["queries"]
+    assert (temp_dir / "leader_board" / "profile.prof").exists()
+
+    # --trace のみの場合は cProfile の統計を書き出さない
+    (temp_dir / "leader_board" / "profile.prof").unlink()
+    monkeypatch.setattr("sys.argv", ["main.py", "view", "--trace"])
+    main()
+    assert "Trace Summary" in capsys.readouterr().out
+    events = [json.loads(line) for line in trace_path.read_text(encoding="utf-8").splitlines()]
+    assert events[0]["name"] == "view"
+    assert not (temp_dir / "leader_board" / "profile.prof").exists()
+
+    # --trace を指定しない場合は集計を表示しない
+    monkeypatch.setattr("sys.argv", ["main.py", "view"])
+    main()
+    assert "Trace Summary" not in capsys.readouterr().out
+
+
+# 起動時には読み込まず、コマンドを実行する時点で読み込むパッケージ
+HEAVY_PACKAGES = ["rich", "yaml", "numpy", "asyncio"]
+
+# 初期依存関係の生成では読み込まず、スコア計算の依存関係を生成する時点で読み込むサブシステム
+SCORING_MODULES = [
+    "ahc_local_leaderboard.config",
+    "ahc_local_leaderboard.rebuild.leaderboard_rebuilder",
+    "ahc_local_leaderboard.rebuild.relative_score_materializer",
+    "ahc_local_leaderboard.submit.persistent_scorer",
+    "ahc_local_leaderboard.submit.test_file_processor",
+    "ahc_local_leaderboard.submit.test_case_processor",
+    "ahc_local_leaderboard.database.score_cache",
+]
+
+
+def measure_import_times(args: list[str], cwd: Path) -> dict[str, int]:
+    env = {**os.environ, "PYTHONPATH": str(Path(ahc_local_leaderboard.__file__).parents[1])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+
+    # 各行は "import time: <self> | <cumulative> | <module>" の形式
+    import_times = {}
+    for line in result.stderr.splitlines():
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            import_times[module.strip()] = int(cumulative)
+    return import_times
+
+
+def test_main_import_time(temp_dir: Path) -> None:
+    import_times = measure_import_times(["-c", "import ahc_local_leaderboard.main"], temp_dir)
+
+    assert [module for module in import_times if module.split(".")[0] in HEAVY_PACKAGES] == []
+    assert "ahc_local_leaderboard.dependency_setup" not in import_times
+
+
+def test_setup_initial_dependencies_does_not_import_scoring_modules(temp_dir: Path) -> None:
+    import_times = measure_import_times(
+        [
+            "-c",
+            "from ahc_local_leaderboard.dependency_setup import setup_initial_dependencies; "
+            "setup_initial_dependencies()",
+        ],
+        temp_dir,
+    )
+
+    assert [module for module in import_times if module.split(".")[0] in HEAVY_PACKAGES] == []
+    assert [module for module in import_times if module in SCORING_MODULES] == []
+
+
+def test_main_status_does_not_import_rich(temp_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (temp_dir / "leader_board").mkdir()
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    DatabaseManager.setup()
+
+    import_times = measure_import_times(["-m", "ahc_local_leaderboard.main", "status"], temp_dir)
+
+    assert "ahc_local_leaderboard.status.leaderboard_status" in import_times
+    assert [module for module in import_times if module.split(".")[0] in HEAVY_PACKAGES] == []
+
+
+def test_main_batch_submit_rejects_pahcer(
+    temp_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    monkeypatch.setattr("sys.argv", ["main.py", "setup"])
+    monkeypatch.setattr("builtins.input", lambda _: "2")
+    main()
+
+    generate_files(temp_dir, "in", ["0000"])
+    generate_files(temp_dir, "out1", ["0000"])
+    generate_files(temp_dir, "out2", ["0000"])
+    generate_files(temp_dir, "pahcer/json", [])
+    (temp_dir / "pahcer" / "json" / "result.json").write_text("{}")
+    capsys.readouterr()
+
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "main.py",
+            "submit",
+            "--submit-file",
+            "out1",
+            "out2",
+            "--pahcer-directory",
+            str(temp_dir / "pahcer"),
+        ],
+    )
+    main()
+
+    assert "'--pahcer-directory' can only be used with a single submit directory." in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "patterns, expected_dirs",
+    [
+        (["out"], ["out"]),
+        (["out*"], ["out", "out1", "out2"]),
+        (["out2", "out*"], ["out2", "out", "out1"]),
+        (["missing*"], ["missing*"]),
+        (["missing"], ["missing"]),
+    ],
+)
+def test_expand_submit_dirs(
+    temp_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    patterns: list[str],
+    expected_dirs: list[str],
+) -> None:
+    monkeypatch.setattr("ahc_local_leaderboard.consts.ROOT_DIR", temp_dir)
+    for dir_name in ["out", "out1", "out2"]:
+        (temp_dir / dir_name).mkdir()
+    (temp_dir / "out.txt").write_text("")
+
+    assert expand_submit_dirs(patterns) == expected_dirs
+
+
 '''
 
 @pytest.fixture(scope="function")
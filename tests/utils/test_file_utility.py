@@ -68,3 +68,14 @@ def test_copy_submit_file_to_leaderboard(
 
     expected_dest = test_dir / "leader_board/top" / test_case.file_name
     mock_copy.assert_called_once_with(test_case.submit_file_path, expected_dest)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1 << 20])
+def test_calculate_file_hash(temp_dir: Path, chunk_size: int) -> None:
+    file_path = temp_dir / "file.txt"
+    file_path.write_bytes(b"hello world")
+
+    assert (
+        FileUtility.calculate_file_hash(file_path, chunk_size)
+        == "b94d27b9934d3e08a52e52d7da7dabfac484efe37a5380ee9088f7ace2efcde9"
+    )
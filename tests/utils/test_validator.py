@@ -7,6 +7,7 @@ import pytest
 
 from ahc_local_leaderboard.utils.validator import (
     CommandValidatorBase,
+    DeleteValidator,
     InitValidator,
     SubmitValidator,
     ViewValidator,
@@ -163,3 +164,20 @@ def test_view_validator_invalid_detail_sort_column_option(mock_record_read_servi
     assert validator.validate(args) is False
     assert len(validator.errors) > 0
     assert "Invalid argument for 'view --sort-column' option:" in validator.errors[0]
+
+
+def test_delete_validator(mock_record_read_service: Mock) -> None:
+
+    validator = DeleteValidator(mock_record_read_service)
+
+    assert validator.validate(argparse.Namespace(command="delete", id=1)) is True
+    assert validator.errors == []
+
+
+def test_delete_validator_invalid_id(mock_record_read_service: Mock) -> None:
+
+    validator = DeleteValidator(mock_record_read_service)
+    args = argparse.Namespace(command="delete", id=2)  # ID 2は存在しないと仮定
+
+    assert validator.validate(args) is False
+    assert "Record not found in the database: id = 2" in validator.errors[0]
@@ -11,6 +11,7 @@ from ahc_local_leaderboard.models.summary_score_record import (
     SummaryScoreRecord,
     TopSummaryScoreRecord,
 )
+from ahc_local_leaderboard.profiling.trace_report import TraceSummary
 from ahc_local_leaderboard.utils.console_handler import ConsoleHandler
 from ahc_local_leaderboard.utils.relative_score_calculater import (
     RelativeScoreCalculaterInterface,
@@ -19,6 +20,7 @@ from ahc_local_leaderboard.view.table_builder import (
     DetailTableBuilder,
     SummaryTableBuilder,
     TopDetailTableBuilder,
+    TraceSummaryTableBuilder,
 )
 
 
@@ -136,3 +138,29 @@ def test_top_detail_table_builder_insert_record(
     builder.display()
 
     ConsoleHandler.console.print.assert_called_once()
+
+
+def test_trace_summary_table_builder_insert_record(setup_console_handler_mock: None) -> None:
+    record: TraceSummary = {
+        "name": "submit.update_top_scores",
+        "kind": "stage",
+        "calls": 2,
+        "total": 0.003,
+        "max": 0.002,
+        "queries": 10,
+    }
+
+    builder = TraceSummaryTableBuilder("Test Trace Summary Table")
+    builder.insert_record(record)
+    builder.display()
+
+    assert [cell for column in builder.table.columns for cell in column.cells] == [
+        "stage",
+        "submit.update_top_scores",
+        "2",
+        "3.000",
+        "1.500",
+        "2.000",
+        "10",
+    ]
+    ConsoleHandler.console.print.assert_called_once()
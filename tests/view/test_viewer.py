@@ -11,6 +11,9 @@ from ahc_local_leaderboard.models.detail_score_record import (
 )
 from ahc_local_leaderboard.models.sort_config import SortConfig
 from ahc_local_leaderboard.models.summary_score_record import SummaryScoreRecord
+from ahc_local_leaderboard.rebuild.relative_score_materializer import (
+    RelativeScoreMaterializer,
+)
 from ahc_local_leaderboard.utils.relative_score_calculater import (
     RelativeScoreCalculaterInterface,
 )
@@ -172,3 +175,23 @@ def test_show_top_detail(viewer: Viewer, mock_record_read_service: Mock) -> None
         viewer.show_top_detail()
         mock_record_read_service.fetch_sorted_top_detail_records.assert_called_once()
         mock_show_top_test_case_table.assert_called_once()
+
+
+def test_show_summary_list_refreshes_relative_scores(
+    mock_record_read_service: Mock,
+    mock_relative_score_calculator: Mock,
+    mock_summary_table_builder_functions: Dict[str, MagicMock],
+    mock_sort_config: Mock,
+) -> None:
+    mock_relative_score_materializer = Mock(spec=RelativeScoreMaterializer)
+    viewer = Viewer(mock_record_read_service, mock_relative_score_calculator, mock_relative_score_materializer)
+    mock_record_read_service.fetch_recent_summary_records.return_value = MagicMock(records=[])
+
+    # 相対スコアと順位を計算し直してから、概要レコードを取得する
+    mock_relative_score_materializer.materialize.side_effect = (
+        lambda: mock_record_read_service.fetch_recent_summary_records.assert_not_called()
+    )
+    viewer.show_summary_list(list_length=1, sort_config=mock_sort_config)
+
+    mock_relative_score_materializer.materialize.assert_called_once()
+    mock_record_read_service.fetch_recent_summary_records.assert_called_once_with(1)